@@ -6,6 +6,7 @@ import { createCsvImportResultHandler } from '@/modules/core/messaging/handlers/
 
 function result(overrides: Partial<CsvImportResult> = {}): CsvImportResult {
   return {
+    finished: true,
     messages: [],
     processed: 10,
     sourceName: 'binance',
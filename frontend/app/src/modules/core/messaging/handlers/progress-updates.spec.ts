@@ -115,6 +115,7 @@ describe('createProgressUpdateHandler', () => {
   it('should delegate csv import results to the csv handler', async () => {
     const handler = createProgressUpdateHandler(mockT);
     const result = await handler.handle(createMock<ProgressUpdateResultData>({
+      finished: true,
       messages: [],
       processed: 1,
       sourceName: 'binance',
@@ -125,6 +126,20 @@ describe('createProgressUpdateHandler', () => {
     expect(result).not.toBeNull();
   });
 
+  it('should not notify intermediate csv import progress', async () => {
+    const handler = createProgressUpdateHandler(mockT);
+    const result = await handler.handle(createMock<ProgressUpdateResultData>({
+      finished: false,
+      messages: [],
+      processed: 1,
+      sourceName: 'binance',
+      subtype: SocketMessageProgressUpdateSubType.CSV_IMPORT_RESULT,
+      total: 10,
+    }));
+
+    expect(result).toBeNull();
+  });
+
   it('should not touch any store for an unknown subtype', async () => {
     const handler = createProgressUpdateHandler(mockT);
     const result = await handler.handle(createMock<ProgressUpdateResultData>({}));
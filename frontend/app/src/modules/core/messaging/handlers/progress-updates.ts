@@ -19,6 +19,10 @@ export function createProgressUpdateHandler(t: ReturnType<typeof useI18n>['t']):
     const subtype = data.subtype;
 
     if (subtype === SocketMessageProgressUpdateSubType.CSV_IMPORT_RESULT) {
+      // Intermediate progress of a big import. Only the final result is notified.
+      if (!data.finished)
+        return null;
+
       const csvHandler = createCsvImportResultHandler(t);
       return csvHandler.handle(data);
     }
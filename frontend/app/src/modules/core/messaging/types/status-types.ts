@@ -151,6 +151,7 @@ const MultiplePricesQueryStatusWithSubtype = CommonQueryStatusData.extend({
 });
 
 export const CsvImportResult = z.object({
+  finished: z.boolean().default(true),
   messages: z.array(z.object({
     isError: z.boolean().default(false),
     msg: z.string(),
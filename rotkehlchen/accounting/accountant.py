@@ -1,9 +1,15 @@
 import logging
+from itertools import islice
 from time import monotonic
 from typing import TYPE_CHECKING
 
 from more_itertools import peekable
 
+from rotkehlchen.accounting.checkpoints import (
+    AccountingCheckpointer,
+    calculate_settings_hash,
+    checkpoints_supported,
+)
 from rotkehlchen.accounting.constants import FREE_PNL_EVENTS_LIMIT
 from rotkehlchen.accounting.export.csv import CSVExporter
 from rotkehlchen.accounting.pot import AccountingPot
@@ -11,18 +17,23 @@ from rotkehlchen.accounting.types import EventAccountingRuleStatus, MissingPrice
 from rotkehlchen.chain.evm.accounting.aggregator import EVMAccountingAggregators
 from rotkehlchen.concurrency import cancellable_sleep
 from rotkehlchen.db.reports import DBAccountingReports
-from rotkehlchen.errors.asset import UnknownAsset, UnprocessableTradePair
+from rotkehlchen.errors.asset import UnknownAsset, UnprocessableTradePair, UnsupportedAsset
 from rotkehlchen.errors.misc import AccountingError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import EVM_CHAIN_IDS_WITH_TRANSACTIONS, Timestamp
 from rotkehlchen.utils.data_structures import DefaultLRUCache, LRUCacheWithRemove
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
     from pathlib import Path
 
     from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+    from rotkehlchen.assets.asset import Asset
     from rotkehlchen.chain.aggregator import ChainsAggregator
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.settings import DBSettings
@@ -38,6 +49,9 @@ log = RotkehlchenLogsAdapter(logger)
 # and each event having in average 3 subevents.
 # TODO: Make this changeable depending on user's set page size
 PROCESSABLE_EVENTS_CACHE_SIZE = 1500
+# Reports of at least this many history events are processed in streaming mode. The
+# processed events are then only kept in the report DB and the export reads them from there
+STREAMING_REPORT_MIN_EVENTS = 20_000
 
 
 class Accountant:
@@ -110,6 +124,37 @@ class Accountant:
         )
         return count + 1
 
+    def _prefetch_prices(
+            self,
+            events: Iterable[AccountingEventMixin],
+            end_ts: Timestamp,
+            ignored_ids: set[str],
+    ) -> None:
+        """Fetch in bulk the missing prices of the assets of the events to be processed,
+        so that processing them does not query the price oracles one timestamp at a time"""
+        assets_timestamps: list[tuple[Asset, Timestamp]] = []
+        for event in events:
+            if (timestamp := event.get_timestamp()) > end_ts:
+                break
+
+            if event.should_ignore(ignored_ids):
+                continue
+
+            try:
+                assets = event.get_assets()
+            except (UnknownAsset, UnsupportedAsset, UnprocessableTradePair):
+                continue
+
+            assets_timestamps.extend(
+                (asset, timestamp) for asset in assets
+                if asset.identifier not in self.ignored_asset_ids
+            )
+
+        PriceHistorian().prefetch_historical_prices(
+            assets_timestamps=assets_timestamps,
+            to_asset=self.pots[0].profit_currency,
+        )
+
     def process_history(
             self,
             start_ts: Timestamp,
@@ -124,7 +169,9 @@ class Accountant:
 
         start_ts here is the timestamp at which to start taking trades and other
         taxable events into account. Not where processing starts from. Processing
-        always starts from the very first event we find in the history.
+        starts from the very first event we find in the history, unless a previous
+        report with the same settings left a valid checkpoint of the accounting state
+        before start_ts. Then processing resumes from the latest such checkpoint.
 
         Returns the id of the generated report
         """
@@ -150,7 +197,8 @@ class Accountant:
                 end_ts=end_ts,
                 settings=db_settings,
             )
-            self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id)  # noqa: E501
+            stream_events = len(events) >= STREAMING_REPORT_MIN_EVENTS
+            self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id, stream_events=stream_events)  # noqa: E501
             self.end_ts = end_ts
             self.csvexporter.reset(start_ts=start_ts, end_ts=end_ts)
 
@@ -163,76 +211,119 @@ class Accountant:
             prev_time = last_event_ts = Timestamp(0)
             ignored_ids = self.db.get_ignored_action_ids(cursor=cursor)
             last_yield = monotonic()
-
-        events_iter = peekable(events)
-        while True:
-            try:
-                (
-                    processed_events_num,
-                    prev_time,
-                ) = self._process_event(
-                    events_iterator=events_iter,
-                    start_ts=start_ts,
-                    end_ts=end_ts,
-                    prev_time=prev_time,
-                    db_settings=db_settings,
-                    ignored_ids=ignored_ids,
-                )
-            except PriceQueryUnsupportedAsset as e:
-                count = self._process_skipping_exception(
-                    exception=e,
-                    events=events,
-                    count=count,
-                    reason='not being able to find price for an unsupported asset',
-                )
-                continue
-            except NoPriceForGivenTimestamp as e:
-                self.pots[0].cost_basis.missing_prices.add(
-                    MissingPrice(
-                        from_asset=e.from_asset,
-                        to_asset=e.to_asset,
-                        time=e.time,
-                        rate_limited=e.rate_limited,
+            checkpointer = None
+            if active_premium and checkpoints_supported(db_settings):
+                checkpointer = AccountingCheckpointer(
+                    dbpnl=dbpnl,
+                    settings_hash=calculate_settings_hash(
+                        cursor=cursor,
+                        settings=db_settings,
+                        ignored_asset_ids=self.ignored_asset_ids,
+                        ignored_action_ids=ignored_ids,
                     ),
-                )
-                continue
-            except RemoteError as e:
-                count = self._process_skipping_exception(
-                    exception=e,
                     events=events,
-                    count=count,
-                    reason='inability to reach an external service at that point in time',
                 )
-                continue
-            except AccountingError as e:
-                log.error(f'Found critical error {e} when processing history. Stopping.')
-                e.report_id = report_id
-                raise
-
-            if processed_events_num == 0:
-                break  # we reached the period end
-
-            last_event_ts = prev_time
-            if monotonic() - last_yield > 0.1:
-                # This loop can take a very long time depending on the amount of events
-                # to process. We need to periodically yield to other greenlets or else
-                # calls to the API may time out. A positive sleep value is required: it
-                # forces a full event-loop cycle (including the I/O poll) so greenlets
-                # blocked on socket I/O -- like the API server -- actually get to run.
-                # A zero sleep does NOT guarantee this and starves the API. The
-                # wall-clock cadence (vs an event count) keeps the overhead a fixed
-                # fraction of report time regardless of how long individual events take.
-                # This is also the cancellation checkpoint of report processing.
-                cancellable_sleep(0.01)
-                last_yield = monotonic()
-            count += processed_events_num
-            if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
-                log.debug(
-                    f'PnL reports event processing has hit the event limit of {events_limit}. '
-                    f'Processing stopped and the results will not '
-                    f'take into account subsequent events. Total events were {len(events)}',
+
+        if checkpointer is not None and (checkpoint := checkpointer.find_checkpoint(start_ts)) is not None:  # noqa: E501
+            try:
+                self.pots[0].restore_checkpoint_state(checkpoint.data)
+            except DeserializationError as e:
+                log.error(f'Failed to restore accounting checkpoint at {checkpoint.timestamp} due to {e!s}')  # noqa: E501
+                checkpointer.invalidate(from_ts=checkpoint.timestamp)
+                self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id, stream_events=stream_events)  # noqa: E501
+            else:
+                log.info(
+                    'Resuming history processing from accounting checkpoint',
+                    checkpoint_ts=checkpoint.timestamp,
+                    skipped_events=checkpoint.events_num,
                 )
-                break
+                count = checkpoint.events_num
+                prev_time = last_event_ts = checkpoint.timestamp
+
+        self._prefetch_prices(
+            events=islice(events, count, None if active_premium else FREE_PNL_EVENTS_LIMIT),
+            end_ts=end_ts,
+            ignored_ids=ignored_ids,
+        )
+        # the same few asset pairs are priced for many timestamps so serve them from memory
+        with GlobalDBHandler().price_series.scope():
+            events_iter = peekable(islice(events, count, None))
+            while True:
+                try:
+                    (
+                        processed_events_num,
+                        prev_time,
+                    ) = self._process_event(
+                        events_iterator=events_iter,
+                        start_ts=start_ts,
+                        end_ts=end_ts,
+                        prev_time=prev_time,
+                        db_settings=db_settings,
+                        ignored_ids=ignored_ids,
+                    )
+                except PriceQueryUnsupportedAsset as e:
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='not being able to find price for an unsupported asset',
+                    )
+                    continue
+                except NoPriceForGivenTimestamp as e:
+                    self.pots[0].cost_basis.missing_prices.add(
+                        MissingPrice(
+                            from_asset=e.from_asset,
+                            to_asset=e.to_asset,
+                            time=e.time,
+                            rate_limited=e.rate_limited,
+                        ),
+                    )
+                    continue
+                except RemoteError as e:
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='inability to reach an external service at that point in time',
+                    )
+                    if checkpointer is not None:  # the skipped event would be missing from any later checkpoint  # noqa: E501
+                        checkpointer.enabled = False
+                    continue
+                except AccountingError as e:
+                    log.error(f'Found critical error {e} when processing history. Stopping.')
+                    e.report_id = report_id
+                    raise
+
+                if processed_events_num == 0:
+                    break  # we reached the period end
+
+                last_event_ts = prev_time
+                if checkpointer is not None:
+                    checkpointer.maybe_add_checkpoint(
+                        pot=self.pots[0],
+                        timestamp=prev_time,
+                        next_event=events_iter.peek(None),
+                    )
+                if monotonic() - last_yield > 0.1:
+                    # This loop can take a very long time depending on the amount of events
+                    # to process. We need to periodically yield to other greenlets or else
+                    # calls to the API may time out. A positive sleep value is required: it
+                    # forces a full event-loop cycle (including the I/O poll) so greenlets
+                    # blocked on socket I/O -- like the API server -- actually get to run.
+                    # A zero sleep does NOT guarantee this and starves the API. The
+                    # wall-clock cadence (vs an event count) keeps the overhead a fixed
+                    # fraction of report time regardless of how long individual events take.
+                    # This is also the cancellation checkpoint of report processing.
+                    cancellable_sleep(0.01)
+                    last_yield = monotonic()
+                count += processed_events_num
+                if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
+                    log.debug(
+                        f'PnL reports event processing has hit the event limit of {events_limit}. '
+                        f'Processing stopped and the results will not '
+                        f'take into account subsequent events. Total events were {len(events)}',
+                    )
+                    break
 
         for pot in self.pots:  # flush any buffered processed-event rows to the report DB
             pot.flush_pending_report_rows()
@@ -325,18 +416,18 @@ class Accountant:
 
         If a directory is given, it simply exports all event.csv in the given directory.
         If no directory is given it returns the path to a zip to export
+
+        For reports processed in streaming mode the events are read back from the report DB.
         """
-        if len(self.pots[0].processed_events) == 0:
+        pot = self.pots[0]
+        if pot.processed_events_num == 0:
             return False, 'No history processed in order to perform an export'
 
+        events: Iterable[ProcessedAccountingEvent] = pot.processed_events
+        if pot.stream_events:
+            events = DBAccountingReports(self.db).iterate_report_data(report_id=pot.report_id)  # type: ignore[arg-type]  # report id is set once events are processed  # noqa: E501
+
         if directory_path is None:
-            return self.csvexporter.create_zip(
-                events=self.pots[0].processed_events,
-                pnls=self.pots[0].pnls,
-            )
+            return self.csvexporter.create_zip(events=events, pnls=pot.pnls)
 
-        return self.csvexporter.export(
-            events=self.pots[0].processed_events,
-            pnls=self.pots[0].pnls,
-            directory=directory_path,
-        )
+        return self.csvexporter.export(events=events, pnls=pot.pnls, directory=directory_path)
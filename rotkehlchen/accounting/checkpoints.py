@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Final
+
+from rotkehlchen.accounting.types import AccountingCheckpoint
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
+from rotkehlchen.globaldb.handler import PRICE_HISTORY_VERSION_SETTING, GlobalDBHandler
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+    from rotkehlchen.accounting.pot import AccountingPot
+    from rotkehlchen.db.drivers.sqlite import DBCursor
+    from rotkehlchen.db.reports import DBAccountingReports
+    from rotkehlchen.db.settings import DBSettings
+    from rotkehlchen.types import Timestamp
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# how much history time must pass between two consecutive checkpoints
+ACCOUNTING_CHECKPOINT_INTERVAL: Final = DAY_IN_SECONDS * 90
+# how many checkpoints to keep per settings hash. Older ones are pruned first.
+MAX_ACCOUNTING_CHECKPOINTS: Final = 24
+# the settings that change the outcome of event processing
+CHECKPOINT_SETTINGS: Final = (
+    'main_currency',
+    'taxfree_after_period',
+    'include_crypto2crypto',
+    'calculate_past_cost_basis',
+    'include_gas_costs',
+    'cost_basis_method',
+    'eth_staking_taxable_after_withdrawal_enabled',
+    'include_fees_in_cost_basis',
+    'use_asset_collections_in_cost_basis',
+)
+
+
+def checkpoints_supported(settings: DBSettings) -> bool:
+    """Checkpoints are only useful if the state before a report's period is calculated.
+    Otherwise processing already starts at the report's period."""
+    return settings.calculate_past_cost_basis
+
+
+def calculate_settings_hash(
+        cursor: DBCursor,
+        settings: DBSettings,
+        ignored_asset_ids: set[str],
+        ignored_action_ids: set[str],
+) -> str:
+    """Hash everything apart from the events themselves that affects the accounting state.
+    Checkpoints are only reused by reports that produce the same hash.
+
+    Prices are covered by the version of the price history of the global DB, which changes
+    whenever an already stored price is edited, replaced or deleted.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    serialized_settings = settings.serialize()
+    hasher.update(json.dumps(
+        {name: serialized_settings.get(name) for name in CHECKPOINT_SETTINGS},
+        sort_keys=True,
+    ).encode())
+    hasher.update(json.dumps(sorted(ignored_asset_ids)).encode())
+    hasher.update(json.dumps(sorted(ignored_action_ids)).encode())
+    for table in ('accounting_rules', 'accounting_rule_events', 'linked_rules_properties'):
+        hasher.update(json.dumps(
+            cursor.execute(f'SELECT * FROM {table} ORDER BY identifier').fetchall(),
+        ).encode())
+    hasher.update(str(GlobalDBHandler.get_setting_value(
+        name=PRICE_HISTORY_VERSION_SETTING,
+        default_value=0,
+    )).encode())
+
+    return hasher.hexdigest()
+
+
+class EventsFingerprint:
+    """Incremental digest of a prefix of the sorted events of a report.
+
+    Comparing the digest of the events before a checkpoint to the one stored with it tells
+    whether any of them was added, removed or edited since the checkpoint was taken.
+    """
+
+    def __init__(self, events: Sequence[AccountingEventMixin]) -> None:
+        self.events = events
+        self.position = 0
+        self._hasher = hashlib.blake2b(digest_size=16)
+
+    def advance(self, position: int) -> str:
+        """Extend the digest up to (excluding) the given events position and return it"""
+        for idx in range(self.position, position):
+            self._hasher.update(f'{self.events[idx].get_fingerprint_key()}\n'.encode())
+
+        self.position = max(self.position, position)
+        return self._hasher.hexdigest()
+
+    def copy(self) -> EventsFingerprint:
+        fingerprint = EventsFingerprint(self.events)
+        fingerprint.position = self.position
+        fingerprint._hasher = self._hasher.copy()
+        return fingerprint
+
+
+class AccountingCheckpointer:
+    """Finds the checkpoint a report can resume from and periodically saves new ones
+    while the report's events are processed"""
+
+    def __init__(
+            self,
+            dbpnl: DBAccountingReports,
+            settings_hash: str,
+            events: Sequence[AccountingEventMixin],
+    ) -> None:
+        self.dbpnl = dbpnl
+        self.settings_hash = settings_hash
+        self.events = events
+        self.fingerprint = EventsFingerprint(events)
+        self.last_interval = -1 if len(events) == 0 else events[0].get_timestamp() // ACCOUNTING_CHECKPOINT_INTERVAL  # noqa: E501
+        self.enabled = True
+
+    def _events_up_to(self, timestamp: Timestamp) -> int:
+        """Number of events at or before the given timestamp. Events are sorted by time."""
+        return bisect_right(self.events, timestamp, key=lambda x: x.get_timestamp())
+
+    def find_checkpoint(self, start_ts: Timestamp) -> AccountingCheckpoint | None:
+        """Find the latest valid checkpoint before start_ts.
+
+        A checkpoint is valid if the events at or before it are the same as when it was
+        taken. Since the fingerprint covers all events up to a checkpoint, an invalid one
+        also invalidates all later checkpoints and they are all deleted.
+        """
+        found, found_fingerprint = None, self.fingerprint.copy()
+        for checkpoint in self.dbpnl.get_checkpoints(self.settings_hash, before_ts=start_ts):
+            if (
+                    self._events_up_to(checkpoint.timestamp) != checkpoint.events_num or
+                    self.fingerprint.advance(checkpoint.events_num) != checkpoint.events_fingerprint  # noqa: E501
+            ):
+                log.debug(f'Accounting checkpoint at {checkpoint.timestamp} is outdated. Deleting it')  # noqa: E501
+                self.invalidate(from_ts=checkpoint.timestamp)
+                break
+
+            found, found_fingerprint = checkpoint, self.fingerprint.copy()
+
+        self.fingerprint = found_fingerprint
+        if found is not None:
+            self.last_interval = found.timestamp // ACCOUNTING_CHECKPOINT_INTERVAL
+
+        return found
+
+    def invalidate(self, from_ts: Timestamp) -> None:
+        """Delete the checkpoints at or after from_ts and restart the events fingerprint"""
+        self.dbpnl.delete_checkpoints(self.settings_hash, from_ts=from_ts)
+        self.fingerprint = EventsFingerprint(self.events)
+
+    def maybe_add_checkpoint(
+            self,
+            pot: AccountingPot,
+            timestamp: Timestamp,
+            next_event: AccountingEventMixin | None,
+    ) -> None:
+        """Save a checkpoint of the pot if processing entered a new checkpoint interval.
+
+        Checkpoints are only taken once all events of a timestamp are processed, and not
+        after a price was found missing since the user may add it before the next report.
+        """
+        if (
+                self.enabled is False or
+                (interval := timestamp // ACCOUNTING_CHECKPOINT_INTERVAL) <= self.last_interval or
+                (next_event is not None and next_event.get_timestamp() <= timestamp) or
+                len(pot.cost_basis.missing_prices) != 0
+        ):
+            return
+
+        events_num = self._events_up_to(timestamp)
+        self.dbpnl.add_checkpoint(
+            settings_hash=self.settings_hash,
+            checkpoint=AccountingCheckpoint(
+                timestamp=timestamp,
+                events_num=events_num,
+                events_fingerprint=self.fingerprint.advance(events_num),
+                data=pot.serialize_checkpoint_state(),
+            ),
+        )
+        self.last_interval = interval
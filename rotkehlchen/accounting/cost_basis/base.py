@@ -1,9 +1,10 @@
 import heapq
 import logging
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Literal, NamedTuple, overload
+from typing import TYPE_CHECKING, Any, Final, Literal, NamedTuple, overload
 
 from rotkehlchen.accounting.types import MissingAcquisition, MissingPrice
 from rotkehlchen.assets.asset import Asset
@@ -11,7 +12,8 @@ from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_ETH, A_WETH
 from rotkehlchen.errors.misc import AccountingError
-from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.errors.serialization import ConversionError, DeserializationError
+from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_fval
 from rotkehlchen.types import CostBasisMethod, Location, Price, Timestamp
@@ -23,12 +25,15 @@ if TYPE_CHECKING:
     from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.settings import DBSettings
-    from rotkehlchen.fval import FVal
     from rotkehlchen.user_messages import MessagesAggregator
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# index of acquisitions restored from an accounting checkpoint, whose processed event
+# is not part of the report that resumed from the checkpoint
+CHECKPOINT_ACQUISITION_INDEX: Final = -1
+
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class AssetAcquisitionEvent:
@@ -76,6 +81,37 @@ class AssetAcquisitionEvent:
             'index': self.index,
         }
 
+    def serialize_for_checkpoint(self) -> dict[str, Any]:
+        """Like serialize() but also keeps the remaining amount so that a partially
+        consumed acquisition can be restored from an accounting checkpoint"""
+        return self.serialize() | {'remaining_amount': str(self.remaining_amount)}
+
+    @classmethod
+    def deserialize_from_checkpoint(cls: type[AssetAcquisitionEvent], data: dict[str, Any]) -> AssetAcquisitionEvent:  # noqa: E501
+        """Restore an acquisition saved by serialize_for_checkpoint.
+
+        The processed event of the acquisition is not part of the report resuming from
+        the checkpoint so the index is set to CHECKPOINT_ACQUISITION_INDEX.
+
+        May raise DeserializationError
+        """
+        try:
+            event = cls(
+                amount=deserialize_fval(data['full_amount'], 'full_amount', 'checkpoint'),
+                timestamp=Timestamp(data['timestamp']),
+                rate=Price(deserialize_fval(data['rate'], 'rate', 'checkpoint')),
+                index=CHECKPOINT_ACQUISITION_INDEX,
+            )
+            event.remaining_amount = deserialize_fval(
+                value=data['remaining_amount'],
+                name='remaining_amount',
+                location='checkpoint',
+            )
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
+        return event
+
     def __gt__(self, other: Any) -> bool:
         if not isinstance(other, AssetAcquisitionEvent):
             raise NotImplementedError
@@ -168,6 +204,22 @@ class BaseCostBasisMethod(ABC):
         if self._acquisitions_heap[0].acquisition_event.remaining_amount == ZERO:
             heapq.heappop(self._acquisitions_heap)
 
+    def reduce_amount(self, amount: FVal, asset: Asset) -> FVal:
+        """Consume `amount` from the acquisitions in the order of the method without
+        calculating any cost basis. Returns the amount that no acquisition could satisfy."""
+        remaining_amount = amount
+        for acquisition_event in self.processing_iterator():
+            if remaining_amount < acquisition_event.remaining_amount:
+                self.consume_result(used_amount=remaining_amount, asset=asset)
+                remaining_amount = ZERO
+                # stop iterating since we found all acquisitions to satisfy reduction
+                break
+
+            remaining_amount -= acquisition_event.remaining_amount
+            self.consume_result(used_amount=acquisition_event.remaining_amount, asset=asset)
+
+        return remaining_amount
+
     def calculate_spend_cost_basis(
             self,
             spending_amount: FVal,
@@ -298,6 +350,27 @@ class BaseCostBasisMethod(ABC):
     def __len__(self) -> int:
         return len(self._acquisitions_heap)
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions heap so that it can be stored in an accounting checkpoint.
+
+        The heap list is kept in its current order which already satisfies the heap
+        invariant, so restoring it does not need to push the elements again.
+        """
+        return {'acquisitions': [
+            [str(entry.priority), entry.acquisition_event.serialize_for_checkpoint()]
+            for entry in self._acquisitions_heap
+        ]}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state saved by serialize_state. May raise DeserializationError"""
+        try:
+            self._acquisitions_heap = [AssetAcquisitionHeapElement(
+                priority=deserialize_fval(priority, 'priority', 'checkpoint'),
+                acquisition_event=AssetAcquisitionEvent.deserialize_from_checkpoint(event),
+            ) for priority, event in data['acquisitions']]
+        except (KeyError, ValueError) as e:
+            raise DeserializationError(f'Invalid acquisitions state in checkpoint: {e!s}') from e
+
 
 class FIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -313,6 +386,16 @@ class FIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        try:
+            self._count = deserialize_fval(data['count'], 'count', 'checkpoint')
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
 
 class LIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -328,6 +411,339 @@ class LIFOCostBasisMethod(BaseCostBasisMethod):
         heapq.heappush(self._acquisitions_heap, AssetAcquisitionHeapElement(-self._count, acquisition))  # noqa: E501
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {'count': str(self._count)}
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        try:
+            self._count = deserialize_fval(data['count'], 'count', 'checkpoint')
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
+
+class AcquisitionLedger(BaseCostBasisMethod):
+    """Base of the array backed cost basis methods where acquisitions are only ever
+    consumed from one end of the ledger, which is the case for FIFO and LIFO.
+
+    Instead of a heap of acquisitions walked one by one, acquisitions are kept in a
+    list along with a list of the cumulative sums of their amounts. Amounts are kept as
+    integers in fixed point with as many decimal places as the most precise amount seen,
+    so the arithmetic is exact. That way finding all the acquisitions that a spend
+    consumes is a binary search over the cumulative sums and only the acquisitions
+    matched to the spend are touched. The matched amounts and the costs are still
+    calculated with FVal in the same order as the heap based methods so that the
+    results are identical.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._events: list[AssetAcquisitionEvent] = []
+        self._cumulative: list[int] = []  # running sum of the scaled amounts of _events
+        self._counters: list[int] = []  # insertion order of _events, kept for checkpoints
+        self._scale = 0  # decimal places of the fixed point amounts
+        self._count = 0
+
+    def _rescale(self, scale: int) -> None:
+        """Increase the decimal places of all the fixed point amounts to scale"""
+        factor = 10 ** (scale - self._scale)
+        self._cumulative = [x * factor for x in self._cumulative]
+        self._scale = scale
+
+    def _to_scaled(self, amount: FVal) -> int:
+        """Convert amount to fixed point, increasing the scale if amount needs it"""
+        sign, digits, exponent = amount.num.as_tuple()
+        assert isinstance(exponent, int), f'Got non finite amount {amount} in cost basis'
+        if -exponent > self._scale:
+            self._rescale(-exponent)
+
+        scaled = int(''.join(map(str, digits))) * 10 ** (exponent + self._scale)
+        return -scaled if sign else scaled
+
+    def _append(self, acquisition: AssetAcquisitionEvent, counter: int) -> None:
+        amount = self._to_scaled(acquisition.remaining_amount)
+        self._cumulative.append(amount if len(self._cumulative) == 0 else self._cumulative[-1] + amount)  # noqa: E501
+        self._events.append(acquisition)
+        self._counters.append(counter)
+
+    def add_in_event(self, acquisition: AssetAcquisitionEvent) -> None:
+        self._append(acquisition, self._count)
+        self._count += 1
+
+    @abstractmethod
+    def _take(self, amount: int) -> tuple[
+            list[AssetAcquisitionEvent],
+            AssetAcquisitionEvent | None,
+    ]:
+        """Remove the scaled amount from the ledger in the order of the method.
+
+        Returns the acquisitions that are used entirely in the order they are consumed
+        and the acquisition that is used partially, if any. Updating the remaining
+        amount of the returned acquisitions is left to the caller.
+
+        Mirrors the heap walk of BaseCostBasisMethod.calculate_spend_cost_basis, so an
+        acquisition is used entirely as long as the amount left to consume is not less
+        than its remaining amount.
+        """
+
+    @abstractmethod
+    def _ordered_indices(self) -> range:
+        """The indices of the acquisitions still in the ledger, in processing order"""
+
+    def processing_iterator(self) -> Iterator[AssetAcquisitionEvent]:
+        while len(self) > 0:
+            yield self._events[self._ordered_indices()[0]]
+
+    def get_acquisitions(self) -> tuple[AssetAcquisitionEvent, ...]:
+        """Returns the acquisitions still in the ledger in processing order"""
+        return tuple(self._events[idx] for idx in self._ordered_indices())
+
+    def __len__(self) -> int:
+        return len(self._ordered_indices())
+
+    def reduce_amount(self, amount: FVal, asset: Asset) -> FVal:
+        remaining_amount = amount
+        used, partial = self._take(self._to_scaled(amount))
+        for acquisition_event in used:
+            remaining_amount -= acquisition_event.remaining_amount
+            acquisition_event.remaining_amount = ZERO
+
+        if partial is not None:
+            partial.remaining_amount -= remaining_amount
+            remaining_amount = ZERO
+
+        return remaining_amount
+
+    def calculate_spend_cost_basis(
+            self,
+            spending_amount: FVal,
+            spending_asset: Asset,
+            timestamp: Timestamp,
+            missing_acquisitions: list[MissingAcquisition],
+            used_acquisitions: list[AssetAcquisitionEvent],
+            settings: DBSettings,
+            timestamp_to_date: Callable[[Timestamp], str],
+            average_cost_basis: FVal | None = None,
+            originating_event_id: int | None = None,
+    ) -> CostBasisInfo:
+        """Same as the heap based calculation but the matched acquisitions are found
+        with a binary search. Amounts and costs are summed in the same order as the heap
+        based calculation so that the results are identical."""
+        remaining_sold_amount = spending_amount
+        taxfree_bought_cost = taxable_bought_cost = taxable_amount = taxfree_amount = ZERO
+        matched_acquisitions = []
+        used, partial = self._take(self._to_scaled(spending_amount))
+        matches: list[tuple[AssetAcquisitionEvent, FVal | None]] = [
+            (x, x.remaining_amount) for x in used
+        ]
+        if partial is not None:
+            matches.append((partial, None))
+
+        for acquisition_event, entire_amount in matches:
+            # the partially used acquisition takes all of the amount left to sell
+            matched_amount = remaining_sold_amount if entire_amount is None else entire_amount
+            acquisition_rate = acquisition_event.rate if average_cost_basis is None else average_cost_basis  # noqa: E501
+            acquisition_cost = acquisition_rate * matched_amount
+            if (
+                    settings.taxfree_after_period is not None and
+                    acquisition_event.timestamp + settings.taxfree_after_period < timestamp
+            ):
+                taxfree_amount += matched_amount
+                taxfree_bought_cost += acquisition_cost
+                taxable = False
+            else:
+                taxable_amount += matched_amount
+                taxable_bought_cost += acquisition_cost
+                taxable = True
+
+            matched_acquisitions.append(MatchedAcquisition(
+                amount=matched_amount,
+                event=acquisition_event,
+                taxable=taxable,
+            ))
+            if entire_amount is None:
+                acquisition_event.remaining_amount -= remaining_sold_amount
+                remaining_sold_amount = ZERO
+            else:
+                remaining_sold_amount -= entire_amount
+                used_acquisitions.append(acquisition_event)
+                acquisition_event.remaining_amount = ZERO
+
+        if log.isEnabledFor(logging.DEBUG):  # avoid eager timestamp_to_date when disabled
+            log.debug(
+                'Spend matched to historical acquisitions',
+                spent_amount=spending_amount,
+                asset=spending_asset,
+                acquisitions_used_entirely=len(used),
+                acquisition_used_partially=partial is not None,
+                time=timestamp_to_date(timestamp),
+            )
+
+        is_complete = True
+        if remaining_sold_amount != ZERO:
+            # if we still have sold amount but no acquisitions to satisfy it then we only
+            # found acquisitions to partially satisfy the sell
+            adjusted_amount = spending_amount - taxfree_amount
+            missing_acquisitions.append(
+                MissingAcquisition(
+                    originating_event_id=originating_event_id,
+                    asset=spending_asset,
+                    time=timestamp,
+                    found_amount=taxable_amount + taxfree_amount,
+                    missing_amount=remaining_sold_amount,
+                ),
+            )
+            taxable_amount = adjusted_amount
+            is_complete = False
+
+        return CostBasisInfo(
+            taxable_amount=taxable_amount,
+            taxable_bought_cost=taxable_bought_cost,
+            taxfree_bought_cost=taxfree_bought_cost,
+            matched_acquisitions=matched_acquisitions,
+            is_complete=is_complete,
+        )
+
+    def _priority(self, counter: int) -> int:
+        """The heap priority of an acquisition, used to keep checkpoints compatible"""
+        return counter
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the ledger in the same format as the heap based methods"""
+        return {
+            'acquisitions': [[
+                str(self._priority(self._counters[idx])),
+                self._events[idx].serialize_for_checkpoint(),
+            ] for idx in self._ordered_indices()],
+            'count': str(self._count),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state saved by serialize_state. May raise DeserializationError"""
+        self._reset()
+        try:
+            entries = sorted((
+                self._priority(deserialize_fval(priority, 'priority', 'checkpoint').to_int(exact=True)),  # noqa: E501
+                AssetAcquisitionEvent.deserialize_from_checkpoint(event),
+            ) for priority, event in data['acquisitions'])
+            for counter, acquisition_event in entries:
+                self._append(acquisition_event, counter)
+            self._count = deserialize_fval(data['count'], 'count', 'checkpoint').to_int(exact=True)  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+        except (ConversionError, ValueError) as e:
+            raise DeserializationError(f'Invalid acquisitions state in checkpoint: {e!s}') from e
+
+
+class FIFOAcquisitionLedger(AcquisitionLedger):
+    """
+    Accounting in FIFO (first-in-first-out) method using an array backed ledger.
+    https://www.investopedia.com/terms/f/fifo.asp
+
+    Acquisitions are consumed from the start of the ledger, keeping the scaled amount
+    consumed so far. The consumed acquisitions are dropped once they make up most
+    of the ledger so that memory stays proportional to the acquisitions left.
+    """
+    def _reset(self) -> None:
+        super()._reset()
+        self._head = 0  # index of the first acquisition that is not entirely consumed
+        self._consumed = 0  # scaled amount consumed from the start of the ledger
+
+    def _rescale(self, scale: int) -> None:
+        self._consumed *= 10 ** (scale - self._scale)
+        super()._rescale(scale)
+
+    def _ordered_indices(self) -> range:
+        return range(self._head, len(self._events))
+
+    def _compact(self) -> None:
+        """Drop the consumed acquisitions when they are at least half of the ledger"""
+        if self._head < 1024 or self._head * 2 < len(self._events):
+            return
+
+        offset = self._cumulative[self._head - 1]
+        self._cumulative = [x - offset for x in self._cumulative[self._head:]]
+        del self._events[:self._head]
+        del self._counters[:self._head]
+        self._consumed -= offset
+        self._head = 0
+
+    def consume_result(self, used_amount: FVal, asset: Asset) -> None:
+        scaled_amount = self._to_scaled(used_amount)  # first since it may rescale the ledger
+        acquisition_event = self._events[self._head]
+        assert ZERO <= used_amount <= acquisition_event.remaining_amount, f'Used amount must be in the interval [0, {acquisition_event.remaining_amount}] but it was {used_amount} for {asset}'  # noqa: E501
+        acquisition_event.remaining_amount -= used_amount
+        if acquisition_event.remaining_amount == ZERO:
+            self._consumed = self._cumulative[self._head]
+            self._head += 1
+            self._compact()
+        else:
+            self._consumed += scaled_amount
+
+    def _take(self, amount: int) -> tuple[
+            list[AssetAcquisitionEvent],
+            AssetAcquisitionEvent | None,
+    ]:
+        target = self._consumed + amount
+        # every acquisition whose cumulative sum is reached by the target is used entirely
+        end = bisect_right(self._cumulative, target, lo=self._head)
+        used, partial = self._events[self._head:end], None
+        if end < len(self._events):
+            partial = self._events[end]
+            self._consumed = target
+        elif len(self._events) != 0:
+            self._consumed = self._cumulative[-1]
+
+        self._head = end
+        self._compact()
+        return used, partial
+
+
+class LIFOAcquisitionLedger(AcquisitionLedger):
+    """
+    Accounting in LIFO (last-in-first-out) method using an array backed ledger.
+    https://www.investopedia.com/terms/l/lifo.asp
+
+    The ledger is a stack consumed from its end, so only the last acquisition can be
+    partially consumed and its cumulative sum is updated in place.
+    """
+    def _priority(self, counter: int) -> int:
+        return -counter
+
+    def _ordered_indices(self) -> range:
+        return range(len(self._events) - 1, -1, -1)
+
+    def consume_result(self, used_amount: FVal, asset: Asset) -> None:
+        scaled_amount = self._to_scaled(used_amount)  # first since it may rescale the ledger
+        acquisition_event = self._events[-1]
+        assert ZERO <= used_amount <= acquisition_event.remaining_amount, f'Used amount must be in the interval [0, {acquisition_event.remaining_amount}] but it was {used_amount} for {asset}'  # noqa: E501
+        acquisition_event.remaining_amount -= used_amount
+        if acquisition_event.remaining_amount == ZERO:
+            self._events.pop()
+            self._cumulative.pop()
+            self._counters.pop()
+        else:
+            self._cumulative[-1] -= scaled_amount
+
+    def _take(self, amount: int) -> tuple[
+            list[AssetAcquisitionEvent],
+            AssetAcquisitionEvent | None,
+    ]:
+        target = (self._cumulative[-1] if len(self._cumulative) != 0 else 0) - amount
+        if target <= 0:  # everything is consumed
+            used = self._events[::-1]
+            self._events, self._cumulative, self._counters = [], [], []
+            return used, None
+
+        # the acquisition in which the target falls is used partially and all after it entirely
+        idx = bisect_left(self._cumulative, target)
+        used = self._events[:idx:-1]
+        del self._events[idx + 1:], self._cumulative[idx + 1:], self._counters[idx + 1:]
+        self._cumulative[idx] = target
+        return used, self._events[idx]
+
 
 class HIFOCostBasisMethod(BaseCostBasisMethod):
     """
@@ -382,6 +798,22 @@ class AverageCostBasisMethod(BaseCostBasisMethod):
         self.current_amount += acquisition.amount
         self._count += 1
 
+    def serialize_state(self) -> dict[str, Any]:
+        return super().serialize_state() | {
+            'count': str(self._count),
+            'current_amount': str(self.current_amount),
+            'current_total_acb': str(self.current_total_acb),
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        super().restore_state(data)
+        try:
+            self._count = deserialize_fval(data['count'], 'count', 'checkpoint')
+            self.current_amount = deserialize_fval(data['current_amount'], 'current_amount', 'checkpoint')  # noqa: E501
+            self.current_total_acb = deserialize_fval(data['current_total_acb'], 'current_total_acb', 'checkpoint')  # noqa: E501
+        except KeyError as e:
+            raise DeserializationError(f'Missing key {e!s}') from e
+
     def consume_result(self, used_amount: FVal, asset: Asset) -> None:
         """
         Same as its parent function but also deducts `used_amount` from `current_amount`.
@@ -455,9 +887,9 @@ class CostBasisEvents:
     def __init__(self, cost_basis_method: CostBasisMethod) -> None:
         """This class contains data about acquisitions and spends."""
         if cost_basis_method == CostBasisMethod.FIFO:
-            self.acquisitions_manager: BaseCostBasisMethod = FIFOCostBasisMethod()
+            self.acquisitions_manager: BaseCostBasisMethod = FIFOAcquisitionLedger()
         elif cost_basis_method == CostBasisMethod.LIFO:
-            self.acquisitions_manager = LIFOCostBasisMethod()
+            self.acquisitions_manager = LIFOAcquisitionLedger()
         elif cost_basis_method == CostBasisMethod.HIFO:
             self.acquisitions_manager = HIFOCostBasisMethod()
         elif cost_basis_method == CostBasisMethod.ACB:
@@ -539,13 +971,24 @@ class CostBasisInfo(NamedTuple):
         try:
             is_complete = data['is_complete']
             matched_acquisitions = [MatchedAcquisition.deserialize(x) for x in data['matched_acquisitions']]  # noqa: E501
+            # bought costs are only saved for report events. Older reports don't have them
+            taxable_bought_cost = deserialize_fval(
+                value=data.get('taxable_bought_cost', '0'),
+                name='taxable_bought_cost',
+                location='cost_basis',
+            )
+            taxfree_bought_cost = deserialize_fval(
+                value=data.get('taxfree_bought_cost', '0'),
+                name='taxfree_bought_cost',
+                location='cost_basis',
+            )
         except KeyError as e:
             raise DeserializationError(f'Could not decode CostBasisInfo json from the DB due to missing key {e!s}') from e  # noqa: E501
 
-        return CostBasisInfo(  # the 0 are not serialized and not used at recall so is okay to skip
+        return CostBasisInfo(  # taxable_amount is not serialized and not used at recall so is okay to skip  # noqa: E501
             taxable_amount=ZERO,
-            taxable_bought_cost=ZERO,
-            taxfree_bought_cost=ZERO,
+            taxable_bought_cost=taxable_bought_cost,
+            taxfree_bought_cost=taxfree_bought_cost,
             is_complete=is_complete,
             matched_acquisitions=matched_acquisitions,
         )
@@ -595,6 +1038,57 @@ class CostBasisCalculator(CustomizableDateMixin):
         self.missing_acquisitions: list[MissingAcquisition] = []
         self.missing_prices: set[MissingPrice] = set()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Serialize the acquisitions of every cost basis bucket along with the missing
+        acquisitions and prices found so far, to be stored in an accounting checkpoint.
+
+        Spends and used acquisitions are not kept since nothing reads them after processing.
+        """
+        return {
+            'assets': {
+                asset.identifier: asset_events.acquisitions_manager.serialize_state()
+                for asset, asset_events in self._events.items()
+            },
+            'missing_acquisitions': [
+                entry._asdict() | {
+                    'asset': entry.asset.identifier,
+                    'found_amount': str(entry.found_amount),
+                    'missing_amount': str(entry.missing_amount),
+                } for entry in self.missing_acquisitions
+            ],
+            'missing_prices': [entry.serialize() for entry in self.missing_prices],
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Replace the current state with one saved by serialize_state.
+
+        May raise DeserializationError if the saved state can not be read.
+        """
+        self.reset(self.settings)
+        try:
+            for asset_identifier, state in data['assets'].items():
+                self._events[Asset(asset_identifier)].acquisitions_manager.restore_state(state)
+
+            self.missing_acquisitions = [MissingAcquisition(
+                originating_event_id=entry['originating_event_id'],
+                asset=Asset(entry['asset']),
+                time=Timestamp(entry['time']),
+                found_amount=deserialize_fval(entry['found_amount'], 'found_amount', 'checkpoint'),
+                missing_amount=deserialize_fval(entry['missing_amount'], 'missing_amount', 'checkpoint'),  # noqa: E501
+            ) for entry in data['missing_acquisitions']]
+            self.missing_prices = {MissingPrice(
+                from_asset=Asset(entry['from_asset']),
+                to_asset=Asset(entry['to_asset']),
+                time=Timestamp(entry['time']),
+                rate_limited=entry['rate_limited'],
+            ) for entry in data['missing_prices']}
+        except KeyError as e:
+            self.reset(self.settings)
+            raise DeserializationError(f'Missing key {e!s} in cost basis checkpoint') from e
+        except DeserializationError:
+            self.reset(self.settings)
+            raise
+
     def _resolve_bucket_asset(self, asset: Asset) -> Asset:
         """Resolve an asset to its canonical cost basis bucket asset.
 
@@ -745,23 +1239,10 @@ class CostBasisCalculator(CustomizableDateMixin):
         if len(asset_events.acquisitions_manager) == 0:
             return False
 
-        remaining_amount = amount
-        for acquisition_event in asset_events.acquisitions_manager.processing_iterator():
-            if remaining_amount < acquisition_event.remaining_amount:
-                asset_events.acquisitions_manager.consume_result(
-                    used_amount=remaining_amount,
-                    asset=asset,
-                )
-                remaining_amount = ZERO
-                # stop iterating since we found all acquisitions to satisfy reduction
-                break
-
-            remaining_amount -= acquisition_event.remaining_amount
-            asset_events.acquisitions_manager.consume_result(
-                used_amount=acquisition_event.remaining_amount,
-                asset=asset,
-            )
-
+        remaining_amount = asset_events.acquisitions_manager.reduce_amount(
+            amount=amount,
+            asset=asset,
+        )
         if remaining_amount != ZERO:
             if not asset.is_fiat():
                 self.missing_acquisitions.append(
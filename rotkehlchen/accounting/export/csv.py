@@ -2,11 +2,13 @@ import json
 import logging
 import os
 from csv import DictWriter
+from itertools import chain
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any, Literal
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from rotkehlchen.accounting.cost_basis.base import CHECKPOINT_ACQUISITION_INDEX
 from rotkehlchen.accounting.structures.processed_event import AccountingEventExportType
 from rotkehlchen.constants import ZERO
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -22,7 +24,7 @@ from rotkehlchen.utils.mixins.customizable_date import CustomizableDateMixin
 from rotkehlchen.utils.version_check import get_current_version
 
 if TYPE_CHECKING:
-    from collections.abc import Collection
+    from collections.abc import Collection, Iterable
 
     from rotkehlchen.accounting.pnl import PnlTotals
     from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
@@ -191,23 +193,30 @@ class CSVExporter(CustomizableDateMixin):
                     if name == 'free' and acquisition.taxable is True:
                         continue
 
-                    index = acquisition.event.index + CSV_INDEX_OFFSET
                     if cost_basis == '':
                         cost_basis = '='
                     else:
                         cost_basis += '+'
 
+                    if acquisition.event.index == CHECKPOINT_ACQUISITION_INDEX:
+                        # acquired before the checkpoint the report resumed from, so
+                        # there is no row to reference. Use the acquisition rate itself.
+                        cost_basis += f'{acquisition.amount!s}*{acquisition.event.rate!s}'
+                        continue
+
+                    index = acquisition.event.index + CSV_INDEX_OFFSET
                     cost_basis += f'{acquisition.amount!s}*H{index}'
 
         dict_event[f'cost_basis_{name}'] = cost_basis
 
-    def _maybe_add_summary(self, events: list[dict[str, Any]], pnls: PnlTotals) -> None:
-        """Depending on given settings, adds a few summary lines at the end of
-        the all events PnL report"""
+    def _make_summary(self, events_num: int, pnls: PnlTotals) -> list[dict[str, Any]]:
+        """Depending on given settings, returns a few summary lines to add at the end of
+        the all events PnL report after the given number of event rows"""
         if self.settings.pnl_csv_have_summary is False:
-            return
+            return []
 
-        length = len(events) + 1
+        summary: list[dict[str, Any]] = []
+        length = events_num + 1
         template: dict[str, Any] = {
             'type': '',
             'notes': '',
@@ -224,12 +233,12 @@ class CSVExporter(CustomizableDateMixin):
             'cost_basis_free': '',
             'direction': '',
         }
-        events.extend((template, template))  # separate with 2 new lines
+        summary.extend((template, template))  # separate with 2 new lines
 
         entry = template.copy()
         entry['taxable_amount'] = 'TAXABLE'
         entry['price'] = 'FREE'
-        events.append(entry)
+        summary.append(entry)
 
         start_sums_index = length + 4
         sums = 0
@@ -251,7 +260,7 @@ class CSVExporter(CustomizableDateMixin):
                 sum_range=f'J2:J{length}',
                 actual_value=value.free,
             )
-            events.append(entry)
+            summary.append(entry)
 
         entry = template.copy()
         entry['free_amount'] = 'TOTAL'
@@ -260,23 +269,25 @@ class CSVExporter(CustomizableDateMixin):
             entry['price'] = f'=SUM(H{start_sums_index}:H{start_sums_index + sums - 1})'
         else:
             entry['taxable_amount'] = entry['price'] = 0
-        events.extend((entry, template, template))  # separate with 2 new lines
+        summary.extend((entry, template, template))  # separate with 2 new lines
 
         version_result = get_current_version()
         entry = template.copy()
         entry['free_amount'] = 'rotki version'
         entry['taxable_amount'] = version_result.our_version
-        events.append(entry)
+        summary.append(entry)
 
         for setting in ACCOUNTING_SETTINGS:
             entry = template.copy()
             entry['free_amount'] = setting
             entry['taxable_amount'] = str(getattr(self.settings, setting))
-            events.append(entry)
+            summary.append(entry)
+
+        return summary
 
     def create_zip(
             self,
-            events: list[ProcessedAccountingEvent],
+            events: Iterable[ProcessedAccountingEvent],
             pnls: PnlTotals,
     ) -> tuple[bool, str]:
         dirpath = Path(mkdtemp())
@@ -328,20 +339,50 @@ class CSVExporter(CustomizableDateMixin):
         self._add_pnl_type(event=event, dict_event=dict_event, amount_column='G', name='taxable')
         return dict_event
 
+    def _write_events_csv(
+            self,
+            path: Path,
+            events: Iterable[ProcessedAccountingEvent],
+            pnls: PnlTotals,
+    ) -> None:
+        """Write the CSV row of each event as it is consumed followed by the summary, so
+        that the events can be streamed from the DB instead of being held in memory.
+
+        May raise:
+        - CSVWriteError if a row contains fields not in the header
+        - PermissionError if the file can't be written
+        """
+        rows = map(self.to_csv_entry, events)
+        if (first_row := next(rows, None)) is None:
+            log.debug(f'Skipping writing empty CSV for {path}')
+            return
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = DictWriter(f, fieldnames=first_row.keys(), delimiter=self.settings.csv_export_delimiter)  # noqa: E501
+            w.writeheader()
+            events_num = 0
+            try:
+                for row in chain((first_row,), rows):
+                    w.writerow(row)
+                    events_num += 1
+                w.writerows(self._make_summary(events_num=events_num, pnls=pnls))
+            except ValueError as e:
+                raise CSVWriteError(f'Failed to write {path} CSV due to {e!s}') from e
+
+        os.utime(path)
+
     def export(
             self,
-            events: list[ProcessedAccountingEvent],
+            events: Iterable[ProcessedAccountingEvent],
             pnls: PnlTotals,
             directory: Path,
     ) -> tuple[bool, str]:
-        serialized_events = [self.to_csv_entry(x) for idx, x in enumerate(events)]
-        self._maybe_add_summary(events=serialized_events, pnls=pnls)
         try:
             directory.mkdir(parents=True, exist_ok=True)
-            dict_to_csv_file(
+            self._write_events_csv(
                 path=directory / FILENAME_ALL_CSV,
-                dictionary_list=serialized_events,
-                csv_delimiter=self.settings.csv_export_delimiter,
+                events=events,
+                pnls=pnls,
             )
         except (CSVWriteError, PermissionError) as e:
             return False, str(e)
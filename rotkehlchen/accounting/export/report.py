@@ -3,13 +3,13 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any
 
+from more_itertools import peekable
+
 from rotkehlchen.accounting.export.csv import CSVExporter
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
 from rotkehlchen.assets.asset import Asset
-from rotkehlchen.db.filtering import ReportDataFilterQuery
 from rotkehlchen.db.reports import DBAccountingReports
-from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -17,6 +17,7 @@ from rotkehlchen.premium.premium import UserLimitType, get_user_limit
 from rotkehlchen.types import CostBasisMethod, Timestamp
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
     from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
@@ -31,24 +32,21 @@ def get_report_events_and_overview(
         database: DBHandler,
         premium: Premium | None,
         report_id: int,
-) -> tuple[list[ProcessedAccountingEvent] | None, dict[str, Any] | None, str | None]:
+) -> tuple[Iterator[ProcessedAccountingEvent] | None, dict[str, Any] | None, str | None]:
+    """Get the report overview and an iterator streaming the report events from the DB"""
     dbreports = DBAccountingReports(database)
     reports, _ = dbreports.get_reports(report_id=report_id, limit=1)
     if len(reports) == 0:
         return None, None, f'PnL report with id {report_id} was not found'
 
-    try:
-        events, _, _ = dbreports.get_report_data(
-            filter_=ReportDataFilterQuery.make(report_id=report_id),
-            limit=get_user_limit(
-                premium=premium,
-                limit_type=UserLimitType.PNL_EVENTS,
-            )[0],
-        )
-    except InputError as e:
-        return None, None, str(e)
-
-    if len(events) == 0:
+    events = peekable(dbreports.iterate_report_data(
+        report_id=report_id,
+        limit=get_user_limit(
+            premium=premium,
+            limit_type=UserLimitType.PNL_EVENTS,
+        )[0],
+    ))
+    if not events:
         return None, None, 'No report events found in order to perform an export'
 
     return events, reports[0], None
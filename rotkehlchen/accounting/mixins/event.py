@@ -26,6 +26,7 @@ class AccountingEventType(SerializableEnumNameMixin):
 
 class AccountingEventMixin(ABC):
     """Interface to be followed by all data structures that go in accounting"""
+    __slots__ = ()
 
     @abstractmethod
     def get_timestamp(self) -> Timestamp:
@@ -42,6 +43,11 @@ class AccountingEventMixin(ABC):
     def get_identifier(self) -> str:
         """Get a unique identifier from an accounting event"""
 
+    @abstractmethod
+    def get_fingerprint_key(self) -> str:
+        """Get a cheap key of the event that changes when the event is edited in a way
+        that can change how it is processed"""
+
     @abstractmethod
     def should_ignore(self, ignored_ids: set[str]) -> bool:
         """Returns whether this event should be ignored due to user settings"""
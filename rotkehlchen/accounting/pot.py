@@ -31,6 +31,7 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.modules.eth2.structures import ValidatorDetailsWithStatus
     from rotkehlchen.chain.evm.accounting.aggregator import EVMAccountingAggregators
     from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.reports import PnlEventRow
     from rotkehlchen.db.settings import DBSettings
     from rotkehlchen.fval import FVal
     from rotkehlchen.user_messages import MessagesAggregator
@@ -78,7 +79,11 @@ class AccountingPot(CustomizableDateMixin):
             msg_aggregator=msg_aggregator,
         )
         self.pnls = PnlTotals()
+        # in streaming mode processed events are only written to the report DB and are
+        # not kept here, so that memory does not grow with the number of report events
+        self.stream_events = False
         self.processed_events: list[ProcessedAccountingEvent] = []
+        self.processed_events_num = 0
         # events excluded from the report because no accounting rule matched them.
         # Surfaced to the user so the report doesn't silently omit data.
         self.events_skipped_no_rule = 0
@@ -94,7 +99,7 @@ class AccountingPot(CustomizableDateMixin):
         self._dbpnl = DBAccountingReports(database)
         # buffer of serialized pnl_events rows, flushed in batches to avoid one DB
         # commit per processed event (the dominant I/O cost of large PnL reports)
-        self._pending_report_rows: list[tuple[int, Timestamp, str, str, str, str | None]] = []
+        self._pending_report_rows: list[PnlEventRow] = []
         # memoize profit-currency rates per report. profit_currency is fixed for the
         # duration of a report so keying on (asset identifier, timestamp) is enough.
         # Only successful lookups are cached so error paths keep being retried.
@@ -121,7 +126,9 @@ class AccountingPot(CustomizableDateMixin):
         return self._validators_with_status.get(validator_index)
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
-        self.processed_events.append(event)
+        self.processed_events_num += 1
+        if not self.stream_events:
+            self.processed_events.append(event)
         if self.is_dummy_pot:  # dummy pots never persist events (see __init__ docstring)
             return
 
@@ -156,6 +163,28 @@ class AccountingPot(CustomizableDateMixin):
 
         self._pending_report_rows = []
 
+    def serialize_checkpoint_state(self) -> dict[str, Any]:
+        """Serialize the state carried from one event to the next so that processing can
+        later resume from this point. PnL totals are not part of it since checkpoints are
+        only resumed from before the start of a report's period, where nothing is counted."""
+        return {
+            'cost_basis': self.cost_basis.serialize_state(),
+            'accountants': self.events_accountant.evm_accounting_aggregators.serialize_state(),
+            'events_skipped_no_rule': self.events_skipped_no_rule,
+        }
+
+    def restore_checkpoint_state(self, data: dict[str, Any]) -> None:
+        """Restore the state saved by serialize_checkpoint_state on a freshly reset pot.
+
+        May raise DeserializationError if the saved state can not be read.
+        """
+        try:
+            self.cost_basis.restore_state(data['cost_basis'])
+            self.events_accountant.evm_accounting_aggregators.restore_state(data['accountants'])
+            self.events_skipped_no_rule = data['events_skipped_no_rule']
+        except (KeyError, ValueError) as e:
+            raise DeserializationError(f'Could not restore accounting checkpoint: {e!s}') from e
+
     def get_rate_in_profit_currency(self, asset: Asset, timestamp: Timestamp) -> Price:
         """Get the profit_currency price of asset in the given timestamp
 
@@ -189,6 +218,7 @@ class AccountingPot(CustomizableDateMixin):
             start_ts: Timestamp,
             end_ts: Timestamp,
             report_id: int,
+            stream_events: bool = False,
     ) -> None:
         self.settings = settings
         with self.database.conn.read_ctx() as cursor:
@@ -202,7 +232,9 @@ class AccountingPot(CustomizableDateMixin):
         self.pnls.reset()
         self.cost_basis.reset(settings)
         self.events_accountant.reset()
+        self.stream_events = stream_events
         self.processed_events = []
+        self.processed_events_num = 0
         self.events_skipped_no_rule = 0
         self._pending_report_rows = []
 
@@ -248,7 +280,7 @@ class AccountingPot(CustomizableDateMixin):
             amount=amount,
             price=price,
             ignored_asset_ids=self.ignored_asset_ids,
-            starting_index=len(self.processed_events),
+            starting_index=self.processed_events_num,
         )
         for prefork_event in prefork_events:
             self._add_processed_event(prefork_event)
@@ -270,7 +302,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=None,
-            index=len(self.processed_events),
+            index=self.processed_events_num,
         )
         if extra_data:
             event.extra_data = extra_data | {'direction': EventDirection.IN.serialize()}
@@ -381,7 +413,7 @@ class AccountingPot(CustomizableDateMixin):
             price=price,
             pnl=PNL(),  # filled out later
             cost_basis=spend_cost,
-            index=len(self.processed_events),
+            index=self.processed_events_num,
         )
         if extra_data:
             spend_event.extra_data = extra_data | {'direction': EventDirection.OUT.serialize()}
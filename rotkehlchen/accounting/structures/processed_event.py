@@ -183,6 +183,9 @@ class ProcessedAccountingEvent:
         data = self.to_exported_dict(ts_converter=ts_converter, export_type=AccountingEventExportType.DB)  # noqa: E501
         data['extra_data'] = self.extra_data
         data['notes'] = self.notes  # undo the tx_ref addition to notes before going to the DB
+        if self.cost_basis is not None:  # the ACB CSV export reads them back from the DB
+            data['cost_basis']['taxable_bought_cost'] = str(self.cost_basis.taxable_bought_cost)
+            data['cost_basis']['taxfree_bought_cost'] = str(self.cost_basis.taxfree_bought_cost)
         data['index'] = self.index
         data['count_entire_amount_spend'] = self.count_entire_amount_spend
         data['count_cost_basis_pnl'] = self.count_cost_basis_pnl
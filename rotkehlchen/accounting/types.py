@@ -1,7 +1,7 @@
 from enum import auto
 from typing import TYPE_CHECKING, Any, NamedTuple
 
-from rotkehlchen.utils.mixins.enums import DBCharEnumMixIn, SerializableEnumNameMixin
+from rotkehlchen.utils.mixins.enums import SerializableEnumNameMixin
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import Asset
@@ -9,23 +9,6 @@ if TYPE_CHECKING:
     from rotkehlchen.types import Timestamp
 
 
-class SchemaEventType(DBCharEnumMixIn):
-    """Supported Event Type schemas
-
-    Keeping it as this for now since we may experiment with a different schemas
-    per accounting event type.
-    """
-    ACCOUNTING_EVENT = 1
-
-    def get_schema(self) -> dict[str, Any]:
-        """May raise EncodingError if schema is invalid"""
-        schema: dict[str, Any] = {}
-        if self == SchemaEventType.ACCOUNTING_EVENT:
-            return schema
-
-        raise AssertionError('Should never happen')
-
-
 class MissingAcquisition(NamedTuple):
     """Data for a missing acquisition
 
@@ -74,6 +57,18 @@ class MissingPrice(NamedTuple):
         }
 
 
+class AccountingCheckpoint(NamedTuple):
+    """A snapshot of the accounting state after processing all events up to timestamp
+
+    events_num is the number of history events processed to reach this state and
+    events_fingerprint a digest of them, used to detect if any of them changed since.
+    """
+    timestamp: Timestamp
+    events_num: int
+    events_fingerprint: str
+    data: dict[str, Any]
+
+
 class EventAccountingRuleStatus(SerializableEnumNameMixin):
     HAS_RULE = auto()
     PROCESSED = auto()
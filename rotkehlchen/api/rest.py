@@ -239,6 +239,7 @@ from rotkehlchen.types import (
     UserNote,
 )
 from rotkehlchen.utils.misc import ts_ms_to_sec, ts_now
+from rotkehlchen.utils.perf import PERF_RECORDER
 from rotkehlchen.utils.version_check import get_current_version
 
 if TYPE_CHECKING:
@@ -2129,6 +2130,28 @@ class RestAPI:
     def ping() -> Response:
         return api_response(_wrap_in_ok_result(True), status_code=HTTPStatus.OK)
 
+    @staticmethod
+    def get_perf_stats(flamegraph: bool, route: str | None) -> Response:
+        if PERF_RECORDER.enabled is False:
+            return api_response(
+                wrap_in_fail_result('Performance instrumentation is not enabled. Start rotki with --perf-instrumentation'),  # noqa: E501
+                status_code=HTTPStatus.CONFLICT,
+            )
+
+        if flamegraph is True:
+            result = PERF_RECORDER.folded_stacks(route=route)
+        else:
+            result = PERF_RECORDER.serialize()
+            if route is not None:
+                result['routes'] = {k: v for k, v in result['routes'].items() if k == route}
+
+        return api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
+
+    @staticmethod
+    def reset_perf_stats() -> Response:
+        PERF_RECORDER.reset()
+        return api_response(OK_RESULT, status_code=HTTPStatus.OK)
+
     @async_api_call()
     def _import_data(
             self,
@@ -3006,6 +3029,24 @@ class RestAPI:
         result_dict = _wrap_in_result(result, '')
         return api_response(result_dict, status_code=HTTPStatus.OK)
 
+    def get_report_summary(
+            self,
+            report_id: int,
+            group_by: Literal['event_type', 'asset'],
+    ) -> Response:
+        try:
+            summary = DBAccountingReports(self.rotkehlchen.data.db).get_report_summary(
+                report_id=report_id,
+                group_by=group_by,
+            )
+        except InputError as e:
+            return api_response(wrap_in_fail_result(str(e)), status_code=HTTPStatus.BAD_REQUEST)
+
+        return api_response(
+            result=process_result(_wrap_in_ok_result(summary)),
+            status_code=HTTPStatus.OK,
+        )
+
     def get_associated_locations(self) -> Response:
         locations = self.rotkehlchen.data.db.get_associated_locations()
         return api_response(
@@ -3050,10 +3091,31 @@ class RestAPI:
             self,
             filter_query: HistoryBaseEntryFilterQuery,
             aggregate_by_group_ids: bool,
+            exact_count: bool = True,
     ) -> Response:
         response_data = self.history_service.get_history_events(
             filter_query=filter_query,
             aggregate_by_group_ids=aggregate_by_group_ids,
+            exact_count=exact_count,
+        )
+        return make_response_from_dict(response_data)
+
+    def get_history_events_columns(
+            self,
+            from_timestamp: Timestamp | None,
+            to_timestamp: Timestamp | None,
+            exclude_ignored_assets: bool,
+            limit: int,
+            after_identifier: int | None,
+            checksum_up_to: int | None,
+    ) -> Response:
+        response_data = self.history_service.get_history_events_columns(
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            exclude_ignored_assets=exclude_ignored_assets,
+            limit=limit,
+            after_identifier=after_identifier,
+            checksum_up_to=checksum_up_to,
         )
         return make_response_from_dict(response_data)
 
@@ -3868,6 +3930,17 @@ class RestAPI:
             task_manager.should_schedule = enabled
         return api_response(_wrap_in_ok_result(result={'enabled': enabled}))
 
+    def get_scheduler_state(self) -> Response:
+        """Get whether the periodic task scheduler is enabled and the queue and run time
+        metrics of each of its tasks, to see which tasks are waiting for resources."""
+        if (task_manager := self.rotkehlchen.task_manager) is None:  # None if logout races us
+            return api_response(_wrap_in_ok_result(result={'enabled': False, 'tasks': {}}))
+
+        return api_response(_wrap_in_ok_result(result={
+            'enabled': task_manager.should_schedule,
+            'tasks': task_manager.get_scheduler_stats(),
+        }))
+
     def get_historical_netvalue(
             self,
             from_timestamp: Timestamp,
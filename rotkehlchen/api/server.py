@@ -33,6 +33,7 @@ from rotkehlchen.api.v1.resources import (
     AccountingReportDownloadResource,
     AccountingReportExportResource,
     AccountingReportsResource,
+    AccountingReportSummaryResource,
     AccountingRulesConflictsResource,
     AccountingRulesExportResource,
     AccountingRulesImportResource,
@@ -123,6 +124,7 @@ from rotkehlchen.api.v1.resources import (
     HistoricalPricesPerAssetResource,
     HistoryActionableItemsResource,
     HistoryEventResource,
+    HistoryEventsColumnarResource,
     HistoryProcessingDebugResource,
     HistoryProcessingResource,
     HistorySkippedExternalEventResource,
@@ -158,6 +160,7 @@ from rotkehlchen.api.v1.resources import (
     OnchainHistoricalBalanceResource,
     OraclesResource,
     OwnedAssetsResource,
+    PerfResource,
     PeriodicDataResource,
     PingResource,
     PremiumCapabilitiesResource,
@@ -205,6 +208,7 @@ from rotkehlchen.api.v1.wallet_resources import (
 )
 from rotkehlchen.concurrency import Task
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.perf import PERF_RECORDER
 from rotkehlchen.utils.version_check import get_current_version
 
 if TYPE_CHECKING:
@@ -291,6 +295,7 @@ URLS_V1: URLS = [
     ('/history/events/position', EventGroupPositionResource),
     ('/history/events/export', ExportHistoryEventResource),
     ('/history/events/export/download', ExportHistoryDownloadResource),
+    ('/history/events/columnar', HistoryEventsColumnarResource),
     ('/history/events/match/asset_movements', MatchAssetMovementsResource),
     ('/history/events/match/bridges', MatchBridgeTransactionsResource),
     ('/history/events/duplicates/customized', CustomizedEventDuplicatesResource),
@@ -307,6 +312,7 @@ URLS_V1: URLS = [
         'per_report_data_resource',
     ),
     ('/reports/<int:report_id>/export', AccountingReportExportResource),
+    ('/reports/<int:report_id>/summary', AccountingReportSummaryResource),
     ('/reports/<int:report_id>/download', AccountingReportDownloadResource),
     ('/accounting/rules', AccountingRulesResource),
     ('/accounting/rules/reset', AccountingRulesResetResource),
@@ -373,6 +379,7 @@ URLS_V1: URLS = [
     ('/actions/ignored', IgnoredActionsResource),
     ('/info', InfoResource),
     ('/ping', PingResource),
+    ('/perf', PerfResource),
     ('/import', DataImportResource),
     ('/nfts', NFTSResource),
     ('/nfts/balances', NFTSBalanceResource),
@@ -545,6 +552,7 @@ class APIServer:
         self.flask_app.register_error_handler(Exception, self.unhandled_exception)
         self.flask_app.before_request(self.before_request_callback)
         self.flask_app.after_request(self.after_request_callback)
+        self.flask_app.teardown_request(self.teardown_request_callback)
 
     @staticmethod
     def unhandled_exception(exception: Exception) -> Response:
@@ -566,6 +574,14 @@ class APIServer:
         Returning a Response short-circuits the request (the session-cookie gate
         rejecting with 401); returning None lets it proceed as normal.
         """
+        if (
+                request.url_rule is not None and
+                (perf_token := PERF_RECORDER.start_request(
+                    route=f'{request.method} {request.url_rule.rule}',
+                )) is not None
+        ):
+            g.rotki_perf_token = perf_token
+
         # Session-cookie gate (Docker). Inert without a key; otherwise deny-by-default
         # against `_cookie_less_rules`, rejecting with a plain 401 so the frontend
         # routes to login. The cookie's `sid` must be the user's active session, so a
@@ -686,8 +702,22 @@ class APIServer:
                 status_code=response.status_code,
                 result=response.json if log_result else 'redacted',
             )
+
+        if 'rotki_perf_token' in g:  # the span is closed in teardown_request_callback
+            g.rotki_perf_status_code = response.status_code
         return response
 
+    @staticmethod
+    def teardown_request_callback(exception: BaseException | None) -> None:
+        """Function that runs at the end of each request, even if it raised or an
+        after_request callback failed, so that the perf span is always closed"""
+        if (perf_token := g.pop('rotki_perf_token', None)) is not None:
+            status_code = g.pop('rotki_perf_status_code', HTTPStatus.INTERNAL_SERVER_ERROR)
+            PERF_RECORDER.finish_request(
+                token=perf_token,
+                is_error=exception is not None or status_code >= HTTPStatus.BAD_REQUEST,
+            )
+
     def run(self, host: str = '127.0.0.1', port: int = 5042, **kwargs: Any) -> None:
         """This is only used for the data faker and not used in production"""
         self.flask_app.run(host=host, port=port, **kwargs)
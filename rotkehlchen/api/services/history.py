@@ -79,9 +79,9 @@ if TYPE_CHECKING:
     from rotkehlchen.db.constants import HistoryMappingState
     from rotkehlchen.db.drivers.sqlite import DBCursor
     from rotkehlchen.db.filtering import HistoryBaseEntryFilterQuery
-    from rotkehlchen.db.history_events import HistoryEventsWithCountResult
+    from rotkehlchen.db.history_events import HistoryEventsReturnType, HistoryEventsWithCountResult
     from rotkehlchen.fval import FVal
-    from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+    from rotkehlchen.history.events.structures.base import HistoryBaseEntry, HistoryEventForApi
     from rotkehlchen.rotkehlchen import Rotkehlchen
 
 logger = logging.getLogger(__name__)
@@ -390,6 +390,7 @@ class HistoryService:
             self,
             filter_query: HistoryBaseEntryFilterQuery,
             aggregate_by_group_ids: bool,
+            exact_count: bool = True,
     ) -> dict[str, Any]:
         dbevents = DBHistoryEvents(self.rotkehlchen.data.db)
         entries_limit, has_premium = get_user_limit(
@@ -409,7 +410,7 @@ class HistoryService:
             # This does NOT fire when only the filtered subset would fit — we would need an
             # extra query to know that, which is not worth it here.
             effective_entries_limit = None if entries_total <= entries_limit else entries_limit
-            _, processed_events_result, joined_group_ids, entries_found, entries_with_limit, entries_total, ignored_group_identifiers, event_to_pair = self._query_history_events_with_matched_processing(  # noqa: E501
+            events_result_info, processed_events_result, joined_group_ids, entries_found, entries_with_limit, entries_total, ignored_group_identifiers, event_to_pair = self._query_history_events_with_matched_processing(  # noqa: E501
                 cursor=cursor,
                 dbevents=dbevents,
                 filter_query=filter_query,
@@ -418,13 +419,15 @@ class HistoryService:
                 match_exact_events=True,
                 entries_total=entries_total,
                 need_entries_found=has_premium is False,
+                exact_count=exact_count,
+                project_for_api=True,  # the page is only serialized for the api
             )
             group_has_ignored_assets = {
                 joined_group_ids.get(group_identifier, group_identifier)
                 for group_identifier in ignored_group_identifiers
             }
             grouped_events_nums: list[int | None]
-            events: list[HistoryBaseEntry]
+            events: list[HistoryEventForApi]
             grouped_events_nums, events = (
                 zip(*processed_events_result, strict=False)  # type: ignore
                 if aggregate_by_group_ids is True and len(processed_events_result) != 0 else
@@ -482,12 +485,65 @@ class HistoryService:
                 event_to_pair=event_to_pair,
                 group_has_ignored_assets=group_has_ignored_assets,
             )),
-            'entries_found': entries_with_limit,
+            'entries_found': entries_with_limit if exact_count else None,
             'entries_limit': entries_limit,
             'entries_total': entries_total,
+            'next_cursor': events_result_info.next_cursor,
         }
         if has_premium is False:
-            result['entries_found_total'] = entries_found
+            result['entries_found_total'] = entries_found if exact_count else None
+
+        return {'result': result, 'message': '', 'status_code': HTTPStatus.OK}
+
+    def get_history_events_columns(
+            self,
+            from_timestamp: Timestamp | None,
+            to_timestamp: Timestamp | None,
+            exclude_ignored_assets: bool,
+            limit: int,
+            after_identifier: int | None,
+            checksum_up_to: int | None,
+    ) -> dict[str, Any]:
+        dbevents = DBHistoryEvents(self.rotkehlchen.data.db)
+        entries_limit, _ = get_user_limit(
+            premium=self.rotkehlchen.premium,
+            limit_type=UserLimitType.HISTORY_EVENTS,
+        )
+        with self.rotkehlchen.data.db.conn.read_ctx() as cursor:
+            if self.rotkehlchen.data.db.get_entries_count(
+                cursor=cursor,
+                entries_table='history_events',
+                group_by='group_identifier',
+            ) <= entries_limit:
+                entries_limit = None  # the limit can't restrict anything. Skip its subquery
+
+            batch = dbevents.get_history_events_columns(
+                cursor=cursor,
+                from_ts=from_timestamp,
+                to_ts=to_timestamp,
+                exclude_ignored_assets=exclude_ignored_assets,
+                entries_limit=entries_limit,
+                limit=limit,
+                after_identifier=after_identifier,
+            )
+            result: dict[str, Any] = {
+                # the values are JSON primitives already. Skip re-walking them
+                'columns': {name: PreSerializedList(values) for name, values in batch.columns.items()},  # noqa: E501
+                'last_identifier': batch.last_identifier,
+                'has_more': batch.has_more,
+                'checksum': str(batch.checksum),
+                'entries_limit': entries_limit,
+            }
+            if checksum_up_to is not None:
+                count, checksum = dbevents.get_history_events_columns_checksum(
+                    cursor=cursor,
+                    from_ts=from_timestamp,
+                    to_ts=to_timestamp,
+                    exclude_ignored_assets=exclude_ignored_assets,
+                    entries_limit=entries_limit,
+                    up_to_identifier=checksum_up_to,
+                )
+                result['checksum_up_to'] = {'count': count, 'checksum': str(checksum)}
 
         return {'result': result, 'message': '', 'status_code': HTTPStatus.OK}
 
@@ -735,9 +791,11 @@ class HistoryService:
             match_exact_events: bool,
             entries_total: int,
             need_entries_found: bool,
+            exact_count: bool = True,
+            project_for_api: bool = False,
     ) -> tuple[
-        HistoryEventsWithCountResult,
-        list[tuple[int, HistoryBaseEntry]] | list[HistoryBaseEntry],
+        HistoryEventsWithCountResult | HistoryEventsWithCountResult[HistoryEventForApi],
+        HistoryEventsReturnType[HistoryEventForApi],
         dict[str, str],
         int,
         int,
@@ -753,6 +811,8 @@ class HistoryService:
             aggregate_by_group_ids=aggregate_by_group_ids,
             match_exact_events=match_exact_events,
             need_entries_found=need_entries_found,
+            exact_count=exact_count,
+            project_for_api=project_for_api,
         )
         (
             processed_events_result,
@@ -803,7 +863,7 @@ class HistoryService:
 
     @staticmethod
     def _serialize_and_group_history_events(
-            events: list[HistoryBaseEntry],
+            events: list[HistoryEventForApi],
             aggregate_by_group_ids: bool,
             event_accounting_rule_statuses: list[EventAccountingRuleStatus],
             grouped_events_nums: list[int | None],
@@ -24,6 +24,7 @@ from rotkehlchen.api.v1.schemas import (
     AccountingReportDataSchema,
     AccountingReportExportSchema,
     AccountingReportsSchema,
+    AccountingReportSummarySchema,
     AccountingRuleConflictsPagination,
     AccountingRulesQuerySchema,
     AddressbookAddressesSchema,
@@ -120,6 +121,7 @@ from rotkehlchen.api.v1.schemas import (
     HistoricalPriceDeleteSchema,
     HistoricalPricesPerAssetSchema,
     HistoryEventSchema,
+    HistoryEventsColumnarSchema,
     HistoryEventsDeletionSchema,
     HistoryProcessingExportSchema,
     HistoryProcessingSchema,
@@ -158,6 +160,7 @@ from rotkehlchen.api.v1.schemas import (
     OnchainHistoricalBalanceSchema,
     OptionalAddressesWithBlockchainsListSchema,
     PendingTransactionDecodingSchema,
+    PerfStatsSchema,
     QueriedAddressesSchema,
     QueryAddressbookSchema,
     QueryCalendarSchema,
@@ -1408,8 +1411,17 @@ class HistoryEventResource(BaseMethodView):
 
     @require_loggedin_user()
     @use_kwargs(post_schema, location='json')
-    def post(self, filter_query: HistoryBaseEntryFilterQuery, aggregate_by_group_ids: bool) -> Response:  # noqa: E501
-        return self.rest_api.get_history_events(filter_query=filter_query, aggregate_by_group_ids=aggregate_by_group_ids)  # noqa: E501
+    def post(
+            self,
+            filter_query: HistoryBaseEntryFilterQuery,
+            aggregate_by_group_ids: bool,
+            exact_count: bool,
+    ) -> Response:
+        return self.rest_api.get_history_events(
+            filter_query=filter_query,
+            aggregate_by_group_ids=aggregate_by_group_ids,
+            exact_count=exact_count,
+        )
 
     @require_loggedin_user()
     @resource_parser.use_kwargs(make_put_schema, location='json')
@@ -1743,6 +1755,16 @@ class AccountingReportDataResource(BaseMethodView):
         return self.rest_api.get_report_data(filter_query=filter_query)
 
 
+class AccountingReportSummaryResource(BaseMethodView):
+
+    get_schema = AccountingReportSummarySchema()
+
+    @require_loggedin_user()
+    @use_kwargs(get_schema, location='json_and_query_and_view_args')
+    def get(self, report_id: int, group_by: Literal['event_type', 'asset']) -> Response:
+        return self.rest_api.get_report_summary(report_id=report_id, group_by=group_by)
+
+
 class AccountingReportExportResource(BaseMethodView):
 
     get_schema = AccountingReportExportSchema()
@@ -2168,6 +2190,20 @@ class PingResource(BaseMethodView):
         return self.rest_api.ping()
 
 
+class PerfResource(BaseMethodView):
+
+    get_schema = PerfStatsSchema()
+
+    @require_loggedin_user()
+    @use_kwargs(get_schema, location='json_and_query')
+    def get(self, flamegraph: bool, route: str | None) -> Response:
+        return self.rest_api.get_perf_stats(flamegraph=flamegraph, route=route)
+
+    @require_loggedin_user()
+    def delete(self) -> Response:
+        return self.rest_api.reset_perf_stats()
+
+
 class DataImportResource(BaseMethodView):
 
     upload_schema = DataImportSchema()
@@ -3391,6 +3427,31 @@ class ExportHistoryEventResource(BaseMethodView):
         )
 
 
+class HistoryEventsColumnarResource(BaseMethodView):
+
+    post_schema = HistoryEventsColumnarSchema()
+
+    @require_loggedin_user()
+    @use_kwargs(post_schema, location='json_and_query')
+    def post(
+            self,
+            from_timestamp: Timestamp | None,
+            to_timestamp: Timestamp | None,
+            exclude_ignored_assets: bool,
+            limit: int,
+            after_identifier: int | None,
+            checksum_up_to: int | None,
+    ) -> Response:
+        return self.rest_api.get_history_events_columns(
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+            exclude_ignored_assets=exclude_ignored_assets,
+            limit=limit,
+            after_identifier=after_identifier,
+            checksum_up_to=checksum_up_to,
+        )
+
+
 class ExportHistoryDownloadResource(BaseMethodView):
 
     get_schema = ExportHistoryDownloadSchema()
@@ -3881,6 +3942,10 @@ class SchedulerResource(BaseMethodView):
 
     put_schema = SchedulerSchema()
 
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_scheduler_state()
+
     @require_loggedin_user()
     @use_kwargs(put_schema, location='json')
     def put(self, enabled: bool) -> Response:
@@ -14,8 +14,8 @@ from marshmallow import INCLUDE, Schema, fields, post_load, pre_load, validate,
 from marshmallow.exceptions import ValidationError
 from werkzeug.datastructures import FileStorage
 
+from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.structures.balance import BalanceType
-from rotkehlchen.accounting.types import SchemaEventType
 from rotkehlchen.assets.asset import (
     Asset,
     AssetWithNameAndType,
@@ -61,6 +61,7 @@ from rotkehlchen.data_import.manager import DataImportSource
 from rotkehlchen.db.cache import IGNORED_CUSTOMIZED_EVENT_DUPLICATE_PREFIX
 from rotkehlchen.db.calendar import CalendarEntry, CalendarFilterQuery, ReminderEntry
 from rotkehlchen.db.constants import (
+    HISTORY_EVENTS_COLUMNAR_MAX_LIMIT,
     LINKABLE_ACCOUNTING_PROPERTIES,
     LINKABLE_ACCOUNTING_SETTINGS_NAME,
     HistoryMappingState,
@@ -77,6 +78,7 @@ from rotkehlchen.db.filtering import (
     EthStakingEventFilterQuery,
     EvmEventFilterQuery,
     HistoricalBalancesFilterQuery,
+    HistoryBaseEntryFilterQuery,
     HistoryEventFilterQuery,
     HistoryEventWithCounterpartyFilterQuery,
     HistoryEventWithTxRefFilterQuery,
@@ -841,6 +843,7 @@ class HistoryEventFilterSchema(
         else:
             filter_query = HistoryEventFilterQuery.make(**common_arguments)
 
+        self.finalize_filter_query(filter_query=filter_query, data=data)
         return self.generate_fields_post_validation(data) | {
             'filter_query': filter_query,
         }
@@ -849,6 +852,9 @@ class HistoryEventFilterSchema(
         """Generates the extra fields to be included in the filter_query dictionary"""
         return {}
 
+    def finalize_filter_query(self, filter_query: HistoryBaseEntryFilterQuery, data: dict[str, Any]) -> None:  # pylint: disable=unused-argument  # noqa: E501
+        """Applies arguments that need the constructed filter_query"""
+
     def generate_fields_post_validation(self, data: dict[str, Any]) -> dict[str, Any]:  # pylint: disable=unused-argument
         """Generates extra fields that will be returned after validation"""
         return {}
@@ -869,6 +875,8 @@ class HistoryEventSchema(
 ):
     """Schema for querying history events"""
     aggregate_by_group_ids = fields.Boolean(load_default=False)
+    cursor = fields.String(load_default=None)
+    exact_count = fields.Boolean(load_default=True)
 
     @validates_schema
     def validate_history_event_schema(
@@ -876,6 +884,12 @@ class HistoryEventSchema(
             data: dict[str, Any],
             **_kwargs: Any,
     ) -> None:
+        if data['cursor'] is not None and data['offset']:
+            raise ValidationError(
+                message='cursor and offset can not be used together',
+                field_name='cursor',
+            )
+
         valid_ordering_attr = {None, 'timestamp'}
         if (
             data['order_by_attributes'] is not None and
@@ -891,19 +905,39 @@ class HistoryEventSchema(
             )
 
     def make_extra_filtering_arguments(self, data: dict[str, Any]) -> dict[str, Any]:
+        order_by_rules = create_order_by_rules_list(
+            data=data,
+            default_order_by_fields=['timestamp', 'sequence_index'],
+            default_ascending=[False, True],
+        )
+        # break ties with a unique column so that the order is stable, which the
+        # cursor of keyset pagination relies on. Groups are rows when aggregating.
+        order_by_rules.append(  # type: ignore[union-attr]  # defaults are given
+            ('group_identifier', True)
+            if data['aggregate_by_group_ids'] else
+            ('history_events_identifier', True),
+        )
         return {
             'limit': data['limit'],
-            'offset': data['offset'],
-            'order_by_rules': create_order_by_rules_list(
-                data=data,
-                default_order_by_fields=['timestamp', 'sequence_index'],
-                default_ascending=[False, True],
-            ),
+            'offset': 0 if data['cursor'] is not None else data['offset'],
+            'order_by_rules': order_by_rules,
         }
 
+    def finalize_filter_query(self, filter_query: HistoryBaseEntryFilterQuery, data: dict[str, Any]) -> None:  # noqa: E501
+        if data['cursor'] is None:
+            return
+
+        try:
+            filter_query.seek_after(cursor=data['cursor'])
+        except (InputError, DeserializationError) as e:
+            raise ValidationError(message=str(e), field_name='cursor') from e
+
     def generate_fields_post_validation(self, data: dict[str, Any]) -> dict[str, Any]:
         """Generates extra fields that will be returned after validation"""
-        return {'aggregate_by_group_ids': data['aggregate_by_group_ids']}
+        return {
+            'aggregate_by_group_ids': data['aggregate_by_group_ids'],
+            'exact_count': data['exact_count'],
+        }
 
 
 class AssetAmountSchema(Schema):
@@ -2328,7 +2362,9 @@ class AccountingReportsSchema(Schema):
 
 class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrderBySchema):
     report_id = fields.Integer(load_default=None)
-    event_type = SerializableEnumField(enum_class=SchemaEventType, load_default=None)
+    event_type = SerializableEnumField(enum_class=AccountingEventType, load_default=None)
+    asset = AssetField(expected_type=Asset, load_default=None)
+    location = LocationField(load_default=None)
 
     @validates_schema
     def validate_report_schema(
@@ -2371,6 +2407,8 @@ class AccountingReportDataSchema(TimestampRangeSchema, DBPaginationSchema, DBOrd
             event_type=event_type,
             from_ts=data['from_timestamp'],
             to_ts=data['to_timestamp'],
+            asset=data['asset'],
+            location=data['location'],
         )
         return {
             'filter_query': filter_query,
@@ -2384,6 +2422,16 @@ class AccountingReportExportSchema(AccountingReportsSchema):
         super().__init__(required_report_id=True)
 
 
+class AccountingReportSummarySchema(AccountingReportsSchema):
+    group_by = fields.String(
+        load_default='event_type',
+        validate=validate.OneOf(choices=('event_type', 'asset')),
+    )
+
+    def __init__(self) -> None:
+        super().__init__(required_report_id=True)
+
+
 class BlockchainAccountDataSchema(TagsSettingSchema):
     address = NonEmptyStringField(required=True)
     label = EmptyAsNoneStringField(load_default=None)
@@ -3614,6 +3662,11 @@ class AppInfoSchema(Schema):
     check_for_updates = fields.Boolean(load_default=False)
 
 
+class PerfStatsSchema(Schema):
+    flamegraph = fields.Boolean(load_default=False)
+    route = fields.String(load_default=None)
+
+
 class HistoryEventsDeletionSchema(HistoryEventFilterSchema):
     """Schema for deleting history events.
 
@@ -4305,6 +4358,45 @@ class ExportHistoryEventSchema(HistoryEventSchema, AsyncQueryArgumentSchema):
         return extra_fields
 
 
+class HistoryEventsColumnarSchema(Schema):
+    """Schema for the columnar bulk export of history events"""
+    from_timestamp = TimestampField(load_default=None)
+    to_timestamp = TimestampField(load_default=None)
+    exclude_ignored_assets = fields.Boolean(load_default=True)
+    limit = fields.Integer(
+        load_default=HISTORY_EVENTS_COLUMNAR_MAX_LIMIT,
+        validate=webargs.validate.Range(
+            min=1,
+            max=HISTORY_EVENTS_COLUMNAR_MAX_LIMIT,
+            error=f'limit must be between 1 and {HISTORY_EVENTS_COLUMNAR_MAX_LIMIT}',
+        ),
+    )
+    after_identifier = fields.Integer(
+        load_default=None,
+        validate=webargs.validate.Range(min=0, error='after_identifier must be >= 0'),
+    )
+    checksum_up_to = fields.Integer(
+        load_default=None,
+        validate=webargs.validate.Range(min=0, error='checksum_up_to must be >= 0'),
+    )
+
+    @validates_schema
+    def validate_schema(
+            self,
+            data: dict[str, Any],
+            **_kwargs: Any,
+    ) -> None:
+        if (
+            data['from_timestamp'] is not None and
+            data['to_timestamp'] is not None and
+            data['from_timestamp'] > data['to_timestamp']
+        ):
+            raise ValidationError(
+                message='from_timestamp must be less than or equal to to_timestamp',
+                field_name='from_timestamp',
+            )
+
+
 class ExportHistoryDownloadSchema(Schema):
     """Schema for downloading history events CSVs."""
     file_path = NonEmptyStringField(required=True)
@@ -50,6 +50,15 @@ def _positive_int_or_zero(value: str) -> int:
     return int_val
 
 
+def _fraction(value: str) -> float:
+    """Force a float between zero and one https://docs.python.org/3/library/argparse.html#type"""
+    float_val = float(value)  # ValueError is caught and shown to user
+    if not 0 <= float_val <= 1:
+        raise ValueError('Value should be between 0 and 1')
+
+    return float_val
+
+
 def app_args(prog: str, description: str) -> argparse.ArgumentParser:
     """Add the rotki arguments to the argument parser and return it"""
     p = argparse.ArgumentParser(
@@ -145,5 +154,22 @@ def app_args(prog: str, description: str) -> argparse.ArgumentParser:
         help="If given then task manager won't schedule new tasks",
         action='store_true',
     )
+    p.add_argument(
+        '--perf-instrumentation',
+        help=(
+            'If given then the DB, cache and remote call timings of each REST API request '
+            'are recorded and served aggregated per route by the /perf endpoint'
+        ),
+        action='store_true',
+    )
+    p.add_argument(
+        '--perf-flamegraph-sample-rate',
+        help=(
+            'Fraction of the REST API requests whose stacks are sampled for flamegraphs. '
+            'Only used together with --perf-instrumentation'
+        ),
+        default=0.0,
+        type=_fraction,
+    )
 
     return p
@@ -6,6 +6,7 @@ from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.utils.data_structures import LRUCacheLowerKey
 from rotkehlchen.utils.misc import get_chunks
+from rotkehlchen.utils.perf import record_cache_lookup
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import (
@@ -170,8 +171,10 @@ class AssetResolver:
         - WrongAssetType
         """
         if (cached_data := AssetResolver.assets_cache.get(identifier)) is not None:
+            record_cache_lookup(cache='asset_resolver_assets', hit=True)
             return cached_data
 
+        record_cache_lookup(cache='asset_resolver_assets', hit=False)
         # If was not found in the cache try querying it in the globaldb
         clean_generation = AssetResolver.cache_clean_generation
         try:
@@ -192,8 +195,10 @@ class AssetResolver:
     @staticmethod
     def get_asset_type(identifier: str, query_packaged_db: bool = True) -> AssetType:
         if (cached_data := AssetResolver.types_cache.get(identifier)) is not None:
+            record_cache_lookup(cache='asset_resolver_types', hit=True)
             return cached_data
 
+        record_cache_lookup(cache='asset_resolver_types', hit=False)
         clean_generation = AssetResolver.cache_clean_generation
         # If the asset was already fully resolved its type is known, so reuse it
         # instead of issuing a fresh `SELECT type` query against the globaldb.
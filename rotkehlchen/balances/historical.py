@@ -1,5 +1,7 @@
 import logging
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from typing import TYPE_CHECKING, Literal, NamedTuple
 
 import pandas as pd
@@ -12,7 +14,7 @@ from rotkehlchen.db.filtering import (
     HistoricalBalancesFilterQuery,
     HistoryEventFilterQuery,
 )
-from rotkehlchen.db.utils import get_query_chunks
+from rotkehlchen.db.utils import deserialize_exact_sum, exact_sum_query, get_query_chunks
 from rotkehlchen.errors.misc import NotFoundError, RemoteError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
@@ -146,19 +148,23 @@ class HistoricalBalancesManager:
                 ] or None
             else:
                 cursor.execute(
-                    f"""SELECT asset, SUM(metric_value) FROM (
-                        SELECT asset, metric_value, MAX(sort_key)
+                    f"""SELECT asset, {exact_sum_query('metric_value')} FROM (
+                        SELECT asset, metric_value, metric_value_int, metric_value_frac_hi,
+                        metric_value_frac_lo, MAX(sort_key)
                         FROM event_metrics em
                         WHERE metric_key = ? {filter_str}
                         AND asset NOT IN (
                             SELECT value FROM multisettings WHERE name='ignored_asset'
                         )
                         GROUP BY location, location_label, protocol, asset
-                    ) GROUP BY asset HAVING SUM(metric_value) > 0
+                    ) GROUP BY asset
                     """,
                     query_bindings,
                 )
-                data = {Asset(asset_id): FVal(total) for asset_id, total in cursor} or None
+                data = {
+                    Asset(asset_id): total for asset_id, *sums in cursor
+                    if (total := deserialize_exact_sum(sums)) > ZERO
+                } or None
 
         return self._has_unprocessed_events(
             where_clause=filter_query.unprocessed_where_clause,
@@ -560,71 +566,48 @@ class HistoricalBalancesManager:
     ) -> tuple[bool, tuple[list[Timestamp], list[dict[str, FVal]]] | None]:
         """Returns daily snapshots of asset balances between the given timestamps.
 
-        Computes balance deltas using SQL LAG() over location/protocol buckets, then
-        accumulates them per asset with pandas. Days without activity for an asset
-        carry forward the last known balance.
+        Reads the end of day balances that the historical balance processing keeps in
+        event_metrics_daily_balances. Days without activity for an asset carry forward
+        its last known balance. If balances were held before the range, the first day of
+        the range has an entry with them even if nothing happened in the range.
 
         Returns a tuple of a boolean representing whether processing is still needed,
         and either None or a pair of day timestamps and their corresponding balances.
         """
         from_ts_ms, to_ts_ms = ts_sec_to_ms(from_ts), ts_sec_to_ms(to_ts)
+        from_day = from_ts_ms - from_ts_ms % DAY_IN_MILLISECONDS
+        ignored_assets_filter = (
+            "asset NOT IN (SELECT value FROM multisettings WHERE name='ignored_asset')"
+        )
+        timestamps: list[Timestamp] = []
+        balances_per_day: list[dict[str, FVal]] = []
         with self.db.conn.read_ctx() as cursor:
-            df = pd.DataFrame(
-                cursor.execute(
-                    """
-                    WITH all_events AS (
-                        SELECT timestamp, asset, CAST(metric_value AS REAL) as balance,
-                               sort_key, location, location_label, protocol
-                        FROM event_metrics em
-                        WHERE metric_key = ?
-                        AND asset NOT IN (
-                            SELECT value FROM multisettings WHERE name='ignored_asset'
-                        )
-                    ), with_delta AS (
-                        SELECT timestamp, sort_key, asset,
-                               balance - COALESCE(
-                                   LAG(balance) OVER (
-                                       PARTITION BY location, location_label, protocol, asset
-                                       ORDER BY sort_key
-                                   ),
-                                   0
-                               ) as delta
-                        FROM all_events
-                    )
-                    SELECT timestamp, sort_key, asset, delta FROM with_delta
-                    WHERE timestamp >= ? AND timestamp <= ?
-                    """,
-                    (EventMetricKey.BALANCE.serialize(), from_ts_ms, to_ts_ms),
-                ),
-                columns=['timestamp', 'sort_key', 'asset', 'delta'],
-            )
-
-        data = None
-        if len(df) != 0:
-            # The query returns balance deltas (changes) for each event.
-            # Sum them up in order to reconstruct the running balance for each asset,
-            # then keep only the last balance of each day (the end-of-day snapshot).
-            df = df.astype(
-                {'timestamp': 'int64', 'sort_key': 'int64', 'asset': 'str', 'delta': 'float64'},
-            ).sort_values('sort_key')
-            df['balance'] = df.groupby('asset', sort=False)['delta'].cumsum()
-            df['day'] = (df['timestamp'] // DAY_IN_MILLISECONDS) * DAY_IN_MILLISECONDS
-            pivoted = (
-                df.groupby(['day', 'asset'], sort=False)['balance']
-                .last().reset_index()
-                .pivot(index='day', columns='asset', values='balance')
-                .sort_index()
-                # Forward-fill so each asset's balance carries independently to days
-                # without activity.
-                .ffill()
-            )
-            timestamps = [ts_ms_to_sec(TimestampMS(int(d))) for d in pivoted.index.tolist()]
-            balances_per_day = [
-                {str(asset): FVal(val) for asset, val in row.items() if pd.notna(val)}
-                for row in pivoted.to_dict('records')
-            ]
-            data = (timestamps, balances_per_day)
-
+            # Latest balance of each asset before the range, using SQLite's bare column
+            # behavior with MAX(). See https://www.sqlite.org/lang_select.html#bareagg
+            balances = {
+                asset: FVal(amount) for asset, amount, _ in cursor.execute(
+                    'SELECT asset, amount, MAX(day) FROM event_metrics_daily_balances '
+                    f'WHERE day < ? AND {ignored_assets_filter} GROUP BY asset',
+                    (from_day,),
+                )
+            }
+            if len(balances) != 0:  # the range starts with the balances held before it
+                timestamps.append(ts_ms_to_sec(TimestampMS(from_day)))
+                balances_per_day.append(balances.copy())
+
+            for day, rows in groupby(cursor.execute(
+                'SELECT day, asset, amount FROM event_metrics_daily_balances '
+                f'WHERE day >= ? AND day <= ? AND {ignored_assets_filter} ORDER BY day',
+                (from_day, to_ts_ms),
+            ), key=itemgetter(0)):
+                balances.update((asset, FVal(amount)) for _, asset, amount in rows)
+                if day == from_day and len(timestamps) != 0:  # replaces the seeded entry
+                    balances_per_day[-1] = balances.copy()
+                else:
+                    timestamps.append(ts_ms_to_sec(TimestampMS(day)))
+                    balances_per_day.append(balances.copy())
+
+        data = (timestamps, balances_per_day) if len(timestamps) != 0 else None
         return self._has_unprocessed_events(
             where_clause='timestamp >= ? AND timestamp <= ?',
             bindings=[from_ts_ms, to_ts_ms],
@@ -22,6 +22,8 @@ from rotkehlchen.utils.base58 import b58decode, b58encode
 from rotkehlchen.utils.mixins.enums import SerializableEnumNameMixin
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from rotkehlchen.types import BTCAddress
 
 COMPRESSED_PUBKEY = True
@@ -405,20 +407,54 @@ class HDKey:
         )
         return self._child_from_xpub(index=index, child_xpub=child_xpub)
 
+    def derive_child_pubkeys(self, indices: Sequence[int]) -> list[bytes]:
+        """
+        Derives the compressed public keys of the given non-hardened children in one batch.
+        Same as calling derive_child for each index and formatting its pubkey, but without
+        creating the child keys and sharing a single field inversion for the whole batch.
+        Args:
+            indices (list(int)): the indices of the children
+        Returns:
+            (list(bytes)): the compressed public keys of the children in the given order
+        """
+        if not self.chain_code:
+            raise XPUBError('Cannot derive XPUB child without chain_code')
+        if self.privkey:
+            raise NotImplementedError('Privkeys xpub derivation not implemented in rotki')
+
+        own_pubkey = self.pubkey.format(COMPRESSED_PUBKEY)
+        tweaks = []
+        for index in indices:
+            if index >= BIP32_HARDEN:
+                raise XPUBError('Need private key to derive XPUB hardened children')
+
+            # Data = serP(point(kpar)) || ser32(i)). Only the tweak is needed for the pubkey
+            tweaks.append(hmac.new(
+                self.chain_code,
+                own_pubkey + index.to_bytes(4, byteorder='big'),
+                digestmod=hashlib.sha512,
+            ).digest()[:32])
+
+        child_pubkeys = []
+        for index, child_pubkey in zip(indices, self.pubkey.add_batch(tweaks), strict=True):
+            if child_pubkey is None:  # "impossible" key. derive_child moves to the next index
+                child_pubkey = self.derive_child(index).pubkey
+            child_pubkeys.append(child_pubkey.format(COMPRESSED_PUBKEY))
+
+        return child_pubkeys
+
     def address(self) -> BTCAddress:
+        return self.pubkey_to_address(self.pubkey.format(COMPRESSED_PUBKEY))
+
+    def pubkey_to_address(self, pubkey: bytes) -> BTCAddress:
+        """Returns the address of the given compressed public key for the type of this key"""
         if self.hint == 'xpub' and self.xpub_type == XpubType.P2TR:
-            return pubkey_to_bech32_address(
-                data=self.pubkey.format(COMPRESSED_PUBKEY),
-                witver=WitnessVersion.BECH32M,
-            )
+            return pubkey_to_bech32_address(data=pubkey, witver=WitnessVersion.BECH32M)
         if self.hint == 'xpub':
-            return pubkey_to_base58_address(self.pubkey.format(COMPRESSED_PUBKEY))
+            return pubkey_to_base58_address(pubkey)
         if self.hint == 'ypub':
-            return pubkey_to_p2sh_p2wpkh_address(self.pubkey.format(COMPRESSED_PUBKEY))
+            return pubkey_to_p2sh_p2wpkh_address(pubkey)
         if self.hint == 'zpub':
-            return pubkey_to_bech32_address(
-                data=self.pubkey.format(COMPRESSED_PUBKEY),
-                witver=WitnessVersion.BECH32,
-            )
+            return pubkey_to_bech32_address(data=pubkey, witver=WitnessVersion.BECH32)
         # else
         raise AssertionError(f'Unknown hint {self.hint} ended up in an HDKey')
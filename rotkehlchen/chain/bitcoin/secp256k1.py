@@ -5,12 +5,20 @@ Implemented from public specifications:
 - BIP32 for non-hardened public child derivation.
 - BIP340/BIP341/BIP86 for x-only keys, tagged hashing, and Taproot output keys.
 
+Multiples of the generator come from a precomputed table of its multiples and batches of
+points are converted to affine coordinates with a single inversion (Montgomery's trick),
+since deriving the addresses of an xpub needs one generator multiplication per address.
+
 Added to rotki using Codex and ChatGPT 5.5.
 """
 
 import hashlib
 from dataclasses import dataclass
-from typing import Final, NamedTuple, Self
+from functools import cache
+from typing import TYPE_CHECKING, Final, NamedTuple, Self, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 P: Final = 0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f
 N: Final = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
@@ -27,6 +35,8 @@ G: Final = Point(
     0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
     0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8,
 )
+# Bits of a scalar covered by each window of the precomputed generator table
+_G_TABLE_WINDOW_BITS: Final = 8
 
 
 def _inverse_mod(value: int) -> int:
@@ -101,29 +111,111 @@ def _jacobian_add(
     return nx, (r * (u1 * h_sq - nx) - s1 * h_cb) % P, h * z1 % P * z2 % P
 
 
-def _point_mul(scalar: int, point: Point) -> Point | None:
-    """Multiply a curve point by a non-negative scalar.
+def _jacobian_add_affine(x1: int, y1: int, z1: int, x2: int, y2: int) -> tuple[int, int, int]:
+    """Add an affine point to a Jacobian point, using (0, 1, 0) as infinity.
+
+    Same as _jacobian_add with z2=1 but skipping the multiplications by it.
+    """
+    if z1 == 0:
+        return x2, y2, 1
+
+    z1_sq = z1 * z1 % P
+    u2, s2 = x2 * z1_sq % P, y2 * z1_sq % P * z1 % P
+    if x1 == u2:
+        if y1 != s2:
+            return 0, 1, 0
+        return _jacobian_double(x1, y1, z1)
+
+    h, r = (u2 - x1) % P, (s2 - y1) % P
+    h_sq = h * h % P
+    h_cb = h_sq * h % P
+    nx = (r * r - h_cb - 2 * x1 * h_sq) % P
+    return nx, (r * (x1 * h_sq - nx) - y1 * h_cb) % P, h * z1 % P
+
+
+def _batch_inverse(values: Sequence[int]) -> list[int]:
+    """Return the inverses of all values modulo the field prime.
 
-    Uses Jacobian coordinates so the multiplication needs a single field inversion instead
-    of one per point addition/doubling.
+    Uses Montgomery's trick so that the whole batch needs a single modular inversion
+    plus three multiplications per value.
     """
-    if scalar < 0:
-        raise ValueError('Invalid negative secp256k1 scalar')
+    prefix_products, accumulator = [], 1
+    for value in values:
+        prefix_products.append(accumulator)
+        accumulator = accumulator * value % P
+
+    inverse = _inverse_mod(accumulator)
+    result = [0] * len(values)
+    for idx in range(len(values) - 1, -1, -1):
+        result[idx] = inverse * prefix_products[idx] % P
+        inverse = inverse * values[idx] % P
+
+    return result
+
 
+def _jacobian_to_affine_batch(points: Sequence[tuple[int, int, int]]) -> list[Point | None]:
+    """Convert Jacobian points to affine ones, returning None for the point at infinity"""
+    z_inverses = iter(_batch_inverse([z for _, _, z in points if z != 0]))
+    result: list[Point | None] = []
+    for x, y, z in points:
+        if z == 0:
+            result.append(None)
+            continue
+
+        z_inv = next(z_inverses)
+        z_inv_sq = z_inv * z_inv % P
+        result.append(Point(x=x * z_inv_sq % P, y=y * z_inv_sq % P * z_inv % P))
+
+    return result
+
+
+@cache
+def _generator_table() -> tuple[tuple[Point, ...], ...]:
+    """Return the affine multiples of G used for fixed-base multiplication.
+
+    Entry [i][j - 1] is j * 2^(8 * i) * G for each 8 bit window i of a 256 bit scalar and
+    each j in [1, 255]. Built on first use, which takes a few thousand point additions.
+    """
+    window_size = 1 << _G_TABLE_WINDOW_BITS
+    points = []
+    bx, by, bz = G.x, G.y, 1
+    for _ in range(256 // _G_TABLE_WINDOW_BITS):
+        x, y, z = bx, by, bz
+        for _ in range(window_size - 1):
+            points.append((x, y, z))
+            x, y, z = _jacobian_add(x, y, z, bx, by, bz)
+        bx, by, bz = x, y, z  # the base of the next window is window_size times this one
+
+    affine_points = cast('list[Point]', _jacobian_to_affine_batch(points))
+    return tuple(
+        tuple(affine_points[idx:idx + window_size - 1])
+        for idx in range(0, len(affine_points), window_size - 1)
+    )
+
+
+def _generator_mul_jacobian(scalar: int) -> tuple[int, int, int]:
+    """Multiply G by a scalar in [0, N) returning a Jacobian point.
+
+    Uses the precomputed generator table so it needs at most one mixed point addition
+    per 8 bit window of the scalar and no doublings.
+    """
+    if not 0 <= scalar < N:
+        raise ValueError('Invalid secp256k1 scalar')
+
+    mask = (1 << _G_TABLE_WINDOW_BITS) - 1
     rx, ry, rz = 0, 1, 0
-    ax, ay, az = point.x, point.y, 1
-    while scalar:
-        if scalar & 1:
-            rx, ry, rz = _jacobian_add(rx, ry, rz, ax, ay, az)
-        ax, ay, az = _jacobian_double(ax, ay, az)
-        scalar >>= 1
-
-    if rz == 0:
-        return None
+    for window in _generator_table():
+        if (digit := scalar & mask) != 0:
+            point = window[digit - 1]
+            rx, ry, rz = _jacobian_add_affine(rx, ry, rz, point.x, point.y)
+        scalar >>= _G_TABLE_WINDOW_BITS
+
+    return rx, ry, rz
 
-    z_inv = _inverse_mod(rz)
-    z_inv_sq = z_inv * z_inv % P
-    return Point(x=rx * z_inv_sq % P, y=ry * z_inv_sq % P * z_inv % P)
+
+def _generator_mul(scalar: int) -> Point | None:
+    """Multiply G by a scalar in [0, N), returning None for the point at infinity"""
+    return _jacobian_to_affine_batch([_generator_mul_jacobian(scalar)])[0]
 
 
 def _lift_x_even_y(x: int) -> Point:
@@ -190,7 +282,7 @@ class PublicKey:
         if len(tweak) != 32 or not 0 < (tweak_int := int.from_bytes(tweak, byteorder='big')) < N:
             raise ValueError('Invalid secp256k1 tweak')
         try:
-            tweak_point = _point_mul(tweak_int, G)
+            tweak_point = _generator_mul(tweak_int)
             result = _point_add(self._point, tweak_point)
         except ValueError as e:
             raise ValueError('Invalid secp256k1 tweak') from e
@@ -202,6 +294,26 @@ class PublicKey:
         except ValueError as e:
             raise ValueError('Invalid secp256k1 tweak') from e
 
+    def add_batch(self, tweaks: Sequence[bytes]) -> list[Self | None]:
+        """Return this public key plus tweak * G for each of the tweaks.
+
+        Same as calling add for each tweak, but the whole batch shares a single field
+        inversion. Invalid tweaks give None instead of raising.
+        """
+        results = []
+        for tweak in tweaks:
+            if len(tweak) != 32 or not 0 < (tweak_int := int.from_bytes(tweak, byteorder='big')) < N:  # noqa: E501
+                results.append((0, 1, 0))
+                continue
+
+            results.append(_jacobian_add_affine(
+                *_generator_mul_jacobian(tweak_int),
+                self._point.x,
+                self._point.y,
+            ))
+
+        return [None if point is None else type(self)(point) for point in _jacobian_to_affine_batch(results)]  # noqa: E501
+
     def taproot_output_key(self) -> bytes:
         """Return the BIP86 tweaked x-only Taproot output key."""
         internal_key = self._point.x.to_bytes(32, byteorder='big')
@@ -211,7 +323,7 @@ class PublicKey:
         try:
             result = _point_add(
                 _lift_x_even_y(self._point.x),
-                _point_mul(tweak_int, G) if tweak_int != 0 else None,
+                _generator_mul(tweak_int) if tweak_int != 0 else None,
             )
         except ValueError as e:
             raise ValueError('Invalid taproot tweak') from e
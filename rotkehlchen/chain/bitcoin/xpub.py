@@ -87,18 +87,31 @@ class XpubManager:
             root: HDKey,
             gap_limit: int,
             blockchain: Literal[SupportedBlockchain.BITCOIN, SupportedBlockchain.BITCOIN_CASH],
+            derived_keys: dict[tuple[int, int], bytes],
     ) -> list[XpubDerivedAddressData]:
-        """May raise:
+        """Public keys of the indices not in derived_keys are derived in batches of gap_limit
+        and added to it.
+
+        May raise:
         - RemoteError: if blockstream/blockchain.info can't be reached
         """
         step_index = start_index
         addresses: list[XpubDerivedAddressData] = []
         should_continue = True
         while should_continue:
-            batch_addresses: list[tuple[int, BTCAddress]] = []
-            for idx in range(step_index, step_index + gap_limit):
-                child = root.derive_child(idx)
-                batch_addresses.append((idx, child.address()))
+            indices = range(step_index, step_index + gap_limit)
+            missing_indices = [idx for idx in indices if (account_index, idx) not in derived_keys]
+            if len(missing_indices) != 0:
+                derived_keys.update(zip(
+                    ((account_index, idx) for idx in missing_indices),
+                    root.derive_child_pubkeys(missing_indices),
+                    strict=True,
+                ))
+
+            batch_addresses: list[tuple[int, BTCAddress]] = [
+                (idx, root.pubkey_to_address(derived_keys[account_index, idx]))
+                for idx in indices
+            ]
 
             have_tx_mapping = self.chains_aggregator.get_chain_manager(
                 blockchain=blockchain,
@@ -139,11 +152,15 @@ class XpubManager:
             start_receiving_index: int,
             start_change_index: int,
             gap_limit: int,
+            derived_keys: dict[tuple[int, int], bytes],
     ) -> list[XpubDerivedAddressData]:
         """Derive all addresses from the xpub that have had transactions. Also includes
         any addresses until the biggest index derived addresses that have had no transactions.
         This is to make it easier to later derive and check more addresses
 
+        derived_keys are the already derived public keys by (account_index, derived_index).
+        Any newly derived ones are added to it.
+
         May raise:
         - RemoteError: if blockstream/blockchain.info/haskoin and others can't be reached
         """
@@ -161,6 +178,7 @@ class XpubManager:
                 root=receiving_xpub,
                 gap_limit=gap_limit,
                 blockchain=xpub_data.blockchain,
+                derived_keys=derived_keys,
             ),
         )
         change_xpub = account_xpub.derive_child(1)
@@ -171,6 +189,7 @@ class XpubManager:
                 root=change_xpub,
                 gap_limit=gap_limit,
                 blockchain=xpub_data.blockchain,
+                derived_keys=derived_keys,
             ),
         )
         return addresses
@@ -190,11 +209,14 @@ class XpubManager:
         """
         with self.db.conn.read_ctx() as cursor:
             last_receiving_idx, last_change_idx = self.db.get_last_consecutive_xpub_derived_indices(cursor, xpub_data)  # noqa: E501
+            derived_keys = self.db.get_xpub_derived_keys(cursor, xpub_data)
+            cached_keys = set(derived_keys)
             derived_addresses_data = self._derive_addresses_from_xpub_data(
                 xpub_data=xpub_data,
                 start_receiving_index=last_receiving_idx,
                 start_change_index=last_change_idx,
                 gap_limit=self.chains_aggregator.btc_derivation_gap_limit,
+                derived_keys=derived_keys,
             )
             known_addresses = getattr(self.db.get_blockchain_accounts(cursor), xpub_data.blockchain.get_key())  # noqa: E501
 
@@ -249,6 +271,13 @@ class XpubManager:
                 xpub_data=xpub_data,
                 derived_addresses_data=derived_addresses_data,
             )
+            new_keys = {k: v for k, v in derived_keys.items() if k not in cached_keys}
+            if len(new_keys) != 0:
+                self.db.add_xpub_derived_keys(
+                    write_cursor=write_cursor,
+                    xpub_data=xpub_data,
+                    derived_keys=new_keys,
+                )
 
         # also add queried balances. Query the price outside the balances lock and
         # only mutate the shared balances/totals under it: sibling chain balance
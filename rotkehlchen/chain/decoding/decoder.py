@@ -3,6 +3,7 @@ import logging
 import pkgutil
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from contextlib import suppress
 from threading import Semaphore
 from typing import TYPE_CHECKING, Final, Literal
@@ -27,6 +28,7 @@ from .tools import BaseDecoderTools
 from .types import CounterpartyDetails, DecodingRulesBase
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from types import ModuleType
 
     from rotkehlchen.assets.asset import AssetWithOracles
@@ -51,6 +53,8 @@ log = RotkehlchenLogsAdapter(logger)
 # mid-batch and the size of the buffered payload, while amortizing the per-commit cost
 # (the dominant DB overhead of the decode loop) over the whole batch.
 EVENT_WRITES_BATCH_SIZE: Final = 25
+# Number of transaction contexts loaded from the DB at once during batch decoding
+TX_CONTEXTS_PREFETCH_SIZE: Final = 100
 
 
 class TransactionDecoder[
@@ -305,6 +309,20 @@ class TransactionDecoder[
         located or fetched.
         """
 
+    def _load_transaction_contexts(
+            self,
+            cursor: DBCursor,
+            tx_hashes: Sequence[T_TxHash],
+    ) -> list[T_TransactionDecodingContext]:
+        """Return the decoding contexts of `tx_hashes` in the same order.
+
+        Subclasses can override this to load the contexts with bulk queries.
+        """
+        return [
+            self._load_transaction_context(cursor=cursor, tx_hash=tx_hash)
+            for tx_hash in tx_hashes
+        ]
+
     @abstractmethod
     def _decode_transaction_from_context(
             self,
@@ -336,9 +354,11 @@ class TransactionDecoder[
             location: BLOCKCHAIN_LOCATIONS_TYPE,
             ignore_cache: bool,
             delete_customized: bool,
+            decoded: bool | None = None,
     ) -> list[T_Event] | None:
         """Load events from the DB for the given tx if they are already decoded and return them,
         or purge them from the DB if ignore_cache is True.
+        If `decoded` is given it's used as the decoded state instead of checking the DB.
         Returns the list of events or None if the tx was not decoded or the events were purged.
         """
         with self.database.conn.read_ctx() as cursor:
@@ -356,7 +376,7 @@ class TransactionDecoder[
                     f'DELETE from {self.tx_mappings_table} WHERE tx_id=? AND value IN (?, ?)',
                     (tx_id, TX_DECODED, TX_SPAM),
                 )
-        else:  # see if events are already decoded and return them
+        elif decoded is not False:  # see if events are already decoded and return them
             with self.database.conn.read_ctx() as cursor:
                 cursor.execute(
                     f'SELECT COUNT(*) from {self.tx_mappings_table} WHERE tx_id=? AND value=?',
@@ -424,28 +444,21 @@ class TransactionDecoder[
         write_buffer: list[tuple[list[T_Event], str, int]] = []
         total_transactions = len(tx_hashes)
         log.debug(f'Started logic to decode {total_transactions} transactions from {self.chain_name}')  # noqa: E501
-        for tx_index, tx_hash in enumerate(tx_hashes):
+        contexts: deque[T_TransactionDecodingContext] = deque()
+        for tx_index in range(total_transactions):
             checkpoint()  # cancellation checkpoint of the bulk decoding loop
             time.sleep(0)  # release the GIL between transactions so concurrent DB readers interleave  # noqa: E501
-            log.debug(f'Decoding logic started for {tx_hash!s} ({self.chain_name})')
-            if send_ws_notifications and tx_index % 10 == 0:
-                log.debug(f'Processed {tx_index} out of {total_transactions} transactions from {self.chain_name}')  # noqa: E501
-                self.msg_aggregator.add_message(
-                    message_type=WSMessageType.PROGRESS_UPDATES,
-                    data={
-                        'chain': self.chain_name,
-                        'subtype': str(ProgressUpdateSubType.UNDECODED_TRANSACTIONS),
-                        'total': total_transactions,
-                        'processed': tx_index,
-                    },
-                )
+            if len(contexts) == 0:
+                with self.database.conn.read_ctx() as cursor:
+                    contexts.extend(self._load_transaction_contexts(
+                        cursor=cursor,
+                        tx_hashes=tx_hashes[tx_index:tx_index + TX_CONTEXTS_PREFETCH_SIZE],
+                    ))
 
-            # TODO: Change this if transaction filter query can accept multiple hashes
-            with self.database.conn.read_ctx() as cursor:
-                context = self._load_transaction_context(
-                    cursor=cursor,
-                    tx_hash=tx_hash,
-                )
+            context = contexts.popleft()
+            log.debug(f'Decoding logic started for {tx_hashes[tx_index]!s} ({self.chain_name})')
+            if send_ws_notifications and tx_index % 10 == 0:
+                self._send_decoding_progress(processed=tx_index, total=total_transactions)
 
             fresh_events, new_refresh_balances, reload_decoders = self._decode_transaction_from_context(  # noqa: E501
                 context=context,
@@ -473,18 +486,22 @@ class TransactionDecoder[
         self._flush_buffered_tx_event_writes(write_buffer)
 
         if send_ws_notifications:
-            self.msg_aggregator.add_message(
-                message_type=WSMessageType.PROGRESS_UPDATES,
-                data={
-                    'chain': self.chain_name,
-                    'subtype': str(ProgressUpdateSubType.UNDECODED_TRANSACTIONS),
-                    'total': total_transactions,
-                    'processed': total_transactions,
-                },
-            )
+            self._send_decoding_progress(processed=total_transactions, total=total_transactions)
 
         return refresh_balances, new_events
 
+    def _send_decoding_progress(self, processed: int, total: int) -> None:
+        log.debug(f'Processed {processed} out of {total} transactions from {self.chain_name}')
+        self.msg_aggregator.add_message(
+            message_type=WSMessageType.PROGRESS_UPDATES,
+            data={
+                'chain': self.chain_name,
+                'subtype': str(ProgressUpdateSubType.UNDECODED_TRANSACTIONS),
+                'total': total,
+                'processed': processed,
+            },
+        )
+
     def _write_new_tx_events_to_the_db(
             self,
             events: list[T_Event],
@@ -571,7 +588,20 @@ class TransactionDecoder[
             db_id: int,
     ) -> None:
         """Writes a single tx's events to the DB with the given cursor and sets the
-        decoded flag. See _write_new_tx_events_to_the_db for the arguments."""
+        decoded flag. See _write_new_tx_events_to_the_db for the arguments.
+
+        The decoded flag is set first and guards the write. The decoded state the tx was
+        decoded with may have been read before a concurrent decoding of the same tx wrote
+        its events, in which case those are kept and these are not written again.
+        """
+        write_cursor.execute(
+            f'INSERT OR IGNORE INTO {self.tx_mappings_table}(tx_id, value) VALUES(?, ?)',
+            (db_id, TX_DECODED),
+        )
+        if write_cursor.rowcount == 0:
+            log.debug(f'{action_id} got decoded concurrently. Not writing its events again')
+            return
+
         if len(events) == 0:
             # This is probably a phishing zero value token transfer tx.
             # Details here: https://github.com/rotki/rotki/issues/5749
@@ -597,11 +627,6 @@ class TransactionDecoder[
                     history=filtered_events,
                 )
 
-        write_cursor.execute(
-            f'INSERT OR IGNORE INTO {self.tx_mappings_table}(tx_id, value) VALUES(?, ?)',
-            (db_id, TX_DECODED),
-        )
-
     def _process_swaps(
             self,
             transaction: T_Transaction,
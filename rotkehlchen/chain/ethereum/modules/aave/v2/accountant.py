@@ -1,7 +1,8 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.assets.asset import Asset
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
 from rotkehlchen.chain.evm.decoding.aave.constants import CPT_AAVE_V2
 from rotkehlchen.chain.evm.types import string_to_evm_address
@@ -14,7 +15,6 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from rotkehlchen.accounting.pot import AccountingPot
-    from rotkehlchen.assets.asset import Asset
     from rotkehlchen.chain.evm.accounting.structures import EventsAccountantCallback
     from rotkehlchen.history.events.structures.evm_event import EvmEvent
     from rotkehlchen.types import ChecksumEvmAddress
@@ -26,6 +26,22 @@ class Aavev2Accountant(ModuleAccountantInterface):
         self.assets_borrowed: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
         self.assets_supplied: dict[tuple[ChecksumEvmAddress, Asset], FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            name: [[address, asset.identifier, str(amount)] for (address, asset), amount in balances.items()]  # noqa: E501
+            for name, balances in (
+                ('assets_borrowed', self.assets_borrowed),
+                ('assets_supplied', self.assets_supplied),
+            )
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        self.reset()
+        for address, asset_identifier, amount in data.get('assets_borrowed', []):
+            self.assets_borrowed[address, Asset(asset_identifier)] = FVal(amount)
+        for address, asset_identifier, amount in data.get('assets_supplied', []):
+            self.assets_supplied[address, Asset(asset_identifier)] = FVal(amount)
+
     def _process_borrow(
             self,
             pot: AccountingPot,  # pylint: disable=unused-argument
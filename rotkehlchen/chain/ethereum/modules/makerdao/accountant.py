@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
@@ -26,6 +26,17 @@ class MakerdaoAccountant(ModuleAccountantInterface):
         self.vault_balances: dict[str, FVal] = defaultdict(FVal)
         self.dsr_balances: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {
+            'vault_balances': {key: str(value) for key, value in self.vault_balances.items()},
+            'dsr_balances': {key: str(value) for key, value in self.dsr_balances.items()},
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        self.reset()
+        self.vault_balances.update({key: FVal(value) for key, value in data.get('vault_balances', {}).items()})  # noqa: E501
+        self.dsr_balances.update({key: FVal(value) for key, value in data.get('dsr_balances', {}).items()})  # noqa: E501
+
     def _process_vault_dai_generation(
             self,
             pot: AccountingPot,  # pylint: disable=unused-argument
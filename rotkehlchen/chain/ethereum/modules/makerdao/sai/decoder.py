@@ -21,6 +21,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     EvmDecodingOutput,
     TransferEnrichmentOutput,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_ETH, A_PETH, A_SAI, A_WETH
@@ -456,6 +457,7 @@ class MakerdaosaiDecoder(EvmDecoderInterface):
 
         return DEFAULT_EVM_DECODING_OUTPUT
 
+    @decodes_topics(SAI_CDP_MIGRATION_TOPIC)
     def _decode_sai_cdp_migration(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -22,6 +22,7 @@ from rotkehlchen.chain.evm.decoding.uniswap.v2.utils import (
     decode_uniswap_like_deposit_and_withdrawals,
     decode_uniswap_v2_like_swap,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.chain.evm.types import ChecksumEvmAddress, string_to_evm_address
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
@@ -54,6 +55,7 @@ SUSHISWAP_V2_INIT_CODE_HASH: Final = '0xe18a34eb0e04b04f7a0ac29a6e80748dca96319b
 
 class SushiswapDecoder(EvmDecoderInterface):
 
+    @decodes_topics(UNISWAP_V2_SWAP_SIGNATURE)
     def _maybe_decode_v2_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -76,6 +78,7 @@ class SushiswapDecoder(EvmDecoderInterface):
             )
         return DEFAULT_EVM_DECODING_OUTPUT
 
+    @decodes_topics(MINT_TOPIC, BURN_TOPIC)
     def _maybe_decode_v2_liquidity_addition_and_removal(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.chain.evm.accounting.interfaces import ModuleAccountantInterface
@@ -22,6 +22,13 @@ class ThegraphAccountant(ModuleAccountantInterface):
     def reset(self) -> None:
         self.assets_supplied: dict[ChecksumEvmAddress, FVal] = defaultdict(FVal)
 
+    def serialize_state(self) -> dict[str, Any]:
+        return {'assets_supplied': {key: str(value) for key, value in self.assets_supplied.items()}}  # noqa: E501
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        self.reset()
+        self.assets_supplied.update({key: FVal(value) for key, value in data.get('assets_supplied', {}).items()})  # noqa: E501
+
     def _process_deposit(
             self,
             pot: AccountingPot,  # pylint: disable=unused-argument
@@ -6,6 +6,7 @@ from rotkehlchen.chain.decoding.utils import maybe_reshuffle_events
 from rotkehlchen.chain.ethereum.modules.aave.v1.decoder import DEFAULT_EVM_DECODING_OUTPUT
 from rotkehlchen.chain.evm.decoding.interfaces import EvmDecoderInterface
 from rotkehlchen.chain.evm.decoding.uniswap.constants import CPT_UNISWAP_V1, UNISWAP_ICON
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -32,6 +33,7 @@ ETH_PURCHASE = b'\x7f@\x91\xb4l3\xe9\x18\xa0\xf3\xaaB0vA\xd1{\xb6p)BzSi\xe5K59\x
 
 class Uniswapv1Decoder(EvmDecoderInterface):
 
+    @decodes_topics(TOKEN_PURCHASE, ETH_PURCHASE)
     def _maybe_decode_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
 from rotkehlchen.assets.utils import (
     asset_normalized_value,
@@ -15,6 +15,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DecoderContext,
     EvmDecodingOutput,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.constants.assets import A_ETH
 from rotkehlchen.constants.misc import ZERO
 from rotkehlchen.errors.misc import RemoteError
@@ -60,6 +61,17 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+ESCROW_EVENT_TOPICS: Final = (
+    SIMPLE_CLAIM,
+    RUG_PULL_TOPIC,
+    REVOKED_V3_TOPIC,
+    REVOKED_V4_TOPIC,
+    DISOWNED_TOPIC,
+    SET_OPEN_CLAIM_TOPIC,
+    REVOCATION_RENOUNCED_TOPIC,
+    PERMISSIONLESS_CLAIMS_SET_TOPIC,
+)
+
 
 class YearnvestingDecoder(EvmDecoderInterface):
     """Decoder for the yearn vesting escrows.
@@ -350,6 +362,7 @@ class YearnvestingDecoder(EvmDecoderInterface):
             address=context.tx_log.address,
         )])
 
+    @decodes_topics(*ESCROW_EVENT_TOPICS)
     def _decode_escrow_events_by_topic(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -362,16 +375,7 @@ class YearnvestingDecoder(EvmDecoderInterface):
         """Match escrow events by topic since the escrow addresses are not known
         statically, verifying the emitting address is a yearn vesting escrow.
         """
-        if tx_log.topics[0] not in (
-            SIMPLE_CLAIM,
-            RUG_PULL_TOPIC,
-            REVOKED_V3_TOPIC,
-            REVOKED_V4_TOPIC,
-            DISOWNED_TOPIC,
-            SET_OPEN_CLAIM_TOPIC,
-            REVOCATION_RENOUNCED_TOPIC,
-            PERMISSIONLESS_CLAIMS_SET_TOPIC,
-        ):
+        if tx_log.topics[0] not in ESCROW_EVENT_TOPICS:
             return DEFAULT_EVM_DECODING_OUTPUT
 
         if get_evm_token(  # a token emitting an event with a colliding signature, like the ENS airdrop claim, can't be a vesting escrow. Checked first to save the bytecode query  # noqa: E501
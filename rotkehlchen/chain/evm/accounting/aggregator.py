@@ -2,7 +2,7 @@ import importlib
 import logging
 import pkgutil
 from contextlib import suppress
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import ModuleLoadingError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -94,6 +94,19 @@ class EVMAccountingAggregator:
         for accountant in self.accountants.values():
             accountant.reset()
 
+    def serialize_state(self) -> dict[str, Any]:
+        """Collect the state of the submodule accountants that keep one"""
+        return {
+            name: state for name, accountant in self.accountants.items()
+            if len(state := accountant.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of the submodule accountants saved by serialize_state"""
+        for name, accountant in self.accountants.items():
+            if (state := data.get(name)) is not None:
+                accountant.restore_state(state)
+
 
 class EVMAccountingAggregators:
     """
@@ -120,3 +133,17 @@ class EVMAccountingAggregators:
         """Reset the state of all initialized submodule accountants"""
         for aggregator in self.aggregators:
             aggregator.reset()
+
+    def serialize_state(self) -> dict[str, Any]:
+        """Collect the state of the submodule accountants of all chains keyed by chain id"""
+        return {
+            str(aggregator.node_inquirer.chain_id.value): state
+            for aggregator in self.aggregators
+            if len(state := aggregator.serialize_state()) != 0
+        }
+
+    def restore_state(self, data: dict[str, Any]) -> None:
+        """Restore the state of the submodule accountants of all chains"""
+        for aggregator in self.aggregators:
+            if (state := data.get(str(aggregator.node_inquirer.chain_id.value))) is not None:
+                aggregator.restore_state(state)
@@ -22,7 +22,7 @@ from rotkehlchen.chain.decoding.constants import CPT_GAS, MIN_LOGS_PROCESSED_TO_
 from rotkehlchen.chain.decoding.decoder import TransactionDecoder
 from rotkehlchen.chain.decoding.types import CounterpartyDetails, DecodingRulesBase
 from rotkehlchen.chain.decoding.utils import decode_safely, maybe_reshuffle_events
-from rotkehlchen.chain.evm.constants import ZERO_ADDRESS
+from rotkehlchen.chain.evm.constants import GENESIS_HASH, ZERO_ADDRESS
 from rotkehlchen.chain.evm.decoding.balancer.v3.constants import BALANCER_V3_SUPPORTED_CHAINS
 from rotkehlchen.chain.evm.decoding.balancer.v3.decoder import Balancerv3CommonDecoder
 from rotkehlchen.chain.evm.decoding.beefy_finance.constants import SUPPORTED_BEEFY_CHAINS
@@ -57,6 +57,7 @@ from rotkehlchen.chain.evm.decoding.stakedao.constants import (
 from rotkehlchen.chain.evm.decoding.stakedao.decoder import StakedaoCommonDecoder
 from rotkehlchen.chain.evm.decoding.superfluid.constants import CFA_V1_ADDRESSES
 from rotkehlchen.chain.evm.decoding.superfluid.decoder import SuperfluidCommonDecoder
+from rotkehlchen.chain.evm.decoding.utils import EVENT_RULE_TOPICS_ATTR, decodes_topics
 from rotkehlchen.chain.evm.decoding.weth.constants import (
     CHAINS_WITH_SPECIAL_WETH,
     CHAINS_WITHOUT_NATIVE_ETH,
@@ -183,6 +184,8 @@ class EvmDecodingRules(DecodingRulesBase):
 class EvmTransactionContext(NamedTuple):
     transaction: EvmTransaction
     receipt: EvmTxReceipt
+    # whether the transaction was decoded when the context got loaded. None if not known
+    decoded: bool | None = None
 
 
 class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRules, 'EvmDecoderInterface', 'EVMTxHash', 'EvmEvent', EvmTransactionContext, 'BaseEvmDecoderTools', DBEvmTx, EvmEventFilterQuery, EvmTransactionsNotDecodedFilterQuery], ABC):  # noqa: E501
@@ -226,6 +229,12 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
         self.monerium = monerium
         self.dbevents = DBHistoryEvents(database)
         self.addresses_exceptions = addresses_exceptions or {}
+        # event rules indexed by the log topics they declare. Built lazily since the
+        # rules keep getting extended while the decoders are loaded
+        self._indexed_event_rules: list[EventDecoderFunction] | None = None
+        self._indexed_rules_num = 0
+        self._event_rules_by_topic: dict[bytes, list[EventDecoderFunction]] = {}
+        self._topic_agnostic_event_rules: list[EventDecoderFunction] = []
         TransactionDecoder.__init__(
             self=self,
             database=database,
@@ -439,6 +448,33 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
                 self.rules.address_mappings.update(new_mappings)
                 self.rules.addresses_to_counterparties.update(decoder.addresses_to_counterparties())
 
+    def _event_rules_for_topic(self, topic: bytes) -> list[EventDecoderFunction]:
+        """Return the event rules that can decode a log with the given first topic
+        in their registration order, so the first matching rule stays the same.
+
+        Rules declare their topics with `decodes_topics`. The ones that don't are
+        included for every topic.
+        """
+        event_rules = self.rules.event_rules
+        if event_rules is not self._indexed_event_rules or self._indexed_rules_num != len(event_rules):  # noqa: E501
+            rules_by_topic: dict[bytes, list[EventDecoderFunction]] = {}
+            topic_agnostic_rules: list[EventDecoderFunction] = []
+            for rule in event_rules:
+                if (rule_topics := getattr(rule, EVENT_RULE_TOPICS_ATTR, None)) is None:
+                    topic_agnostic_rules.append(rule)
+                    for topic_rules in rules_by_topic.values():
+                        topic_rules.append(rule)
+                    continue
+
+                for rule_topic in rule_topics:
+                    rules_by_topic.setdefault(rule_topic, topic_agnostic_rules.copy()).append(rule)
+
+            self._event_rules_by_topic = rules_by_topic
+            self._topic_agnostic_event_rules = topic_agnostic_rules
+            self._indexed_event_rules, self._indexed_rules_num = event_rules, len(event_rules)
+
+        return self._event_rules_by_topic.get(topic, self._topic_agnostic_event_rules)
+
     def try_all_rules(
             self,
             token: EvmToken | None,
@@ -455,7 +491,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
         if len(tx_log.topics) == 0:
             return None  # ignore anonymous events
 
-        for rule in self.rules.event_rules:
+        for rule in self._event_rules_for_topic(tx_log.topics[0]):
             decoding_output, err = decode_safely(
                 handled_exceptions=self.possible_decoding_exceptions,
                 msg_aggregator=self.msg_aggregator,
@@ -822,10 +858,12 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             ignore_cache: bool,
             delete_customized: bool = False,
             write_buffer: list[tuple[list[EvmEvent], str, int]] | None = None,
+            decoded: bool | None = None,
     ) -> tuple[list[EvmEvent], bool, set[str] | None]:
         """
         Get a transaction's events if existing in the DB or decode them.
         If write_buffer is given the decoded events' DB write is deferred into it.
+        `decoded` is the already known decoded state of the transaction, if any.
         Returns:
         - the list of decoded events
         - a flag which is True if balances refresh is needed
@@ -837,6 +875,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             location=Location.from_chain(self.evm_inquirer.blockchain),  # type: ignore[arg-type]
             ignore_cache=ignore_cache,
             delete_customized=delete_customized,
+            decoded=decoded,
         )) is not None:
             return events, False, None
 
@@ -938,6 +977,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             log.debug(f'Failed to decode token with address {tx_log.address} due to inability to match token type')  # noqa: E501
             return None
 
+    @decodes_topics(ERC20_OR_ERC721_APPROVE)
     def _maybe_decode_erc20_approve(
             self,
             token: EvmToken | None,
@@ -1127,6 +1167,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             events.append(eth_event)
         return events
 
+    @decodes_topics(ERC20_OR_ERC721_TRANSFER)
     def _maybe_decode_erc20_721_transfer(
             self,
             token: EvmToken | None,
@@ -1326,6 +1367,37 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
 
         return EvmTransactionContext(transaction=tx, receipt=receipt)
 
+    def _load_transaction_contexts(
+            self,
+            cursor: DBCursor,
+            tx_hashes: Sequence[EVMTxHash],
+    ) -> list[EvmTransactionContext]:
+        """Load the transactions, receipts and decoded state of all the hashes in bulk.
+
+        Transactions missing data in the DB, and the genesis one, go through
+        _load_transaction_context so that the missing data is queried.
+        """
+        decoding_data = self.dbtx.get_transactions_decoding_data(
+            cursor=cursor,
+            tx_hashes=[x for x in tx_hashes if x != GENESIS_HASH],
+            chain_id=self.evm_inquirer.chain_id,
+        )
+        contexts = []
+        for tx_hash in tx_hashes:
+            if (
+                    (data := decoding_data.get(tx_hash)) is not None and
+                    self.transactions.has_all_tx_data(data[0])
+            ):
+                contexts.append(EvmTransactionContext(
+                    transaction=data[0],
+                    receipt=data[1],
+                    decoded=data[2],
+                ))
+            else:
+                contexts.append(self._load_transaction_context(cursor=cursor, tx_hash=tx_hash))
+
+        return contexts
+
     def _decode_transaction_from_context(
             self,
             context: EvmTransactionContext,
@@ -1339,6 +1411,7 @@ class EVMTransactionDecoder(TransactionDecoder['EvmTransaction', EvmDecodingRule
             ignore_cache=ignore_cache,
             delete_customized=delete_customized,
             write_buffer=write_buffer,
+            decoded=context.decoded,
         )
 
     def _make_event_filter_query(self, tx_ref: EVMTxHash) -> EvmEventFilterQuery:
@@ -20,6 +20,7 @@ from rotkehlchen.chain.evm.decoding.structures import (
     DecoderContext,
     EvmDecodingOutput,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.globaldb.cache import globaldb_get_general_cache_values
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
@@ -607,6 +608,7 @@ class PendleCommonDecoder(EvmDecoderInterface, ReloadableDecoderMixin):
 
         return DEFAULT_EVM_DECODING_OUTPUT
 
+    @decodes_topics(REDEEM_REWARDS_TOPIC)
     def _decode_claim_rewards_by_topic(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
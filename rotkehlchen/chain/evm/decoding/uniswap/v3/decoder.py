@@ -32,6 +32,7 @@ from rotkehlchen.chain.evm.decoding.uniswap.v3.utils import (
     decode_uniswap_v3_like_deposit_or_withdrawal,
     decode_uniswap_v3_like_router_swap,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 
@@ -119,6 +120,7 @@ class Uniswapv3CommonDecoder(EvmDecoderInterface):
             evm_inquirer=self.node_inquirer,
         )
 
+    @decodes_topics(SWAP_SIGNATURE)
     def _maybe_decode_v3_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
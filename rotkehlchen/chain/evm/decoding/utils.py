@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Final, Literal
 
 from rotkehlchen.assets.utils import get_evm_token, token_normalized_value
 from rotkehlchen.chain.evm.types import string_to_evm_address
@@ -53,6 +53,20 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 
+EVENT_RULE_TOPICS_ATTR: Final = 'decoded_topics'
+
+
+def decodes_topics[T: Callable[..., Any]](*topics: bytes) -> Callable[[T], T]:
+    """Declare the log topics an event rule can decode so that the decoder only calls it
+    for logs with one of those topics. Rules without a declaration are tried on every log.
+    """
+    def decorator(func: T) -> T:
+        setattr(func, EVENT_RULE_TOPICS_ATTR, frozenset(topics))
+        return func
+
+    return decorator
+
+
 def bridge_prepare_data(
         tx_log: EvmTxReceiptLog,
         deposit_topics: Sequence[bytes],
@@ -12,7 +12,7 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.evm.structures import EvmTxReceipt
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.drivers.sqlite import DBCursor
-    from rotkehlchen.types import ChecksumEvmAddress, EVMTxHash
+    from rotkehlchen.types import ChecksumEvmAddress, EvmTransaction, EVMTxHash
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -31,6 +31,10 @@ class L2WithL1FeesTransactions(EvmTransactions, ABC):
         super().__init__(evm_inquirer=node_inquirer, database=database)
         self.dbevmtx = DBL2WithL1FeesTx(database)
 
+    def has_all_tx_data(self, transaction: EvmTransaction) -> bool:
+        """A missing l1 fee is read as zero and has to be pulled by ensure_tx_data_exists"""
+        return cast('L2WithL1FeesTransaction', transaction).l1_fee != 0
+
     def ensure_tx_data_exists(
             self,
             cursor: DBCursor,
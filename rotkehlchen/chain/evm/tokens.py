@@ -10,10 +10,14 @@ from rotkehlchen.assets.utils import (
     token_normalized_value_decimals,
 )
 from rotkehlchen.balances.historical import HistoricalBalancesManager
+from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.proxies_inquirer import ProxyType
 from rotkehlchen.chain.evm.types import WeightedNode, asset_id_is_evm_token
 from rotkehlchen.constants import ONE, ZERO
-from rotkehlchen.constants.resolver import tokenid_to_collectible_id
+from rotkehlchen.constants.resolver import evm_address_to_identifier, tokenid_to_collectible_id
+from rotkehlchen.constants.timing import WEEK_IN_SECONDS
+from rotkehlchen.db.cache import DBCacheDynamic
+from rotkehlchen.db.evmtx import unpack_receipt_logs
 from rotkehlchen.errors.misc import NotFoundError, RemoteError, RequestTooLargeError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
@@ -22,12 +26,13 @@ from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import (
     ChecksumEvmAddress,
+    Location,
     Price,
     SupportedBlockchain,
     Timestamp,
     TokenKind,
 )
-from rotkehlchen.utils.misc import combine_dicts, get_chunks
+from rotkehlchen.utils.misc import address_to_bytes32, combine_dicts, get_chunks, ts_now
 
 from .constants import ETHERSCAN_MAX_ARGUMENTS_TO_CONTRACT, ZERO_ADDRESS
 from .contracts import EvmContract
@@ -101,6 +106,10 @@ class TokenChunkQueryResult:
 
 OTHER_MAX_TOKEN_CHUNK_LENGTH = 460
 
+# Tracked addresses are checked against all the known tokens at most this often. In between
+# only the tokens they interacted with, as seen in their events and transaction logs, are checked.
+TOKEN_DETECTION_FULL_SWEEP_INTERVAL = WEEK_IN_SECONDS
+
 # this is a number of arguments that a pure tokensBalance contract occupies when is added
 # to multicall. In total, it occupies (7 + number of tokens passed) arguments.
 PURE_TOKENS_BALANCE_ARGUMENTS = 7
@@ -385,9 +394,11 @@ class EvmTokens(ABC):  # noqa: B024
             chain_id=self.evm_inquirer.chain_id,
             exceptions=self._get_token_exceptions(),
         )
+        token_candidates = self._get_token_candidates(addresses)
         detected_erc20_tokens, failed_detection_addresses, detected_erc20_balances = self._detect_tokens(  # noqa: E501
             addresses=addresses,
             tokens_to_check=erc20_tokens,
+            token_candidates=token_candidates,
         )
         all_detected_tokens = self._detect_erc721_tokens(
             addresses=[
@@ -418,8 +429,122 @@ class EvmTokens(ABC):  # noqa: B024
                     address=address,
                     blockchain=self.evm_inquirer.blockchain,
                     tokens=detected_tokens,
+                    full_sweep=address not in token_candidates,
                 )
 
+    def _update_token_candidates(self, tracked_addresses: set[ChecksumEvmAddress]) -> None:
+        """Add to the token candidates of the tracked addresses the tokens of the events saved
+        since the last update, along with the tokens of the ERC20 Transfer logs from or to
+        them in the transactions of those events.
+
+        Logs are read from the receipts of the transactions that got events, since a receipt
+        may be saved well after its transaction and a transaction is only decoded once it has
+        its receipt.
+        """
+        blockchain, chain_id = self.evm_inquirer.blockchain, self.evm_inquirer.chain_id
+        location = Location.from_chain_id(chain_id).serialize_for_db()
+        tracked_topics = {address_to_bytes32(address): address for address in tracked_addresses}
+        if len(tracked_topics) == 0:
+            return
+
+        candidates: set[tuple[ChecksumEvmAddress, str]] = set()
+        with self.db.conn.read_ctx() as cursor:
+            if (last_event_id := cursor.execute(
+                'SELECT MAX(identifier) FROM history_events',
+            ).fetchone()[0]) is None:
+                return
+
+            from_event_id = self.db.get_dynamic_cache(
+                cursor=cursor,
+                name=DBCacheDynamic.LAST_TOKEN_CANDIDATES_EVENT_ID,
+                blockchain=blockchain.value,
+            ) or 0
+            if from_event_id >= last_event_id:
+                return
+
+            cursor.execute(
+                'SELECT DISTINCT location_label, asset FROM history_events '
+                'WHERE identifier > ? AND identifier <= ? AND location=? AND asset LIKE ?',
+                (from_event_id, last_event_id, location, f'eip155:{chain_id.value}/erc20:%'),
+            )
+            candidates.update(
+                (location_label, asset) for location_label, asset in cursor
+                if location_label in tracked_addresses
+            )
+            for (packed_logs,) in cursor.execute(
+                'SELECT R.logs FROM evmtx_receipts AS R INNER JOIN evm_transactions AS T '
+                'ON R.tx_id=T.identifier WHERE T.chain_id=? AND instr(R.logs, ?) > 0 AND '
+                'T.tx_hash IN (SELECT C.tx_ref FROM chain_events_info AS C INNER JOIN '
+                'history_events AS H ON C.identifier=H.identifier '
+                'WHERE H.identifier > ? AND H.identifier <= ? AND H.location=?)',
+                (
+                    chain_id.serialize_for_db(),
+                    ERC20_OR_ERC721_TRANSFER,
+                    from_event_id,
+                    last_event_id,
+                    location,
+                ),
+            ):
+                for tx_log in unpack_receipt_logs(packed_logs):
+                    if len(tx_log.topics) != 3 or tx_log.topics[0] != ERC20_OR_ERC721_TRANSFER:
+                        continue  # ERC721 transfers have the token id as a 4th topic
+
+                    for topic in tx_log.topics[1:]:
+                        if (address := tracked_topics.get(topic)) is not None:
+                            candidates.add((address, evm_address_to_identifier(
+                                address=tx_log.address,
+                                chain_id=chain_id,
+                                token_type=TokenKind.ERC20,
+                            )))
+
+        log.debug(f'Adding {len(candidates)} {self.evm_inquirer.chain_name} token candidates')
+        with self.db.user_write() as write_cursor:
+            self.db.add_token_candidates(
+                write_cursor=write_cursor,
+                blockchain=blockchain,
+                candidates=candidates,
+            )
+            self.db.set_dynamic_cache(
+                write_cursor=write_cursor,
+                name=DBCacheDynamic.LAST_TOKEN_CANDIDATES_EVENT_ID,
+                value=last_event_id,
+                blockchain=blockchain.value,
+            )
+
+    def _get_token_candidates(
+            self,
+            addresses: Sequence[ChecksumEvmAddress],
+    ) -> dict[ChecksumEvmAddress, set[str]]:
+        """Return the identifiers of the tokens to check for each of the given addresses that
+        does not need a full sweep of all the known tokens.
+
+        Only tracked addresses that had a full sweep in the last
+        TOKEN_DETECTION_FULL_SWEEP_INTERVAL are returned. Others, such as new accounts or
+        proxies whose transactions are not queried, are checked against all the tokens.
+        """
+        with self.db.conn.read_ctx() as cursor:
+            tracked_addresses = set(self.db.get_single_blockchain_addresses(
+                cursor=cursor,
+                blockchain=self.evm_inquirer.blockchain,
+            ))
+
+        self._update_token_candidates(tracked_addresses)
+        token_candidates, now = {}, ts_now()
+        with self.db.conn.read_ctx() as cursor:
+            for address in addresses:
+                if address not in tracked_addresses:
+                    continue
+
+                candidates, last_sweep_ts = self.db.get_token_candidates(
+                    cursor=cursor,
+                    address=address,
+                    blockchain=self.evm_inquirer.blockchain,
+                )
+                if last_sweep_ts is not None and now - last_sweep_ts < TOKEN_DETECTION_FULL_SWEEP_INTERVAL:  # noqa: E501
+                    token_candidates[address] = candidates
+
+        return token_candidates
+
     def _detect_erc721_tokens(
             self,
             addresses: Sequence[ChecksumEvmAddress],
@@ -528,6 +653,7 @@ class EvmTokens(ABC):  # noqa: B024
             self,
             addresses: Sequence[ChecksumEvmAddress],
             tokens_to_check: list[EvmTokenDetectionData],
+            token_candidates: Mapping[ChecksumEvmAddress, set[str]] | None = None,
     ) -> tuple[
         dict[ChecksumEvmAddress, list[Asset]],
         set[ChecksumEvmAddress],
@@ -544,6 +670,9 @@ class EvmTokens(ABC):  # noqa: B024
         For failed addresses, this method intentionally does not return partial token results,
         because callers treat failures as non-cacheable and must avoid destructive overwrites.
 
+        Addresses in token_candidates are only checked for the tokens_to_check whose
+        identifier is in their candidates. The rest are checked for all tokens_to_check.
+
         May raise:
         - RemoteError if an external service such as Etherscan is queried and
           there is a problem with its query.
@@ -555,9 +684,14 @@ class EvmTokens(ABC):  # noqa: B024
         balances_per_address: DetectedTokenBalancesType = {}
         failed_addresses: set[ChecksumEvmAddress] = set()
         for address in addresses:
+            if token_candidates is not None and (candidates := token_candidates.get(address)) is not None:  # noqa: E501
+                address_tokens = [x for x in tokens_to_check if x.identifier in candidates]
+            else:
+                address_tokens = tokens_to_check
+
             query_result = self._query_chunks(
                 address=address,
-                tokens=tokens_to_check,
+                tokens=address_tokens,
                 chunk_size=chunk_size,
                 call_order=call_order,
             )
@@ -1272,6 +1272,14 @@ class EvmTransactions(ABC):  # noqa: B024
 
         return True
 
+    def has_all_tx_data(
+            self,
+            transaction: EvmTransaction,  # pylint: disable=unused-argument
+    ) -> bool:
+        """Whether a transaction read from the DB along with its receipt has all the data that
+        ensure_tx_data_exists makes sure of. Subclasses pulling extra data should override it."""
+        return True
+
     def ensure_tx_data_exists(
             self,
             cursor: DBCursor,
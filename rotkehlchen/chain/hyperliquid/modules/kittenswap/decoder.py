@@ -13,6 +13,7 @@ from rotkehlchen.chain.evm.decoding.uniswap.v3.constants import SWAP_SIGNATURE
 from rotkehlchen.chain.evm.decoding.uniswap.v3.utils import (
     decode_uniswap_v3_like_router_swap,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.errors.misc import BlockchainQueryError, RemoteError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -128,6 +129,7 @@ class KittenswapDecoder(EvmDecoderInterface):
             process_swaps=True,
         )
 
+    @decodes_topics(SWAP_SIGNATURE)
     def _maybe_decode_swap(
             self,
             token: EvmToken | None,  # pylint: disable=unused-argument
@@ -11,7 +11,7 @@ from sqlcipher3 import dbapi2 as sqlcipher  # pylint: disable=no-name-in-module
 
 from rotkehlchen.api.websockets.typedefs import DBUploadStatusStep, WSMessageType
 from rotkehlchen.constants.misc import USERDB_NAME, USERSDIR_NAME
-from rotkehlchen.crypto import decrypt, encrypt
+from rotkehlchen.crypto import AES_BLOCK_SIZE, decrypt, encrypt
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.drivers.sqlite import DBConnection, DBConnectionType
 from rotkehlchen.db.misc import detect_sqlcipher_version, plaintext_db_integrity_check
@@ -19,6 +19,15 @@ from rotkehlchen.db.utils import unlock_database
 from rotkehlchen.errors.api import AuthenticationError
 from rotkehlchen.errors.misc import DataIntegrityError, SystemPermissionError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.premium.chunks import (
+    ChunkedBackup,
+    backup_chunk_id,
+    backup_chunk_key,
+    backup_manifest_hash,
+    iterate_backup_chunks,
+    pack_backup_chunk,
+    unpack_backup_chunk,
+)
 from rotkehlchen.utils.misc import timestamp_to_date, ts_now
 
 if TYPE_CHECKING:
@@ -34,6 +43,21 @@ log = RotkehlchenLogsAdapter(logger)
 BUFFERSIZE = 64 * 1024
 
 
+def _compress_db(tempdbpath: Path) -> bytes:
+    """Compress the dumped plaintext DB at tempdbpath in blocks"""
+    compressor = zlib.compressobj(level=9)
+    compressed_data = bytearray()
+    with open(tempdbpath, 'rb') as src_f:
+        block = src_f.read(BUFFERSIZE)
+        while block:
+            compressed_data += compressor.compress(block)
+            block = src_f.read(BUFFERSIZE)
+
+        compressed_data += compressor.flush()
+
+    return bytes(compressed_data)
+
+
 class DataHandler:
 
     def __init__(
@@ -269,21 +293,12 @@ class DataHandler:
             message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
             data={'type': str(DBUploadStatusStep.COMPRESSING)},
         )
-        compressor = zlib.compressobj(level=9)
-        compressed_data = bytearray()
-        with open(tempdbpath, 'rb') as src_f:
-            block = src_f.read(BUFFERSIZE)
-            while block:
-                compressed_data += compressor.compress(block)
-                block = src_f.read(BUFFERSIZE)
-
-            compressed_data += compressor.flush()
-
+        compressed_data = _compress_db(tempdbpath)
         self.msg_aggregator.add_message(
             message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
             data={'type': str(DBUploadStatusStep.ENCRYPTING)},
         )
-        encrypted_data = encrypt(self.db.password.encode(), bytes(compressed_data))
+        encrypted_data = encrypt(self.db.password.encode(), compressed_data)
         # We rehash the data on the server side to check that it was uploaded correctly,
         # so the hash we send must be of the encrypted data that is actually uploaded.
         data_hash = base64.b64encode(
@@ -293,21 +308,44 @@ class DataHandler:
         tempdbpath.unlink()
         return encrypted_data, data_hash
 
-    def decompress_and_decrypt_db(self, encrypted_data: bytes) -> None:
-        """Decrypt and decompress the encrypted data we receive from the server
+    @staticmethod
+    def whole_db_backup_size(tempdbpath: Path) -> int:
+        """The size in bytes that the dumped plaintext DB has once compressed and encrypted
+        by compress_and_encrypt_db. Used to compare against a whole DB backup in the server."""
+        compressed_size = len(_compress_db(tempdbpath))
+        return AES_BLOCK_SIZE + (compressed_size // AES_BLOCK_SIZE + 1) * AES_BLOCK_SIZE
 
-        If successful then replace our local Database
+    def chunk_and_encrypt_db(
+            self,
+            tempdbpath: Path,
+            remote_chunk_ids: set[str],
+    ) -> ChunkedBackup:
+        """Split the dumped plaintext DB in chunks and compress and encrypt the ones
+        that are not in remote_chunk_ids"""
+        self.msg_aggregator.add_message(
+            message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
+            data={'type': str(DBUploadStatusStep.COMPRESSING)},
+        )
+        key = backup_chunk_key(self.db.password)
+        chunk_ids: list[str] = []
+        new_chunks: dict[str, bytes] = {}
+        for chunk in iterate_backup_chunks(tempdbpath):
+            chunk_ids.append(chunk_id := backup_chunk_id(key, chunk))
+            if chunk_id not in remote_chunk_ids and chunk_id not in new_chunks:
+                new_chunks[chunk_id] = pack_backup_chunk(self.db.password, chunk)
+
+        backup = ChunkedBackup(
+            chunk_ids=chunk_ids,
+            new_chunks=new_chunks,
+            data_hash=backup_manifest_hash(chunk_ids),
+            data_size=tempdbpath.stat().st_size,
+        )
+        # cleanup temp file to avoid windows problem (https://github.com/rotki/rotki/issues/5051)
+        tempdbpath.unlink()
+        return backup
 
-        May Raise:
-        - UnableToDecryptRemoteData due to decrypt()
-        - DBUpgradeError if the rotki DB version is newer than the software or
-        there is a DB upgrade and there is an error or if the version is older
-        than the one supported.
-        - SystemPermissionError if the DB file permissions are not correct
-        - DataIntegrityError if the downloaded database fails the SQLite integrity check
-        """
-        log.info('Decompress and decrypt DB')
-        # First make a backup of the DB we are about to replace
+    def _backup_local_db(self) -> None:
+        """Make a backup of the DB we are about to replace with the one from the server"""
         date = timestamp_to_date(ts=ts_now(), formatstr='%Y_%m_%d_%H_%M_%S', treat_as_local=True)
         users_dir = self.data_directory / USERSDIR_NAME
         shutil.copyfile(
@@ -315,15 +353,61 @@ class DataHandler:
             users_dir / self.username / f'rotkehlchen_db_{date}.backup',
         )
 
-        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
-        decompressed_data = zlib.decompress(decrypted_data)
-        # Verify the downloaded plaintext DB before letting it overwrite the local one
+    def _import_remote_db(self, plaintext_data: bytes) -> None:
+        """Verify the downloaded plaintext DB and let it overwrite the local one
+
+        May Raise the same errors as decompress_and_decrypt_db except UnableToDecryptRemoteData
+        """
         with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdirname:  # needed on windows, see https://tinyurl.com/tmp-win-err  # noqa: E501
             tempdbpath = Path(tmpdirname) / 'remote.db'
-            tempdbpath.write_bytes(decompressed_data)
+            tempdbpath.write_bytes(plaintext_data)
             ok, integrity_error = plaintext_db_integrity_check(tempdbpath)
         if not ok:
             message = f'Downloaded database failed the integrity check: {integrity_error}'
             log.error(message)
             raise DataIntegrityError(message)
-        self.db.import_unencrypted(decompressed_data)
+        self.db.import_unencrypted(plaintext_data)
+
+    def decompress_and_decrypt_db(self, encrypted_data: bytes) -> None:
+        """Decrypt and decompress the encrypted data we receive from the server
+
+        If successful then replace our local Database
+
+        May Raise:
+        - UnableToDecryptRemoteData due to decrypt()
+        - DBUpgradeError if the rotki DB version is newer than the software or
+        there is a DB upgrade and there is an error or if the version is older
+        than the one supported.
+        - SystemPermissionError if the DB file permissions are not correct
+        - DataIntegrityError if the downloaded database fails the SQLite integrity check
+        """
+        log.info('Decompress and decrypt DB')
+        self._backup_local_db()
+        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
+        self._import_remote_db(zlib.decompress(decrypted_data))
+
+    def join_and_decrypt_db(
+            self,
+            chunk_ids: list[str],
+            encrypted_chunks: dict[str, bytes],
+    ) -> None:
+        """Decrypt and decompress the chunks of a chunked backup we receive from the server
+        and join them in the order of chunk_ids
+
+        If successful then replace our local Database
+
+        May Raise the same errors as decompress_and_decrypt_db. DataIntegrityError is also
+        raised if a chunk does not match its id.
+        """
+        log.info('Join and decrypt chunked DB')
+        self._backup_local_db()
+        key = backup_chunk_key(self.db.password)
+        chunks: dict[str, bytes] = {}
+        for chunk_id, data in encrypted_chunks.items():
+            if backup_chunk_id(key, chunk := unpack_backup_chunk(self.db.password, data)) != chunk_id:  # noqa: E501
+                message = f'Downloaded database chunk {chunk_id} does not match its id'
+                log.error(message)
+                raise DataIntegrityError(message)
+            chunks[chunk_id] = chunk
+
+        self._import_remote_db(b''.join(chunks[chunk_id] for chunk_id in chunk_ids))
@@ -1,5 +1,6 @@
 import hashlib
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
 
@@ -28,7 +29,8 @@ if TYPE_CHECKING:
     from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 
 
-ITEMS_PER_DB_WRITE = 400
+ITEMS_PER_DB_WRITE = 2000
+CSV_IMPORT_PROGRESS_INTERVAL = 2  # min seconds between two progress messages of an import
 MAX_ERROR_PERCENT = 0.2  # max percent of messages to total entries
 MIN_ENTRIES = 50  # minimum number of entries before checking MAX_ERROR_PERCENT
 
@@ -51,6 +53,7 @@ class BaseExchangeImporter(ABC):
         self.imported_entries: int = 0
         self.import_msgs: list[dict] = []
         self.max_msgs: bool = False
+        self.last_progress_ts: float = time.monotonic()
 
     def import_csv(self, filepath: Path, **kwargs: Any) -> tuple[bool, str]:
         self.reset()
@@ -75,13 +78,7 @@ class BaseExchangeImporter(ABC):
                     grouped_msgs[msg]['rows'].append(row)
 
             log.debug(f'Imported {self.imported_entries}/{self.total_entries} entries.')
-            self.db.msg_aggregator.add_message(WSMessageType.PROGRESS_UPDATES, {
-                'source_name': self.name,
-                'subtype': str(ProgressUpdateSubType.CSV_IMPORT_RESULT),
-                'total': self.total_entries,
-                'processed': self.imported_entries,
-                'messages': list(grouped_msgs.values()),
-            })
+            self.send_progress(messages=list(grouped_msgs.values()), finished=True)
 
         except InputError as e:
             return False, str(e)
@@ -109,23 +106,41 @@ class BaseExchangeImporter(ABC):
 
     def flush_all(self, write_cursor: DBCursor) -> None:
         self.db.add_margin_positions(write_cursor, margin_positions=self._margin_trades)
-        for event in self._history_events:
-            if self.history_db.add_history_event(
-                write_cursor=write_cursor,
-                event=event,
-                mapping_values={HISTORY_MAPPING_KEY_STATE: HistoryMappingState.IMPORTED_FROM_CSV},
-            ) is None:
-                self.append_msg(
-                    row_index=-1,  # we don't know the row index.
-                    msg=(
-                        f'Skipped duplicate {event.entry_type}: {event.event_type.serialize()}/{event.event_subtype.serialize()} '  # noqa: E501
-                        f'of {event.amount} {event.asset.symbol_or_name()} at {timestamp_to_date(ts_ms_to_sec(event.timestamp), "%Y/%m/%d %H:%M:%S")}'  # noqa: E501
-                    ),
-                    is_error=False,
-                )
+        duplicates = self.history_db.add_history_events_bulk(
+            write_cursor=write_cursor,
+            history=self._history_events,
+            mapping_values={HISTORY_MAPPING_KEY_STATE: HistoryMappingState.IMPORTED_FROM_CSV},
+        )
+        for event in duplicates:
+            if self.max_msgs:
+                break  # no need to format messages that won't be collected
+
+            self.append_msg(
+                row_index=-1,  # we don't know the row index.
+                msg=(
+                    f'Skipped duplicate {event.entry_type}: {event.event_type.serialize()}/{event.event_subtype.serialize()} '  # noqa: E501
+                    f'of {event.amount} {event.asset.symbol_or_name()} at {timestamp_to_date(ts_ms_to_sec(event.timestamp), "%Y/%m/%d %H:%M:%S")}'  # noqa: E501
+                ),
+                is_error=False,
+            )
 
         self._margin_trades = []
         self._history_events = []
+        if time.monotonic() - self.last_progress_ts >= CSV_IMPORT_PROGRESS_INTERVAL:
+            self.send_progress(messages=[], finished=False)
+
+    def send_progress(self, messages: list[dict[str, Any]], finished: bool) -> None:
+        """Send the progress of the import to the frontend. The messages are only
+        shown once the import is finished, so intermediate updates carry none."""
+        self.last_progress_ts = time.monotonic()
+        self.db.msg_aggregator.add_message(WSMessageType.PROGRESS_UPDATES, {
+            'source_name': self.name,
+            'subtype': str(ProgressUpdateSubType.CSV_IMPORT_RESULT),
+            'total': self.total_entries,
+            'processed': self.imported_entries,
+            'messages': messages,
+            'finished': finished,
+        })
 
     def append_msg(self, row_index: int, msg: str, is_error: bool) -> None:
         """Append message to queue to be sent to frontend.
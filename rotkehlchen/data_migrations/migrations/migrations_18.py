@@ -1,9 +1,10 @@
 import json
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
 from rotkehlchen.assets.asset import EvmToken
 from rotkehlchen.chain.evm.decoding.thegraph.constants import CPT_THEGRAPH
+from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.chain.gnosis.modules.monerium.constants import (
     V1_TO_V2_MONERIUM_MAPPINGS as GNOSIS_MONERIUM_MAPPINGS,
 )
@@ -11,8 +12,10 @@ from rotkehlchen.chain.polygon_pos.modules.monerium.constants import (
     V1_TO_V2_MONERIUM_MAPPINGS as POLYGON_MONERIUM_MAPPINGS,
 )
 from rotkehlchen.db.constants import TX_SPAM
+from rotkehlchen.db.evmtx import unpack_receipt_logs
 from rotkehlchen.db.filtering import EvmEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.db.utils import get_query_chunks
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.globaldb.cache import globaldb_set_general_cache_values
 from rotkehlchen.globaldb.handler import GlobalDBHandler
@@ -30,6 +33,14 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+THEGRAPH_STAKING_ADDRESS: Final = string_to_evm_address('0xF55041E37E12cD407ad00CE2910B8269B01263b9')  # noqa: E501
+DELEGATION_TRANSFERRED_TO_L2: Final = bytes.fromhex('231E5CFEFF7759A468241D939AB04A60D603B17E359057ABBB8F52AFC3E4986B')  # noqa: E501
+STAKE_DELEGATION_TOPICS: Final = {
+    bytes.fromhex('1B2E7737E043C5CF1B587CEB4DAEB7AE00148B9BDA8F79F1093EEAD08F141952'),  # StakeDelegationWithdrawn  # noqa: E501
+    bytes.fromhex('CD0366DCE5247D874FFC60A762AA7ABBB82C1695BBB171609C1B8861E279EB73'),  # StakeDelegated  # noqa: E501
+    bytes.fromhex('0430183F84D9C4502386D499DA806543DEE1D9DE83C08B01E39A6D2116C43B25'),  # StakeDelegatedLocked  # noqa: E501
+}
+
 
 def data_migration_18(rotki: Rotkehlchen, progress_handler: MigrationProgressHandler) -> None:  # pylint: disable=unused-argument
     """
@@ -64,75 +75,47 @@ def data_migration_18(rotki: Rotkehlchen, progress_handler: MigrationProgressHan
         approved_delegators = {x.address for x in events if x.address is not None}
         all_addresses = approved_delegators | set(tracked_addresses)
 
-        tracked_placeholders = ','.join('?' * len(tracked_addresses))
-        delegators_placeholders = ','.join('?' * len(approved_delegators))
-        all_placeholders = ','.join('?' * (len(approved_delegators) + len(tracked_addresses)))
-        # Find all possible logs we need to keep for our related addresses and mark the transactions  # noqa: E501
-        querystr = f"""SELECT DISTINCT et.tx_hash FROM evm_transactions et
-    JOIN evmtx_receipts er ON et.identifier = er.tx_id
-    JOIN evmtx_receipt_logs erl ON er.tx_id = erl.tx_id
-    JOIN evmtx_receipt_log_topics erlt0 ON erl.identifier = erlt0.log
-    JOIN evmtx_receipt_log_topics erlt2 ON erl.identifier = erlt2.log
-    WHERE erl.address = '0xF55041E37E12cD407ad00CE2910B8269B01263b9'
-      AND
-        (erlt0.topic_index = 0  /* DelegationTransferredToL2 */
-      AND erlt0.topic = X'231E5CFEFF7759A468241D939AB04A60D603B17E359057ABBB8F52AFC3E4986B'
-    AND ((
-         erlt2.topic_index = 2
-         AND erlt2.topic IN ({tracked_placeholders}))"""
-        query_bindings = [address_to_bytes32(x) for x in tracked_addresses]
-
-        if len(approved_delegators) != 0:
-            querystr += f' OR (erlt2.topic_index = 1 AND erlt2.topic IN({delegators_placeholders}))'  # noqa: E501
-            query_bindings += [address_to_bytes32(x) for x in approved_delegators]
-
-        querystr += f"""
-        ))OR
-        ((erlt0.topic_index = 0  /* StakeDelegationWithdrawn */
-        AND erlt0.topic = X'1B2E7737E043C5CF1B587CEB4DAEB7AE00148B9BDA8F79F1093EEAD08F141952') AND (erlt2.topic_index = 2 AND erlt2.topic IN ({all_placeholders})))
-        """  # noqa: E501
-        query_bindings += [address_to_bytes32(x) for x in all_addresses]
-
-        querystr += f"""
-        OR
-        ((erlt0.topic_index = 0  /* StakeDelegated */
-        AND erlt0.topic = X'CD0366DCE5247D874FFC60A762AA7ABBB82C1695BBB171609C1B8861E279EB73') AND (erlt2.topic_index = 2 AND erlt2.topic IN ({all_placeholders})))
-        """  # noqa: E501
-        query_bindings += [address_to_bytes32(x) for x in all_addresses]
-
-        querystr += f"""
-        OR
-        ((erlt0.topic_index = 0  /* StakeDelegatedLocked */
-        AND erlt0.topic = X'0430183F84D9C4502386D499DA806543DEE1D9DE83C08B01E39A6D2116C43B25') AND (erlt2.topic_index = 2 AND erlt2.topic IN ({all_placeholders})))
-        """  # noqa: E501
-        query_bindings += [address_to_bytes32(x) for x in all_addresses]
-
-        to_keep_hashes = []
+        tracked_topics = {address_to_bytes32(x) for x in tracked_addresses}
+        delegators_topics = {address_to_bytes32(x) for x in approved_delegators}
+        all_topics = {address_to_bytes32(x) for x in all_addresses}
+        # Find all possible logs we need to keep for our related addresses and mark the transactions.  # noqa: E501
+        # The logs are packed in the receipt so prefilter the receipts containing the address.
+        to_keep_ids, thegraph_tx_ids = [], []
         with rotki.data.db.conn.read_ctx() as cursor:
-            cursor.execute(querystr, query_bindings)
-            to_keep_hashes = [x[0] for x in cursor]
+            for tx_id, packed_logs in cursor.execute(
+                'SELECT tx_id, logs FROM evmtx_receipts WHERE instr(logs, ?) > 0',
+                (bytes.fromhex(THEGRAPH_STAKING_ADDRESS[2:]),),
+            ):
+                thegraph_logs = [
+                    x for x in unpack_receipt_logs(packed_logs)
+                    if x.address == THEGRAPH_STAKING_ADDRESS
+                ]
+                if len(thegraph_logs) == 0:
+                    continue
+
+                thegraph_tx_ids.append(tx_id)
+                if any(
+                    len(x.topics) >= 3 and ((
+                        x.topics[0] == DELEGATION_TRANSFERRED_TO_L2 and
+                        (x.topics[2] in tracked_topics or x.topics[1] in delegators_topics)
+                    ) or (x.topics[0] in STAKE_DELEGATION_TOPICS and x.topics[2] in all_topics))
+                    for x in thegraph_logs
+                ):
+                    to_keep_ids.append(tx_id)
 
         # Finally delete the unneeded transactions
-        query_bindings = []
-        querystr = """DELETE FROM evm_transactions
-        WHERE identifier IN (
-        SELECT DISTINCT et.identifier
-        FROM evm_transactions et
-        JOIN evmtx_receipts er ON et.identifier = er.tx_id
-        JOIN evmtx_receipt_logs erl ON er.tx_id = erl.tx_id
-        WHERE erl.address = '0xF55041E37E12cD407ad00CE2910B8269B01263b9'
-    ) AND tx_hash NOT IN (SELECT tx_ref from chain_events_info)"""
-        if len(to_keep_hashes) != 0:
-            # we have also performed a thorough logs query above in case some were not decoded.
-            # As if the transactions were not decoded yet then the
-            # tx_hash NOT IN (SELECT tx_hash from chain_events_info) won't help avoid
-            # deleting important transactions
-            to_keep_placeholders = ','.join('?' * len(to_keep_hashes))
-            querystr += f' AND tx_hash NOT IN ({to_keep_placeholders})'
-            query_bindings += to_keep_hashes
-
+        # we have also performed a thorough logs query above in case some were not decoded.
+        # As if the transactions were not decoded yet then the
+        # tx_hash NOT IN (SELECT tx_hash from chain_events_info) won't help avoid
+        # deleting important transactions
+        to_delete_ids = set(thegraph_tx_ids) - set(to_keep_ids)
         with rotki.data.db.conn.write_ctx() as write_cursor:
-            write_cursor.execute(querystr, query_bindings)
+            for tx_ids, placeholders in get_query_chunks(data=list(to_delete_ids)):
+                write_cursor.execute(
+                    f'DELETE FROM evm_transactions WHERE identifier IN ({placeholders}) '
+                    'AND tx_hash NOT IN (SELECT tx_ref from chain_events_info)',
+                    tx_ids,
+                )
 
         rotki.data.db.conn.vacuum()  # also since this cleans up a lot of space vacuum
 
@@ -36,7 +36,7 @@ if TYPE_CHECKING:
     from rotkehlchen.accounting.pot import AccountingPot
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.drivers.sqlite import DBCursor
-    from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+    from rotkehlchen.history.events.structures.base import HistoryBaseEntry, HistoryEventForApi
 
 
 logger = logging.getLogger(__name__)
@@ -761,7 +761,7 @@ def query_missing_accounting_rules(
         db: DBHandler,
         accountant: Accountant,
         pot_factory: Callable[[], AccountingPot],
-        events: Sequence[HistoryBaseEntry],
+        events: Sequence[HistoryEventForApi],
 ) -> list[EventAccountingRuleStatus]:
     """
     For a list of events returns a list of the same length with boolean values where True
@@ -63,7 +63,7 @@ class AddressArgType(TypedDict):
 
 
 class BlockchainArgType(TypedDict):
-    """Type of kwargs, used to get the value of `LAST_BLOCKCHAIN_BALANCES_QUERY_TS`"""
+    """Type of kwargs, used to get the value of `LAST_BLOCKCHAIN_BALANCES_QUERY_TS` and `LAST_TOKEN_CANDIDATES_EVENT_ID`"""  # noqa: E501
     blockchain: str
 
 
@@ -135,6 +135,11 @@ class DBCacheDynamic(Enum):
         '{blockchain}_last_balances_query_ts',
         _deserialize_timestamp_from_str,
     )
+    # last history event whose asset and transaction logs were added to the token candidates
+    LAST_TOKEN_CANDIDATES_EVENT_ID: Final = (
+        '{blockchain}_last_token_candidates_event_id',
+        _deserialize_int_from_str,
+    )
 
     @overload
     def get_db_key(self, **kwargs: Unpack[LabeledLocationArgsType]) -> str:
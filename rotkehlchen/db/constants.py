@@ -57,6 +57,9 @@ class HistoryEventLinkType(DBIntEnumMixIn):
 
 EVM_ACCOUNTS_DETAILS_LAST_QUERIED_TS: Final = 'last_queried_timestamp'
 EVM_ACCOUNTS_DETAILS_TOKENS: Final = 'tokens'
+# tokens an address interacted with, checked at token detection in between full sweeps
+EVM_ACCOUNTS_DETAILS_TOKEN_CANDIDATE: Final = 'token_candidate'
+EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS: Final = 'last_token_sweep_ts'
 
 # sqlite treats NULLs as different values in UNIQUE checks.
 # we use "NONE" instead of NULL so that only one "no value" row can exist.
@@ -104,6 +107,8 @@ class UpdateType(Enum):
 # Giving a name for history_events.identifier since without it in the free version case https://github.com/rotki/rotki/issues/7362 we were hitting a no such column: history_events.identifier  # noqa: E501
 HISTORY_BASE_ENTRY_FIELDS: Final = 'entry_type, history_events.identifier AS history_events_identifier, group_identifier, sequence_index, timestamp, location, location_label, asset, amount, notes, type, subtype, extra_data, ignored '  # noqa: E501
 HISTORY_BASE_ENTRY_LENGTH: Final = 13
+# The columns of history_events apart from the generated ones, which can't be written to
+HISTORY_EVENTS_STORED_COLUMNS: Final = 'identifier, entry_type, group_identifier, sequence_index, timestamp, location, location_label, asset, amount, notes, type, subtype, extra_data, ignored'  # noqa: E501
 
 CHAIN_EVENT_FIELDS: Final = 'tx_ref, counterparty, address'
 CHAIN_EVENT_NULL_FIELDS: Final = 'NULL as tx_ref, NULL as counterparty, NULL as address'
@@ -113,4 +118,7 @@ ETH_STAKING_EVENT_FIELDS: Final = 'validator_index, is_exit_or_blocknumber'
 ETH_STAKING_EVENT_NULL_FIELDS: Final = 'NULL as validator_index, NULL as is_exit_or_blocknumber'
 ETH_STAKING_FIELD_LENGTH: Final = 2
 
+# Max events of a single batch of the columnar export of the history events
+HISTORY_EVENTS_COLUMNAR_MAX_LIMIT: Final = 50000
+
 EXTRAINTERNALTXPREFIX: Final = 'extrainternaltx'
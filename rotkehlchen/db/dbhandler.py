@@ -52,6 +52,8 @@ from rotkehlchen.db.constants import (
     BINANCE_HISTORY_START_TS_KEY,
     BINANCE_MARKETS_KEY,
     EVM_ACCOUNTS_DETAILS_LAST_QUERIED_TS,
+    EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS,
+    EVM_ACCOUNTS_DETAILS_TOKEN_CANDIDATE,
     EVM_ACCOUNTS_DETAILS_TOKENS,
     EXTRAINTERNALTXPREFIX,
     GATE_LOCATION_KEY,
@@ -168,7 +170,7 @@ from rotkehlchen.utils.misc import get_chunks, ts_ms_to_sec, ts_now
 from rotkehlchen.utils.serialization import rlk_jsondumps
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Iterator, Mapping, Sequence
+    from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
 
     from rotkehlchen.chain.substrate.types import SubstrateAddress
     from rotkehlchen.db.filtering import UserNotesFilterQuery
@@ -272,6 +274,11 @@ class DBHandler:
         # total_changes counter at query time: any DB write since then makes the entry
         # stale, so no write path needs to know about this cache to invalidate it.
         self._history_events_count_cache: dict[str | None, tuple[int, int]] = {}
+        # Running checksums of the columnar history events export, so that checking the rows a
+        # consumer already holds only hashes the rows after the closest checkpoint. Keyed by
+        # the export filters, each maps an identifier to the count and checksum of the rows
+        # up to it. Carries the total_changes counter like _history_events_count_cache.
+        self.history_events_checksums_cache: tuple[int, dict[tuple, dict[int, tuple[int, int]]]] = (-1, {})  # noqa: E501
         # tracks, in memory, which chains may have transactions pending receipt fetching or
         # decoding so the periodic scheduler can skip its full-table "is there work?" scans
         self.pending_txs_tracker = PendingTransactionsTracker()
@@ -1037,6 +1044,15 @@ class DBHandler:
     ) -> Timestamp | None:
         ...
 
+    @overload
+    def get_dynamic_cache(
+            self,
+            cursor: DBCursor,
+            name: Literal[DBCacheDynamic.LAST_TOKEN_CANDIDATES_EVENT_ID],
+            **kwargs: Unpack[BlockchainArgType],
+    ) -> int | None:
+        ...
+
     def get_dynamic_cache(
             self,
             cursor: DBCursor,
@@ -1234,6 +1250,16 @@ class DBHandler:
     ) -> None:
         ...
 
+    @overload
+    def set_dynamic_cache(
+            self,
+            write_cursor: DBCursor,
+            name: Literal[DBCacheDynamic.LAST_TOKEN_CANDIDATES_EVENT_ID],
+            value: int,
+            **kwargs: Unpack[BlockchainArgType],
+    ) -> None:
+        ...
+
     def set_dynamic_cache(
             self,
             write_cursor: DBCursor,
@@ -2144,8 +2170,13 @@ class DBHandler:
             address: ChecksumEvmAddress,
             blockchain: SupportedBlockchain,
             tokens: Sequence[Asset],
+            full_sweep: bool = False,
     ) -> None:
-        """Saves detected tokens for an address"""
+        """Saves detected tokens for an address.
+
+        If full_sweep is True the tokens were detected by checking all the known tokens
+        and the time of the sweep is also saved.
+        """
         now = ts_now()
         chain_id = blockchain.to_chain_id().serialize_for_db()
         insert_rows: list[tuple[ChecksumEvmAddress, int, str, str | Timestamp]] = [
@@ -2171,6 +2202,13 @@ class DBHandler:
             'DELETE FROM evm_accounts_details WHERE account=? AND chain_id=? AND KEY IN(?, ?)',
             (address, chain_id, EVM_ACCOUNTS_DETAILS_TOKENS, EVM_ACCOUNTS_DETAILS_LAST_QUERIED_TS),
         )
+        if full_sweep:
+            write_cursor.execute(
+                'DELETE FROM evm_accounts_details WHERE account=? AND chain_id=? AND key=?',
+                (address, chain_id, EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS),
+            )
+            insert_rows.append((address, chain_id, EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS, now))
+
         # Insert new values
         write_cursor.executemany(
             'INSERT OR REPLACE INTO evm_accounts_details '
@@ -2178,6 +2216,52 @@ class DBHandler:
             insert_rows,
         )
 
+    def add_token_candidates(
+            self,
+            write_cursor: DBCursor,
+            blockchain: SupportedBlockchain,
+            candidates: Iterable[tuple[ChecksumEvmAddress, str]],
+    ) -> None:
+        """Saves (address, token identifier) pairs of tokens that the addresses interacted with
+        so that token detection can check only them in between full sweeps"""
+        chain_id = blockchain.to_chain_id().serialize_for_db()
+        write_cursor.executemany(
+            'INSERT OR IGNORE INTO evm_accounts_details '
+            '(account, chain_id, key, value) VALUES (?, ?, ?, ?)',
+            [
+                (address, chain_id, EVM_ACCOUNTS_DETAILS_TOKEN_CANDIDATE, token_identifier)
+                for address, token_identifier in candidates
+            ],
+        )
+
+    def get_token_candidates(
+            self,
+            cursor: DBCursor,
+            address: ChecksumEvmAddress,
+            blockchain: SupportedBlockchain,
+    ) -> tuple[set[str], Timestamp | None]:
+        """Returns the identifiers of the token candidates and of the already detected tokens
+        of an address along with the time of its last full token sweep, if any"""
+        candidates, last_sweep_ts = set(), None
+        cursor.execute(
+            'SELECT key, value FROM evm_accounts_details WHERE account=? AND chain_id=? '
+            'AND key IN (?, ?, ?)',
+            (
+                address,
+                blockchain.to_chain_id().serialize_for_db(),
+                EVM_ACCOUNTS_DETAILS_TOKENS,
+                EVM_ACCOUNTS_DETAILS_TOKEN_CANDIDATE,
+                EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS,
+            ),
+        )
+        for key, value in cursor:
+            if key == EVM_ACCOUNTS_DETAILS_LAST_TOKEN_SWEEP_TS:
+                last_sweep_ts = deserialize_timestamp(value)
+            else:
+                candidates.add(value)
+
+        return candidates, last_sweep_ts
+
     def _deserialize_account_blockchain_from_db(
             self,
             chain_str: str,
@@ -4393,6 +4477,48 @@ class DBHandler:
         )
         return [BTCAddress(row[0]) for row in cursor.fetchall()]
 
+    def get_xpub_derived_keys(
+            self,
+            cursor: DBCursor,
+            xpub_data: XpubData,
+    ) -> dict[tuple[int, int], bytes]:
+        """Get the cached public keys derived from an xpub by (account_index, derived_index)"""
+        cursor.execute(
+            'SELECT account_index, derived_index, pubkey FROM xpub_derived_keys WHERE xpub=? '
+            'AND derivation_path=? AND blockchain=?',
+            (
+                xpub_data.xpub.xpub,
+                xpub_data.serialize_derivation_path_for_db(),
+                xpub_data.blockchain.value,
+            ),
+        )
+        return {
+            (account_index, derived_index): pubkey
+            for account_index, derived_index, pubkey in cursor
+        }
+
+    def add_xpub_derived_keys(
+            self,
+            write_cursor: DBCursor,
+            xpub_data: XpubData,
+            derived_keys: Mapping[tuple[int, int], bytes],
+    ) -> None:
+        """Cache public keys derived from an xpub keyed by (account_index, derived_index)"""
+        write_cursor.executemany(
+            'INSERT OR IGNORE INTO xpub_derived_keys(xpub, derivation_path, blockchain, '
+            'account_index, derived_index, pubkey) VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    xpub_data.xpub.xpub,
+                    xpub_data.serialize_derivation_path_for_db(),
+                    xpub_data.blockchain.value,
+                    account_index,
+                    derived_index,
+                    pubkey,
+                ) for (account_index, derived_index), pubkey in derived_keys.items()
+            ],
+        )
+
     def ensure_xpub_mappings_exist(
             self,
             write_cursor: DBCursor,
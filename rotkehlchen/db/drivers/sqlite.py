@@ -36,11 +36,13 @@ from sqlcipher3 import dbapi2 as sqlcipher
 from rotkehlchen.concurrency import TaskCancelledError, checkpoint, current_token
 from rotkehlchen.db.checks import sanity_check_impl
 from rotkehlchen.db.minimized_schema import MINIMIZED_USER_DB_INDEXES, MINIMIZED_USER_DB_SCHEMA
+from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.minimized_schema import (
     MINIMIZED_GLOBAL_DB_INDEXES,
     MINIMIZED_GLOBAL_DB_SCHEMA,
 )
 from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.perf import get_request_span
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator, Sequence
@@ -143,6 +145,7 @@ class DBCursor:
         if __debug__:
             logger.trace(f'EXECUTE {statement} with bindings {bindings} for cursor {id(self)}')
         self._prefetched_rows.clear()  # a new statement discards the previous result set
+        start = time.perf_counter() if (span := get_request_span()) is not None else 0.0
         try:
             with self.connection.statement_lock:
                 try:
@@ -155,6 +158,8 @@ class DBCursor:
             _maybe_raise_cancelled(e)
             raise
 
+        if span is not None:
+            span.record_statement(statement, time.perf_counter() - start)
         if __debug__:
             logger.trace(f'FINISH EXECUTE {statement} with bindings {bindings} for cursor {id(self)}')  # noqa: E501
         return self
@@ -167,12 +172,15 @@ class DBCursor:
         if __debug__:
             logger.trace(f'EXECUTEMANY {statement} with bindings {bindings} for cursor {id(self)}')
         self._prefetched_rows.clear()  # a new statement discards the previous result set
+        start = time.perf_counter() if (span := get_request_span()) is not None else 0.0
         try:
             with self.connection.statement_lock:
                 self._cursor.executemany(statement, *bindings)
         except (sqlcipher.OperationalError, rsqlite.OperationalError) as e:  # pylint: disable=no-member
             _maybe_raise_cancelled(e)
             raise
+        if span is not None:
+            span.record_statement(statement, time.perf_counter() - start)
         if __debug__:
             logger.trace(f'FINISH EXECUTEMANY {statement} with bindings {bindings} for cursor {id(self)}')  # noqa: E501
         return self
@@ -277,6 +285,37 @@ class DBCursor:
             self._cursor.close()
 
 
+class FValSum:
+    """SQL aggregate summing the decimal TEXT amounts of the user and transient DBs exactly
+
+    Registered as FVAL_SUM() so that sums of amounts can be computed inside SQLite
+    without the precision loss of SUM(CAST(amount AS REAL)). Like SUM() it skips NULL
+    values and gives NULL if there is nothing to sum. The sum is returned as TEXT.
+
+    It runs python code for every row, so it is much slower than the native SUM(). The
+    amounts of the user DB are summed with exact_sum_query, which only passes it the
+    amounts that don't fit their generated integer columns.
+    """
+
+    def __init__(self) -> None:
+        self.total: FVal | None = None
+
+    def step(self, value: str | None) -> None:
+        if value is None:
+            return
+
+        try:
+            amount = FVal(value)
+        except ValueError:
+            logger.debug(f'Skipping non numeric value {value} in FVAL_SUM')
+            return
+
+        self.total = amount if self.total is None else self.total + amount
+
+    def finalize(self) -> str | None:
+        return None if self.total is None else str(self.total)
+
+
 class DBConnectionType(Enum):
     USER = auto()
     TRANSIENT = auto()
@@ -482,6 +521,9 @@ class DBConnection:
             # distance directly in SQL instead of pulling every matching row into memory.
             with self.statement_lock:
                 self._conn.create_function('levenshtein', 2, levenshtein, deterministic=True)
+        elif connection_type in (DBConnectionType.USER, DBConnectionType.TRANSIENT):
+            with self.statement_lock:
+                self._conn.create_aggregate('FVAL_SUM', 1, FValSum)
         self.minimized_schema = None
         self.minimized_indexes = None
         if connection_type == DBConnectionType.USER:
@@ -25,7 +25,7 @@ from rotkehlchen.db.filtering import (
     WithdrawalTypesFilter,
 )
 from rotkehlchen.db.history_events import DBHistoryEvents
-from rotkehlchen.db.utils import get_query_chunks
+from rotkehlchen.db.utils import deserialize_exact_sum, exact_sum_query, get_query_chunks
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import HistoryBaseEntry, HistoryBaseEntryType
@@ -316,15 +316,19 @@ class DBEth2:
     @staticmethod
     def _validator_stats_process_queries(
             cursor: DBCursor,
-            amount_querystr: str,
+            sum_amounts: bool,
             filter_query: EthStakingEventFilterQuery,
     ) -> dict[int, FVal]:
         """Execute DB query and extract numerical value per validator after using filter_query
-        Return a dict of validator index to sum of amounts per validator in the filter
+        Return a dict of validator index to the exact sum of the amounts per validator in the
+        filter if sum_amounts is True, else to the amount of one of its events.
         """
+        amount_querystr = exact_sum_query('amount') if sum_amounts else 'amount'
         base_query = f'SELECT validator_index, {amount_querystr} ' + ETH_STAKING_EVENT_JOIN
         query, bindings = filter_query.prepare(with_pagination=False, with_order=False)
         cursor.execute(base_query + query + ' GROUP BY eth_staking_events_info.validator_index', bindings)  # noqa: E501
+        if sum_amounts:
+            return {entry[0]: deserialize_exact_sum(entry[1:]) for entry in cursor}
 
         return {entry[0]: FVal(entry[1]) for entry in cursor}
 
@@ -364,7 +368,7 @@ class DBEth2:
             cursor: DBCursor,
             from_ts: Timestamp,
             to_ts: Timestamp,
-            amount_querystr: str,
+            sum_amounts: bool,
             validator_indices: list[int],
             withdrawal_types_filter: WithdrawalTypesFilter,
     ) -> dict[int, FVal]:
@@ -373,7 +377,7 @@ class DBEth2:
         for chunk, _ in get_query_chunks(data=validator_indices):
             for key, value in self._validator_stats_process_queries(
                 cursor=cursor,
-                amount_querystr=amount_querystr,
+                sum_amounts=sum_amounts,
                 filter_query=EthWithdrawalFilterQuery.make(
                     from_ts=from_ts,
                     to_ts=to_ts,
@@ -415,13 +419,13 @@ class DBEth2:
                 cursor=cursor,
                 from_ts=from_ts,
                 to_ts=to_ts,
-                amount_querystr='SUM(CAST(amount AS REAL))',
+                sum_amounts=True,
                 validator_indices=validator_indices,
                 withdrawal_types_filter=WithdrawalTypesFilter.ONLY_PARTIAL,
             ))
             for v_index, exit_amount in self._query_chunked_withdrawal_amount_sums(
                 cursor=cursor,
-                amount_querystr='amount',
+                sum_amounts=False,
                 from_ts=from_ts,
                 to_ts=to_ts,
                 validator_indices=validator_indices,
@@ -730,7 +734,7 @@ class DBEth2:
         """
         blocks_rewards_amounts = self._validator_stats_process_queries(
             cursor=cursor,
-            amount_querystr='SUM(CAST(amount AS REAL))',  # note: has precision issues
+            sum_amounts=True,
             filter_query=blocks_execution_filter_query,
         )
 
@@ -1,6 +1,7 @@
 import logging
+import struct
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, ClassVar, get_args
+from typing import TYPE_CHECKING, Any, ClassVar, Final, get_args
 
 from sqlcipher3 import dbapi2 as sqlcipher
 
@@ -14,7 +15,7 @@ from rotkehlchen.chain.ethereum.modules.eth2.constants import (
 )
 from rotkehlchen.chain.evm.constants import GENESIS_HASH, ZERO_ADDRESS
 from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
-from rotkehlchen.chain.evm.types import EvmAccount, string_to_evm_address
+from rotkehlchen.chain.evm.types import EvmAccount
 from rotkehlchen.chain.gnosis.constants import GNOSIS_GENESIS
 from rotkehlchen.chain.monad.constants import MONAD_GENESIS
 from rotkehlchen.chain.optimism.constants import OPTIMISM_GENESIS
@@ -58,13 +59,78 @@ from rotkehlchen.types import (
     deserialize_evm_tx_hash,
 )
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
+from rotkehlchen.utils.misc import bytes_to_address
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
     from rotkehlchen.db.drivers.sqlite import DBCursor
 
+# The logs of a receipt are stored packed in a single blob of evmtx_receipts. It starts with
+# a format version byte followed by each log as a header of (log index, address, number of
+# topics, data length), its 32 byte topics and then its data. Bump the version and keep
+# reading the previous one when changing the layout.
+RECEIPT_LOGS_FORMAT_VERSION: Final = 1
+RECEIPT_LOG_HEADER: Final = struct.Struct('>I20sBI')
+RECEIPT_LOG_TOPIC_SIZE: Final = 32
+_ADDRESS_PADDING: Final = bytes(12)
+
+
+def pack_receipt_logs(logs: Iterable[EvmTxReceiptLog]) -> bytes:
+    """Pack the given receipt logs into the blob stored in evmtx_receipts.logs
+
+    May raise:
+    - DeserializationError if a topic is not 32 bytes long
+    """
+    parts = [bytes((RECEIPT_LOGS_FORMAT_VERSION,))]
+    for entry in logs:
+        if any(len(topic) != RECEIPT_LOG_TOPIC_SIZE for topic in entry.topics):
+            raise DeserializationError(f'Receipt log {entry.log_index} has a non 32 byte topic')
+
+        parts.append(RECEIPT_LOG_HEADER.pack(
+            entry.log_index,
+            bytes.fromhex(entry.address[2:]),
+            len(entry.topics),
+            len(entry.data),
+        ))
+        parts.extend(entry.topics)
+        parts.append(entry.data)
+
+    return b''.join(parts)
+
+
+def unpack_receipt_logs(packed: bytes) -> list[EvmTxReceiptLog]:
+    """Read the logs of a blob created by pack_receipt_logs.
+
+    Each field is read at its offset of the blob, without slicing it per log first.
+
+    May raise:
+    - DeserializationError if the blob has an unknown format version
+    """
+    if packed[0] != RECEIPT_LOGS_FORMAT_VERSION:
+        raise DeserializationError(f'Unknown receipt logs format version {packed[0]}')
+
+    logs, offset = [], 1
+    while offset < len(packed):
+        log_index, address, topics_num, data_length = RECEIPT_LOG_HEADER.unpack_from(packed, offset)  # noqa: E501
+        topics_start = offset + RECEIPT_LOG_HEADER.size
+        data_start = topics_start + topics_num * RECEIPT_LOG_TOPIC_SIZE
+        offset = data_start + data_length
+        logs.append(EvmTxReceiptLog(
+            log_index=log_index,
+            data=packed[data_start:offset],
+            address=bytes_to_address(_ADDRESS_PADDING + address),
+            topics=[
+                packed[topic_start:topic_start + RECEIPT_LOG_TOPIC_SIZE]
+                for topic_start in range(topics_start, data_start, RECEIPT_LOG_TOPIC_SIZE)
+            ],
+        ))
+
+    return logs
+
 
 class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTransactionsFilterQuery, EvmTransactionsNotDecodedFilterQuery]):  # noqa: E501
     # Index in the SQL result tuple where authorization fields (nonce, delegated_address) begin
@@ -342,8 +408,15 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
         """
         query, bindings = filter_.prepare()
         query, bindings = self._form_evm_transaction_dbquery(query, bindings)
+        return self._deserialize_transactions(cursor.execute(query, bindings))
+
+    def _deserialize_transactions(self, results: Iterable[tuple[Any, ...]]) -> list[EvmTransaction]:  # noqa: E501
+        """Build the transactions from the rows of a query formed by _form_evm_transaction_dbquery
+
+        Transactions that can't be deserialized are skipped and an error is shown to the user.
+        """
         grouped_transactions: dict[int, tuple[Any, ...]] = {}  # Group results by transaction identifier  # noqa: E501
-        for result in cursor.execute(query, bindings):
+        for result in results:
             if (tx_identifier := result[12]) not in grouped_transactions:  # Store base transaction data + empty auth list  # noqa: E501
                 grouped_transactions[tx_identifier] = (*result[:self.AUTHORIZATION_DATA_START_INDEX], [])  # noqa: E501
 
@@ -464,6 +537,12 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
             status = 1
 
         contract_address = deserialize_evm_address(data['contractAddress']) if data['contractAddress'] else None  # noqa: E501
+        packed_logs = pack_receipt_logs(EvmTxReceiptLog(
+            log_index=log_entry['logIndex'],
+            data=hexstring_to_bytes(log_entry['data']),
+            address=deserialize_evm_address(log_entry['address']),
+            topics=[hexstring_to_bytes(topic) for topic in log_entry['topics']],
+        ) for log_entry in data['logs'])
         tx_id = write_cursor.execute(
             'SELECT identifier from evm_transactions WHERE tx_hash=? AND chain_id=?',
             (tx_hash_b, serialized_chain_id),
@@ -471,9 +550,9 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
 
         try:
             write_cursor.execute(
-                'INSERT INTO evmtx_receipts (tx_id, contract_address, status, type) '
-                'VALUES(?, ?, ?, ?) ',
-                (tx_id, contract_address, status, tx_type),
+                'INSERT INTO evmtx_receipts (tx_id, contract_address, status, type, logs) '
+                'VALUES(?, ?, ?, ?, ?) ',
+                (tx_id, contract_address, status, tx_type, packed_logs),
             )
         except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
             if 'UNIQUE constraint failed: evmtx_receipts.tx_id' not in str(e):
@@ -483,32 +562,6 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
 
         # a new receipt was just added, so this tx is now pending decoding
         self.db.pending_txs_tracker.mark_decoding_dirty(chain_id.to_blockchain())
-        for log_entry in data['logs']:
-            write_cursor.execute(
-                'INSERT INTO evmtx_receipt_logs (tx_id, log_index, data, address) '
-                'VALUES(? ,? ,? ,?)',
-                (
-                    tx_id,
-                    log_entry['logIndex'],
-                    hexstring_to_bytes(log_entry['data']),
-                    deserialize_evm_address(log_entry['address']),
-                ),
-            )
-            log_id = write_cursor.lastrowid
-            topic_tuples = []
-            for idx, topic in enumerate(log_entry['topics']):
-                topic_tuples.append((
-                    log_id,
-                    hexstring_to_bytes(topic),
-                    idx,
-                ))
-            if len(topic_tuples) != 0:
-                write_cursor.executemany(
-                    'INSERT INTO evmtx_receipt_log_topics (log, topic, topic_index) '
-                    'VALUES(? ,? ,?)',
-                    topic_tuples,
-                )
-
         return tx_id
 
     def get_receipt(
@@ -519,44 +572,26 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
     ) -> EvmTxReceipt | None:
         """Get the evm receipt for the given tx_hash and chain id"""
         if (result := cursor.execute(
-            'SELECT T.identifier, R.contract_address, R.status, R.type '
+            'SELECT R.contract_address, R.status, R.type, R.logs '
             'FROM evm_transactions AS T INNER JOIN evmtx_receipts AS R ON T.identifier=R.tx_id '
             'WHERE T.tx_hash=? AND T.chain_id=?',
             (tx_hash, chain_id.serialize_for_db()),
         ).fetchone()) is None:
             return None
 
-        tx_id = result[0]
         tx_receipt = EvmTxReceipt(
             tx_hash=tx_hash,
             chain_id=chain_id,
-            contract_address=result[1],
-            status=bool(result[2]),  # works since value is either 0 or 1
-            tx_type=result[3],
+            contract_address=result[0],
+            status=bool(result[1]),  # works since value is either 0 or 1
+            tx_type=result[2],
         )
+        self._add_receipt_logs(tx_receipt=tx_receipt, packed_logs=result[3])
+        return tx_receipt
 
-        logs_data: dict[int, tuple[int, bytes, str]] = {}
-        topics_by_log: dict[int, list[bytes]] = {}
-        for log_id, log_index, data, address, topic in cursor.execute(
-            'SELECT L.identifier, L.log_index, L.data, L.address, T.topic '
-            'FROM evmtx_receipt_logs AS L '
-            'LEFT JOIN evmtx_receipt_log_topics AS T ON L.identifier=T.log '
-            'WHERE L.tx_id=? ORDER BY L.log_index, T.topic_index ASC',
-            (tx_id,),
-        ):
-            if log_id not in logs_data:
-                logs_data[log_id] = (log_index, data, address)
-                topics_by_log[log_id] = []
-            if topic is not None:
-                topics_by_log[log_id].append(topic)
-
-        for log_id, (log_index, data, address) in logs_data.items():
-            tx_receipt_log = EvmTxReceiptLog(
-                log_index=log_index,
-                data=data,
-                address=string_to_evm_address(address),
-            )
-            tx_receipt_log.topics = topics_by_log[log_id]
+    def _add_receipt_logs(self, tx_receipt: EvmTxReceipt, packed_logs: bytes) -> None:
+        """Add to the receipt its logs from the packed logs blob of the DB"""
+        for tx_receipt_log in unpack_receipt_logs(packed_logs):
             if (
                 len(tx_receipt_log.topics) == 0 and
                 tx_receipt_log.address not in (
@@ -564,12 +599,56 @@ class DBEvmTx(DBCommonTx[ChecksumEvmAddress, EvmTransaction, EVMTxHash, EvmTrans
                     WITHDRAWAL_REQUEST_CONTRACT,
                 )
             ):  # skip anonymous logs unless they are from specific addresses whose decoders properly handle it.  # noqa: E501
-                log.debug(f'Ignoring anonymous tx log in {tx_hash!s} at {chain_id}')
+                log.debug(f'Ignoring anonymous tx log in {tx_receipt.tx_hash!s} at {tx_receipt.chain_id}')  # noqa: E501
                 continue
 
             tx_receipt.logs.append(tx_receipt_log)
 
-        return tx_receipt
+    def get_transactions_decoding_data(
+            self,
+            cursor: DBCursor,
+            tx_hashes: Sequence[EVMTxHash],
+            chain_id: ChainID,
+    ) -> dict[EVMTxHash, tuple[EvmTransaction, EvmTxReceipt, bool]]:
+        """Get in bulk the transactions, their receipts and whether they are decoded.
+
+        Does the same as calling get_transactions and get_receipt per tx hash but in a few
+        queries per chunk of hashes. Transactions whose receipt is not in the DB are omitted.
+        """
+        decoding_data: dict[EVMTxHash, tuple[EvmTransaction, EvmTxReceipt, bool]] = {}
+        for chunk, placeholders in get_query_chunks(data=tx_hashes):
+            query, bindings = self._form_evm_transaction_dbquery(
+                query=(
+                    f'WHERE evm_transactions.tx_hash IN ({placeholders}) AND '
+                    'evm_transactions.chain_id=? AND '
+                    'evm_transactions.identifier IN (SELECT tx_id FROM evmtx_receipts)'
+                ),
+                bindings=[*chunk, chain_id.serialize_for_db()],
+            )
+            transactions = {
+                tx.db_id: tx for tx in self._deserialize_transactions(cursor.execute(query, bindings))  # noqa: E501
+            }
+            if len(transactions) == 0:
+                continue
+
+            for tx_ids, tx_ids_placeholders in get_query_chunks(data=list(transactions)):
+                for tx_id, contract_address, status, tx_type, packed_logs, decoded in cursor.execute(  # noqa: E501
+                    'SELECT R.tx_id, R.contract_address, R.status, R.type, R.logs, EXISTS('
+                    'SELECT 1 FROM evm_tx_mappings AS M WHERE M.tx_id=R.tx_id AND M.value=?) '
+                    f'FROM evmtx_receipts AS R WHERE R.tx_id IN ({tx_ids_placeholders})',
+                    (TX_DECODED, *tx_ids),
+                ):
+                    tx_receipt = EvmTxReceipt(
+                        tx_hash=transactions[tx_id].tx_hash,
+                        chain_id=chain_id,
+                        contract_address=contract_address,
+                        status=bool(status),  # works since value is either 0 or 1
+                        tx_type=tx_type,
+                    )
+                    self._add_receipt_logs(tx_receipt=tx_receipt, packed_logs=packed_logs)
+                    decoding_data[transactions[tx_id].tx_hash] = (transactions[tx_id], tx_receipt, bool(decoded))  # noqa: E501
+
+        return decoding_data
 
     def delete_transactions(
             self,
@@ -1,13 +1,16 @@
+import binascii
+import json
 import logging
 import re
 from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Any, Final, Literal, NamedTuple, Self, TypeVar
+from typing import TYPE_CHECKING, Any, Final, Literal, NamedTuple, Self, TypeVar, cast
 
 from eth_utils import is_hex_address
 
-from rotkehlchen.accounting.types import SchemaEventType
+from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
 from rotkehlchen.assets.ignored_assets_handling import IgnoredAssetsHandling
 from rotkehlchen.assets.types import AssetFlag, AssetType
@@ -53,6 +56,7 @@ if TYPE_CHECKING:
 
     from rotkehlchen.assets.asset import Asset
     from rotkehlchen.chain.evm.types import EvmAccount
+    from rotkehlchen.history.events.structures.base import HistoryEventForApi
     from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 
 
@@ -73,6 +77,9 @@ LEFT JOIN eth_staking_events_info ON history_events.identifier=eth_staking_event
 EVENTS_WITH_COUNTERPARTY_JOIN: Final = 'FROM history_events INNER JOIN chain_events_info ON history_events.identifier=chain_events_info.identifier '  # noqa: E501
 ETH_STAKING_EVENT_JOIN: Final = 'FROM history_events INNER JOIN eth_staking_events_info ON history_events.identifier=eth_staking_events_info.identifier '  # noqa: E501
 ETH_DEPOSIT_EVENT_JOIN = ALL_EVENTS_DATA_JOIN
+# Attributes of the history event objects for the columns of history event orderings
+# whose names differ. Used to build the keyset pagination cursor from the last event.
+HISTORY_EVENTS_KEYSET_ATTRIBUTES: Final = {'history_events_identifier': 'identifier'}
 
 
 T = TypeVar('T')
@@ -266,6 +273,70 @@ class DBAmountRangeFilter(DBFilter):
         return filters, bindings
 
 
+@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
+class DBKeysetFilter(DBFilter):
+    """Seek past the given values of the ordering columns.
+
+    Lets consecutive pages of an ordered query be read by continuing after the last
+    row of the previous page instead of having sqlite skip over it with OFFSET.
+    The columns are ascending unless ascending says otherwise per column.
+    """
+    columns: tuple[str, ...]
+    after: tuple[Any, ...] | None = None
+    ascending: tuple[bool, ...] | None = None
+
+    def prepare(self) -> tuple[list[str], list[Any]]:
+        if self.after is None:
+            return [], []
+
+        ascending = self.ascending if self.ascending is not None else (True,) * len(self.columns)
+        if len(set(ascending)) == 1:  # a single direction can be compared as a row value
+            return (
+                [f'({", ".join(self.columns)}) {">" if ascending[0] else "<"} ({", ".join("?" * len(self.columns))})'],  # noqa: E501
+                list(self.after),
+            )
+
+        # mixed directions need one term per column: equal on all the previous columns
+        # and past the value on this one. The bound on the first column is redundant
+        # but lets sqlite seek with an index on it.
+        terms, bindings = [], [self.after[0]]
+        for idx, (column, is_ascending) in enumerate(zip(self.columns, ascending, strict=True)):
+            terms.append(' AND '.join(
+                [f'{previous} = ?' for previous in self.columns[:idx]] +
+                [f'{column} {">" if is_ascending else "<"} ?'],
+            ))
+            bindings.extend(self.after[:idx + 1])
+
+        return (
+            [f'{self.columns[0]} {">=" if ascending[0] else "<="} ? AND ({" OR ".join(f"({term})" for term in terms)})'],  # noqa: E501
+            bindings,
+        )
+
+
+def serialize_keyset_cursor(values: Sequence[Any]) -> str:
+    """Turn the ordering key of the last row of a page into an opaque continuation token"""
+    return urlsafe_b64encode(json.dumps(list(values), separators=(',', ':')).encode()).decode()
+
+
+def deserialize_keyset_cursor(cursor: str, length: int) -> tuple[Any, ...]:
+    """Read back the ordering key from a continuation token of serialize_keyset_cursor.
+
+    May raise:
+    - DeserializationError if the token is malformed or has a different number of values
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error) as e:
+        raise DeserializationError(f'Invalid pagination cursor {cursor}') from e
+
+    if not isinstance(values, list) or len(values) != length or not all(
+        isinstance(value, (int, str)) for value in values
+    ):
+        raise DeserializationError(f'Invalid pagination cursor {cursor}')
+
+    return tuple(values)
+
+
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class DBEvmTransactionJoinsFilter(DBFilter):
     """This join finds transactions involving any of the address/chain combos.
@@ -365,22 +436,13 @@ class DBReportDataReportIDFilter(DBFilter):
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class DBReportDataEventTypeFilter(DBFilter):
-    event_type: str | SchemaEventType | None = None
+    event_type: AccountingEventType | None = None
 
     def prepare(self) -> tuple[list[str], list[Any]]:
         if self.event_type is None:
             return [], []
 
-        if isinstance(self.event_type, str):
-            try:
-                value = SchemaEventType.deserialize_from_db(self.event_type)
-            except DeserializationError as e:
-                log.error(f'Failed to filter a DB transaction query by event_type: {e!s}')
-                return [], []
-        else:
-            value = self.event_type
-
-        return ['event_type=?'], [str(value)]
+        return ['event_type=?'], [self.event_type.serialize()]
 
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
@@ -426,6 +488,7 @@ class DBFilterQuery(ABC):
     group_by: DBFilterGroupBy | None = None
     order_by: DBFilterOrder | None = None
     pagination: DBFilterPagination | None = None
+    keyset: DBKeysetFilter | None = None
 
     def prepare(
             self,
@@ -434,6 +497,7 @@ class DBFilterQuery(ABC):
             with_group_by: bool = False,
             without_ignored_asset_filter: bool = False,
             extra_conditions: list[tuple[str, list[Any]]] | None = None,
+            with_keyset: bool = False,
     ) -> tuple[str, list[Any]]:
         """Prepares a filter by converting the filters to a query string
 
@@ -449,6 +513,8 @@ class DBFilterQuery(ABC):
         - extra_conditions: Additional SQL conditions (with bindings) to inject into the
         WHERE clause. Each entry is a (sql_fragment, bindings) tuple. These are appended
         after the normal filters but before GROUP BY / ORDER BY / PAGINATION.
+        - with_keyset: Seek past the keyset of the last page, if any. Applied to the rows, or
+        to the groups with HAVING when grouping. Off by default since counts must ignore it.
         """
         query_parts = []
         bindings: list[Any] = []
@@ -476,6 +542,15 @@ class DBFilterQuery(ABC):
                 filterstrings.append(f'({condition_sql})')
                 bindings.extend(condition_bindings)
 
+        keyset_query: list[str] = []
+        keyset_bindings: list[Any] = []
+        if with_keyset and self.keyset is not None:
+            keyset_query, keyset_bindings = self.keyset.prepare()
+        is_grouped = with_group_by and self.group_by is not None
+        if len(keyset_query) != 0 and not is_grouped:
+            filterstrings.append(f'({keyset_query[0]})')
+            bindings.extend(keyset_bindings)
+
         if len(filterstrings) != 0:
             operator = ' AND ' if self.and_op else ' OR '
             filter_query = f'{"WHERE " if self.join_clause is None else "AND ("}{operator.join(filterstrings)}{"" if self.join_clause is None else ")"}'  # noqa: E501
@@ -484,6 +559,9 @@ class DBFilterQuery(ABC):
         if with_group_by and self.group_by is not None:
             groupby_query = self.group_by.prepare()
             query_parts.append(groupby_query)
+            if len(keyset_query) != 0:
+                query_parts.append(f'HAVING {keyset_query[0]}')
+                bindings.extend(keyset_bindings)
 
         if with_order and self.order_by is not None:
             orderby_query, orderby_bindings = self.order_by.prepare()
@@ -813,7 +891,7 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
         return report_id_filter.report_id
 
     @property
-    def event_type(self) -> str | SchemaEventType | None:
+    def event_type(self) -> AccountingEventType | None:
         event_type_filter = self.event_type_filter
         if event_type_filter is None:
             return None
@@ -827,9 +905,11 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             limit: int | None = None,
             offset: int | None = None,
             report_id: int | None = None,
-            event_type: str | None = None,
+            event_type: AccountingEventType | None = None,
             from_ts: Timestamp | None = None,
             to_ts: Timestamp | None = None,
+            asset: Asset | None = None,
+            location: Location | None = None,
     ) -> ReportDataFilterQuery:
         if order_by_rules is None:
             order_by_rules = [('timestamp', True)]
@@ -845,6 +925,10 @@ class ReportDataFilterQuery(DBFilterQuery, FilterWithTimestamp):
             filters.append(DBReportDataReportIDFilter(and_op=True, report_id=report_id))
         if event_type is not None:
             filters.append(DBReportDataEventTypeFilter(and_op=True, event_type=event_type))
+        if asset is not None:
+            filters.append(DBAssetFilter(and_op=True, asset=asset, asset_key='asset_identifier'))
+        if location is not None:
+            filters.append(DBLocationFilter(and_op=True, location=location))
 
         filter_query.timestamp_filter = DBTimestampFilter(
             and_op=True,
@@ -1103,6 +1187,45 @@ class HistoryBaseEntryFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWith
         filter_query.filters = filters
         return filter_query
 
+    def _keyset_ordering(self) -> tuple[tuple[str, ...], tuple[bool, ...]]:
+        """The columns and directions of the ordering that keyset pagination seeks on.
+
+        May raise:
+        - InvalidFilter if the ordering can't be used for keyset pagination
+        """
+        if self.order_by is None or not all(isinstance(rule, tuple) for rule in self.order_by.rules):  # noqa: E501
+            raise InvalidFilter('Keyset pagination needs an ordering by plain columns')
+
+        rules = cast('list[tuple[str, bool]]', self.order_by.rules)
+        return tuple(column for column, _ in rules), tuple(ascending for _, ascending in rules)
+
+    def seek_after(self, cursor: str) -> None:
+        """Continue after the last entry of the page that returned the given cursor.
+
+        May raise:
+        - InvalidFilter if the ordering can't be used for keyset pagination
+        - DeserializationError if the cursor is malformed
+        """
+        columns, ascending = self._keyset_ordering()
+        self.keyset = DBKeysetFilter(
+            and_op=True,
+            columns=columns,
+            after=deserialize_keyset_cursor(cursor=cursor, length=len(columns)),
+            ascending=ascending,
+        )
+
+    def page_cursor(self, last_entry: HistoryEventForApi) -> str:
+        """The cursor to pass to seek_after for reading the page after the given entry
+
+        May raise:
+        - InvalidFilter if the ordering can't be used for keyset pagination
+        """
+        columns, _ = self._keyset_ordering()
+        return serialize_keyset_cursor([
+            getattr(last_entry, HISTORY_EVENTS_KEYSET_ATTRIBUTES.get(column, column))
+            for column in columns
+        ])
+
     @staticmethod
     @abstractmethod
     def get_join_query() -> str:
@@ -1,9 +1,11 @@
+import copy
+import hashlib
 import json
 import logging
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Literal, cast, overload
+from typing import TYPE_CHECKING, Any, Final, Literal, cast, overload
 
 from sqlcipher3 import dbapi2 as sqlcipher
 
@@ -28,6 +30,7 @@ from rotkehlchen.db.constants import (
     ETH_STAKING_FIELD_LENGTH,
     HISTORY_BASE_ENTRY_FIELDS,
     HISTORY_BASE_ENTRY_LENGTH,
+    HISTORY_EVENTS_STORED_COLUMNS,
     HISTORY_MAPPING_KEY_STATE,
     SQL_VARIABLE_CHUNK_SIZE,
     TX_DECODED,
@@ -37,6 +40,9 @@ from rotkehlchen.db.constants import (
 from rotkehlchen.db.filtering import (
     ALL_EVENTS_DATA_JOIN,
     EVENTS_WITH_COUNTERPARTY_JOIN,
+    DBFilterOrder,
+    DBFilterPagination,
+    DBKeysetFilter,
     DBMultiIntegerFilter,
     EthDepositEventFilterQuery,
     EthWithdrawalFilterQuery,
@@ -47,19 +53,22 @@ from rotkehlchen.db.filtering import (
     HistoryEventWithTxRefFilterQuery,
     SolanaEventFilterQuery,
 )
-from rotkehlchen.db.utils import get_query_chunks
+from rotkehlchen.db.utils import deserialize_exact_sum, exact_sum_query, get_query_chunks
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.exchanges.constants import ALL_SUPPORTED_EXCHANGES
 from rotkehlchen.feature_flags import is_accounting_update_enabled
 from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.events.constants import CHAIN_ENTRY_TYPES, STAKING_ENTRY_TYPES
+from rotkehlchen.history.events.projection import ProjectedHistoryEvent
 from rotkehlchen.history.events.structures.asset_movement import AssetMovement
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntry,
     HistoryBaseEntryType,
     HistoryEvent,
+    HistoryEventForApi,
 )
 from rotkehlchen.history.events.structures.bitcoin_event import BitcoinEvent
 from rotkehlchen.history.events.structures.eth2 import (
@@ -76,7 +85,7 @@ from rotkehlchen.history.events.structures.swap import SwapEvent
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.history.price import query_price_or_use_default
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.serialization.deserialize import deserialize_fval
+from rotkehlchen.serialization.deserialize import deserialize_tx_signature
 from rotkehlchen.types import (
     BITCOIN_LOCATIONS,
     BLOCKCHAIN_LOCATIONS_TYPE,
@@ -90,10 +99,10 @@ from rotkehlchen.types import (
     Timestamp,
     TimestampMS,
 )
-from rotkehlchen.utils.misc import ts_ms_to_sec, ts_now_in_ms, ts_sec_to_ms
+from rotkehlchen.utils.misc import ts_now_in_ms, ts_sec_to_ms
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Callable, Iterator, Mapping, Sequence
 
     from rotkehlchen.chain.solana.rpc import Signature
     from rotkehlchen.db.dbhandler import DBHandler
@@ -103,6 +112,54 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 NOTES_ADDRESS_MARKER_RE = re.compile(r'\b(?:to|from)\b\s+(.+)$')
+# Columns of the unique ordering used when streaming history events in chunks
+HISTORY_EVENTS_KEYSET_COLUMNS: Final = ('timestamp', 'sequence_index', 'history_events_identifier')
+# How many events to read from the DB at a time when streaming them, so that memory use
+# doesn't grow with the size of the history
+HISTORY_EVENTS_STREAM_CHUNK_SIZE: Final = 1000
+# Selected columns of the columnar export and the names they are returned with. The names
+# follow the serialization of the events in the API. is_exit_or_blocknumber is split in
+# is_exit and block_number depending on the entry type.
+HISTORY_EVENTS_COLUMNAR_SELECT: Final = (
+    'SELECT history_events.identifier, entry_type, group_identifier, sequence_index, '
+    'timestamp, location, location_label, asset, amount, notes, type, subtype, extra_data, '
+    'tx_ref, counterparty, address, validator_index, is_exit_or_blocknumber '
+    f'{ALL_EVENTS_DATA_JOIN}'
+)
+HISTORY_EVENTS_COLUMNAR_COLUMNS: Final = (
+    'identifier', 'entry_type', 'group_identifier', 'sequence_index', 'timestamp', 'location',
+    'location_label', 'asset', 'amount', 'user_notes', 'event_type', 'event_subtype',
+    'extra_data', 'tx_ref', 'counterparty', 'address', 'validator_index', 'is_exit',
+    'block_number',
+)
+HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO: Final = 2 ** 64
+_ENTRY_TYPE_NAMES: Final = {entry_type.value: entry_type.serialize() for entry_type in HistoryBaseEntryType}  # noqa: E501
+_LOCATION_NAMES: Final = {location.serialize_for_db(): str(location) for location in Location}
+# How the tx_ref of each onchain entry type is turned to its string form. Same as the
+# _deserialize_tx_ref of their classes followed by str()
+_TX_REF_TO_STRING: Final[dict[int, Callable[[bytes], str]]] = {
+    HistoryBaseEntryType.EVM_EVENT.value: lambda tx_ref: f'0x{tx_ref.hex()}',
+    HistoryBaseEntryType.EVM_SWAP_EVENT.value: lambda tx_ref: f'0x{tx_ref.hex()}',
+    HistoryBaseEntryType.ETH_DEPOSIT_EVENT.value: lambda tx_ref: f'0x{tx_ref.hex()}',
+    HistoryBaseEntryType.SOLANA_EVENT.value: lambda tx_ref: str(deserialize_tx_signature(tx_ref)),  # noqa: E501
+    HistoryBaseEntryType.SOLANA_SWAP_EVENT.value: lambda tx_ref: str(deserialize_tx_signature(tx_ref)),  # noqa: E501
+    HistoryBaseEntryType.BITCOIN_EVENT.value: bytes.hex,
+}
+
+
+def _columnar_row_checksum(row: tuple) -> int:
+    """Checksum of a row of HISTORY_EVENTS_COLUMNAR_SELECT. The checksums of a set of rows
+    are summed modulo HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO so that batches can be combined
+    independently of their order."""
+    return int.from_bytes(hashlib.blake2b(repr(row).encode(), digest_size=8).digest())
+
+
+def _tx_ref_to_string(entry_type: int, tx_ref: bytes) -> str | None:
+    try:
+        return _TX_REF_TO_STRING[entry_type](tx_ref)
+    except (KeyError, DeserializationError) as e:
+        log.error(f'Failed to read the tx_ref {tx_ref!r} of a history event of type {entry_type} due to {e!s}')  # noqa: E501
+        return None
 
 
 def get_bitcoin_counterparty_addresses(
@@ -172,20 +229,31 @@ def _build_matched_movement_exclusion(
     )
 
 
-type HistoryEventsReturnType = list[HistoryBaseEntry] | list[tuple[int, HistoryBaseEntry]]
+# The events are HistoryEventForApi only for the history events listing. See project_for_api
+type HistoryEventsReturnType[EventT: HistoryEventForApi = HistoryBaseEntry] = list[EventT] | list[tuple[int, EventT]]  # noqa: E501
 
 
 @dataclass(frozen=True)
-class HistoryEventsResult:
-    events: HistoryEventsReturnType
+class HistoryEventsResult[EventT: HistoryEventForApi = HistoryBaseEntry]:
+    events: HistoryEventsReturnType[EventT]
     ignored_group_identifiers: set[str]
     entries_with_limit_count: int | None = None
 
 
 @dataclass(frozen=True)
-class HistoryEventsWithCountResult(HistoryEventsResult):
+class HistoryEventsWithCountResult[EventT: HistoryEventForApi = HistoryBaseEntry](HistoryEventsResult[EventT]):  # noqa: E501
     entries_found: int = 0
     entries_with_limit: int = 0
+    # continuation token of the next page for keyset pagination. None if this is the last one
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class HistoryEventsColumnarBatch:
+    columns: dict[str, list[Any]]  # HISTORY_EVENTS_COLUMNAR_COLUMNS -> values of the rows
+    last_identifier: int | None  # identifier of the last row. None if the batch is empty
+    has_more: bool
+    checksum: int  # order independent checksum of the rows. See _columnar_row_checksum
 
 
 class DBHistoryEvents:
@@ -485,6 +553,106 @@ class DBHistoryEvents:
 
         return inserted_count
 
+    def add_history_events_bulk(
+            self,
+            write_cursor: DBCursor,
+            history: Sequence[HistoryBaseEntry],
+            mapping_values: dict[str, HistoryMappingState] | None = None,
+    ) -> list[HistoryBaseEntry]:
+        """Insert a batch of history events with set based queries. Returns the events
+        that were skipped as duplicates of an existing or an earlier event of the batch.
+
+        The (group_identifier, sequence_index) keys of the whole batch are checked against
+        the DB with a single join on a temporary table and then the rows of every table
+        are written with one executemany. Meant for big imports such as CSV files.
+
+        Check add_history_event() to see possible Exceptions
+        """
+        if len(history) == 0:
+            return []
+
+        write_cursor.execute(
+            'CREATE TEMP TABLE IF NOT EXISTS _history_events_bulk_keys('
+            'group_identifier TEXT NOT NULL, sequence_index INTEGER NOT NULL)',
+        )
+        write_cursor.execute('DELETE FROM _history_events_bulk_keys')
+        write_cursor.executemany(
+            'INSERT INTO _history_events_bulk_keys(group_identifier, sequence_index) '
+            'VALUES(?, ?)',
+            {(event.group_identifier, event.sequence_index) for event in history},
+        )
+        seen_keys = set(write_cursor.execute(
+            'SELECT K.group_identifier, K.sequence_index FROM _history_events_bulk_keys K '
+            'INNER JOIN history_events H ON H.group_identifier=K.group_identifier '
+            'AND H.sequence_index=K.sequence_index',
+        ))
+        new_events, duplicates = [], []
+        for event in history:
+            if (key := (event.group_identifier, event.sequence_index)) in seen_keys:
+                duplicates.append(event)
+            else:
+                seen_keys.add(key)
+                new_events.append(event)
+
+        if len(new_events) == 0:
+            write_cursor.execute('DROP TABLE IF EXISTS _history_events_bulk_keys')
+            return duplicates
+
+        serialized_events = [event.serialize_for_db() for event in new_events]
+        base_inserts: defaultdict[str, list[tuple]] = defaultdict(list)
+        for serialized in serialized_events:
+            base_inserts[serialized[0][0]].append(serialized[0][2])
+        for insert_query, bindings in base_inserts.items():
+            write_cursor.executemany(f'INSERT INTO {insert_query}', bindings)
+
+        # the keys of the new events are in the temporary table, so get all the new
+        # identifiers with the same join instead of a lastrowid per event
+        identifiers = {
+            (entry[0], entry[1]): entry[2] for entry in write_cursor.execute(
+                'SELECT H.group_identifier, H.sequence_index, H.identifier FROM '
+                '_history_events_bulk_keys K INNER JOIN history_events H ON '
+                'H.group_identifier=K.group_identifier AND H.sequence_index=K.sequence_index',
+            )
+        }
+        write_cursor.execute('DROP TABLE IF EXISTS _history_events_bulk_keys')
+
+        extra_inserts: defaultdict[str, list[tuple]] = defaultdict(list)
+        ignored_ids, mappings = [], []
+        ignored_assets = self.db.get_ignored_asset_ids(cursor=write_cursor)
+        for event, serialized in zip(new_events, serialized_events, strict=True):
+            identifier = identifiers[event.group_identifier, event.sequence_index]
+            for insert_query, _, bindings in serialized[1:]:
+                extra_inserts[insert_query].append((identifier, *bindings))
+            if event.asset.identifier in ignored_assets:
+                ignored_ids.append((identifier,))
+            if mapping_values is not None:
+                mappings.extend(
+                    (identifier, k, v.serialize_for_db()) for k, v in mapping_values.items()
+                )
+            self._store_bitcoin_event_counterparty_addresses(
+                write_cursor=write_cursor,
+                identifier=identifier,
+                location=event.location,
+                event_type=event.event_type,
+                notes=event.notes,
+                decoded_addresses=event.counterparty_addresses if isinstance(event, BitcoinEvent) else None,  # noqa: E501
+                clear_existing=False,
+            )
+
+        for insert_query, bindings in extra_inserts.items():
+            write_cursor.executemany(f'INSERT OR IGNORE INTO {insert_query}', bindings)
+        write_cursor.executemany('UPDATE history_events SET ignored=1 WHERE identifier=?', ignored_ids)  # noqa: E501
+        write_cursor.executemany(
+            'INSERT OR IGNORE INTO history_events_mappings(parent_identifier, name, value) '
+            'VALUES(?, ?, ?)',
+            mappings,
+        )
+        self._mark_events_modified(
+            write_cursor=write_cursor,
+            timestamp=min(event.timestamp for event in new_events),
+        )
+        return duplicates
+
     @staticmethod
     def save_history_event_backup(
             write_cursor: DBCursor,
@@ -495,8 +663,8 @@ class DBHistoryEvents:
         multiple edits happen.
         """
         if write_cursor.execute(
-            'INSERT OR IGNORE INTO history_events_backup '
-            'SELECT * FROM history_events WHERE identifier=?',
+            f'INSERT OR IGNORE INTO history_events_backup({HISTORY_EVENTS_STORED_COLUMNS}) '
+            f'SELECT {HISTORY_EVENTS_STORED_COLUMNS} FROM history_events WHERE identifier=?',
             (identifier,),
         ).rowcount == 0:
             return  # A backup already exists for this event
@@ -516,10 +684,13 @@ class DBHistoryEvents:
         Events without a backup are silently skipped.
         """
         for chunk, placeholders in get_query_chunks(identifiers):
-            for table in ('history_events', 'chain_events_info'):
+            for table, columns in (
+                    ('history_events', HISTORY_EVENTS_STORED_COLUMNS),
+                    ('chain_events_info', 'identifier, tx_ref, counterparty, address'),
+            ):
                 write_cursor.execute(
-                    f'INSERT OR REPLACE INTO {table} '
-                    f'SELECT * FROM {table}_backup WHERE identifier IN ({placeholders})',
+                    f'INSERT OR REPLACE INTO {table}({columns}) '
+                    f'SELECT {columns} FROM {table}_backup WHERE identifier IN ({placeholders})',
                     chunk,
                 )
             # Delete backup entries (also deletes backup chain info via foreign key)
@@ -1231,12 +1402,14 @@ class DBHistoryEvents:
                 with_order=match_exact_events is True and include_order is True,  # skip order when we want the whole group of events since we order in an outer part of the query later  # noqa: E501
                 without_ignored_asset_filter=True,
                 extra_conditions=[(exclusion_sql, exclusion_bindings)],
+                with_keyset=True,
             )
             prefix = 'SELECT COUNT(*), *'
         else:
             filters, query_bindings = filter_query.prepare(
                 with_order=match_exact_events is True and include_order is True,  # same as above
                 with_pagination=False,
+                with_keyset=True,
             )
             prefix = (
                 'SELECT COUNT(*) OVER(), *'
@@ -1573,6 +1746,35 @@ class DBHistoryEvents:
         )
         return result.events
 
+    @overload
+    def _get_history_events_with_ignored_groups(
+            self,
+            cursor: DBCursor,
+            filter_query: HistoryBaseEntryFilterQuery,
+            entries_limit: int | None,
+            aggregate_by_group_ids: bool = ...,
+            match_exact_events: bool = ...,
+            include_entries_with_limit_count: bool = ...,
+            include_ignored_group_identifiers: bool = ...,
+            project_for_api: Literal[False] = ...,
+    ) -> HistoryEventsResult:
+        ...
+
+    @overload
+    def _get_history_events_with_ignored_groups(
+            self,
+            cursor: DBCursor,
+            filter_query: HistoryBaseEntryFilterQuery,
+            entries_limit: int | None,
+            aggregate_by_group_ids: bool = ...,
+            match_exact_events: bool = ...,
+            include_entries_with_limit_count: bool = ...,
+            include_ignored_group_identifiers: bool = ...,
+            *,
+            project_for_api: bool,
+    ) -> HistoryEventsResult | HistoryEventsResult[HistoryEventForApi]:
+        ...
+
     def _get_history_events_with_ignored_groups(
             self,
             cursor: DBCursor,
@@ -1582,7 +1784,11 @@ class DBHistoryEvents:
             match_exact_events: bool = True,
             include_entries_with_limit_count: bool = False,
             include_ignored_group_identifiers: bool = True,
-    ) -> HistoryEventsResult:
+            project_for_api: bool = False,
+    ) -> HistoryEventsResult | HistoryEventsResult[HistoryEventForApi]:
+        """With project_for_api the rows of the PROJECTED_EVENT_CLASSES entry types are
+        returned as ProjectedHistoryEvent, to be serialized for the api without building
+        the events. Only for the history events listing."""
         base_query, filters_bindings = self._create_history_events_query(
             filter_query=filter_query,
             aggregate_by_group_ids=aggregate_by_group_ids,
@@ -1599,8 +1805,8 @@ class DBHistoryEvents:
 
         ethereum_tracked_accounts: set[ChecksumEvmAddress] | None = None
         cursor.execute(base_query, filters_bindings)
-        output_grouped: list[tuple[int, HistoryBaseEntry]] = []
-        output_flat: list[HistoryBaseEntry] = []
+        output_grouped: list[tuple[int, HistoryEventForApi]] = []
+        output_flat: list[HistoryEventForApi] = []
         has_entries_count_column = (
             include_entries_with_limit_count and aggregate_by_group_ids is False
         )
@@ -1622,14 +1828,17 @@ class DBHistoryEvents:
                 entries_with_limit_count = int(entry[0])
             entry_type = HistoryBaseEntryType(entry[type_idx])
             try:
-                deserialized_event: HistoryBaseEntry
+                deserialized_event: HistoryEventForApi
                 # Deserialize event depending on its type
                 if entry_type == HistoryBaseEntryType.EVM_EVENT:
                     data = (
                         entry[data_start_idx:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + CHAIN_FIELD_LENGTH + 1]    # noqa: E501
                     )
-                    deserialized_event = EvmEvent.deserialize_from_db(data)
+                    deserialized_event = (
+                        ProjectedHistoryEvent(entry_type, data)
+                        if project_for_api else EvmEvent.deserialize_from_db(data)
+                    )
                 elif entry_type in (
                         HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
                         HistoryBaseEntryType.ETH_BLOCK_EVENT,
@@ -1675,6 +1884,11 @@ class DBHistoryEvents:
                         entry[data_start_idx:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + CHAIN_FIELD_LENGTH + 1],  # noqa: E501
                     )
+                elif project_for_api and entry_type == HistoryBaseEntryType.HISTORY_EVENT:
+                    deserialized_event = ProjectedHistoryEvent(
+                        entry_type,
+                        entry[data_start_idx:data_end_idx],
+                    )
                 else:
                     data = entry[data_start_idx:data_end_idx]
                     deserialized_event = (
@@ -1914,17 +2128,267 @@ class DBHistoryEvents:
             match_exact_events=match_exact_events,
         )
 
-    @overload
-    def get_history_events_and_limit_info(
+    def iterate_history_events_internal(
+            self,
+            filter_query: HistoryEventFilterQuery,
+            chunk_size: int = HISTORY_EVENTS_STREAM_CHUNK_SIZE,
+    ) -> Iterator[list[HistoryBaseEntry]]:
+        """Stream all the events matching the filter in chunks of at most chunk_size events,
+        ordered by timestamp, sequence index and identifier.
+
+        Each chunk is read with its own cursor and continues after the ordering key of the
+        last event of the previous chunk. So only a single chunk is held in memory and the DB
+        can be written to in between chunks. Order and pagination of the filter are ignored.
+        """
+        keyset_filter = DBKeysetFilter(and_op=True, columns=HISTORY_EVENTS_KEYSET_COLUMNS)
+        chunk_query = copy.copy(filter_query)
+        chunk_query.filters = [*filter_query.filters, keyset_filter]
+        chunk_query.order_by = DBFilterOrder(
+            rules=[(column, True) for column in HISTORY_EVENTS_KEYSET_COLUMNS],
+            case_sensitive=True,
+        )
+        chunk_query.pagination = DBFilterPagination(limit=chunk_size, offset=0)
+        while True:
+            with self.db.conn.read_ctx() as cursor:
+                events = self.get_history_events_internal(
+                    cursor=cursor,
+                    filter_query=chunk_query,
+                )
+
+            # a chunk can be short due to events failing to deserialize, so only
+            # stop once there is nothing left after the last key
+            if len(events) == 0:
+                return
+
+            yield events
+            last_event = events[-1]
+            keyset_filter.after = (
+                last_event.timestamp,
+                last_event.sequence_index,
+                last_event.identifier,
+            )
+
+    def _columnar_checkpoints(self, filters_key: tuple, total_changes: int) -> dict[int, tuple[int, int]]:  # noqa: E501
+        """The cached count and checksum of the columnar export rows up to each checkpoint
+        identifier. Empty if the DB was written since they were computed."""
+        cached_changes, checkpoints = self.db.history_events_checksums_cache
+        if (
+            cached_changes != total_changes or
+            self.db.conn.write_task_ident is not None or
+            self.db.conn.savepoint_task_ident is not None
+        ):
+            return {}
+
+        return checkpoints.get(filters_key, {})
+
+    def _save_columnar_checkpoint(
+            self,
+            filters_key: tuple,
+            total_changes: int,
+            identifier: int,
+            count: int,
+            checksum: int,
+    ) -> None:
+        """Remember the count and checksum of the columnar export rows up to identifier.
+        total_changes must be read before querying them, so that a write racing the query
+        can only invalidate the checkpoint. Same as get_entries_count of DBHandler."""
+        if (
+            self.db.conn.total_changes != total_changes or
+            self.db.conn.write_task_ident is not None or
+            self.db.conn.savepoint_task_ident is not None
+        ):
+            return
+
+        if self.db.history_events_checksums_cache[0] != total_changes:
+            self.db.history_events_checksums_cache = (total_changes, {})
+        self.db.history_events_checksums_cache[1].setdefault(filters_key, {})[identifier] = (count, checksum)  # noqa: E501
+
+    @staticmethod
+    def _prepare_columnar_filters(
+            from_ts: Timestamp | None,
+            to_ts: Timestamp | None,
+            exclude_ignored_assets: bool,
+            entries_limit: int | None,
+            after_identifier: int | None,
+            up_to_identifier: int | None,
+    ) -> tuple[str, list[Any]]:
+        """The WHERE clause and bindings of the columnar export of the history events"""
+        conditions, bindings = [], []
+        if from_ts is not None:
+            conditions.append('timestamp >= ?')
+            bindings.append(ts_sec_to_ms(from_ts))
+        if to_ts is not None:
+            conditions.append('timestamp <= ?')
+            bindings.append(ts_sec_to_ms(to_ts))
+        if exclude_ignored_assets:
+            conditions.append('ignored = 0')
+        if after_identifier is not None:
+            conditions.append('history_events.identifier > ?')
+            bindings.append(after_identifier)
+        if up_to_identifier is not None:
+            conditions.append('history_events.identifier <= ?')
+            bindings.append(up_to_identifier)
+        if entries_limit is not None:  # same restriction as the one of the events listing
+            conditions.append(
+                'group_identifier IN (SELECT DISTINCT group_identifier FROM history_events '
+                'ORDER BY timestamp DESC, sequence_index ASC LIMIT ?)',
+            )
+            bindings.append(entries_limit)
+
+        return ('WHERE ' + ' AND '.join(conditions) if len(conditions) != 0 else ''), bindings
+
+    def get_history_events_columns(
             self,
             cursor: DBCursor,
-            filter_query: HistoryBaseEntryFilterQuery,
+            from_ts: Timestamp | None,
+            to_ts: Timestamp | None,
+            exclude_ignored_assets: bool,
             entries_limit: int | None,
-            aggregate_by_group_ids: Literal[True],
-            match_exact_events: bool,
-            need_entries_found: bool = ...,
-    ) -> HistoryEventsWithCountResult:
-        ...
+            limit: int,
+            after_identifier: int | None = None,
+    ) -> HistoryEventsColumnarBatch:
+        """Read a batch of at most limit events, ordered by identifier and after the given
+        one, as columns of plain values named as in the API serialization of the events.
+
+        The values are converted straight from the DB rows without creating the event
+        objects, which is what makes it fit for exporting whole histories in bulk.
+        """
+        filters_key = (from_ts, to_ts, exclude_ignored_assets, entries_limit)
+        total_changes = self.db.conn.total_changes  # snapshot before the query. See below
+        filters, bindings = self._prepare_columnar_filters(
+            from_ts=from_ts,
+            to_ts=to_ts,
+            exclude_ignored_assets=exclude_ignored_assets,
+            entries_limit=entries_limit,
+            after_identifier=after_identifier,
+            up_to_identifier=None,
+        )
+        rows = cursor.execute(
+            f'{HISTORY_EVENTS_COLUMNAR_SELECT} {filters} '
+            'ORDER BY history_events.identifier ASC LIMIT ?',
+            [*bindings, limit + 1],  # one more to know if there are more rows
+        ).fetchall()
+        if (has_more := len(rows) > limit):
+            rows = rows[:limit]
+        if len(rows) == 0:
+            return HistoryEventsColumnarBatch(
+                columns={name: [] for name in HISTORY_EVENTS_COLUMNAR_COLUMNS},
+                last_identifier=None,
+                has_more=False,
+                checksum=0,
+            )
+
+        checksum = sum(_columnar_row_checksum(row) for row in rows) % HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO  # noqa: E501
+        # continue the running checksum of the rows before the batch, if known, so that a
+        # later check of the rows up to the end of this batch does not hash them again
+        previous = (0, 0) if after_identifier is None else self._columnar_checkpoints(
+            filters_key=filters_key,
+            total_changes=total_changes,
+        ).get(after_identifier)
+        if previous is not None:
+            self._save_columnar_checkpoint(
+                filters_key=filters_key,
+                total_changes=total_changes,
+                identifier=rows[-1][0],
+                count=previous[0] + len(rows),
+                checksum=(previous[1] + checksum) % HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO,
+            )
+
+        (
+            identifiers, entry_types, group_identifiers, sequence_indices, timestamps,
+            locations, location_labels, assets, amounts, notes, event_types, event_subtypes,
+            extra_data, tx_refs, counterparties, addresses, validator_indices,
+            exits_or_blocknumbers,
+        ) = (list(column) for column in zip(*rows, strict=True))
+        withdrawal_type = HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT.value
+        block_type = HistoryBaseEntryType.ETH_BLOCK_EVENT.value
+        return HistoryEventsColumnarBatch(
+            columns={
+                'identifier': identifiers,
+                'entry_type': [_ENTRY_TYPE_NAMES[x] for x in entry_types],
+                'group_identifier': group_identifiers,
+                'sequence_index': sequence_indices,
+                'timestamp': timestamps,
+                'location': [_LOCATION_NAMES[x] for x in locations],
+                'location_label': location_labels,
+                'asset': assets,
+                'amount': amounts,
+                'user_notes': notes,
+                'event_type': event_types,
+                'event_subtype': event_subtypes,
+                'extra_data': [
+                    HistoryBaseEntry.deserialize_extra_data(entry=(identifier,), extra_data=data)
+                    for identifier, data in zip(identifiers, extra_data, strict=True)
+                ],
+                'tx_ref': [
+                    None if tx_ref is None else _tx_ref_to_string(entry_type, tx_ref)
+                    for entry_type, tx_ref in zip(entry_types, tx_refs, strict=True)
+                ],
+                'counterparty': counterparties,
+                'address': addresses,
+                'validator_index': validator_indices,
+                'is_exit': [
+                    bool(value) if entry_type == withdrawal_type else None
+                    for entry_type, value in zip(entry_types, exits_or_blocknumbers, strict=True)
+                ],
+                'block_number': [
+                    value if entry_type == block_type else None
+                    for entry_type, value in zip(entry_types, exits_or_blocknumbers, strict=True)
+                ],
+            },
+            last_identifier=identifiers[-1],
+            has_more=has_more,
+            checksum=checksum,
+        )
+
+    def get_history_events_columns_checksum(
+            self,
+            cursor: DBCursor,
+            from_ts: Timestamp | None,
+            to_ts: Timestamp | None,
+            exclude_ignored_assets: bool,
+            entries_limit: int | None,
+            up_to_identifier: int,
+    ) -> tuple[int, int]:
+        """Count and combined checksum of the columnar export rows up to an identifier.
+
+        Lets a consumer that already holds those rows check that none of them was added,
+        edited or removed since, and if so only fetch the ones after the identifier.
+
+        The running checksums of the batches served since the last DB write are kept, so
+        only the rows after the closest of them are hashed. Any DB write drops them.
+        """
+        filters_key = (from_ts, to_ts, exclude_ignored_assets, entries_limit)
+        total_changes = self.db.conn.total_changes  # snapshot before the query
+        checkpoints = self._columnar_checkpoints(filters_key=filters_key, total_changes=total_changes)  # noqa: E501
+        start_identifier = max(
+            (identifier for identifier in checkpoints if identifier <= up_to_identifier),
+            default=None,
+        )
+        count, checksum = (0, 0) if start_identifier is None else checkpoints[start_identifier]
+        if start_identifier != up_to_identifier:
+            filters, bindings = self._prepare_columnar_filters(
+                from_ts=from_ts,
+                to_ts=to_ts,
+                exclude_ignored_assets=exclude_ignored_assets,
+                entries_limit=entries_limit,
+                after_identifier=start_identifier,
+                up_to_identifier=up_to_identifier,
+            )
+            for row in cursor.execute(f'{HISTORY_EVENTS_COLUMNAR_SELECT} {filters}', bindings):
+                count += 1
+                checksum += _columnar_row_checksum(row)
+
+            checksum %= HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO
+            self._save_columnar_checkpoint(
+                filters_key=filters_key,
+                total_changes=total_changes,
+                identifier=up_to_identifier,
+                count=count,
+                checksum=checksum,
+            )
+
+        return count, checksum
 
     @overload
     def get_history_events_and_limit_info(
@@ -1932,9 +2396,11 @@ class DBHistoryEvents:
             cursor: DBCursor,
             filter_query: HistoryBaseEntryFilterQuery,
             entries_limit: int | None,
-            aggregate_by_group_ids: Literal[False] = ...,
+            aggregate_by_group_ids: bool = ...,
             match_exact_events: bool = ...,
             need_entries_found: bool = ...,
+            exact_count: bool = ...,
+            project_for_api: Literal[False] = ...,
     ) -> HistoryEventsWithCountResult:
         ...
 
@@ -1944,14 +2410,14 @@ class DBHistoryEvents:
             cursor: DBCursor,
             filter_query: HistoryBaseEntryFilterQuery,
             entries_limit: int | None,
-            aggregate_by_group_ids: bool = False,
+            aggregate_by_group_ids: bool = ...,
             match_exact_events: bool = ...,
             need_entries_found: bool = ...,
-    ) -> HistoryEventsWithCountResult:
-        """
-        This fallback is needed due to
-        https://github.com/python/mypy/issues/6113#issuecomment-869828434
-        """
+            exact_count: bool = ...,
+            *,
+            project_for_api: bool,
+    ) -> HistoryEventsWithCountResult | HistoryEventsWithCountResult[HistoryEventForApi]:
+        ...
 
     def get_history_events_and_limit_info(
             self,
@@ -1961,34 +2427,62 @@ class DBHistoryEvents:
             aggregate_by_group_ids: bool = False,
             match_exact_events: bool = False,
             need_entries_found: bool = True,
-    ) -> HistoryEventsWithCountResult:
+            exact_count: bool = True,
+            project_for_api: bool = False,
+    ) -> HistoryEventsWithCountResult | HistoryEventsWithCountResult[HistoryEventForApi]:
         """Gets all history events for all types, based on the filter query.
 
         Also returns how many are the total found for the filter and the total found applying
         the limit if provided. Otherwise count_with_limit and count_without_limit are equal.
+        With exact_count False both counts are skipped and returned as zero. Then only
+        next_cursor tells if more pages follow.
+
+        A paginated query reads one entry more than the page to know if more pages follow.
+        If they do, next_cursor continues after the last entry via filter_query.seek_after.
+
+        project_for_api is passed to _get_history_events_with_ignored_groups.
         """
+        page_query, page_limit = filter_query, None
+        if filter_query.pagination is not None and filter_query.pagination.limit:
+            page_limit = filter_query.pagination.limit
+            page_query = copy.copy(filter_query)
+            page_query.pagination = filter_query.pagination._replace(limit=page_limit + 1)
+
         events_result = self._get_history_events_with_ignored_groups(
             cursor=cursor,
-            filter_query=filter_query,
+            filter_query=page_query,
             entries_limit=entries_limit,
             aggregate_by_group_ids=aggregate_by_group_ids,
             match_exact_events=match_exact_events,
             include_entries_with_limit_count=False,  # use separate lightweight count query
+            project_for_api=project_for_api,
         )
-        # Always use a separate lightweight count query (no COUNT(*) OVER() window in data
-        # query) so that SQLite can apply LIMIT early-termination in the data query.
-        count_without_limit, count_with_limit = self.get_history_events_count(
-            cursor=cursor,
-            query_filter=filter_query,
-            entries_limit=entries_limit,
-            aggregate_by_group_ids=aggregate_by_group_ids,
-            need_count_without_limit=need_entries_found,
-        )
+        events, next_cursor = events_result.events, None
+        if page_limit is not None and len(events) > page_limit:
+            events = events[:page_limit]
+            last_event = (
+                cast('tuple[int, HistoryEventForApi]', events[-1])[1]
+                if aggregate_by_group_ids else cast('HistoryEventForApi', events[-1])
+            )
+            next_cursor = filter_query.page_cursor(last_entry=last_event)
+
+        count_without_limit = count_with_limit = 0
+        if exact_count:
+            # Always use a separate lightweight count query (no COUNT(*) OVER() window in data
+            # query) so that SQLite can apply LIMIT early-termination in the data query.
+            count_without_limit, count_with_limit = self.get_history_events_count(
+                cursor=cursor,
+                query_filter=filter_query,
+                entries_limit=entries_limit,
+                aggregate_by_group_ids=aggregate_by_group_ids,
+                need_count_without_limit=need_entries_found,
+            )
         return HistoryEventsWithCountResult(
-            events=events_result.events,
+            events=events,
             entries_found=count_without_limit,
             entries_with_limit=count_with_limit,
             ignored_group_identifiers=events_result.ignored_group_identifiers,
+            next_cursor=next_cursor,
         )
 
     def get_entries_assets_history_events(
@@ -2112,25 +2606,14 @@ class DBHistoryEvents:
             query_filters: str,
             bindings: list[Any],
     ) -> list[tuple[str, FVal]]:
-        """Returns the sum of the amounts received by asset"""
-        query = (
-            'SELECT asset, SUM(CAST(amount AS REAL))'
-            f'FROM history_events {query_filters} GROUP BY asset;'
+        """Returns the exact sum of the amounts received by asset"""
+        cursor.execute(
+            f'SELECT asset, {exact_sum_query("amount")} '
+            f'FROM history_events {query_filters} GROUP BY asset;',
+            bindings,
         )
-        cursor.execute(query, bindings)
-        assets_amounts = []
-        for row in cursor:
-            try:
-                asset = row[0]  # existence is guaranteed due the foreign key relation
-                amount = deserialize_fval(
-                    value=row[1],
-                    name='total amount in history events stats',
-                    location='get_amount_stats',
-                )
-                assets_amounts.append((asset, amount))
-            except DeserializationError as e:
-                log.debug(f'Failed to deserialize amount {row[1]}. {e!s}')
-        return assets_amounts
+        # existence of the asset is guaranteed due the foreign key relation
+        return [(row[0], deserialize_exact_sum(row[1:])) for row in cursor]
 
     def get_amount_and_value_stats(
             self,
@@ -2141,9 +2624,14 @@ class DBHistoryEvents:
     ) -> tuple[list[tuple[str, FVal, FVal]], FVal]:
         """Returns the sum of the amounts received by asset and the sum of value in main currency
         at the time of the events and the total value of all the assets queried in main currency.
+
+        The amounts are summed exactly in SQL per asset and second, since all the events
+        of such a group use the same price. So only one price is queried per group.
+        The sums use the generated integer amount columns, see exact_sum_query.
         """
-        total_events = cursor.execute(
-            f'SELECT COUNT(*) FROM history_events {query_filters}',
+        query = f'FROM history_events {query_filters} GROUP BY asset, timestamp / 1000'
+        total_groups = cursor.execute(
+            f'SELECT COUNT(*) FROM (SELECT 1 {query})',
             bindings,
         ).fetchone()[0]
 
@@ -2151,48 +2639,42 @@ class DBHistoryEvents:
         assets_value: dict[str, FVal] = defaultdict(FVal)
         total_value: FVal = ZERO
         query_location: str = 'get_amount_stats'
-        log.debug(f'Will process {counterparty} stats for {total_events} events')
-        send_ws_every_events = self.db.msg_aggregator.how_many_events_per_ws(total_events)
-        for idx, row in enumerate(cursor.execute(
-            f'SELECT asset, amount, timestamp FROM history_events {query_filters};',
-            bindings,
-        )):
-            if idx % send_ws_every_events == 0:
-                self.db.msg_aggregator.add_message(
-                    message_type=WSMessageType.PROGRESS_UPDATES,
-                    data={
-                        'total': total_events,
-                        'processed': idx,
-                        'subtype': str(ProgressUpdateSubType.STATS_PRICE_QUERY),
-                        'counterparty': counterparty,
-                    },
-                )
+        log.debug(f'Will process {counterparty} stats for {total_groups} groups of events')
+        send_ws_every_events = self.db.msg_aggregator.how_many_events_per_ws(total_groups)
+        with GlobalDBHandler().price_series.scope():
+            for idx, row in enumerate(cursor.execute(
+                f'SELECT asset, timestamp / 1000, {exact_sum_query("amount")} {query};',
+                bindings,
+            )):
+                if idx % send_ws_every_events == 0:
+                    self.db.msg_aggregator.add_message(
+                        message_type=WSMessageType.PROGRESS_UPDATES,
+                        data={
+                            'total': total_groups,
+                            'processed': idx,
+                            'subtype': str(ProgressUpdateSubType.STATS_PRICE_QUERY),
+                            'counterparty': counterparty,
+                        },
+                    )
 
-            try:
                 asset = row[0]  # existence is guaranteed due the foreign key relation
-                amount = deserialize_fval(
-                    value=row[1],
-                    name='total amount in history events stats',
-                    location=query_location,
-                )
+                amount = deserialize_exact_sum(row[2:])
                 price = query_price_or_use_default(
                     asset=Asset(asset),
-                    time=ts_ms_to_sec(row[2]),
+                    time=Timestamp(row[1]),
                     default_value=ZERO,
                     location=query_location,
                 )
                 assets_amounts[asset] += amount
                 assets_value[asset] += (value := amount * price)
                 total_value += value
-            except DeserializationError as e:
-                log.debug(f'Failed to deserialize amount {row[1]}. {e!s}')
 
         # send final message
         self.db.msg_aggregator.add_message(
             message_type=WSMessageType.PROGRESS_UPDATES,
             data={
-                'total': total_events,
-                'processed': total_events,
+                'total': total_groups,
+                'processed': total_groups,
                 'subtype': str(ProgressUpdateSubType.STATS_PRICE_QUERY),
                 'counterparty': counterparty,
             },
@@ -2267,26 +2749,23 @@ class DBHistoryEvents:
         from_ts_ms, to_ts_ms = ts_sec_to_ms(from_ts), ts_sec_to_ms(to_ts)
         with self.db.conn.read_ctx() as cursor:
             cursor.execute(
-                'SELECT SUM(CAST(amount AS FLOAT)) FROM history_events JOIN chain_events_info '
+                f'SELECT {exact_sum_query("amount")} FROM history_events JOIN chain_events_info '
                 'ON history_events.identifier=chain_events_info.identifier WHERE '
                 "asset='ETH' AND type='spend' and subtype='fee' AND counterparty='gas' AND "
                 'timestamp >= ? AND timestamp <= ?',
                 (from_ts_ms, to_ts_ms),
             )
-            if (amount := cursor.fetchone()[0]) is not None:
-                eth_on_gas = str(amount)
-            else:
-                eth_on_gas = '0'
+            eth_on_gas = str(deserialize_exact_sum(cursor.fetchone()))
 
             skip_spam_assets = "history_events.asset NOT IN (SELECT value FROM multisettings WHERE name = 'ignored_asset')"  # noqa: E501
             cursor.execute(
-                'SELECT location_label, SUM(CAST(amount AS FLOAT)) FROM history_events JOIN chain_events_info '  # noqa: E501
+                f'SELECT location_label, {exact_sum_query("amount")} FROM history_events JOIN chain_events_info '  # noqa: E501
                 'ON history_events.identifier=chain_events_info.identifier WHERE '
                 "asset='ETH' AND type='spend' and subtype='fee' AND counterparty='gas' AND "
                 'timestamp >= ? AND timestamp <= ? GROUP BY location_label',
                 (from_ts_ms, to_ts_ms),
             )
-            eth_on_gas_per_address = {row[0]: str(row[1]) for row in cursor}
+            eth_on_gas_per_address = {row[0]: str(deserialize_exact_sum(row[1:])) for row in cursor}  # noqa: E501
             cursor.execute(
                 'SELECT chain_id, COUNT(DISTINCT group_identifier) as tx_count FROM chain_events_info '  # noqa: E501
                 'JOIN history_events ON chain_events_info.identifier = history_events.identifier '
@@ -2394,14 +2873,14 @@ class DBHistoryEvents:
             self,
             cursor: DBCursor,
             aggregate_by_group_ids: bool,
-            events_result: list[tuple[int, HistoryBaseEntry]] | list[HistoryBaseEntry],
+            events_result: HistoryEventsReturnType | HistoryEventsReturnType[HistoryEventForApi],
             entries_found: int,
             entries_with_limit: int,
             entries_total: int,
             ignored_group_identifiers: set[str],
             link_type: HistoryEventLinkType = HistoryEventLinkType.ASSET_MOVEMENT_MATCH,
     ) -> tuple[
-        list[tuple[int, HistoryBaseEntry]] | list[HistoryBaseEntry],
+        HistoryEventsReturnType[HistoryEventForApi],
         dict[str, str],
         int,
         int,
@@ -2440,9 +2919,9 @@ class DBHistoryEvents:
             )
 
         if aggregate_by_group_ids:
-            events_list = [event for _, event in cast('list[tuple[int, HistoryBaseEntry]]', events_result)]  # noqa: E501
+            events_list = [event for _, event in cast('list[tuple[int, HistoryEventForApi]]', events_result)]  # noqa: E501
         else:
-            events_list = cast('list[HistoryBaseEntry]', events_result)
+            events_list = cast('list[HistoryEventForApi]', events_result)
 
         result_group_ids = {event.group_identifier for event in events_list}
         group_ids_to_count: set[str] = set()
@@ -2548,7 +3027,7 @@ class DBHistoryEvents:
                 # another movement, and this logic will run twice for one joined group.
                 entries_total -= 1
 
-        processed_events_result: list[tuple[int, HistoryBaseEntry]] | list[HistoryBaseEntry] = []
+        processed_events_result: HistoryEventsReturnType[HistoryEventForApi] = []
         if aggregate_by_group_ids:
             # Aggregating by group. Need to ensure that for each movement/match group there is
             # only one event present. Process the events and for each event that is part of a
@@ -2558,7 +3037,7 @@ class DBHistoryEvents:
             already_processed_matches: set[str] = set()
             events_to_replace, processed_result_idx = {}, 0
             movement_events_in_result = {}
-            for grouped_events_num, event in cast('list[tuple[int, HistoryBaseEntry]]', events_result):  # noqa: E501
+            for grouped_events_num, event in cast('list[tuple[int, HistoryEventForApi]]', events_result):  # noqa: E501
                 if (
                     event.entry_type == HistoryBaseEntryType.ASSET_MOVEMENT_EVENT and
                     event.event_subtype != HistoryEventSubType.FEE
@@ -2638,8 +3117,8 @@ class DBHistoryEvents:
                     processed_events_result[idx] = (processed_events_result[idx][0], event)  # type: ignore  # will be a list of tuple[int, HistoryBaseEntry]
 
         else:  # Not aggregating. Need to include all associated events in the movement groups.
-            events_by_group: dict[str, list[HistoryBaseEntry]] = defaultdict(list)
-            for event in cast('list[HistoryBaseEntry]', events_result):
+            events_by_group: dict[str, list[HistoryEventForApi]] = defaultdict(list)
+            for event in cast('list[HistoryEventForApi]', events_result):
                 events_by_group[event.group_identifier].append(event)
 
             # Collect any group ids that are associated with some of the current events, but that
@@ -2663,7 +3142,7 @@ class DBHistoryEvents:
                         )
 
             # Load the actual events for these associated groups
-            joined_events_by_group: dict[str, list[HistoryBaseEntry]] = defaultdict(list)
+            joined_events_by_group: dict[str, list[HistoryEventForApi]] = defaultdict(list)
             if len(needed_group_ids) > 0:
                 joined_events_result = self._get_history_events_with_ignored_groups(
                     cursor=cursor,
@@ -2673,7 +3152,7 @@ class DBHistoryEvents:
                     entries_limit=None,
                 )
                 for joined_event in joined_events_result.events:
-                    joined_events_by_group[joined_event.group_identifier].append(joined_event)  # type: ignore  # will be a list of HistoryBaseEntry
+                    joined_events_by_group[joined_event.group_identifier].append(joined_event)
                 ignored_group_identifiers.update(
                     joined_events_result.ignored_group_identifiers,
                 )
@@ -2685,7 +3164,7 @@ class DBHistoryEvents:
             # showing up twice when two of its matches are on the page but the movement isn't).
             consumed_joined_groups: set[str] = set()
 
-            def extend_with_joined_group(events: list[HistoryBaseEntry], joined_group_id: str) -> None:  # noqa: E501
+            def extend_with_joined_group(events: list[HistoryEventForApi], joined_group_id: str) -> None:  # noqa: E501
                 if joined_group_id in consumed_joined_groups:
                     return
                 consumed_joined_groups.add(joined_group_id)
@@ -2703,7 +3182,7 @@ class DBHistoryEvents:
                         for _, group_id, _ in match_info_list:
                             extend_with_joined_group(events, group_id)
 
-                processed_events_result.extend(sorted(events, key=lambda event: event.timestamp))  # type: ignore  # will be a list of HistoryBaseEntry
+                processed_events_result.extend(sorted(events, key=lambda event: event.timestamp))
 
         return (
             processed_events_result,
@@ -18,9 +18,7 @@ MINIMIZED_USER_DB_SCHEMA = {
     "evm_transactions_authorizations": "tx_idintegernotnullprimarykey,nonceintegernotnull,delegated_addresstextnotnull,foreignkey(tx_id)referencesevm_transactions(identifier)ondeletecascade",
     "optimism_transactions": "tx_idintegernotnullprimarykey,l1_feetext,foreignkey(tx_id)referencesevm_transactions(identifier)ondeletecascadeonupdatecascade",
     "evm_internal_transactions": "parent_txintegernotnull,trace_idintegernotnull,from_addresstextnotnull,to_addresstext,valuetextnotnull,gastextnotnull,gas_usedtextnotnull,sourceintegernotnulldefault0,foreignkey(parent_tx)referencesevm_transactions(identifier)ondeletecascadeonupdatecascade,primarykey(parent_tx,trace_id,from_address,to_address,value,gas,gas_used)",
-    "evmtx_receipts": "tx_idintegernotnullprimarykey,contract_addresstext,statusintegernotnullcheck(statusin(0,1)),typeintegernotnull,foreignkey(tx_id)referencesevm_transactions(identifier)ondeletecascadeonupdatecascade",
-    "evmtx_receipt_logs": "identifierintegernotnullprimarykey,tx_idintegernotnull,log_indexintegernotnull,datablobnotnull,addresstextnotnull,foreignkey(tx_id)referencesevmtx_receipts(tx_id)ondeletecascadeonupdatecascade,unique(tx_id,log_index)",
-    "evmtx_receipt_log_topics": "logintegernotnull,topicblobnotnull,topic_indexintegernotnull,foreignkey(log)referencesevmtx_receipt_logs(identifier)ondeletecascadeonupdatecascade,primarykey(log,topic_index)",
+    "evmtx_receipts": "tx_idintegernotnullprimarykey,contract_addresstext,statusintegernotnullcheck(statusin(0,1)),typeintegernotnull,logsblobnotnull,foreignkey(tx_id)referencesevm_transactions(identifier)ondeletecascadeonupdatecascade",
     "evmtx_address_mappings": "tx_idintegernotnull,addresstextnotnull,foreignkey(tx_id)referencesevm_transactions(identifier)onupdatecascadeondeletecascade,primarykey(tx_id,address)",
     "zksynclite_tx_type": "typechar(1)primarykeynotnull,seqintegerunique",
     "zksynclite_transactions": "identifierintegernotnullprimarykey,tx_hashblobnotnullunique,typechar(1)notnulldefault('a')referenceszksynclite_tx_type(type),is_decodedintegernotnulldefault0check(is_decodedin(0,1)),timestampintegernotnull,block_numberintegernotnull,from_addresstextnotnull,to_addresstext,assettextnotnull,amounttextnotnull,feetext,foreignkey(asset)referencesassets(identifier)onupdatecascade",
@@ -34,9 +32,10 @@ MINIMIZED_USER_DB_SCHEMA = {
     "tag_mappings": "object_referencetext,tag_nametext,foreignkey(tag_name)referencestags(name)primarykey(object_reference,tag_name)",
     "xpubs": "xpubtextnotnull,derivation_pathtextnotnull,labeltext,blockchaintextnotnull,primarykey(xpub,derivation_path,blockchain)",
     "xpub_mappings": "addresstextnotnull,xpubtextnotnull,derivation_pathtextnotnull,account_indexinteger,derived_indexinteger,blockchaintextnotnull,foreignkey(blockchain,address)referencesblockchain_accounts(blockchain,account)ondeletecascadeforeignkey(xpub,derivation_path,blockchain)referencesxpubs(xpub,derivation_path,blockchain)ondeletecascadeprimarykey(address,xpub,derivation_path,blockchain)",
+    "xpub_derived_keys": "xpubtextnotnull,derivation_pathtextnotnull,blockchaintextnotnull,account_indexintegernotnull,derived_indexintegernotnull,pubkeyblobnotnull,foreignkey(xpub,derivation_path,blockchain)referencesxpubs(xpub,derivation_path,blockchain)ondeletecascadeprimarykey(xpub,derivation_path,blockchain,account_index,derived_index)",
     "eth2_validators": "identifierintegernotnullprimarykey,validator_indexintegerunique,public_keytextnotnullunique,ownership_proportiontextnotnull,withdrawal_addresstext,validator_typeintegernotnullcheck(validator_typein(0,1,2)),activation_timestampinteger,withdrawable_timestampinteger,exited_timestampinteger",
     "eth_validators_data_cache": "idintegernotnullprimarykey,validator_indexintegernotnull,timestampintegernotnull,--timestampisinmillisecondsbalancetextnotnull,withdrawals_pnltextnotnull,exit_pnltextnotnull,unique(validator_index,timestamp),foreignkey(validator_index)referenceseth2_validators(validator_index)onupdatecascadeondeletecascade",
-    "history_events": "identifierintegernotnullprimarykey,entry_typeintegernotnull,group_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,notestext,typetextnotnull,subtypetextnotnull,extra_datatext,ignoredintegernotnulldefault0,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(group_identifier,sequence_index)",
+    "history_events": "identifierintegernotnullprimarykey,entry_typeintegernotnull,group_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,notestext,typetextnotnull,subtypetextnotnull,extra_datatext,ignoredintegernotnulldefault0,amount_intintegergeneratedalwaysas(casewhen(amountglob'[0-9]*'oramountglob'-[0-9]*')andsubstr(amount,2)notglob'*[^0-9.]*'andamountnotglob'*.*.*'andinstr(amount||'.','.')<=13+(amountglob'-*')andlength(amount)-instr(amount||'.','.')<=18thencast(substr(amount,1,instr(amount||'.','.')-1)asinteger)end)virtual,amount_frac_hiintegergeneratedalwaysas(casewhenamount_intisnotnullthen(1-2*(amountglob'-*'))*cast(substr(substr(amount,instr(amount||'.','.')+1)||'000000000',1,9)asinteger)end)virtual,amount_frac_lointegergeneratedalwaysas(casewhenamount_intisnotnullthen(1-2*(amountglob'-*'))*cast(substr(substr(amount,instr(amount||'.','.')+1)||'000000000000000000',10,9)asinteger)end)virtual,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(group_identifier,sequence_index)",
     "chain_events_info": "identifierintegerprimarykey,tx_refblobnotnull,counterpartytext,addresstext,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
     "bitcoin_events_addresses": "event_identifierintegernotnull,addresstextnotnull,foreignkey(event_identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade,primarykey(event_identifier,address)",
     "bitcoin_transactions": "identifierintegernotnullprimarykey,locationchar(1)notnullreferenceslocation(location),tx_idtextnotnull,timestampintegernotnull,block_heightintegernotnull,feeintegernotnull,vin_countinteger,vout_countinteger,unique(location,tx_id)",
@@ -45,7 +44,7 @@ MINIMIZED_USER_DB_SCHEMA = {
     "bitcoin_tx_mappings": "tx_idintegernotnull,valueintegernotnull,primarykey(tx_id,value),foreignkey(tx_id)referencesbitcoin_transactions(identifier)ondeletecascadeonupdatecascade",
     "eth_staking_events_info": "identifierintegerprimarykey,validator_indexintegernotnull,is_exit_or_blocknumberintegernotnull,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
     "history_events_mappings": "parent_identifierintegernotnull,nametextnotnull,valueintegernotnull,foreignkey(parent_identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade,primarykey(parent_identifier,name,value)",
-    "history_events_backup": "identifierintegernotnullprimarykey,entry_typeintegernotnull,group_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,notestext,typetextnotnull,subtypetextnotnull,extra_datatext,ignoredintegernotnulldefault0,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(group_identifier,sequence_index)",
+    "history_events_backup": "identifierintegernotnullprimarykey,entry_typeintegernotnull,group_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,notestext,typetextnotnull,subtypetextnotnull,extra_datatext,ignoredintegernotnulldefault0,amount_intintegergeneratedalwaysas(casewhen(amountglob'[0-9]*'oramountglob'-[0-9]*')andsubstr(amount,2)notglob'*[^0-9.]*'andamountnotglob'*.*.*'andinstr(amount||'.','.')<=13+(amountglob'-*')andlength(amount)-instr(amount||'.','.')<=18thencast(substr(amount,1,instr(amount||'.','.')-1)asinteger)end)virtual,amount_frac_hiintegergeneratedalwaysas(casewhenamount_intisnotnullthen(1-2*(amountglob'-*'))*cast(substr(substr(amount,instr(amount||'.','.')+1)||'000000000',1,9)asinteger)end)virtual,amount_frac_lointegergeneratedalwaysas(casewhenamount_intisnotnullthen(1-2*(amountglob'-*'))*cast(substr(substr(amount,instr(amount||'.','.')+1)||'000000000000000000',10,9)asinteger)end)virtual,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(group_identifier,sequence_index)",
     "chain_events_info_backup": "identifierintegerprimarykey,tx_refblobnotnull,counterpartytext,addresstext,foreignkey(identifier)referenceshistory_events_backup(identifier)onupdatecascadeondeletecascade",
     "ignored_actions": "identifiertextprimarykey",
     "nfts": "identifiertextnotnullprimarykey,nametext,last_pricetextnotnull,last_price_assettextnotnull,manual_priceintegernotnullcheck(manual_pricein(0,1)),owner_addresstext,blockchaintextgeneratedalwaysas('eth')virtual,is_lpintegernotnullcheck(is_lpin(0,1)),image_urltext,collection_nametext,usd_pricerealnotnulldefault0,foreignkey(blockchain,owner_address)referencesblockchain_accounts(blockchain,account)ondeletecascade,foreignkey(identifier)referencesassets(identifier)onupdatecascade,foreignkey(last_price_asset)referencesassets(identifier)onupdatecascade",
@@ -77,7 +76,8 @@ MINIMIZED_USER_DB_SCHEMA = {
     "historical_balance_cache": "idintegernotnullprimarykey,blockchaintextnotnull,addresstextnotnull,assettextnotnull,amounttextnotnull,timestampintegernotnull,block_numberintegernotnull,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(blockchain,address,asset,block_number)",
     "blockchain_balances_cache": "blockchaintextnotnull,addresstextnotnull,assettextnotnull,labeltextnotnulldefault'',categorychar(1)notnulldefault('a'),amounttextnotnull,foreignkey(asset)referencesassets(identifier)onupdatecascade,primarykey(blockchain,address,asset,label,category)",
     "data_issues": "idintegernotnullprimarykey,kindtextnotnull,locationtextnotnull,location_labeltextnotnulldefault'',protocoltextnotnulldefault'',assettextnotnulldefault'',event_identifierinteger,ts_startintegernotnull,ts_endintegernotnull,severitytextnotnull,statetextnotnull,auto_remediation_attempts_jsontextnotnulldefault'[]',payload_jsontextnotnull,created_atintegernotnull,resolved_atinteger",
-    "event_metrics": "idintegernotnullprimarykey,event_identifierintegernotnullreferenceshistory_events(identifier)ondeletecascade,locationchar(1)notnull,location_labeltext,protocoltext,metric_keytextnotnull,metric_valuetextnotnull,assettextnotnull,timestampintegernotnull,sequence_indexintegernotnull,sort_keyintegernotnull,unique(event_identifier,location_label,protocol,metric_key,asset)",
+    "event_metrics": "idintegernotnullprimarykey,event_identifierintegernotnullreferenceshistory_events(identifier)ondeletecascade,locationchar(1)notnull,location_labeltext,protocoltext,metric_keytextnotnull,metric_valuetextnotnull,assettextnotnull,timestampintegernotnull,sequence_indexintegernotnull,sort_keyintegernotnull,metric_value_intintegergeneratedalwaysas(casewhen(metric_valueglob'[0-9]*'ormetric_valueglob'-[0-9]*')andsubstr(metric_value,2)notglob'*[^0-9.]*'andmetric_valuenotglob'*.*.*'andinstr(metric_value||'.','.')<=13+(metric_valueglob'-*')andlength(metric_value)-instr(metric_value||'.','.')<=18thencast(substr(metric_value,1,instr(metric_value||'.','.')-1)asinteger)end)virtual,metric_value_frac_hiintegergeneratedalwaysas(casewhenmetric_value_intisnotnullthen(1-2*(metric_valueglob'-*'))*cast(substr(substr(metric_value,instr(metric_value||'.','.')+1)||'000000000',1,9)asinteger)end)virtual,metric_value_frac_lointegergeneratedalwaysas(casewhenmetric_value_intisnotnullthen(1-2*(metric_valueglob'-*'))*cast(substr(substr(metric_value,instr(metric_value||'.','.')+1)||'000000000000000000',10,9)asinteger)end)virtual,unique(event_identifier,location_label,protocol,metric_key,asset)",
+    "event_metrics_daily_balances": "dayintegernotnull,assettextnotnull,amounttextnotnull,primarykey(day,asset)",
 }
 
 MINIMIZED_USER_DB_INDEXES = {
@@ -1,21 +1,29 @@
+import json
 import logging
-from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Literal, overload
+from typing import TYPE_CHECKING, Any, Final, Literal, overload
 
 from sqlcipher3 import dbapi2 as sqlcipher
 
+from rotkehlchen.accounting.checkpoints import MAX_ACCOUNTING_CHECKPOINTS
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
+from rotkehlchen.accounting.types import AccountingCheckpoint
 from rotkehlchen.errors.asset import WrongAssetType
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.utils.misc import ts_now
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# how many pnl_events rows are read at once when streaming the events of a report
+REPORT_DATA_CHUNK_SIZE: Final = 1000
+
+type PnlEventRow = tuple[int, Timestamp, str, str, str, str, str, str, str, str, str | None]
+
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from rotkehlchen.accounting.pnl import PnlTotals
     from rotkehlchen.db.dbhandler import DBHandler
@@ -154,6 +162,50 @@ class DBAccountingReports:
                 'INSERT OR IGNORE INTO pnl_report_totals(report_id, name, taxable_value, free_value) VALUES(?, ?, ?, ?)',  # noqa: E501
                 tuples,
             )
+            cursor.execute(
+                'INSERT OR REPLACE INTO pnl_report_summary(report_id, event_type, '
+                'asset_identifier, events_num, pnl_taxable, pnl_free) '
+                'SELECT report_id, event_type, asset_identifier, COUNT(*), '
+                "COALESCE(FVAL_SUM(pnl_taxable), '0'), COALESCE(FVAL_SUM(pnl_free), '0') "
+                'FROM pnl_events WHERE report_id=? GROUP BY event_type, asset_identifier',
+                (report_id,),
+            )
+
+    def get_report_summary(
+            self,
+            report_id: int,
+            group_by: Literal['event_type', 'asset'],
+    ) -> list[dict[str, Any]]:
+        """Breakdown of the number of events and the PnL of a report by event type or asset.
+
+        Read from the summary of the report so the report events are not visited. The PnL
+        is summed exactly and the entries are ordered by their total PnL, highest first.
+
+        May raise:
+        - InputError if the report ID does not exist in the DB
+        """
+        with self.db.conn_transient.read_ctx() as cursor:
+            if cursor.execute(
+                'SELECT COUNT(*) FROM pnl_reports WHERE identifier=?',
+                (report_id,),
+            ).fetchone()[0] != 1:
+                raise InputError(
+                    f'Tried to get the summary of non existing PnL report with id {report_id}',
+                )
+
+            column = 'asset_identifier' if group_by == 'asset' else group_by
+            summary = [{
+                group_by: entry[0],
+                'events_num': entry[1],
+                'pnl_taxable': FVal(entry[2]),
+                'pnl_free': FVal(entry[3]),
+            } for entry in cursor.execute(
+                f'SELECT {column}, SUM(events_num), FVAL_SUM(pnl_taxable), FVAL_SUM(pnl_free) '
+                f'FROM pnl_report_summary WHERE report_id=? GROUP BY {column}',
+                (report_id,),
+            )]
+
+        return sorted(summary, key=lambda x: x['pnl_taxable'] + x['pnl_free'], reverse=True)
 
     def get_reports(
             self,
@@ -234,9 +286,67 @@ class DBAccountingReports:
                     f'Could not delete PnL report {report_id} from the DB. Report was not found',
                 )
 
+    def add_checkpoint(self, settings_hash: str, checkpoint: AccountingCheckpoint) -> None:
+        """Save an accounting checkpoint, replacing any existing one at the same timestamp,
+        and prune the oldest checkpoints of the settings hash beyond the allowed number"""
+        with self.db.transient_write() as cursor:
+            cursor.execute(
+                'INSERT OR REPLACE INTO accounting_checkpoints(settings_hash, timestamp, '
+                'events_num, events_fingerprint, data) VALUES(?, ?, ?, ?, ?)',
+                (
+                    settings_hash,
+                    checkpoint.timestamp,
+                    checkpoint.events_num,
+                    checkpoint.events_fingerprint,
+                    json.dumps(checkpoint.data),
+                ),
+            )
+            cursor.execute(
+                'DELETE FROM accounting_checkpoints WHERE settings_hash=? AND timestamp NOT IN '
+                '(SELECT timestamp FROM accounting_checkpoints WHERE settings_hash=? '
+                'ORDER BY timestamp DESC LIMIT ?)',
+                (settings_hash, settings_hash, MAX_ACCOUNTING_CHECKPOINTS),
+            )
+
+    def get_checkpoints(
+            self,
+            settings_hash: str,
+            before_ts: Timestamp,
+    ) -> list[AccountingCheckpoint]:
+        """Get the accounting checkpoints of a settings hash taken strictly before the given
+        timestamp, in ascending timestamp order. Unreadable checkpoints are skipped."""
+        checkpoints = []
+        with self.db.conn_transient.read_ctx() as cursor:
+            for timestamp, events_num, events_fingerprint, data in cursor.execute(
+                    'SELECT timestamp, events_num, events_fingerprint, data FROM '
+                    'accounting_checkpoints WHERE settings_hash=? AND timestamp < ? '
+                    'ORDER BY timestamp ASC',
+                    (settings_hash, before_ts),
+            ):
+                try:
+                    checkpoints.append(AccountingCheckpoint(
+                        timestamp=timestamp,
+                        events_num=events_num,
+                        events_fingerprint=events_fingerprint,
+                        data=json.loads(data),
+                    ))
+                except json.JSONDecodeError as e:
+                    log.error(f'Could not read accounting checkpoint at {timestamp} due to {e!s}')
+
+        return checkpoints
+
+    def delete_checkpoints(self, settings_hash: str, from_ts: Timestamp) -> None:
+        """Delete the accounting checkpoints of a settings hash at or after from_ts"""
+        with self.db.transient_write() as cursor:
+            cursor.execute(
+                'DELETE FROM accounting_checkpoints WHERE settings_hash=? AND timestamp >= ?',
+                (settings_hash, from_ts),
+            )
+
     PNL_EVENTS_INSERT = (
-        'INSERT INTO pnl_events(report_id, timestamp, data, pnl_taxable, pnl_free, asset) '
-        'VALUES(?, ?, ?, ?, ?, ?);'
+        'INSERT INTO pnl_events(report_id, timestamp, data, event_type, location, '
+        'asset_identifier, free_amount, taxable_amount, pnl_taxable, pnl_free, asset) '
+        'VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);'
     )
 
     @staticmethod
@@ -245,7 +355,7 @@ class DBAccountingReports:
             time: Timestamp,
             ts_converter: Callable[[Timestamp], str],
             event: ProcessedAccountingEvent,
-    ) -> tuple[int, Timestamp, str, str, str, str | None]:
+    ) -> PnlEventRow:
         """Serialize a processed accounting event into a pnl_events row tuple.
 
         May raise DeserializationError if there is a conflict at serialization of the event.
@@ -259,6 +369,11 @@ class DBAccountingReports:
             report_id,
             time,
             event.serialize_for_db(ts_converter),
+            event.event_type.serialize(),
+            event.location.serialize_for_db(),
+            event.asset.identifier,
+            str(event.free_amount),
+            str(event.taxable_amount),
             str(event.pnl.taxable),
             str(event.pnl.free),
             asset_symbol,
@@ -266,7 +381,7 @@ class DBAccountingReports:
 
     def add_report_data_rows(
             self,
-            rows: list[tuple[int, Timestamp, str, str, str, str | None]],
+            rows: list[PnlEventRow],
     ) -> None:
         """Batch-insert pre-serialized pnl_events rows in a single transient-DB transaction.
 
@@ -331,9 +446,17 @@ class DBAccountingReports:
                     f'Tried to get PnL events from non existing report with id {report_id}',
                 )
 
-            query, bindings = filter_.prepare()
-            query = f'SELECT timestamp, data FROM pnl_events {query}'
-            cursor.execute(query, bindings)
+            # only the requested page, capped by the user limit, is read and deserialized
+            query, bindings = filter_.prepare(with_pagination=False)
+            page_limit, offset = limit, 0
+            if filter_.pagination is not None:
+                offset = filter_.pagination.offset
+                if filter_.pagination.limit:  # 0 means no limit
+                    page_limit = min(limit, filter_.pagination.limit)
+            cursor.execute(
+                f'SELECT timestamp, data FROM pnl_events {query} LIMIT ? OFFSET ?',
+                (*bindings, page_limit, offset),
+            )
 
             records = []
             for result in cursor:
@@ -348,15 +471,9 @@ class DBAccountingReports:
 
                 records.append(record)
 
-            if filter_.pagination is not None:
-                no_pagination_filter = deepcopy(filter_)
-                no_pagination_filter.pagination = None
-                query, bindings = no_pagination_filter.prepare()
-                entries_found = cursor.execute(f'SELECT COUNT(*) FROM pnl_events {query}', bindings).fetchone()[0]  # noqa: E501
-                entries_total = entries_found
-            else:
-                entries_found = len(records)
-                entries_total = entries_found
+            query, bindings = filter_.prepare(with_pagination=False, with_order=False)
+            entries_found = cursor.execute(f'SELECT COUNT(*) FROM pnl_events {query}', bindings).fetchone()[0]  # noqa: E501
+            entries_total = entries_found
 
         return _get_reports_or_events_maybe_limit(
             entry_type='events',
@@ -365,3 +482,45 @@ class DBAccountingReports:
             entries=records,
             limit=limit,
         )
+
+    def iterate_report_data(
+            self,
+            report_id: int,
+            limit: int | None = None,
+    ) -> Iterator[ProcessedAccountingEvent]:
+        """Stream the events of a PnL report in processing order without holding them all
+        in memory. They are read in chunks with a fresh cursor for each chunk so that no
+        statement is left open on the transient connection between chunks.
+
+        Up to limit events are returned if given. Events that can't be deserialized are
+        skipped as in get_report_data.
+        """
+        last_key: tuple[int, int] = (-1, -1)  # (timestamp, identifier) of the last read row
+        remaining = limit
+        while remaining is None or remaining > 0:
+            chunk_size = REPORT_DATA_CHUNK_SIZE if remaining is None else min(remaining, REPORT_DATA_CHUNK_SIZE)  # noqa: E501
+            with self.db.conn_transient.cursor() as cursor:
+                rows = cursor.execute(
+                    'SELECT identifier, timestamp, data FROM pnl_events '
+                    'WHERE report_id=? AND (timestamp, identifier) > (?, ?) '
+                    'ORDER BY timestamp ASC, identifier ASC LIMIT ?',
+                    (report_id, *last_key, chunk_size),
+                ).fetchall()
+
+            for identifier, timestamp, data in rows:
+                last_key = (timestamp, identifier)
+                try:
+                    event = ProcessedAccountingEvent.deserialize_from_db(timestamp, data)
+                except DeserializationError as e:
+                    self.db.msg_aggregator.add_error(
+                        f'Error deserializing AccountingEvent from the DB. Skipping it.'
+                        f'Error was: {e!s}',
+                    )
+                    continue
+
+                if remaining is not None:
+                    remaining -= 1
+                yield event
+
+            if len(rows) < chunk_size:
+                break
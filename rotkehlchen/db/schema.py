@@ -251,6 +251,26 @@ CREATE TABLE IF NOT EXISTS xpub_mappings (
 );
 """
 
+# Cache of the compressed public keys derived from each xpub so that checking for new
+# xpub addresses only derives the indices that were never derived before.
+# account_index is 0 for receiving and 1 for change addresses
+DB_CREATE_XPUB_DERIVED_KEYS = """
+CREATE TABLE IF NOT EXISTS xpub_derived_keys (
+    xpub TEXT NOT NULL,
+    derivation_path TEXT NOT NULL,
+    blockchain TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    derived_index INTEGER NOT NULL,
+    pubkey BLOB NOT NULL,
+    FOREIGN KEY(xpub, derivation_path, blockchain) REFERENCES xpubs(
+        xpub,
+        derivation_path,
+        blockchain
+    ) ON DELETE CASCADE
+    PRIMARY KEY (xpub, derivation_path, blockchain, account_index, derived_index)
+);
+"""
+
 
 # Store information about the tokens queried for each combination of account and blockchain.
 # The table is designed to have a key-value structure where we use the key `token` to
@@ -392,32 +412,11 @@ CREATE TABLE IF NOT EXISTS evmtx_receipts (
     contract_address TEXT, /* can be null */
     status INTEGER NOT NULL CHECK (status IN (0, 1)),
     type INTEGER NOT NULL,
+    logs BLOB NOT NULL, /* all the logs packed as described in rotkehlchen/db/evmtx.py */
     FOREIGN KEY(tx_id) REFERENCES evm_transactions(identifier) ON DELETE CASCADE ON UPDATE CASCADE
 );
 """
 
-DB_CREATE_EVMTX_RECEIPT_LOGS = """
-CREATE TABLE IF NOT EXISTS evmtx_receipt_logs (
-    identifier INTEGER NOT NULL PRIMARY KEY,  /* adding identifier here instead of composite key in order to not duplicate in topics which are A LOT */
-    tx_id INTEGER NOT NULL,
-    log_index INTEGER NOT NULL,
-    data BLOB NOT NULL,
-    address TEXT NOT NULL,
-    FOREIGN KEY(tx_id) REFERENCES evmtx_receipts(tx_id) ON DELETE CASCADE ON UPDATE CASCADE,
-    UNIQUE(tx_id, log_index)
-);
-"""  # noqa: E501
-
-DB_CREATE_EVMTX_RECEIPT_LOG_TOPICS = """
-CREATE TABLE IF NOT EXISTS evmtx_receipt_log_topics (
-    log INTEGER NOT NULL,
-    topic BLOB NOT NULL,
-    topic_index INTEGER NOT NULL,
-    FOREIGN KEY(log) REFERENCES evmtx_receipt_logs(identifier) ON DELETE CASCADE ON UPDATE CASCADE,
-    PRIMARY KEY(log, topic_index)
-);
-"""
-
 DB_CREATE_EVMTX_ADDRESS_MAPPINGS = """
 CREATE TABLE IF NOT EXISTS evmtx_address_mappings (
     tx_id INTEGER NOT NULL,
@@ -566,7 +565,27 @@ CREATE TABLE IF NOT EXISTS skipped_external_events (
 );
 """
 
-DB_CREATE_HISTORY_EVENTS = """
+
+def _fixed_point_columns(column: str) -> str:
+    """Integer columns generated from the decimal TEXT column so that SQLite can sum it
+    exactly with the native SUM(): the integer part and the first and last nine of 18
+    decimals, all with the sign of the value. They are NULL for the values that do not
+    fit (more than 12 integer digits or more than 18 decimals), see exact_sum_query."""
+    dot = f"instr({column} || '.', '.')"
+    sign = f"(1 - 2 * ({column} GLOB '-*'))"
+    decimals = f'substr({column}, {dot} + 1)'
+    return f"""    {column}_int INTEGER GENERATED ALWAYS AS (CASE WHEN
+        ({column} GLOB '[0-9]*' OR {column} GLOB '-[0-9]*') AND
+        substr({column}, 2) NOT GLOB '*[^0-9.]*' AND {column} NOT GLOB '*.*.*' AND
+        {dot} <= 13 + ({column} GLOB '-*') AND length({column}) - {dot} <= 18
+        THEN CAST(substr({column}, 1, {dot} - 1) AS INTEGER) END) VIRTUAL,
+    {column}_frac_hi INTEGER GENERATED ALWAYS AS (CASE WHEN {column}_int IS NOT NULL
+        THEN {sign} * CAST(substr({decimals} || '000000000', 1, 9) AS INTEGER) END) VIRTUAL,
+    {column}_frac_lo INTEGER GENERATED ALWAYS AS (CASE WHEN {column}_int IS NOT NULL
+        THEN {sign} * CAST(substr({decimals} || '000000000000000000', 10, 9) AS INTEGER) END) VIRTUAL,"""  # noqa: E501
+
+
+DB_CREATE_HISTORY_EVENTS = f"""
 CREATE TABLE IF NOT EXISTS history_events (
     identifier INTEGER NOT NULL PRIMARY KEY,
     entry_type INTEGER NOT NULL,
@@ -582,6 +601,7 @@ CREATE TABLE IF NOT EXISTS history_events (
     subtype TEXT NOT NULL,
     extra_data TEXT,
     ignored INTEGER NOT NULL DEFAULT 0,
+{_fixed_point_columns('amount')}
     FOREIGN KEY(asset) REFERENCES assets(identifier) ON UPDATE CASCADE,
     UNIQUE(group_identifier, sequence_index)
 );
@@ -1056,7 +1076,7 @@ CREATE TABLE IF NOT EXISTS data_issues (
 );
 """
 
-DB_CREATE_EVENT_METRICS = """
+DB_CREATE_EVENT_METRICS = f"""
 CREATE TABLE IF NOT EXISTS event_metrics (
     id INTEGER NOT NULL PRIMARY KEY,
     event_identifier INTEGER NOT NULL REFERENCES history_events(identifier) ON DELETE CASCADE,
@@ -1069,10 +1089,23 @@ CREATE TABLE IF NOT EXISTS event_metrics (
     timestamp INTEGER NOT NULL,
     sequence_index INTEGER NOT NULL,
     sort_key INTEGER NOT NULL,
+{_fixed_point_columns('metric_value')}
     UNIQUE(event_identifier, location_label, protocol, metric_key, asset)
 );
 """
 
+# End of day balance of each asset summed over all its event_metrics buckets. Rows only
+# exist for the days in which the balance metrics of an asset changed, so readers carry
+# the latest row of each asset forward. Maintained by the historical balance processing.
+DB_CREATE_EVENT_METRICS_DAILY_BALANCES = """
+CREATE TABLE IF NOT EXISTS event_metrics_daily_balances (
+    day INTEGER NOT NULL,
+    asset TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY(day, asset)
+);
+"""
+
 # The history_events indexes significantly improve performance when filtering history events in large DBs.  # noqa: E501
 # Shown below are before/after query speeds we observed for each index:
 # idx_history_events_entry_type: Before: 12951ms, After: 0ms
@@ -1148,8 +1181,6 @@ BEGIN TRANSACTION;
 {DB_CREATE_OPTIMISM_TRANSACTIONS}
 {DB_CREATE_EVM_INTERNAL_TRANSACTIONS}
 {DB_CREATE_EVMTX_RECEIPTS}
-{DB_CREATE_EVMTX_RECEIPT_LOGS}
-{DB_CREATE_EVMTX_RECEIPT_LOG_TOPICS}
 {DB_CREATE_EVMTX_ADDRESS_MAPPINGS}
 {DB_CREATE_ZKSYNCLITE_TX_TYPE}
 {DB_CREATE_ZKSYNCLITE_TRANSACTIONS}
@@ -1163,6 +1194,7 @@ BEGIN TRANSACTION;
 {DB_CREATE_TAG_MAPPINGS}
 {DB_CREATE_XPUBS}
 {DB_CREATE_XPUB_MAPPINGS}
+{DB_CREATE_XPUB_DERIVED_KEYS}
 {DB_CREATE_ETH2_VALIDATORS}
 {DB_CREATE_ETH_VALIDATORS_DATA_CACHE}
 {DB_CREATE_HISTORY_EVENTS}
@@ -1207,6 +1239,7 @@ BEGIN TRANSACTION;
 {DB_CREATE_BLOCKCHAIN_BALANCES_CACHE}
 {DB_CREATE_DATA_ISSUES}
 {DB_CREATE_EVENT_METRICS}
+{DB_CREATE_EVENT_METRICS_DAILY_BALANCES}
 {DB_CREATE_INDEXES}
 COMMIT;
 PRAGMA foreign_keys=on;
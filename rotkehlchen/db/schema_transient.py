@@ -36,13 +36,20 @@ CREATE TABLE IF NOT EXISTS pnl_report_settings (
 );
 """
 
-# Many records for events related through foreign key to each PnL report.
+# Many records for events related through foreign key to each PnL report. The full event
+# is in data. The fields that events are filtered, ordered and aggregated by are also
+# kept in their own columns so that queries don't need to deserialize data.
 DB_CREATE_PNL_EVENTS = """
 CREATE TABLE IF NOT EXISTS pnl_events (
     identifier INTEGER NOT NULL PRIMARY KEY,
     report_id INTEGER NOT NULL,
     timestamp INTEGER NOT NULL,
     data TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    location CHAR(1) NOT NULL,
+    asset_identifier TEXT NOT NULL,
+    free_amount TEXT NOT NULL,
+    taxable_amount TEXT NOT NULL,
     pnl_taxable TEXT NOT NULL,
     pnl_free TEXT NOT NULL,
     asset TEXT,
@@ -50,6 +57,40 @@ CREATE TABLE IF NOT EXISTS pnl_events (
 );
 """
 
+DB_CREATE_PNL_EVENTS_INDICES = """
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_timestamp ON pnl_events(report_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_event_type ON pnl_events(report_id, event_type);
+CREATE INDEX IF NOT EXISTS idx_pnl_events_report_asset ON pnl_events(report_id, asset_identifier);
+"""
+
+# Number of events and PnL of a report per event type and asset. Filled once the report
+# is processed so that breakdowns of the report don't need to go through all its events.
+DB_CREATE_PNL_REPORT_SUMMARY = """
+CREATE TABLE IF NOT EXISTS pnl_report_summary (
+    report_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    asset_identifier TEXT NOT NULL,
+    events_num INTEGER NOT NULL,
+    pnl_taxable TEXT NOT NULL,
+    pnl_free TEXT NOT NULL,
+    FOREIGN KEY (report_id) REFERENCES pnl_reports(identifier) ON DELETE CASCADE ON UPDATE CASCADE,
+    PRIMARY KEY(report_id, event_type, asset_identifier)
+);
+"""
+
+# Snapshots of the accounting state taken while processing a PnL report so that later
+# reports with the same settings can resume from them instead of replaying all history
+DB_CREATE_ACCOUNTING_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS accounting_checkpoints (
+    settings_hash TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    events_num INTEGER NOT NULL,
+    events_fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY(settings_hash, timestamp)
+);
+"""
+
 DB_CREATE_SETTINGS = """
 CREATE TABLE IF NOT EXISTS settings (
     name VARCHAR[24] NOT NULL PRIMARY KEY,
@@ -64,6 +105,9 @@ BEGIN TRANSACTION;
 {DB_CREATE_REPORT_SETTINGS}
 {DB_CREATE_REPORT_TOTALS}
 {DB_CREATE_PNL_EVENTS}
+{DB_CREATE_PNL_EVENTS_INDICES}
+{DB_CREATE_PNL_REPORT_SUMMARY}
+{DB_CREATE_ACCOUNTING_CHECKPOINTS}
 {DB_CREATE_SETTINGS}
 COMMIT;
 PRAGMA foreign_keys=on;
@@ -45,8 +45,8 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
-ROTKEHLCHEN_DB_VERSION: Final = 53
-ROTKEHLCHEN_TRANSIENT_DB_VERSION: Final = 2
+ROTKEHLCHEN_DB_VERSION: Final = 54
+ROTKEHLCHEN_TRANSIENT_DB_VERSION: Final = 5
 DEFAULT_TAXFREE_AFTER_PERIOD: Final = YEAR_IN_SECONDS
 DEFAULT_INCLUDE_CRYPTO2CRYPTO: Final = True
 DEFAULT_INCLUDE_GAS_COSTS: Final = True
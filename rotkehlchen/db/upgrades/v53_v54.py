@@ -0,0 +1,175 @@
+import logging
+import struct
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from rotkehlchen.constants import DAY_IN_MILLISECONDS, ZERO
+from rotkehlchen.fval import FVal
+from rotkehlchen.logging import RotkehlchenLogsAdapter, enter_exit_debug_log
+from rotkehlchen.utils.progress import perform_userdb_upgrade_steps, progress_step
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.sqlite import DBCursor
+    from rotkehlchen.db.upgrade_manager import DBUpgradeProgressHandler
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+
+def _pack_receipt_logs(logs: list[tuple[int, bytes, str, list[bytes]]]) -> bytes:
+    """Pack (log index, data, address, topics) entries in version 1 of the receipt logs
+    format. Kept here so that the upgrade does not change along with DBEvmTx."""
+    parts = [b'\x01']
+    for log_index, data, address, topics in logs:
+        parts.append(struct.pack('>I20sBI', log_index, bytes.fromhex(address[2:]), len(topics), len(data)))  # noqa: E501
+        parts.extend(topics)
+        parts.append(data)
+
+    return b''.join(parts)
+
+
+def _fixed_point_columns(column: str) -> list[str]:
+    """The definitions of the integer columns generated from the decimal TEXT column for
+    exact native sums. Kept here so that the upgrade does not change along with the schema."""
+    dot = f"instr({column} || '.', '.')"
+    sign = f"(1 - 2 * ({column} GLOB '-*'))"
+    decimals = f'substr({column}, {dot} + 1)'
+    return [
+        f"""{column}_int INTEGER GENERATED ALWAYS AS (CASE WHEN
+        ({column} GLOB '[0-9]*' OR {column} GLOB '-[0-9]*') AND
+        substr({column}, 2) NOT GLOB '*[^0-9.]*' AND {column} NOT GLOB '*.*.*' AND
+        {dot} <= 13 + ({column} GLOB '-*') AND length({column}) - {dot} <= 18
+        THEN CAST(substr({column}, 1, {dot} - 1) AS INTEGER) END) VIRTUAL""",
+        f"""{column}_frac_hi INTEGER GENERATED ALWAYS AS (CASE WHEN {column}_int IS NOT NULL
+        THEN {sign} * CAST(substr({decimals} || '000000000', 1, 9) AS INTEGER) END) VIRTUAL""",
+        f"""{column}_frac_lo INTEGER GENERATED ALWAYS AS (CASE WHEN {column}_int IS NOT NULL
+        THEN {sign} * CAST(substr({decimals} || '000000000000000000', 10, 9) AS INTEGER) END) VIRTUAL""",  # noqa: E501
+    ]
+
+
+@enter_exit_debug_log(name='UserDB v53->v54 upgrade')
+def upgrade_v53_to_v54(db: DBHandler, progress_handler: DBUpgradeProgressHandler) -> None:
+    """Upgrades the DB from v53 to v54. This happens in 1.45."""
+
+    @progress_step(description='Create and fill event metrics daily balances table.')
+    def _create_event_metrics_daily_balances_table(write_cursor: DBCursor) -> None:
+        """Create the daily balances table and fill it from the existing balance metrics.
+
+        The historical balance processing only rebuilds the days after the events it
+        reprocesses, so the days already processed need to be filled here.
+        """
+        write_cursor.execute("""
+CREATE TABLE IF NOT EXISTS event_metrics_daily_balances (
+    day INTEGER NOT NULL,
+    asset TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY(day, asset)
+);
+""")
+        bucket_balances: dict[tuple[str, str | None, str | None, str], FVal] = {}
+        asset_balances: dict[str, FVal] = defaultdict(lambda: ZERO)
+        daily_rows: list[tuple[int, str, str]] = []
+        current_day, day_assets = 0, set[str]()
+        for row in write_cursor.execute(
+            'SELECT location, location_label, protocol, asset, metric_value, timestamp '
+            "FROM event_metrics WHERE metric_key = 'balance' "
+            'ORDER BY timestamp, sort_key, id',
+        ):
+            if (day := row[5] - row[5] % DAY_IN_MILLISECONDS) != current_day:
+                daily_rows.extend((current_day, x, str(asset_balances[x])) for x in day_assets)
+                current_day, day_assets = day, set()
+
+            balance = FVal(row[4])
+            asset_balances[row[3]] += balance - bucket_balances.get(row[:4], ZERO)
+            bucket_balances[row[:4]] = balance
+            day_assets.add(row[3])
+
+        daily_rows.extend((current_day, x, str(asset_balances[x])) for x in day_assets)
+        write_cursor.executemany(
+            'INSERT INTO event_metrics_daily_balances(day, asset, amount) VALUES (?, ?, ?)',
+            daily_rows,
+        )
+
+    @progress_step(description='Pack evm transaction receipt logs.')
+    def _pack_evm_receipt_logs(write_cursor: DBCursor) -> None:
+        """Store the logs and topics of each receipt packed in a blob of the receipts
+        table instead of a row per log and per topic"""
+        write_cursor.executescript("""
+ALTER TABLE evmtx_receipts RENAME TO evmtx_receipts_old;
+CREATE TABLE evmtx_receipts (
+    tx_id INTEGER NOT NULL PRIMARY KEY,
+    contract_address TEXT, /* can be null */
+    status INTEGER NOT NULL CHECK (status IN (0, 1)),
+    type INTEGER NOT NULL,
+    logs BLOB NOT NULL, /* all the logs packed as described in rotkehlchen/db/evmtx.py */
+    FOREIGN KEY(tx_id) REFERENCES evm_transactions(identifier) ON DELETE CASCADE ON UPDATE CASCADE
+);
+""")  # noqa: E501
+        last_tx_id, chunk_size = -1, 1000
+        while len(receipts := write_cursor.execute(
+            'SELECT tx_id, contract_address, status, type FROM evmtx_receipts_old '
+            'WHERE tx_id > ? ORDER BY tx_id LIMIT ?',
+            (last_tx_id, chunk_size),
+        ).fetchall()) != 0:
+            last_tx_id = receipts[-1][0]
+            logs_by_tx: defaultdict[int, list[tuple[int, bytes, str, list[bytes]]]] = defaultdict(list)  # noqa: E501
+            last_log_id = None
+            for tx_id, log_id, log_index, data, address, topic in write_cursor.execute(
+                'SELECT L.tx_id, L.identifier, L.log_index, L.data, L.address, T.topic '
+                'FROM evmtx_receipt_logs AS L '
+                'LEFT JOIN evmtx_receipt_log_topics AS T ON L.identifier=T.log '
+                'WHERE L.tx_id BETWEEN ? AND ? '
+                'ORDER BY L.tx_id, L.log_index, T.topic_index',
+                (receipts[0][0], last_tx_id),
+            ):
+                if log_id != last_log_id:
+                    logs_by_tx[tx_id].append((log_index, data, address, []))
+                    last_log_id = log_id
+                if topic is not None:
+                    logs_by_tx[tx_id][-1][3].append(topic)
+
+            write_cursor.executemany(
+                'INSERT INTO evmtx_receipts(tx_id, contract_address, status, type, logs) '
+                'VALUES(?, ?, ?, ?, ?)',
+                [(*receipt, _pack_receipt_logs(logs_by_tx.get(receipt[0], []))) for receipt in receipts],  # noqa: E501
+            )
+
+        write_cursor.executescript("""
+DROP TABLE evmtx_receipt_log_topics;
+DROP TABLE evmtx_receipt_logs;
+DROP TABLE evmtx_receipts_old;
+""")
+
+    @progress_step(description='Create xpub derived keys table.')
+    def _create_xpub_derived_keys_table(write_cursor: DBCursor) -> None:
+        write_cursor.execute("""
+CREATE TABLE IF NOT EXISTS xpub_derived_keys (
+    xpub TEXT NOT NULL,
+    derivation_path TEXT NOT NULL,
+    blockchain TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    derived_index INTEGER NOT NULL,
+    pubkey BLOB NOT NULL,
+    FOREIGN KEY(xpub, derivation_path, blockchain) REFERENCES xpubs(
+        xpub,
+        derivation_path,
+        blockchain
+    ) ON DELETE CASCADE
+    PRIMARY KEY (xpub, derivation_path, blockchain, account_index, derived_index)
+);
+""")
+
+    @progress_step(description='Add the fixed point amount columns.')
+    def _add_fixed_point_amount_columns(write_cursor: DBCursor) -> None:
+        """Add the integer columns generated from the amounts that let SQLite sum them
+        exactly with the native SUM()"""
+        for table, column in (
+                ('history_events', 'amount'),
+                ('history_events_backup', 'amount'),
+                ('event_metrics', 'metric_value'),
+        ):
+            for definition in _fixed_point_columns(column):
+                write_cursor.execute(f'ALTER TABLE {table} ADD COLUMN {definition}')
+
+    perform_userdb_upgrade_steps(db=db, progress_handler=progress_handler, should_vacuum=True)
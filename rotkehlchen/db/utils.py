@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Union
 
 from eth_utils import is_checksum_address
@@ -8,6 +9,7 @@ from rotkehlchen.accounting.structures.balance import BalanceType
 from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.chain.accounts import BlockchainAccountData, SingleBlockchainAccountData
 from rotkehlchen.chain.substrate.utils import is_valid_substrate_address
+from rotkehlchen.constants import ZERO
 from rotkehlchen.db.checks import db_script_normalizer
 from rotkehlchen.db.constants import KDF_ITER, SQL_VARIABLE_CHUNK_SIZE
 from rotkehlchen.fval import FVal
@@ -466,6 +468,29 @@ def get_query_chunks[T](
     ]
 
 
+def exact_sum_query(column: str) -> str:
+    """The aggregates that sum the decimal TEXT column exactly, read by deserialize_exact_sum.
+
+    The values that fit the integer columns generated from the column (see
+    _fixed_point_columns in the schema) are summed by SQLite's native SUM(). Only the
+    values that don't fit, which are rare, go through the python FVAL_SUM().
+    """
+    return (
+        f'SUM({column}_int), SUM({column}_frac_hi), SUM({column}_frac_lo), '
+        f'FVAL_SUM({column}) FILTER (WHERE {column}_int IS NULL)'
+    )
+
+
+def deserialize_exact_sum(sums: Sequence[Any]) -> FVal:
+    """Combine the four sums of exact_sum_query in the sum of the column. Zero if there
+    was nothing to sum."""
+    int_sum, frac_hi_sum, frac_lo_sum, other_sum = sums
+    total = ZERO if int_sum is None else FVal(
+        Decimal(int_sum * 10 ** 18 + frac_hi_sum * 10 ** 9 + frac_lo_sum).scaleb(-18),
+    )
+    return total if other_sum is None else total + FVal(other_sum)
+
+
 def unlock_database(
         db_connection: DBConnection,
         password: str,
@@ -156,6 +156,9 @@ class MarginPosition(AccountingEventMixin):
     def get_identifier(self) -> str:
         return self.identifier
 
+    def get_fingerprint_key(self) -> str:
+        return f'{self.identifier},{self.profit_loss},{self.fee}'
+
     def get_assets(self) -> list[Asset]:
         return [self.pl_currency]
 
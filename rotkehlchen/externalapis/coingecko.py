@@ -14,11 +14,20 @@ from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
 from rotkehlchen.externalapis.interface import ExternalServiceWithApiKeyOptionalDB
 from rotkehlchen.fval import FVal
-from rotkehlchen.interfaces import HistoricalPriceOracleWithCoinListInterface
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.interfaces import (
+    HistoricalPriceOracleWithCoinListInterface,
+    HistoricalPriceRangeOracleInterface,
+)
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_fval
 from rotkehlchen.types import ChainID, ExternalService, Price, Timestamp, TokenKind
-from rotkehlchen.utils.misc import set_user_agent, timestamp_to_date, ts_now
+from rotkehlchen.utils.misc import (
+    set_user_agent,
+    timestamp_to_date,
+    timestamp_to_daystart_timestamp,
+    ts_now,
+)
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
 from rotkehlchen.utils.network import create_session
 from rotkehlchen.utils.rate_limiter import TokenBucket
@@ -36,6 +45,9 @@ log = RotkehlchenLogsAdapter(logger)
 # (price lookups) finish without artificial pacing.
 COINGECKO_RATE_LIMIT_RPS: Final = 0.45
 COINGECKO_RATE_LIMIT_BURST: Final = 5
+# Longest range queried with a single market_chart/range call. Ranges above 90 days
+# return daily prices which is all we keep anyway.
+COINGECKO_RANGE_QUERY_MAX_SECONDS: Final = YEAR_IN_SECONDS
 
 
 class CoingeckoAssetData(NamedTuple):
@@ -527,8 +539,10 @@ COINGECKO_SIMPLE_VS_CURRENCIES = {
 class Coingecko(
         ExternalServiceWithApiKeyOptionalDB,
         HistoricalPriceOracleWithCoinListInterface,
+        HistoricalPriceRangeOracleInterface,
         PenalizablePriceOracleMixin,
 ):
+    range_query_max_seconds = COINGECKO_RANGE_QUERY_MAX_SECONDS
 
     def __init__(self, database: DBHandler | None) -> None:
         ExternalServiceWithApiKeyOptionalDB.__init__(self, database=database, service_name=ExternalService.COINGECKO)  # noqa: E501
@@ -908,3 +922,70 @@ class Coingecko(
             ) from e
 
         return price
+
+    def query_historical_price_range(
+            self,
+            from_asset: Asset,
+            to_asset: Asset,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> list[HistoricalPrice]:
+        """Query the daily prices between the two timestamps with a single market_chart/range
+        call. Like the prices of the history endpoint they are the first price of each UTC
+        day and are returned at the day start. Without an api key the range is limited to
+        the last year.
+
+        May raise:
+        - PriceQueryUnsupportedAsset if either from_asset or to_asset are not supported
+        - RemoteError if there is a problem querying coingecko or reading its response
+        """
+        try:
+            from_asset = from_asset.resolve_to_asset_with_oracles()
+            to_asset = to_asset.resolve_to_asset_with_oracles()
+            from_coingecko_id = from_asset.to_coingecko()
+        except (UnknownAsset, UnsupportedAsset) as e:
+            raise PriceQueryUnsupportedAsset(e.identifier) from e
+
+        if (vs_currency := Coingecko.check_vs_currencies(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            location='historical price range',
+        )) is None:
+            raise PriceQueryUnsupportedAsset(to_asset.identifier)
+
+        from_timestamp = timestamp_to_daystart_timestamp(from_timestamp)
+        if self.api_key is None:
+            from_timestamp = max(from_timestamp, Timestamp(ts_now() - YEAR_IN_SECONDS + DAY_IN_SECONDS))  # noqa: E501
+            if from_timestamp > to_timestamp:
+                return []  # the whole range is older than what can be queried
+
+        result = self._query(
+            module='coins',
+            subpath=f'{from_coingecko_id}/market_chart/range',
+            options={
+                'vs_currency': vs_currency,
+                'from': str(from_timestamp),
+                'to': str(to_timestamp),
+            },
+        )
+        prices: dict[Timestamp, HistoricalPrice] = {}
+        try:
+            for timestamp_ms, price in result['prices']:
+                day_start = timestamp_to_daystart_timestamp(Timestamp(timestamp_ms // 1000))
+                if day_start in prices or price is None:
+                    continue  # keep only the first price of each day
+
+                prices[day_start] = HistoricalPrice(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    source=HistoricalPriceOracle.COINGECKO,
+                    timestamp=day_start,
+                    price=Price(FVal(price)),
+                )
+        except (KeyError, TypeError, ValueError) as e:
+            raise RemoteError(
+                f'Unexpected coingecko market chart range response for '
+                f'{from_asset.identifier} to {to_asset.identifier}: {e!s}',
+            ) from e
+
+        return list(prices.values())
@@ -49,7 +49,10 @@ from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.deserialization import deserialize_price
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
-from rotkehlchen.interfaces import HistoricalPriceOracleWithCoinListInterface
+from rotkehlchen.interfaces import (
+    HistoricalPriceOracleWithCoinListInterface,
+    HistoricalPriceRangeOracleInterface,
+)
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_timestamp
 from rotkehlchen.types import ExternalService, Price, Timestamp
@@ -209,11 +212,55 @@ def _check_hourly_data_sanity(
             )
 
 
+def _deserialize_histohour_prices(
+        data: list[dict[str, Any]],
+        from_asset: AssetWithOracles,
+        to_asset: AssetWithOracles,
+) -> list[HistoricalPrice]:
+    """Turn histohour entries into the historical prices to enter in the DB. Entries
+    with zero price or that can't be deserialized are skipped."""
+    prices = []
+    for entry in data:
+        try:
+
+            if (
+                timestamp := deserialize_timestamp(entry['TIMESTAMP'])
+            ) < CRYPTOCOMPARE_INVALID_PRICE_TS_CUTOFF:
+                log.warning(f'Skipping cc entry with unexpected timestamp {entry=}')
+                continue
+
+            price = Price((deserialize_price(entry['HIGH']) + deserialize_price(entry['LOW'])) / 2)  # noqa: E501
+            if price == ZERO_PRICE:
+                continue  # don't write zero prices
+            prices.append(HistoricalPrice(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                source=HistoricalPriceOracle.CRYPTOCOMPARE,
+                timestamp=timestamp,
+                price=price,
+            ))
+        except (DeserializationError, KeyError) as e:
+            msg = str(e)
+            if isinstance(e, KeyError):
+                msg = f'Missing key entry for {msg}.'
+            log.error(
+                f'{msg}. Error getting price entry from cryptocompare histohour '
+                f'price results. Skipping entry.',
+            )
+            continue
+
+    return prices
+
+
 class Cryptocompare(
         ExternalServiceWithApiKeyOptionalDB,
         HistoricalPriceOracleWithCoinListInterface,
+        HistoricalPriceRangeOracleInterface,
         PenalizablePriceOracleMixin,
 ):
+    # two hours short of the query limit since the range bounds may fall within an hour
+    range_query_max_seconds = (CRYPTOCOMPARE_HOURQUERYLIMIT - 2) * HOUR_IN_SECONDS
+
     def __init__(self, database: DBHandler | None) -> None:
         HistoricalPriceOracleWithCoinListInterface.__init__(self, oracle_name='cryptocompare')
         ExternalServiceWithApiKeyOptionalDB.__init__(
@@ -882,38 +929,11 @@ class Cryptocompare(
 
         # Let's always check for data sanity for the hourly prices.
         _check_hourly_data_sanity(calculated_history, from_asset, to_asset)
-        # Turn them into the format we will enter into the DB
-        prices = []
-        for entry in calculated_history:
-            try:
-
-                if (
-                    timestamp := deserialize_timestamp(entry['TIMESTAMP'])
-                ) < CRYPTOCOMPARE_INVALID_PRICE_TS_CUTOFF:
-                    log.warning(f'Skipping cc entry with unexpected timestamp {entry=}')
-                    continue
-
-                price = Price((deserialize_price(entry['HIGH']) + deserialize_price(entry['LOW'])) / 2)  # noqa: E501
-                if price == ZERO_PRICE:
-                    continue  # don't write zero prices
-                prices.append(HistoricalPrice(
-                    from_asset=from_asset,
-                    to_asset=to_asset,
-                    source=HistoricalPriceOracle.CRYPTOCOMPARE,
-                    timestamp=timestamp,
-                    price=price,
-                ))
-            except (DeserializationError, KeyError) as e:
-                msg = str(e)
-                if isinstance(e, KeyError):
-                    msg = f'Missing key entry for {msg}.'
-                log.error(
-                    f'{msg}. Error getting price entry from cryptocompare histohour '
-                    f'price results. Skipping entry.',
-                )
-                continue
-
-        GlobalDBHandler.add_historical_prices(prices)
+        GlobalDBHandler.add_historical_prices(_deserialize_histohour_prices(
+            data=calculated_history,
+            from_asset=from_asset,
+            to_asset=to_asset,
+        ))
         self.last_histohour_query_ts = ts_now()  # also save when last query finished
 
     def query_historical_price(
@@ -955,6 +975,37 @@ class Cryptocompare(
         log.debug('Got historical price from cryptocompare', from_asset=from_asset, to_asset=to_asset, timestamp=timestamp, price=price)  # noqa: E501
         return price
 
+    def query_historical_price_range(
+            self,
+            from_asset: Asset,
+            to_asset: Asset,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> list[HistoricalPrice]:
+        """Query the hourly prices between the two timestamps with a single histohour call
+
+        May raise:
+        - PriceQueryUnsupportedAsset if from/to asset is known to miss from cryptocompare
+        - RemoteError if there is a problem reaching the cryptocompare server
+        or with reading the response returned by the server
+        """
+        try:
+            from_asset = from_asset.resolve_to_asset_with_oracles()
+            to_asset = to_asset.resolve_to_asset_with_oracles()
+        except (UnknownAsset, WrongAssetType) as e:
+            raise PriceQueryUnsupportedAsset(e.identifier) from e
+
+        data = self.query_endpoint_histohour(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            limit=min(
+                CRYPTOCOMPARE_HOURQUERYLIMIT,
+                (to_timestamp - from_timestamp) // HOUR_IN_SECONDS + 2,
+            ),
+            to_timestamp=to_timestamp,
+        )
+        return _deserialize_histohour_prices(data=data, from_asset=from_asset, to_asset=to_asset)
+
     def all_coins(self) -> dict[str, dict[str, Any]]:
         """
         Gets the mapping of all the cryptocompare coins.
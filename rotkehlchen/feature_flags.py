@@ -2,8 +2,14 @@ import os
 from typing import Final
 
 ROTKI_ACCOUNTING_UPDATE: Final = 'ROTKI_ACCOUNTING_UPDATE'
+ROTKI_CHUNKED_BACKUPS: Final = 'ROTKI_CHUNKED_BACKUPS'
 
 
 def is_accounting_update_enabled() -> bool:
     """Return whether experimental accounting update functionality is enabled."""
     return os.environ.get(ROTKI_ACCOUNTING_UPDATE) == 'True'
+
+
+def is_chunked_backups_enabled() -> bool:
+    """Return whether experimental chunked premium DB backups are enabled."""
+    return os.environ.get(ROTKI_CHUNKED_BACKUPS) == 'True'
@@ -67,6 +67,7 @@ from rotkehlchen.utils.serialization import (
     deserialize_generic_asset_from_db,
 )
 
+from .price_series import PriceSeriesCache
 from .upgrades.manager import configure_globaldb
 from .utils import GLOBAL_DB_VERSION, globaldb_get_setting_value, initialize_globaldb
 
@@ -82,6 +83,12 @@ if TYPE_CHECKING:
     from rotkehlchen.user_messages import MessagesAggregator
 
 MANUAL_SERIALIZED: Final = HistoricalPriceOracle.MANUAL.serialize_for_db()
+# How many from/to/timestamp entries to resolve per historical prices query. Each takes 4 bindings
+HISTORICAL_PRICES_QUERY_CHUNK_SIZE: Final = 2000
+# Setting bumped by every write that can change a price already stored in price_history.
+# Plain additions of new prices from the oracles don't bump it, since they can't change
+# a price that was already used.
+PRICE_HISTORY_VERSION_SETTING: Final = 'price_history_version'
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
@@ -106,6 +113,43 @@ ALL_ASSETS_TABLES_QUERY_WITH_COLLECTIONS = (
 )
 
 
+def _source_priority_case(
+        sources: tuple[HistoricalPriceOracle, ...] | None,
+) -> tuple[str, list]:
+    """Build a CASE expression ranking price_history rows by their source and its bindings.
+
+    Manual prices always rank first, followed by the given sources in order (if provided)
+    and any non-listed sources last.
+    """
+    bindings: list = [MANUAL_SERIALIZED]
+    if sources is None:
+        return 'CASE WHEN source_type=? THEN 0 ELSE 1 END', bindings
+
+    # assign a numerical priority to the rows based on the oracle priority order
+    # so then the SQL query sorts by it
+    case_parts, priority = ['CASE WHEN source_type=? THEN 0'], 1
+    for source in sources:
+        if source == HistoricalPriceOracle.MANUAL:  # manual price entries always first
+            continue
+
+        case_parts.append(f'WHEN source_type=? THEN {priority}')
+        bindings.append(source.serialize_for_db())
+        priority += 1
+
+    # 999 is an intentionally very low-priority rank for any source not explicitly
+    # listed above. This keeps unknown/unlisted sources after all preferred ones.
+    case_parts.append('ELSE 999 END')
+    return ' '.join(case_parts), bindings
+
+
+def _bump_price_history_version(write_cursor: DBCursor) -> None:
+    write_cursor.execute(
+        "INSERT INTO settings(name, value) VALUES(?, '1') "
+        'ON CONFLICT(name) DO UPDATE SET value=CAST(value AS INTEGER) + 1',
+        (PRICE_HISTORY_VERSION_SETTING,),
+    )
+
+
 def _prioritize_manual_balances_query(
         sources: tuple[HistoricalPriceOracle, ...] | None = None,
         timestamp: Timestamp | None = None,
@@ -119,26 +163,7 @@ def _prioritize_manual_balances_query(
       3. then explicit source order (if provided)
       4. any non-listed sources last
     """
-    bindings: list = [MANUAL_SERIALIZED]
-    if sources is None:
-        source_priority_case = 'CASE WHEN source_type=? THEN 0 ELSE 1 END'
-    else:
-        # assign a numerical priority to the rows based on the oracle priority order
-        # so then the SQL query sorts by it
-        case_parts, priority = ['CASE WHEN source_type=? THEN 0'], 1
-        for source in sources:
-            if source == HistoricalPriceOracle.MANUAL:  # manual price entries always first
-                continue
-
-            case_parts.append(f'WHEN source_type=? THEN {priority}')
-            bindings.append(source.serialize_for_db())
-            priority += 1
-
-        # 999 is an intentionally very low-priority rank for any source not explicitly
-        # listed above. This keeps unknown/unlisted sources after all preferred ones.
-        case_parts.append('ELSE 999 END')
-        source_priority_case = ' '.join(case_parts)
-
+    source_priority_case, bindings = _source_priority_case(sources=sources)
     if timestamp is not None:
         # ABS(timestamp - ?) is the first placeholder in ORDER BY, so timestamp
         # must be bound first, followed by the CASE placeholders for source_type.
@@ -155,6 +180,8 @@ class GlobalDBHandler:
     conn: DBConnection
     used_backup: bool  # specifies if the global DB was restored from a backup
     packaged_db_lock: Lock
+    # in-memory price series of the price_history table used while its scope is open
+    price_series: PriceSeriesCache
     # guards the lazy creation of _packaged_db_conn. Class-level since the
     # connection may first be needed concurrently from any two threads
     _packaged_db_conn_lock: Lock = Lock()
@@ -204,6 +231,7 @@ class GlobalDBHandler:
             sql_vm_instructions_cb=sql_vm_instructions_cb,
         )
         GlobalDBHandler.__instance.packaged_db_lock = Lock()
+        GlobalDBHandler.__instance.price_series = PriceSeriesCache()
 
         # initialise the asset resolver here since asset updater class might require it.
         AssetResolver(globaldb=GlobalDBHandler.__instance, constant_assets=CONSTANT_ASSETS)
@@ -1512,8 +1540,19 @@ class GlobalDBHandler:
     ) -> HistoricalPrice | None:
         """Gets the price around a particular timestamp
 
-        If no price can be found returns None
+        If no price can be found returns None. While a price series cache scope is
+        open the lookup is served from the in-memory series of the asset pair.
         """
+        if (globaldb := GlobalDBHandler()).price_series.active:
+            return globaldb.price_series.get_historical_price(
+                conn=globaldb.conn,
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+                max_seconds_distance=max_seconds_distance,
+                sources=sources,
+            )
+
         querystr = (
             'SELECT from_asset, to_asset, source_type, timestamp, price FROM price_history '
             'WHERE from_asset=? AND to_asset=? AND timestamp between ? AND ?'
@@ -1544,45 +1583,68 @@ class GlobalDBHandler:
 
     @staticmethod
     def get_historical_prices(
-            query_data: list[tuple[Asset, Asset, Timestamp]],
+            query_data: Sequence[tuple[Asset, Asset, Timestamp]],
             max_seconds_distance: int,
             source: HistoricalPriceOracle | None = None,
+            sources: tuple[HistoricalPriceOracle, ...] | None = None,
     ) -> list[HistoricalPrice | None]:
         """Given a list of from/to/timestamp data to query returns all values
         that could be found in the DB and None for those that could not be found.
+
+        Each entry gets the same price get_historical_price would return for it, but all
+        the entries are resolved with one query per chunk by joining them with price_history
+        and ranking the candidate rows of each entry. Either a single source or a tuple of
+        sources in order of preference can be given to restrict the lookup.
         """
-        querystr = (
-            'SELECT from_asset, to_asset, source_type, timestamp, price '
-            'FROM price_history WHERE from_asset=? AND to_asset=? AND timestamp BETWEEN ? AND ?'
-        )
-        querylist: list[tuple] = []
         if source is not None:
-            querystr += ' AND source_type=? '
-            serialized_source = source.serialize_for_db()
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance, serialized_source))  # noqa: E501
+            sources = (source,)
+        elif sources is not None and len(sources) == 0:
+            return [None] * len(query_data)
 
-        else:
-            for from_asset, to_asset, timestamp in query_data:
-                querylist.append((from_asset.identifier, to_asset.identifier, timestamp - max_seconds_distance, timestamp + max_seconds_distance))  # noqa: E501
+        priority_case, priority_bindings = _source_priority_case(sources=sources)
+        source_filter, source_bindings = '', []
+        if sources is not None:
+            source_filter = f' AND price_history.source_type IN ({",".join(["?"] * len(sources))})'  # noqa: E501
+            source_bindings = [entry.serialize_for_db() for entry in sources]
 
-        prices_results: list[HistoricalPrice | None] = []
+        prices_results: list[HistoricalPrice | None] = [None] * len(query_data)
         with GlobalDBHandler().conn.read_ctx() as cursor:
-            for query_entry, (_, _, queried_timestamp) in zip(querylist, query_data, strict=True):
-                order_str, order_bindings = _prioritize_manual_balances_query(timestamp=queried_timestamp)  # noqa: E501
-                result = cursor.execute(querystr + order_str, query_entry + tuple(order_bindings)).fetchone()  # noqa: E501
-                if result is None:
-                    prices_results.append(None)
-                    continue
+            for chunk_start in range(0, len(query_data), HISTORICAL_PRICES_QUERY_CHUNK_SIZE):
+                chunk = query_data[chunk_start:chunk_start + HISTORICAL_PRICES_QUERY_CHUNK_SIZE]
+                requests_bindings: list = []
+                for idx, (from_asset, to_asset, timestamp) in enumerate(chunk, start=chunk_start):
+                    requests_bindings.extend((idx, from_asset.identifier, to_asset.identifier, timestamp))  # noqa: E501
 
-                db_price = HistoricalPrice.deserialize_from_db(result)
-                prices_results.append(HistoricalPrice(
-                    from_asset=db_price.from_asset,
-                    to_asset=db_price.to_asset,
-                    source=db_price.source,
-                    timestamp=queried_timestamp,  # Use original queried timestamp
-                    price=db_price.price,
-                ))
+                cursor.execute(
+                    f'WITH requests(idx, from_asset, to_asset, timestamp) AS (VALUES {",".join(["(?, ?, ?, ?)"] * len(chunk))}) '  # noqa: E501
+                    'SELECT idx, from_asset, to_asset, source_type, timestamp, price FROM ('
+                    'SELECT requests.idx, price_history.from_asset, price_history.to_asset, '
+                    'price_history.source_type, price_history.timestamp, price_history.price, '
+                    'ROW_NUMBER() OVER (PARTITION BY requests.idx ORDER BY '
+                    'ABS(price_history.timestamp - requests.timestamp), '
+                    f'{priority_case}) AS price_rank '
+                    'FROM requests JOIN price_history ON '
+                    'price_history.from_asset=requests.from_asset AND '
+                    'price_history.to_asset=requests.to_asset AND '
+                    'price_history.timestamp BETWEEN requests.timestamp - ? AND requests.timestamp + ?'  # noqa: E501
+                    f'{source_filter}) WHERE price_rank=1',
+                    (
+                        *requests_bindings,
+                        *priority_bindings,
+                        max_seconds_distance,
+                        max_seconds_distance,
+                        *source_bindings,
+                    ),
+                )
+                for entry in cursor:
+                    db_price = HistoricalPrice.deserialize_from_db(entry[1:])
+                    prices_results[entry[0]] = HistoricalPrice(
+                        from_asset=db_price.from_asset,
+                        to_asset=db_price.to_asset,
+                        source=db_price.source,
+                        timestamp=query_data[entry[0]][2],  # Use original queried timestamp
+                        price=db_price.price,
+                    )
 
         return prices_results
 
@@ -1592,13 +1654,14 @@ class GlobalDBHandler:
 
         If any addition causes a DB error it's skipped and an error is logged
         """
+        added = [x.serialize_for_db() for x in entries]
         try:
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
                 write_cursor.executemany(
                     """INSERT OR IGNORE INTO price_history(
                     from_asset, to_asset, source_type, timestamp, price
                     ) VALUES (?, ?, ?, ?, ?)
-                    """, [x.serialize_for_db() for x in entries],
+                    """, added,
                 )
         except rsqlite.IntegrityError as e:
             # roll back any of the executemany that may have gone in
@@ -1607,6 +1670,7 @@ class GlobalDBHandler:
                 f'Will attempt to input them one by one',
             )
 
+            added = []
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
                 for entry in entries:
                     try:
@@ -1614,12 +1678,16 @@ class GlobalDBHandler:
                             """INSERT OR IGNORE INTO price_history(
                             from_asset, to_asset, source_type, timestamp, price
                             ) VALUES (?, ?, ?, ?, ?)
-                            """, entry.serialize_for_db(),
+                            """, (serialized := entry.serialize_for_db()),
                         )
                     except rsqlite.IntegrityError as entry_error:
                         log.error(
                             f'Failed to add {entry!s} due to {entry_error!s}. Skipping entry addition',  # noqa: E501
                         )
+                    else:
+                        added.append(serialized)
+
+        GlobalDBHandler().price_series.merge_prices(rows=added, replace=False)
 
     @staticmethod
     def add_single_historical_price(entry: HistoricalPrice) -> bool:
@@ -1639,12 +1707,14 @@ class GlobalDBHandler:
                     """,
                     serialized,
                 )
+                _bump_price_history_version(write_cursor)
         except rsqlite.IntegrityError as e:
             log.error(
                 f'Failed to add single historical price. {e!s}. ',
             )
             return False
 
+        GlobalDBHandler().price_series.merge_prices(rows=[serialized], replace=True)
         return True
 
     @staticmethod
@@ -1706,7 +1776,11 @@ class GlobalDBHandler:
                 'SELECT from_asset, to_asset FROM price_history WHERE source_type=? AND (from_asset=? OR to_asset=?)',  # noqa: E501
                 (HistoricalPriceOracle.MANUAL_CURRENT.serialize_for_db(), from_asset.identifier, from_asset.identifier),  # noqa: E501
             )
-            return {Asset(asset) for entry in write_cursor for asset in entry}
+            assets_to_invalidate = {Asset(asset) for entry in write_cursor for asset in entry}
+            _bump_price_history_version(write_cursor)
+
+        GlobalDBHandler().price_series.invalidate_assets([from_asset.identifier])
+        return assets_to_invalidate
 
     @staticmethod
     def get_manual_current_price(asset: Asset) -> tuple[Asset, Price] | None:
@@ -1791,8 +1865,10 @@ class GlobalDBHandler:
                 raise InputError(
                     f'Not found manual current price to delete for asset {asset!s}',
                 )
+            _bump_price_history_version(write_cursor)
 
-            return assets_to_invalidate
+        GlobalDBHandler().price_series.invalidate_assets([asset.identifier])
+        return assets_to_invalidate
 
     @staticmethod
     def get_manual_prices(
@@ -1845,6 +1921,7 @@ class GlobalDBHandler:
 
                 if write_cursor.rowcount == 0:
                     return False
+                _bump_price_history_version(write_cursor)
         except rsqlite.IntegrityError as e:
             log.error(
                 f'Failed to edit manual historical prices from {entry.from_asset} '
@@ -1852,6 +1929,7 @@ class GlobalDBHandler:
             )
             return False
 
+        GlobalDBHandler().price_series.merge_prices(rows=[entry_serialized], replace=True)
         return True
 
     @staticmethod
@@ -1883,7 +1961,13 @@ class GlobalDBHandler:
                     f'and timestamp: {timestamp!s} for source: {source_type!s}.',
                 )
                 return False
+            _bump_price_history_version(write_cursor)
 
+        GlobalDBHandler().price_series.remove_prices(
+            pair=(from_asset.identifier, to_asset.identifier),
+            source_type=bindings[3],
+            timestamp=timestamp,
+        )
         return True
 
     @staticmethod
@@ -1901,12 +1985,19 @@ class GlobalDBHandler:
         try:
             with GlobalDBHandler().conn.write_ctx() as write_cursor:
                 write_cursor.execute(querystr, tuple(query_list))
+                if write_cursor.rowcount != 0:
+                    _bump_price_history_version(write_cursor)
         except rsqlite.IntegrityError as e:
             log.error(
                 f'Failed to delete historical prices from {from_asset} to {to_asset} '
                 f'and source: {source!s} due to {e!s}',
             )
 
+        GlobalDBHandler().price_series.remove_prices(
+            pair=(from_asset.identifier, to_asset.identifier),
+            source_type=None if source is None else source.serialize_for_db(),
+        )
+
     @staticmethod
     def get_historical_price_range(
             from_asset: Asset,
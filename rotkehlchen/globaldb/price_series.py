@@ -0,0 +1,282 @@
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Final
+
+from rotkehlchen.history.deserialization import deserialize_price
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from rotkehlchen.assets.asset import Asset
+    from rotkehlchen.db.drivers.sqlite import DBConnection
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Upper bound of price points kept in memory across all the cached pairs
+PRICE_SERIES_CACHE_MAX_POINTS: Final = 500_000
+
+
+@dataclass(slots=True)
+class PriceSeries:
+    """All the cached price_history rows of an asset pair sorted by timestamp and source
+
+    The rows are kept in compact columns instead of as objects per row.
+    """
+    timestamps: array  # array('q')
+    sources: bytearray  # the serialized HistoricalPriceOracle of each row as a single byte
+    prices: list[str]  # the price of each row as stored in the DB
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def find(self, timestamp: int, source: int) -> tuple[int, bool]:
+        """Return the position of the row with the given timestamp and source and whether
+        it exists. If it does not exist the position is where it has to be inserted."""
+        idx, hi = bisect_left(self.timestamps, timestamp), bisect_right(self.timestamps, timestamp)  # noqa: E501
+        while idx < hi and self.sources[idx] < source:
+            idx += 1
+
+        return idx, idx < hi and self.sources[idx] == source
+
+    def insert(self, idx: int, timestamp: int, source: int, price: str) -> None:
+        self.timestamps.insert(idx, timestamp)
+        self.sources.insert(idx, source)
+        self.prices.insert(idx, price)
+
+    def delete(self, idx: int) -> None:
+        del self.timestamps[idx]
+        del self.sources[idx]
+        del self.prices[idx]
+
+
+def _source_priority(
+        source: str,
+        sources: tuple[HistoricalPriceOracle, ...] | None,
+) -> int:
+    """Rank a row's source the same way the globaldb historical price query does.
+
+    Manual prices always rank first, followed by the given sources in order (if provided)
+    and any non-listed sources last.
+    """
+    if source == HistoricalPriceOracle.MANUAL.serialize_for_db():
+        return 0
+
+    if sources is None:
+        return 1
+
+    priority = 1
+    for entry in sources:
+        if entry == HistoricalPriceOracle.MANUAL:
+            continue
+        if entry.serialize_for_db() == source:
+            return priority
+        priority += 1
+
+    return 999
+
+
+class PriceSeriesCache:
+    """In-memory cache of the price_history rows of asset pairs
+
+    It is only used while a scope is open, e.g. while a PnL report or the history events
+    stats are processed, since those query prices for a lot of timestamps of the same
+    few asset pairs. On the first lookup of a pair all its rows are loaded and then every
+    other lookup is a binary search over them. Pairs are evicted in LRU order when the
+    total amount of points exceeds max_points.
+
+    Every write to the price_history table needs to be applied to the cached series of the
+    affected pairs with merge_prices or remove_prices.
+    """
+
+    def __init__(self, max_points: int = PRICE_SERIES_CACHE_MAX_POINTS) -> None:
+        self.max_points = max_points
+        self.series: OrderedDict[tuple[str, str], PriceSeries] = OrderedDict()
+        self.total_points = 0
+        self.lock = Lock()
+        self._active_scopes = 0
+        # bumped on every write so that series loaded concurrently with a
+        # write are not stored in the cache after the write has happened
+        self._generation = 0
+
+    @property
+    def active(self) -> bool:
+        return self._active_scopes > 0
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Use the cache for historical price lookups until the scope exits.
+
+        Scopes can be nested. The cached series are dropped when the outermost exits.
+        """
+        with self.lock:
+            self._active_scopes += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self._active_scopes -= 1
+                if self._active_scopes == 0:
+                    self._clear()
+
+    def get_historical_price(
+            self,
+            conn: DBConnection,
+            from_asset: Asset,
+            to_asset: Asset,
+            timestamp: Timestamp,
+            max_seconds_distance: int,
+            sources: tuple[HistoricalPriceOracle, ...] | None = None,
+    ) -> HistoricalPrice | None:
+        """Same semantics as GlobalDBHandler.get_historical_price but served from memory.
+
+        Picks the row closest to timestamp within max_seconds_distance and breaks ties
+        by source preference (manual first, then the given sources order).
+        """
+        if sources is not None and len(sources) == 0:
+            return None
+
+        series = self._get_or_load(conn=conn, from_asset=from_asset, to_asset=to_asset)
+        allowed = None if sources is None else {ord(x.serialize_for_db()) for x in sources}
+        lo = bisect_left(series.timestamps, timestamp - max_seconds_distance)
+        hi = bisect_right(series.timestamps, timestamp + max_seconds_distance)
+        best_idx, best_key = None, None
+        for idx in range(lo, hi):
+            if allowed is not None and series.sources[idx] not in allowed:
+                continue
+
+            key = (
+                abs(series.timestamps[idx] - timestamp),
+                _source_priority(source=chr(series.sources[idx]), sources=sources),
+            )
+            if best_key is None or key < best_key:
+                best_idx, best_key = idx, key
+
+        if best_idx is None:
+            return None
+
+        return HistoricalPrice(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            source=HistoricalPriceOracle.deserialize_from_db(chr(series.sources[best_idx])),
+            timestamp=Timestamp(series.timestamps[best_idx]),
+            price=deserialize_price(series.prices[best_idx]),
+        )
+
+    def merge_prices(
+            self,
+            rows: Iterable[tuple[str, str, str, int, str]],
+            replace: bool,
+    ) -> None:
+        """Apply written price_history rows to the cached series of their pairs.
+
+        The rows are in the format of HistoricalPrice.serialize_for_db. A row that already
+        exists in the series only has its price updated if replace is True, mirroring
+        INSERT OR REPLACE and INSERT OR IGNORE respectively.
+        """
+        with self.lock:
+            self._generation += 1
+            for from_asset, to_asset, source_type, timestamp, price in rows:
+                if (series := self.series.get((from_asset, to_asset))) is None:
+                    continue  # the pair is loaded from the DB with the row on first lookup
+
+                idx, exists = series.find(timestamp=timestamp, source=ord(source_type))
+                if exists is False:
+                    series.insert(idx=idx, timestamp=timestamp, source=ord(source_type), price=price)  # noqa: E501
+                    self.total_points += 1
+                elif replace:
+                    series.prices[idx] = price
+
+            self._evict()
+
+    def remove_prices(
+            self,
+            pair: tuple[str, str],
+            source_type: str | None = None,
+            timestamp: int | None = None,
+    ) -> None:
+        """Apply deleted price_history rows of the pair to its cached series. The rows can
+        be narrowed down by source and timestamp, otherwise all rows of the pair go."""
+        with self.lock:
+            self._generation += 1
+            if (series := self.series.get(pair)) is None:
+                return
+
+            if source_type is None and timestamp is None:
+                self.series.pop(pair)
+                self.total_points -= len(series)
+                return
+
+            source = None if source_type is None else ord(source_type)
+            if timestamp is not None:
+                lo, hi = bisect_left(series.timestamps, timestamp), bisect_right(series.timestamps, timestamp)  # noqa: E501
+            else:
+                lo, hi = 0, len(series)
+            for idx in range(hi - 1, lo - 1, -1):
+                if source is None or series.sources[idx] == source:
+                    series.delete(idx)
+                    self.total_points -= 1
+
+    def invalidate_assets(self, asset_ids: Iterable[str]) -> None:
+        """Drop the cached series of all pairs that include any of the given assets"""
+        asset_ids = set(asset_ids)
+        with self.lock:
+            self._generation += 1
+            for pair in [x for x in self.series if x[0] in asset_ids or x[1] in asset_ids]:
+                self.total_points -= len(self.series.pop(pair))
+
+    def _clear(self) -> None:
+        self._generation += 1
+        self.series.clear()
+        self.total_points = 0
+
+    def _evict(self) -> None:
+        """Evict pairs in LRU order until the points fit in max_points. The most recently
+        used pair is always kept even if on its own it exceeds the limit."""
+        while self.total_points > self.max_points and len(self.series) > 1:
+            _, evicted = self.series.popitem(last=False)
+            self.total_points -= len(evicted)
+
+    def _get_or_load(
+            self,
+            conn: DBConnection,
+            from_asset: Asset,
+            to_asset: Asset,
+    ) -> PriceSeries:
+        key = (from_asset.identifier, to_asset.identifier)
+        with self.lock:
+            if (series := self.series.get(key)) is not None:
+                self.series.move_to_end(key)
+                return series
+            generation = self._generation
+
+        series = PriceSeries(timestamps=array('q'), sources=bytearray(), prices=[])
+        with conn.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT timestamp, source_type, price FROM price_history '
+                'WHERE from_asset=? AND to_asset=? ORDER BY timestamp, source_type',
+                key,
+            )
+            for entry in cursor:
+                series.timestamps.append(entry[0])
+                series.sources.append(ord(entry[1]))
+                series.prices.append(entry[2])
+
+        with self.lock:
+            if generation != self._generation or key in self.series or self._active_scopes == 0:  # noqa: E501
+                return series  # the cache changed while loading. Use it once without storing
+
+            self.series[key] = series
+            self.total_points += len(series)
+            self._evict()
+
+        log.debug(f'Loaded {len(series)} cached prices of {key[0]} -> {key[1]} in memory')
+        return series
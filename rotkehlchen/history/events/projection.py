@@ -0,0 +1,160 @@
+"""Projection of history events DB rows for the history events listing API
+
+Listing a page of history events used to build the full event object of each row only to
+serialize it again right away. For the entry types whose API serialization depends only on
+their DB row, ProjectedHistoryEvent serializes the row straight to the API dict. It only has
+what the listing reads, as given by HistoryEventForApi, so any other attribute raises.
+"""
+from typing import TYPE_CHECKING, Any, Final
+
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.history.events.structures.base import (
+    HistoryBaseEntry,
+    HistoryBaseEntryType,
+    HistoryEvent,
+    serialize_history_event_for_api,
+)
+from rotkehlchen.history.events.structures.evm_event import ALL_DETAILS_KEYS, EvmEvent
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_fval
+from rotkehlchen.types import Location, TimestampMS, deserialize_evm_tx_hash
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.types import EventAccountingRuleStatus
+    from rotkehlchen.db.constants import HistoryMappingState
+
+# The entry types that are projected and the event class of each. Others, such as the eth
+# staking events, asset movements and swaps, generate parts of their serialization (auto
+# notes, staking fields) and are always built as full events.
+PROJECTED_EVENT_CLASSES: Final[dict[HistoryBaseEntryType, type[HistoryEvent | EvmEvent]]] = {
+    HistoryBaseEntryType.HISTORY_EVENT: HistoryEvent,
+    HistoryBaseEntryType.EVM_EVENT: EvmEvent,
+}
+_DB_LOCATIONS: Final = {location.serialize_for_db(): location for location in Location}
+
+
+class ProjectedHistoryEvent:
+    """A history event DB row of one of the PROJECTED_EVENT_CLASSES serialized for the api
+    without building the event. Implements HistoryEventForApi, so that the history events
+    listing can use it in place of the event."""
+    __slots__ = (
+        '_event',
+        '_extra_data',
+        '_raw_extra_data',
+        '_row',
+        '_serialized_amount',
+        'entry_type',
+        'event_subtype',
+        'event_type',
+        'group_identifier',
+        'identifier',
+        'location',
+        'location_label',
+        'notes',
+        'sequence_index',
+        'timestamp',
+    )
+
+    def __init__(self, entry_type: HistoryBaseEntryType, entry: tuple) -> None:
+        """Project the given row as read by deserialize_from_db of the entry type's class.
+
+        May raise the same errors as deserialize_from_db, so the same rows are skipped:
+        - DeserializationError
+        - UnknownAsset
+        """
+        self._event: HistoryBaseEntry | None = None
+        self._row = entry
+        self.entry_type = entry_type
+        self.identifier: int = entry[0]
+        self.group_identifier: str = entry[1]
+        self.sequence_index: int = entry[2]
+        self.timestamp = TimestampMS(entry[3])
+        if (location := _DB_LOCATIONS.get(entry[4])) is None:
+            location = Location.deserialize_from_db(entry[4])  # raises the proper error
+        self.location = location
+        self.location_label: str | None = entry[5]
+        Asset(entry[6]).check_existence()
+        self._serialized_amount = str(deserialize_fval(entry[7], 'amount', 'history event'))
+        self.notes: str | None = entry[8]
+        self.event_type = HistoryEventType.deserialize(entry[9])
+        self.event_subtype = HistoryEventSubType.deserialize(entry[10])
+        self._extra_data: dict[str, Any] | None = None
+        self._raw_extra_data: str | None = entry[11]
+
+    def full_event(self) -> HistoryBaseEntry:
+        """The full event of the row. Built on first access"""
+        if self._event is None:
+            self._event = PROJECTED_EVENT_CLASSES[self.entry_type].deserialize_from_db(self._row)  # noqa: E501
+        return self._event
+
+    @property
+    def extra_data(self) -> dict[str, Any] | None:
+        if (raw_extra_data := self._raw_extra_data) is not None:
+            self._extra_data = HistoryBaseEntry.deserialize_extra_data(
+                entry=(self.identifier, self.group_identifier),
+                extra_data=raw_extra_data,
+            )
+            self._raw_extra_data = None
+        return self._extra_data
+
+    def should_ignore(self, ignored_ids: set[str]) -> bool:
+        return self.group_identifier in ignored_ids
+
+    def serialize(self) -> dict[str, Any]:
+        """Same as the serialize() of the full event"""
+        if self.location == Location.KRAKEN and self.event_type == HistoryEventType.STAKING:
+            return self.full_event().serialize()  # has auto generated notes
+
+        serialized_data = {
+            'timestamp': self.timestamp,
+            'event_type': self.event_type.serialize(),
+            'event_subtype': self.event_subtype.serialize_or_none(),
+            'location': str(self.location),
+            'location_label': self.location_label,
+            'asset': self._row[6],
+            'amount': self._serialized_amount,
+            'identifier': self.identifier,
+            'entry_type': self.entry_type.serialize(),
+            'group_identifier': self.group_identifier,
+            'sequence_index': self.sequence_index,
+            'extra_data': self.extra_data,
+        }
+        if self.notes is not None:
+            serialized_data['user_notes'] = self.notes
+
+        if self.entry_type == HistoryBaseEntryType.EVM_EVENT:
+            serialized_data |= {
+                'tx_ref': str(deserialize_evm_tx_hash(self._row[13])),
+                'counterparty': self._row[14],
+                'address': self._row[15],
+            }
+
+        return serialized_data
+
+    def serialize_for_api(
+            self,
+            mapping_states: dict[int, list[HistoryMappingState]],
+            ignored_ids: set[str],
+            hidden_event_ids: set[int],
+            event_accounting_rule_status: EventAccountingRuleStatus,
+            grouped_events_num: int | None = None,
+            has_ignored_assets: bool = False,
+    ) -> dict[str, Any]:
+        """Same as the serialize_for_api() of the full event"""
+        result = serialize_history_event_for_api(
+            event=self,
+            mapping_states=mapping_states,
+            ignored_ids=ignored_ids,
+            hidden_event_ids=hidden_event_ids,
+            event_accounting_rule_status=event_accounting_rule_status,
+            grouped_events_num=grouped_events_num,
+            has_ignored_assets=has_ignored_assets,
+        )
+        if (  # see EvmEvent.has_details
+            self.entry_type == HistoryBaseEntryType.EVM_EVENT and
+            (extra_data := self.extra_data) is not None and
+            len(extra_data.keys() & ALL_DETAILS_KEYS) > 0
+        ):
+            result['has_details'] = True
+
+        return result
@@ -60,6 +60,7 @@ AssetMovementTransferSubtype = Literal[HistoryEventSubType.RECEIVE, HistoryEvent
 
 class AssetMovement(HistoryBaseEntry[AssetMovementExtraData | None]):
     """Asset movement event representing deposits and withdrawals on exchanges."""
+    __slots__ = ()
 
     extra_data: AssetMovementExtraData | None
 
@@ -160,9 +161,8 @@ class AssetMovement(HistoryBaseEntry[AssetMovementExtraData | None]):
             event_subtype=event_subtype,
             asset=Asset(entry[6]).check_existence(),
             amount=amount,
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
             notes=entry[8],
-        )
+        )._with_db_extra_data(entry[11])
 
     def serialize(self) -> dict[str, Any]:
         """Serialize the event for api, and generate the auto_notes.
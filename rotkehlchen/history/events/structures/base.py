@@ -2,7 +2,7 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from enum import auto
-from typing import TYPE_CHECKING, Any, TypedDict, TypeVar
+from typing import TYPE_CHECKING, Any, Protocol, Self, TypedDict, TypeVar
 
 from rotkehlchen.accounting.constants import DEFAULT, EVENT_CATEGORY_MAPPINGS, EXCHANGE
 from rotkehlchen.accounting.mixins.event import AccountingEventMixin, AccountingEventType
@@ -27,6 +27,8 @@ from rotkehlchen.utils.misc import timestamp_to_date, ts_ms_to_sec
 from rotkehlchen.utils.mixins.enums import DBIntEnumMixIn
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from more_itertools import peekable
 
     from rotkehlchen.accounting.pot import AccountingPot
@@ -173,13 +175,116 @@ class HistoryBaseEntryData[
     extra_data: ExtraDataType | None
 
 
+class HistoryEventForApi(Protocol):
+    """What the history events listing reads from the events it serializes for the api.
+    Implemented by HistoryBaseEntry and by the ProjectedHistoryEvent of its DB rows."""
+
+    @property
+    def identifier(self) -> int | None:
+        ...
+
+    @property
+    def group_identifier(self) -> str:
+        ...
+
+    @property
+    def sequence_index(self) -> int:
+        ...
+
+    @property
+    def timestamp(self) -> TimestampMS:
+        ...
+
+    @property
+    def entry_type(self) -> HistoryBaseEntryType:
+        ...
+
+    @property
+    def event_type(self) -> HistoryEventType:
+        ...
+
+    @property
+    def event_subtype(self) -> HistoryEventSubType:
+        ...
+
+    @property
+    def extra_data(self) -> Mapping[str, Any] | None:
+        ...
+
+    def serialize(self) -> dict[str, Any]:
+        ...
+
+    def should_ignore(self, ignored_ids: set[str]) -> bool:
+        ...
+
+    def serialize_for_api(
+            self,
+            mapping_states: dict[int, list[HistoryMappingState]],
+            ignored_ids: set[str],
+            hidden_event_ids: set[int],
+            event_accounting_rule_status: EventAccountingRuleStatus,
+            grouped_events_num: int | None = None,
+            has_ignored_assets: bool = False,
+    ) -> dict[str, Any]:
+        ...
+
+
+def serialize_history_event_for_api(
+        event: HistoryEventForApi,
+        mapping_states: dict[int, list[HistoryMappingState]],
+        ignored_ids: set[str],
+        hidden_event_ids: set[int],
+        event_accounting_rule_status: EventAccountingRuleStatus,
+        grouped_events_num: int | None = None,
+        has_ignored_assets: bool = False,
+) -> dict[str, Any]:
+    """Serialize event and extra flags for api"""
+    result: dict[str, Any] = {'entry': event.serialize()}
+    if event.should_ignore(ignored_ids=ignored_ids):
+        result['ignored_in_accounting'] = True
+    if (
+        event.identifier is not None and
+        (event_states := mapping_states.get(event.identifier)) is not None
+    ):
+        result['states'] = [x.serialize() for x in event_states]
+    if event.identifier in hidden_event_ids:
+        result['hidden'] = True
+    if grouped_events_num is not None:
+        result['grouped_events_num'] = grouped_events_num
+    if has_ignored_assets:
+        result['has_ignored_assets'] = True
+
+    result['event_accounting_rule_status'] = event_accounting_rule_status.serialize()
+
+    return result
+
+
 class HistoryBaseEntry[
         ExtraDataType: 'dict[str, Any] | AssetMovementExtraData | None',
 ](AccountingEventMixin, ABC):
     """
     Intended to be the base class for all types of event. All trades, deposits,
     swaps etc. are going to be made up of multiple such entries.
+
+    Hundreds of thousands of events are kept in memory when processing the whole history,
+    so the events are slotted. Subclasses should declare the __slots__ of their own
+    attributes too, or their instances get a __dict__ again.
     """
+    __slots__ = (
+        '_extra_data',
+        '_raw_extra_data',
+        'amount',
+        'asset',
+        'event_subtype',
+        'event_type',
+        'group_identifier',
+        'identifier',
+        'location',
+        'location_label',
+        'notes',
+        'sequence_index',
+        'timestamp',
+    )
 
     def __init__(
             self,
@@ -253,6 +358,29 @@ class HistoryBaseEntry[
             self.extra_data == other.extra_data
         )
 
+    @property
+    def extra_data(self) -> ExtraDataType | None:
+        """The event specific extra data. For events read from the DB its json is only
+        loaded on first access, since most bulk readers of the events never look at it."""
+        if (raw_extra_data := self._raw_extra_data) is not None:
+            self._extra_data = self.deserialize_extra_data(
+                entry=(self.identifier, self.group_identifier),
+                extra_data=raw_extra_data,
+            )
+            self._raw_extra_data = None
+        return self._extra_data
+
+    @extra_data.setter
+    def extra_data(self, extra_data: ExtraDataType | None) -> None:
+        self._extra_data = extra_data
+        self._raw_extra_data = None
+
+    def _with_db_extra_data(self, extra_data: str | None) -> Self:
+        """Set the extra_data json of an event read from the DB, to be loaded on access"""
+        self._extra_data = None
+        self._raw_extra_data = extra_data
+        return self
+
     def _history_base_entry_repr_fields(self) -> list[str]:
         """Returns a list of printable fields"""
         return [
@@ -415,24 +543,15 @@ class HistoryBaseEntry[
             has_ignored_assets: bool = False,
     ) -> dict[str, Any]:
         """Serialize event and extra flags for api"""
-        result: dict[str, Any] = {'entry': self.serialize()}
-        if self.should_ignore(ignored_ids=ignored_ids):
-            result['ignored_in_accounting'] = True
-        if (
-            self.identifier is not None and
-            (event_states := mapping_states.get(self.identifier)) is not None
-        ):
-            result['states'] = [x.serialize() for x in event_states]
-        if self.identifier in hidden_event_ids:
-            result['hidden'] = True
-        if grouped_events_num is not None:
-            result['grouped_events_num'] = grouped_events_num
-        if has_ignored_assets:
-            result['has_ignored_assets'] = True
-
-        result['event_accounting_rule_status'] = event_accounting_rule_status.serialize()
-
-        return result
+        return serialize_history_event_for_api(
+            event=self,
+            mapping_states=mapping_states,
+            ignored_ids=ignored_ids,
+            hidden_event_ids=hidden_event_ids,
+            event_accounting_rule_status=event_accounting_rule_status,
+            grouped_events_num=grouped_events_num,
+            has_ignored_assets=has_ignored_assets,
+        )
 
     def maybe_get_direction(
             self,
@@ -508,6 +627,15 @@ class HistoryBaseEntry[
         assert self.identifier is not None, 'Should never be called without identifier'
         return str(self.identifier)
 
+    def get_fingerprint_key(self) -> str:
+        key = (
+            f'{self.identifier},{self.group_identifier},{self.sequence_index},{self.timestamp},'
+            f'{self.location.serialize_for_db()},{self.location_label},'
+            f'{self.event_type.serialize()},{self.event_subtype.serialize()},'
+            f'{self.asset.identifier},{self.amount}'
+        )
+        return key if self.extra_data is None else f'{key},{self.extra_data}'
+
     def get_assets(self) -> list[Asset]:
         return [self.asset]
 
@@ -520,6 +648,7 @@ class HistoryBaseEntry[
 
 class HistoryEvent(HistoryBaseEntry):
     """General history events such as exchange events"""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -584,8 +713,7 @@ class HistoryEvent(HistoryBaseEntry):
             notes=entry[8],
             event_type=HistoryEventType.deserialize(entry[9]),
             event_subtype=HistoryEventSubType.deserialize(entry[10]),
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
-        )
+        )._with_db_extra_data(entry[11])
 
     @classmethod
     def deserialize(cls: type[HistoryEvent], data: dict[str, Any]) -> HistoryEvent:
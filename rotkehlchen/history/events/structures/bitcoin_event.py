@@ -32,6 +32,7 @@ class BitcoinEvent(OnchainEvent[BTCTxId, BTCAddress]):
     back with the event and so takes no part in equality, the same way the metadata
     attribute it replaces didn't.
     """
+    __slots__ = ('counterparty_addresses',)
 
     def __init__(
             self,
@@ -74,6 +74,10 @@ log = RotkehlchenLogsAdapter(logger)
 
 class EthStakingEvent(HistoryBaseEntry, ABC):  # noqa: PLW1641  # hash in superclass
     """An ETH staking related event. Block production/withdrawal"""
+    # validator_index and is_exit_or_blocknumber are slots of the subclasses, since
+    # EthDepositEvent also inherits the slots of EvmEvent and a class can't have two bases
+    # both adding slots
+    __slots__ = ()
 
     def __init__(
             self,
@@ -114,6 +118,9 @@ class EthStakingEvent(HistoryBaseEntry, ABC):  # noqa: PLW1641  # hash in superc
             self.is_exit_or_blocknumber == other.is_exit_or_blocknumber  # type: ignore
         )
 
+    def get_fingerprint_key(self) -> str:
+        return f'{super().get_fingerprint_key()},{self.validator_index},{self.is_exit_or_blocknumber}'  # noqa: E501
+
     def _serialize_staking_tuple_for_db(self) -> tuple[
             tuple[str, str, HISTORY_EVENT_DB_TUPLE_WRITE],
             tuple[str, str, tuple[int, int]],
@@ -130,6 +137,7 @@ class EthStakingEvent(HistoryBaseEntry, ABC):  # noqa: PLW1641  # hash in superc
 
 class EthWithdrawalEvent(EthStakingEvent):
     """An ETH Withdrawal event"""
+    __slots__ = ('is_exit_or_blocknumber', 'validator_index')
 
     def __init__(
             self,
@@ -328,6 +336,7 @@ class EthBlockEvent(EthStakingEvent):
     multiple ones, this is what we must count as the actual MEV reported. Also we should not trust
     what the relayer (seq index 1) is reporting. Only what we verify we received.
     """
+    __slots__ = ('is_exit_or_blocknumber', 'validator_index')
 
     def __init__(
             self,
@@ -470,6 +479,7 @@ class EthBlockEvent(EthStakingEvent):
 
 class EthDepositEvent(EvmEvent, EthStakingEvent):  # noqa: PLW1641  # hash in superclass
     """An ETH deposit event"""
+    __slots__ = ('is_exit_or_blocknumber', 'validator_index')
 
     def __init__(
             self,
@@ -50,6 +50,7 @@ class BridgeExtraData(TypedDict, total=False):
 
 
 class EvmEvent(OnchainEvent[EVMTxHash, ChecksumEvmAddress]):  # hash in superclass
+    __slots__ = ()
 
     @staticmethod
     def _calculate_group_identifier(tx_ref: EVMTxHash, location: Location) -> str:
@@ -20,6 +20,7 @@ if TYPE_CHECKING:
 
 
 class EvmSwapEvent(EvmEvent, SwapEvent):
+    __slots__ = ()
 
     def __init__(
             self,
@@ -95,11 +96,10 @@ class EvmSwapEvent(EvmEvent, SwapEvent):
             notes=entry[8] or None,
             event_type=HistoryEventType.deserialize(entry[9]),  # type: ignore  # event type and subtype should always be correct from the DB
             event_subtype=HistoryEventSubType.deserialize(entry[10]),  # type: ignore
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
             tx_ref=deserialize_evm_tx_hash(entry[13]),
             counterparty=entry[14],
             address=deserialize_optional(input_val=entry[15], fn=string_to_evm_address),
-        )
+        )._with_db_extra_data(entry[11])
 
     def serialize(self) -> dict[str, Any]:
         """Serialize the event for api."""
@@ -53,6 +53,7 @@ class OnchainEvent[T_TxRef, T_Address](HistoryBaseEntry):
         - address: optional blockchain-specific address (e.g., contract address)
     """
 
+    __slots__ = ('address', 'counterparty', 'tx_ref')
     # need explicitly define due to also changing eq: https://stackoverflow.com/a/53519136/110395
     __hash__ = HistoryBaseEntry.__hash__
 
@@ -227,11 +228,10 @@ class OnchainEvent[T_TxRef, T_Address](HistoryBaseEntry):
             notes=entry[8],
             event_type=HistoryEventType.deserialize(entry[9]),
             event_subtype=HistoryEventSubType.deserialize(entry[10]),
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
             tx_ref=cls._deserialize_tx_ref(entry[13]),
             counterparty=entry[14],
             address=deserialize_optional(input_val=entry[15], fn=cls.deserialize_address),
-        )
+        )._with_db_extra_data(entry[11])
 
     @classmethod
     def deserialize(cls, data: dict[str, Any]) -> Self:
@@ -274,6 +274,9 @@ class OnchainEvent[T_TxRef, T_Address](HistoryBaseEntry):
     def get_accounting_event_type() -> AccountingEventType:
         return AccountingEventType.TRANSACTION_EVENT
 
+    def get_fingerprint_key(self) -> str:
+        return f'{super().get_fingerprint_key()},{self.counterparty}'
+
     def process(
             self,
             accounting: AccountingPot,
@@ -27,6 +27,7 @@ log = RotkehlchenLogsAdapter(logger)
 
 
 class SolanaEvent(OnchainEvent[Signature, SolanaAddress]):  # hash in superclass
+    __slots__ = ()
 
     def __init__(
             self,
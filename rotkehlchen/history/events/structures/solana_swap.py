@@ -19,6 +19,7 @@ if TYPE_CHECKING:
 
 
 class SolanaSwapEvent(SolanaEvent, SwapEvent):
+    __slots__ = ()
 
     def __init__(
             self,
@@ -91,11 +92,10 @@ class SolanaSwapEvent(SolanaEvent, SwapEvent):
             notes=entry[8] or None,
             event_type=HistoryEventType.deserialize(entry[9]),  # type: ignore  # event type and subtype should always be correct from the DB
             event_subtype=HistoryEventSubType.deserialize(entry[10]),  # type: ignore
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
             tx_ref=Signature.from_bytes(entry[13]),
             counterparty=entry[14],
             address=SolanaAddress(entry[15]) if entry[15] is not None else None,
-        )
+        )._with_db_extra_data(entry[11])
 
     def serialize(self) -> dict[str, Any]:
         """Serialize the event for api."""
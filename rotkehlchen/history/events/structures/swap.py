@@ -56,6 +56,7 @@ class SwapEventEntryData(TypedDict):
 
 class SwapEvent(HistoryBaseEntry):
     """Swap event representing trades on exchanges, defi, and more."""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -132,9 +133,8 @@ class SwapEvent(HistoryBaseEntry):
             event_subtype=HistoryEventSubType.deserialize(entry[10]),  # type: ignore  # should always be correct from the DB
             asset=Asset(entry[6]).check_existence(),
             amount=amount,
-            extra_data=cls.deserialize_extra_data(entry=entry, extra_data=entry[11]),
             notes=entry[8] or None,
-        )
+        )._with_db_extra_data(entry[11])
 
     def serialize(self) -> dict[str, Any]:
         """Serialize the event for api, and generate the auto_notes.
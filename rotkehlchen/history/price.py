@@ -1,14 +1,15 @@
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from contextlib import suppress
 from http import HTTPStatus
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Final, NamedTuple
 
 from rotkehlchen.api.websockets.typedefs import ProgressUpdateSubType, WSMessageType
 from rotkehlchen.assets.asset import Asset, EvmToken
 from rotkehlchen.chain.evm.decoding.uniswap.constants import CPT_UNISWAP_V2, CPT_UNISWAP_V3
 from rotkehlchen.chain.evm.decoding.uniswap.v3.utils import get_uniswap_v3_position_price
 from rotkehlchen.chain.evm.utils import lp_price_from_uniswaplike_pool_contract
+from rotkehlchen.concurrency import exception_of, spawn, wait
 from rotkehlchen.constants import HOUR_IN_SECONDS, ONE, ZERO
 from rotkehlchen.constants.assets import (
     A_ETH,
@@ -25,6 +26,7 @@ from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsuppo
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.inquirer import Inquirer
+from rotkehlchen.interfaces import HistoricalPriceRangeOracleInterface
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import Price, Timestamp
 from rotkehlchen.utils.misc import timestamp_to_daystart_timestamp
@@ -37,7 +39,7 @@ from .types import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterable, Mapping, Sequence
     from pathlib import Path
 
     from rotkehlchen.chain.ethereum.oracles.uniswap import UniswapV2Oracle, UniswapV3Oracle
@@ -51,6 +53,29 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Max assets whose price ranges are prefetched at the same time from a single oracle.
+# The oracle's rate limiter still paces the calls.
+PRICE_PREFETCH_MAX_WORKERS: Final = 4
+
+
+def plan_price_ranges(
+        timestamps: Sequence[Timestamp],
+        max_seconds: int,
+) -> list[tuple[Timestamp, Timestamp]]:
+    """Cover the given sorted timestamps with the fewest ranges of at most max_seconds
+
+    Each range starts at the first timestamp not yet covered and extends to the last
+    timestamp that still fits in it, which gives the minimum number of ranges.
+    """
+    ranges: list[tuple[Timestamp, Timestamp]] = []
+    for timestamp in timestamps:
+        if len(ranges) != 0 and timestamp - ranges[-1][0] <= max_seconds:
+            ranges[-1] = (ranges[-1][0], timestamp)
+        else:
+            ranges.append((timestamp, timestamp))
+
+    return ranges
+
 
 def query_price_or_use_default(
         asset: Asset,
@@ -346,18 +371,8 @@ class PriceHistorian:
         # two separate attribute loads could pair oracles with mismatched instances
         state = instance._oracle_state
         assert state is not None, 'PriceHistorian should never be called before setting the oracles'  # noqa: E501
-        oracles, oracle_instances = state.oracles, state.instances
         # try to get the price from the cache using only enabled historical sources
-        sources = (
-            HistoricalPriceOracle.MANUAL,
-            HistoricalPriceOracle.XRATESCOM,
-            *oracles,
-        )
-        if HistoricalPriceOracle.CRYPTOCOMPARE not in oracles:
-            # Consider cached cryptocompare prices if they exist. We removed it
-            # from the oracle list since they went paid.
-            sources = (*sources, HistoricalPriceOracle.CRYPTOCOMPARE)
-
+        sources = PriceHistorian._cached_price_sources(oracles=state.oracles)
         if (cached_price_entry := GlobalDBHandler.get_historical_price(
             from_asset=from_asset,
             to_asset=to_asset,
@@ -378,9 +393,46 @@ class PriceHistorian:
         )) is not None:
             return cached_price_entry.price
 
+        return PriceHistorian._query_oracles_historical_price(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            timestamp=timestamp,
+            state=state,
+        )[0]
+
+    @staticmethod
+    def _cached_price_sources(
+            oracles: tuple[HistoricalPriceOracle, ...],
+    ) -> tuple[HistoricalPriceOracle, ...]:
+        """Return the sources of the cached prices to use for the given enabled oracles"""
+        sources = (
+            HistoricalPriceOracle.MANUAL,
+            HistoricalPriceOracle.XRATESCOM,
+            *oracles,
+        )
+        if HistoricalPriceOracle.CRYPTOCOMPARE not in oracles:
+            # Consider cached cryptocompare prices if they exist. We removed it
+            # from the oracle list since they went paid.
+            sources = (*sources, HistoricalPriceOracle.CRYPTOCOMPARE)
+
+        return sources
+
+    @staticmethod
+    def _query_oracles_historical_price(
+            from_asset: Asset,
+            to_asset: Asset,
+            timestamp: Timestamp,
+            state: HistoricalOracleState,
+    ) -> tuple[Price, HistoricalPriceOracle]:
+        """Query the enabled oracles in order for the price, skipping the cache, and save
+        the first price found in the global DB. Returns the price and the oracle it came from.
+
+        May raise:
+        - NoPriceForGivenTimestamp if no oracle has a price for the asset in the given timestamp
+        """
         # else cryptocompare also has historical fiat to fiat data
         rate_limited = False
-        for oracle, oracle_instance in zip(oracles, oracle_instances, strict=True):
+        for oracle, oracle_instance in zip(state.oracles, state.instances, strict=True):
             if not oracle_instance.can_query_history(
                 from_asset=from_asset,
                 to_asset=to_asset,
@@ -425,7 +477,7 @@ class PriceHistorian:
                 ),
                 price=price,
             )])
-            return price
+            return price, oracle
 
         raise NoPriceForGivenTimestamp(
             from_asset=from_asset,
@@ -435,58 +487,311 @@ class PriceHistorian:
         )
 
     @staticmethod
-    def query_multiple_prices(
-            assets_timestamp: list[tuple[Asset, Timestamp]],
-            target_asset: Asset,
-            msg_aggregator: MessagesAggregator,
-    ) -> Mapping[Asset, Mapping[Timestamp, Price]]:
-        """Return the price of the assets at the given timestamps in the target
-        asset currency.
+    def _find_cached_prices(
+            queries: Sequence[tuple[Asset, Asset, Timestamp]],
+            sources: tuple[HistoricalPriceOracle, ...],
+    ) -> tuple[dict[tuple[Asset, Asset, Timestamp], Price], list[tuple[Asset, Asset, Timestamp]]]:  # noqa: E501
+        """Look up the cached prices of the given entries in the global DB with a few set
+        based queries. Returns the found prices and the entries that are not cached."""
+        prices: dict[tuple[Asset, Asset, Timestamp], Price] = {}
+        misses: list[tuple[Asset, Asset, Timestamp]] = []
+        for query, cached_price in zip(queries, GlobalDBHandler.get_historical_prices(
+            query_data=queries,
+            max_seconds_distance=HOUR_IN_SECONDS,
+            sources=sources,
+        ), strict=True):
+            if cached_price is not None:
+                prices[query] = cached_price.price
+            else:
+                misses.append(query)
+
+        # Daily-granularity oracles have a single price per UTC day, cached at the day start
+        not_cached: list[tuple[Asset, Asset, Timestamp]] = []
+        for query, cached_price in zip(misses, GlobalDBHandler.get_historical_prices(
+            query_data=[
+                (from_asset, to_asset, timestamp_to_daystart_timestamp(timestamp))
+                for from_asset, to_asset, timestamp in misses
+            ],
+            max_seconds_distance=0,
+            sources=tuple(source for source in sources if source in DAILY_GRANULARITY_ORACLES),
+        ), strict=True):
+            if cached_price is not None:
+                prices[query] = cached_price.price
+            else:
+                not_cached.append(query)
+
+        return prices, not_cached
+
+    @staticmethod
+    def query_historical_prices(
+            queries: Sequence[tuple[Asset, Asset, Timestamp]],
+            msg_aggregator: MessagesAggregator | None = None,
+    ) -> dict[tuple[Asset, Asset, Timestamp], Price]:
+        """Bulk version of query_historical_price for many from/to/timestamp entries.
+
+        The cached prices of all the entries are looked up in the global DB with a few set
+        based queries and only the misses are queried from the oracles, grouped per asset
+        pair so a daily price fetched for one entry is reused for the rest of that day.
+        Entries whose price can't be found are missing from the result. If a msg_aggregator
+        is given, progress of the query is sent to the frontend.
         """
-        log.debug(
-            f'Querying the historical {target_asset.identifier} price of these assets: '
-            f'{", ".join(f"{asset.identifier} at {ts}" for asset, ts in assets_timestamp)}',
-            assets_timestamp=assets_timestamp,
-        )
-        assets_price: defaultdict[Asset, defaultdict] = defaultdict(
-            lambda: defaultdict(lambda: ZERO_PRICE),
+        prices: dict[tuple[Asset, Asset, Timestamp], Price] = {}
+        to_lookup: list[tuple[Asset, Asset, Timestamp]] = []
+        unique_queries = list(dict.fromkeys(queries))
+        for query in unique_queries:
+            from_asset, to_asset, timestamp = query
+            if from_asset == to_asset:
+                prices[query] = Price(ONE)
+                continue
+
+            try:
+                if (special_asset_price := PriceHistorian.get_price_for_special_asset(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    timestamp=timestamp,
+                )) is not None:
+                    prices[query] = special_asset_price
+                elif from_asset.is_fiat() and to_asset.is_fiat():  # forex specific path
+                    prices[query] = PriceHistorian.query_historical_price(
+                        from_asset=from_asset,
+                        to_asset=to_asset,
+                        timestamp=timestamp,
+                    )
+                else:
+                    to_lookup.append(query)
+            except (RemoteError, NoPriceForGivenTimestamp) as e:
+                log.warning(
+                    f'Could not query the historical {to_asset.identifier} price for '
+                    f'{from_asset.identifier} at time {timestamp} due to: {e!s}. Skipping',
+                )
+
+        state = PriceHistorian()._oracle_state
+        assert state is not None, 'PriceHistorian should never be called before setting the oracles'  # noqa: E501
+        cached_prices, to_query = PriceHistorian._find_cached_prices(
+            queries=to_lookup,
+            sources=PriceHistorian._cached_price_sources(oracles=state.oracles),
         )
-        unique_pairs = list(dict.fromkeys(assets_timestamp))
-        send_ws_every_prices = msg_aggregator.how_many_events_per_ws(
-            total_events=(total_events := len(unique_pairs)),
+        prices.update(cached_prices)
+        log.debug(
+            f'Found {len(unique_queries) - len(to_query)} out of {len(unique_queries)} '
+            f'historical prices without querying the oracles',
         )
-        for idx, (asset, timestamp) in enumerate(unique_pairs):
-            if idx % send_ws_every_prices == 0:
+        if msg_aggregator is not None:
+            send_ws_every_prices = msg_aggregator.how_many_events_per_ws(
+                total_events=len(to_query),
+            )
+
+        # prices fetched from daily-granularity oracles keyed by pair and day start
+        daily_prices: dict[tuple[Asset, Asset, Timestamp], Price] = {}
+        to_query.sort(key=lambda query: (query[0].identifier, query[1].identifier, query[2]))
+        for idx, query in enumerate(to_query):
+            if msg_aggregator is not None and idx % send_ws_every_prices == 0:
                 msg_aggregator.add_message(
                     message_type=WSMessageType.PROGRESS_UPDATES,
                     data={
-                        'total': total_events,
-                        'processed': idx,
+                        'total': len(unique_queries),
+                        'processed': len(unique_queries) - len(to_query) + idx,
                         'subtype': str(ProgressUpdateSubType.MULTIPLE_PRICES_QUERY_STATUS),
                     },
                 )
 
+            from_asset, to_asset, timestamp = query
+            daily_key = (from_asset, to_asset, timestamp_to_daystart_timestamp(timestamp))
+            if (daily_price := daily_prices.get(daily_key)) is not None:
+                prices[query] = daily_price  # fetched for the same pair earlier that day
+                continue
+
             try:
-                assets_price[asset][timestamp] = PriceHistorian.query_historical_price(
-                    from_asset=asset,
-                    to_asset=target_asset,
+                prices[query], oracle = PriceHistorian._query_oracles_historical_price(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
                     timestamp=timestamp,
+                    state=state,
                 )
-            except (RemoteError, NoPriceForGivenTimestamp) as e:
+            except NoPriceForGivenTimestamp as e:
                 log.warning(
-                    f'Could not query the historical {target_asset.identifier} price for '
-                    f'{asset.identifier} at time {timestamp} due to: {e!s}. Skipping',
+                    f'Could not query the historical {to_asset.identifier} price for '
+                    f'{from_asset.identifier} at time {timestamp} due to: {e!s}. Skipping',
                 )
                 continue
 
-        msg_aggregator.add_message(
-            message_type=WSMessageType.PROGRESS_UPDATES,
-            data={
-                'total': total_events,
-                'processed': total_events,
-                'subtype': str(ProgressUpdateSubType.MULTIPLE_PRICES_QUERY_STATUS),
-            },
+            if oracle in DAILY_GRANULARITY_ORACLES:
+                daily_prices[daily_key] = prices[query]
+
+        if msg_aggregator is not None:
+            msg_aggregator.add_message(
+                message_type=WSMessageType.PROGRESS_UPDATES,
+                data={
+                    'total': len(unique_queries),
+                    'processed': len(unique_queries),
+                    'subtype': str(ProgressUpdateSubType.MULTIPLE_PRICES_QUERY_STATUS),
+                },
+            )
+
+        return prices
+
+    @staticmethod
+    def _prefetchable_asset(asset: Asset, to_asset: Asset) -> Asset | None:
+        """Return the asset whose oracle price is needed to price asset in to_asset, or None
+        if its price does not come from the oracles, e.g. for fiat pairs or LP tokens"""
+        if asset == A_ETH2:
+            asset = A_ETH
+
+        if (
+            asset == to_asset or asset == A_KFEE or
+            asset.identifier in Inquirer.eur_pegged_assets
+        ):
+            return None
+
+        try:
+            if asset.is_fiat() and to_asset.is_fiat():
+                return None
+
+            if asset.is_evm_token() and (
+                (token := asset.resolve_to_evm_token()).protocol in {CPT_UNISWAP_V2, CPT_UNISWAP_V3} or  # noqa: E501
+                token.underlying_tokens is not None
+            ):
+                return None
+        except (UnknownAsset, WrongAssetType):
+            return None
+
+        return asset
+
+    @staticmethod
+    def _prefetch_price_ranges(
+            oracle: HistoricalPriceRangeOracleInterface,
+            to_asset: Asset,
+            pending: deque[tuple[Asset, list[Timestamp]]],
+            prices: list[HistoricalPrice],
+    ) -> None:
+        """Take assets and their timestamps from pending until it is empty and add to prices
+        what the fewest range queries of the oracle covering the timestamps return"""
+        while True:
+            try:
+                from_asset, timestamps = pending.popleft()
+            except IndexError:
+                return
+
+            for from_timestamp, to_timestamp in plan_price_ranges(
+                timestamps=sorted(timestamps),
+                max_seconds=oracle.range_query_max_seconds,
+            ):
+                if not oracle.can_query_history(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    timestamp=to_timestamp,
+                ):
+                    continue
+
+                try:
+                    prices.extend(oracle.query_historical_price_range(
+                        from_asset=from_asset,
+                        to_asset=to_asset,
+                        from_timestamp=from_timestamp,
+                        to_timestamp=to_timestamp,
+                    ))
+                except (PriceQueryUnsupportedAsset, UnknownAsset, WrongAssetType):
+                    break  # the oracle does not know the pair
+                except NoPriceForGivenTimestamp:
+                    continue  # no prices in this range but later ranges may have some
+                except RemoteError as e:
+                    log.warning(
+                        f'Failed to prefetch the {to_asset.identifier} prices of '
+                        f'{from_asset.identifier} between {from_timestamp} and '
+                        f'{to_timestamp} from {oracle} due to {e!s}',
+                    )
+                    if e.error_code == HTTPStatus.TOO_MANY_REQUESTS:
+                        break
+
+    @staticmethod
+    def prefetch_historical_prices(
+            assets_timestamps: Iterable[tuple[Asset, Timestamp]],
+            to_asset: Asset,
+    ) -> int:
+        """Fetch in bulk the to_asset prices of the given asset and timestamp entries that
+        are not cached yet, so that querying them one by one later hits the cache.
+
+        The timestamps of each asset that miss from the cache are covered with the fewest
+        ranges the oracles that support range queries can return in a single call. These
+        oracles are tried in the user's order, each one only for the entries the previous
+        ones did not return, and the assets of an oracle are queried in parallel within its
+        rate limit. All the prices an oracle returned are written to the global DB at once.
+        Entries that are still missing are left to the point queries of the other oracles.
+
+        Returns the number of prices written to the global DB.
+        """
+        state = PriceHistorian()._oracle_state
+        assert state is not None, 'PriceHistorian should never be called before setting the oracles'  # noqa: E501
+        range_oracles = [
+            instance for instance in state.instances
+            if isinstance(instance, HistoricalPriceRangeOracleInterface)
+        ]
+        if len(range_oracles) == 0:
+            return 0
+
+        queries = list(dict.fromkeys(
+            (asset, to_asset, timestamp) for from_asset, timestamp in assets_timestamps
+            if (asset := PriceHistorian._prefetchable_asset(from_asset, to_asset)) is not None
+        ))
+        sources = PriceHistorian._cached_price_sources(oracles=state.oracles)
+        _, misses = PriceHistorian._find_cached_prices(queries=queries, sources=sources)
+        log.debug(f'Prefetching {len(misses)} out of {len(queries)} historical prices')
+        written = 0
+        for oracle in range_oracles:
+            if len(misses) == 0:
+                break
+
+            timestamps_per_asset: defaultdict[Asset, list[Timestamp]] = defaultdict(list)
+            for from_asset, _, timestamp in misses:
+                timestamps_per_asset[from_asset].append(timestamp)
+
+            pending = deque(timestamps_per_asset.items())
+            prices: list[HistoricalPrice] = []
+            wait(tasks := [
+                spawn(
+                    PriceHistorian._prefetch_price_ranges,
+                    oracle=oracle,
+                    to_asset=to_asset,
+                    pending=pending,
+                    prices=prices,
+                ) for _ in range(min(PRICE_PREFETCH_MAX_WORKERS, len(pending)))
+            ])
+            for task in tasks:
+                if (exception := exception_of(task)) is not None:
+                    log.error(f'Unexpected error while prefetching prices from {oracle}: {exception!s}')  # noqa: E501
+
+            if len(prices) == 0:
+                continue
+
+            GlobalDBHandler.add_historical_prices(prices)
+            written += len(prices)
+            _, misses = PriceHistorian._find_cached_prices(queries=misses, sources=sources)
+
+        log.debug(f'Prefetched {written} historical prices. {len(misses)} are still missing')
+        return written
+
+    @staticmethod
+    def query_multiple_prices(
+            assets_timestamp: list[tuple[Asset, Timestamp]],
+            target_asset: Asset,
+            msg_aggregator: MessagesAggregator,
+    ) -> Mapping[Asset, Mapping[Timestamp, Price]]:
+        """Return the price of the assets at the given timestamps in the target
+        asset currency.
+        """
+        log.debug(
+            f'Querying the historical {target_asset.identifier} price of these assets: '
+            f'{", ".join(f"{asset.identifier} at {ts}" for asset, ts in assets_timestamp)}',
+            assets_timestamp=assets_timestamp,
+        )
+        assets_price: defaultdict[Asset, defaultdict] = defaultdict(
+            lambda: defaultdict(lambda: ZERO_PRICE),
         )
+        for (asset, _, timestamp), price in PriceHistorian.query_historical_prices(
+            queries=[(asset, target_asset, timestamp) for asset, timestamp in assets_timestamp],
+            msg_aggregator=msg_aggregator,
+        ).items():
+            assets_price[asset][timestamp] = price
 
         return assets_price
 
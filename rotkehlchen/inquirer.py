@@ -156,6 +156,7 @@ from rotkehlchen.types import (
 from rotkehlchen.utils.data_structures import LRUCacheWithRemove
 from rotkehlchen.utils.misc import timestamp_to_daystart_timestamp, ts_now
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
+from rotkehlchen.utils.perf import record_cache_lookup
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -531,8 +532,10 @@ class Inquirer:
     ) -> CachedPriceEntry | None:
         cache = Inquirer._cached_current_price.get(cache_key)
         if cache is None or ts_now() - cache.time > CURRENT_PRICE_CACHE_SECS:
+            record_cache_lookup(cache='inquirer_current_price', hit=False)
             return None
 
+        record_cache_lookup(cache='inquirer_current_price', hit=True)
         return cache
 
     @staticmethod
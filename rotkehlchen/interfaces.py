@@ -22,6 +22,7 @@ from rotkehlchen.utils.serialization import jsonloads_dict
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import Asset, AssetWithOracles
+    from rotkehlchen.history.types import HistoricalPrice
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -121,6 +122,34 @@ class HistoricalPriceOracleInterface(CurrentPriceOracleInterface, abc.ABC):
         """
 
 
+class HistoricalPriceRangeOracleInterface(HistoricalPriceOracleInterface, abc.ABC):
+    """Historical price oracle that can also return all the prices of a time range in one call
+
+    Used to prefetch the prices of many timestamps of an asset pair at once instead of
+    querying them one by one.
+    """
+
+    # Longest time range in seconds that a single range query can cover
+    range_query_max_seconds: int
+
+    @abc.abstractmethod
+    def query_historical_price_range(
+            self,
+            from_asset: Asset,
+            to_asset: Asset,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> list[HistoricalPrice]:
+        """Return the prices of from_asset in to_asset the oracle has between the two
+        timestamps, using a single remote call. The range should not be longer than
+        range_query_max_seconds.
+
+        May raise:
+        - PriceQueryUnsupportedAsset
+        - RemoteError
+        """
+
+
 class HistoricalPriceOracleWithCoinListInterface(HistoricalPriceOracleInterface, abc.ABC):
     """Historical Price Oracle with a cacheable list of all coins"""
 
@@ -15,11 +15,13 @@ import pandas as pd
 
 from rotkehlchen.constants.timing import HOUR_IN_SECONDS
 from rotkehlchen.mcp.backend import (
+    BackendEndpointMissingError,
     BackendQueryError,
     balances_timeout,
     get_backend_config,
     query_all_balances,
     query_historical_prices,
+    query_history_events_columns,
     query_history_events_page,
     query_settings,
     set_privacy_mode,
@@ -33,6 +35,11 @@ if TYPE_CHECKING:
     from rotkehlchen.mcp.constants import PrivacyMode
 
 PAGE_SIZE: Final = 1000
+# Events per batch of the columnar export. Each batch is read straight from the DB without
+# building event objects, so it can be much larger than a page of the events listing.
+COLUMNAR_BATCH_SIZE: Final = 10_000
+# Checksums of the columnar export are summed modulo this, the same as the backend does.
+COLUMNAR_CHECKSUM_MODULO: Final = 2 ** 64
 DEFAULT_MAX_RESULT_ROWS: Final = 500
 MAX_RESULT_ROWS: Final = 5_000
 REDACTED_TEXT: Final = '[redacted]'
@@ -170,10 +177,23 @@ SENSITIVE_IDENTIFIER_RE: Final = re.compile(
 _session_seed: Final = secrets.token_bytes(32)
 
 
+@dataclass(frozen=True)
+class HistoryEventsLoadState:
+    """Where a complete columnar load of the history events ended. A later refresh of the
+    same scope only fetches the events after ``last_identifier``, provided the backend still
+    reports the same count and checksum for the events up to it."""
+    scope: AnalyticsScope
+    last_identifier: int
+    rows: int
+    checksum: int
+    value_currency: str | None  # the currency the rows were valued in, if they were
+
+
 @dataclass(frozen=True)
 class TableData:
     frame: pd.DataFrame
     source: dict[str, Any]
+    load_state: HistoryEventsLoadState | None = None
 
 
 @dataclass(frozen=True)
@@ -302,6 +322,104 @@ def _sanitize_row(row: dict[str, Any], privacy_mode: PrivacyMode) -> dict[str, A
     return sanitized
 
 
+def _hash_column(series: pd.Series) -> pd.Series:
+    """``_hash_identifier`` over a column, hashing each distinct value only once."""
+    hashes = {value: _hash_identifier(value) for value in series.dropna().unique()}
+    return series.map(hashes)
+
+
+def _string_mask(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_object_dtype(series):
+        return series.map(lambda value: isinstance(value, str)).astype(bool)
+    if pd.api.types.is_string_dtype(series):
+        return series.notna()
+    return pd.Series(False, index=series.index)
+
+
+def _expand_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Column-wise ``_flatten`` of a columnar load: numeric strings get a ``<col>_float``
+    companion and the mappings of a column (``extra_data``) are flattened to ``<col>_<key>``
+    columns of the rows carrying them.
+    """
+    for column in list(frame.columns):
+        series = frame[column]
+        if not (is_string := _string_mask(series)).any():
+            continue
+        # cast, as a column of integer strings would otherwise reach SQL as INTEGER
+        as_float = pd.to_numeric(series.where(is_string), errors='coerce').astype('float64')
+        if as_float.notna().any():
+            frame[f'{column}_float'] = as_float
+
+    for column in list(frame.columns):
+        series = frame[column]
+        if not pd.api.types.is_object_dtype(series):
+            continue
+        is_mapping = series.map(lambda value: isinstance(value, dict)).astype(bool)
+        if not is_mapping.any():
+            continue
+
+        flattened = pd.DataFrame(
+            [_flatten({column: value}) for value in series[is_mapping]],
+            index=series.index[is_mapping],
+        )
+        # like _flatten, the column itself only stays for the rows not carrying a mapping
+        if is_mapping.all():
+            frame = frame.drop(columns=column)
+        else:
+            frame[column] = series.where(~is_mapping)
+        frame = frame.join(flattened)
+    return frame
+
+
+def _sanitize_columns(frame: pd.DataFrame, privacy_mode: PrivacyMode) -> pd.DataFrame:
+    """``_sanitize_row`` applied to whole columns of a columnar load, with the same
+    classification, so that both ways of loading produce the same table for the same data.
+    Only a column that would hold nothing but NULLs may be left out here.
+    """
+    if privacy_mode == 'raw':
+        return frame
+
+    identifier_columns = (
+        STRICT_IDENTIFIER_COLUMN_NAMES if privacy_mode == 'strict' else PII_COLUMN_NAMES
+    )
+    sanitized: dict[str, pd.Series] = {}
+    for column in frame.columns:
+        series, base = frame[column], _base_column_name(str(column))
+        if base in TEXT_COLUMN_NAMES:
+            has_value = series.notna() & series.ne('')
+            sanitized[f'has_{column}'] = has_value
+            if base in GENERATED_TEXT_COLUMN_NAMES and privacy_mode == 'balanced':
+                sanitized[column] = series.where(has_value).map(
+                    lambda value: _scrub_identifiers(str(value)),
+                    na_action='ignore',
+                )
+            else:
+                sanitized[column] = pd.Series(REDACTED_TEXT, index=series.index, dtype=object).where(has_value)  # noqa: E501
+        elif base in identifier_columns:
+            sanitized[f'{column}_hash'] = _hash_column(series)
+            if privacy_mode == 'balanced' and base == 'location_label':  # see _sanitize_row
+                readable = series.map(
+                    lambda value: isinstance(value, str) and value.lower() in READABLE_LOCATION_LABELS,  # noqa: E501
+                ).astype(bool)
+                if readable.any():
+                    sanitized[column] = series.where(readable)
+        elif base in SAFE_PASSTHROUGH_COLUMN_NAMES:
+            sanitized[column] = series
+        elif (is_string := _string_mask(series)).any():
+            # Unrecognized strings: numeric ones keep a float companion, the rest is hashed.
+            # Values that are not strings are safe analytic payload and stay as they are.
+            as_float = pd.to_numeric(series.where(is_string), errors='coerce').astype('float64')
+            if (is_numeric := as_float.notna()).any():
+                sanitized[f'{column}_float'] = as_float
+            if (is_hashed := is_string & ~is_numeric).any():
+                sanitized[f'{column}_hash'] = _hash_column(series.where(is_hashed))
+            if (is_other := series.notna() & ~is_string).any():
+                sanitized[column] = series.where(is_other)
+        else:
+            sanitized[column] = series
+    return pd.DataFrame(sanitized, index=frame.index)
+
+
 def _add_partial_withdrawal_income(frame: pd.DataFrame) -> None:
     """Reclassify partial beacon-chain withdrawals as ``income``, in place.
 
@@ -427,6 +545,10 @@ def _resolve_prices(
     return resolved
 
 
+def _value_currency() -> str:
+    return str(query_settings().get('main_currency') or DEFAULT_VALUE_CURRENCY)
+
+
 def _add_fiat_values(frame: pd.DataFrame) -> dict[str, Any]:
     """Add ``price``/``value``/``price_missing`` to a loaded history frame, in place.
 
@@ -435,7 +557,7 @@ def _add_fiat_values(frame: pd.DataFrame) -> dict[str, Any]:
     is not cached get a null ``value``, never 0 -- a zero would silently understate every
     total an agent computes over the column.
     """
-    target_asset = str(query_settings().get('main_currency') or DEFAULT_VALUE_CURRENCY)
+    target_asset = _value_currency()
     summary: dict[str, Any] = {
         'value_currency': target_asset,
         'priced_rows': 0,
@@ -469,7 +591,35 @@ def _add_fiat_values(frame: pd.DataFrame) -> dict[str, Any]:
     }
 
 
-def _load_history_events(scope: AnalyticsScope) -> TableData:
+def _fill_flag_columns(frame: pd.DataFrame) -> None:
+    for column in frame.columns:
+        if str(column).startswith('has_'):
+            # These flags are only emitted for rows that carry the underlying field, so
+            # ragged event types leave gaps and the column ends up object dtype -- which then
+            # reaches SQL as a confusing 0/1/NULL mix. A missing flag means the field was
+            # absent on that event type, which is exactly false, so fill it and keep a real
+            # bool.
+            frame[column] = frame[column].fillna(value=False).astype(bool)
+
+
+def _add_derived_columns(frame: pd.DataFrame) -> None:
+    """Fill the ``has_*`` flags and add the date and taxonomy columns of a history frame,
+    in place."""
+    _fill_flag_columns(frame)
+    if 'timestamp' in frame.columns and pd.api.types.is_integer_dtype(frame['timestamp']):
+        # Add readable date columns derived from the ms timestamp so an LLM can filter on
+        # `year` / `datetime` instead of computing error-prone unix-millisecond bounds.
+        dt = pd.to_datetime(frame['timestamp'], unit='ms', utc=True)
+        frame['datetime'] = dt.dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+        frame['year'] = dt.dt.year
+
+    _add_taxonomy_columns(frame)
+
+
+def _load_history_events_pages(scope: AnalyticsScope) -> TableData:
+    """Load the history events by paging the events listing. Used for the loads grouped by
+    group identifier, which the columnar export does not do, and for backends without it.
+    """
     # No cap by default: load the complete (time-scoped) set so the user gets complete data
     # unless they explicitly bound it with --max-events to limit load time on a huge history.
     max_events = get_backend_config().max_events
@@ -531,23 +681,7 @@ def _load_history_events(scope: AnalyticsScope) -> TableData:
     if cache_truncated:
         completeness = 'truncated_by_max_events'
     frame = pd.DataFrame(rows) if rows else pd.DataFrame()
-    for column in frame.columns:
-        if str(column).startswith('has_'):
-            # These flags are only emitted for rows that carry the underlying field, so
-            # ragged event types leave gaps and the column ends up object dtype -- which then
-            # reaches SQL as a confusing 0/1/NULL mix. A missing flag means the field was
-            # absent on that event type, which is exactly false, so fill it and keep a real
-            # bool.
-            frame[column] = frame[column].fillna(value=False).astype(bool)
-
-    if 'timestamp' in frame.columns and pd.api.types.is_integer_dtype(frame['timestamp']):
-        # Add readable date columns derived from the ms timestamp so an LLM can filter on
-        # `year` / `datetime` instead of computing error-prone unix-millisecond bounds.
-        dt = pd.to_datetime(frame['timestamp'], unit='ms', utc=True)
-        frame['datetime'] = dt.dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        frame['year'] = dt.dt.year
-
-    _add_taxonomy_columns(frame)
+    _add_derived_columns(frame)
 
     # Valuation runs here, in the loader, so its minutes of price lookups stay outside the
     # connection lock and queries keep serving the previous snapshot meanwhile.
@@ -573,7 +707,143 @@ def _load_history_events(scope: AnalyticsScope) -> TableData:
     )
 
 
-def _load_balances(scope: AnalyticsScope) -> TableData:
+def _columnar_frame(columns: dict[str, list[Any]], privacy_mode: PrivacyMode) -> pd.DataFrame:
+    """Build the sanitized frame of a columnar load straight from its columns, without
+    going through a dict per row."""
+    if len(columns) == 0 or len(next(iter(columns.values()))) == 0:
+        return pd.DataFrame()
+
+    frame = _sanitize_columns(_expand_columns(pd.DataFrame(columns)), privacy_mode)
+    _add_derived_columns(frame)
+    return frame
+
+
+def _load_history_events_columnar(
+        scope: AnalyticsScope,
+        previous: TableData | None,
+) -> TableData:
+    """Load the history events from the columnar export of the backend, in batches of whole
+    columns read straight from its DB with the time scope and ignored assets applied there.
+
+    If the previous load of the same scope was complete and the backend still reports the
+    same count and checksum for the events it loaded, only the events added since are
+    fetched and appended to it. Anything else, e.g. an edited or deleted event, makes the
+    checksum differ and the whole scope is loaded again.
+    """
+    max_events = get_backend_config().max_events
+    state = previous.load_state if previous is not None else None
+    if state is not None and (
+            state.scope != scope or
+            (scope.include_values and state.value_currency != _value_currency())
+    ):
+        state = None
+
+    incremental = False
+    after_identifier = checksum_up_to = None
+    if state is not None:
+        after_identifier = checksum_up_to = state.last_identifier
+
+    frames: list[pd.DataFrame] = []
+    rows_loaded, checksum, entries_limit = 0, 0, None
+    completeness, has_more = 'complete', True
+    while has_more:
+        limit = COLUMNAR_BATCH_SIZE
+        if max_events is not None:
+            if rows_loaded >= max_events:
+                completeness = 'truncated_by_max_events'
+                break
+            limit = min(limit, max_events - rows_loaded)
+
+        result = query_history_events_columns(
+            limit=limit,
+            after_identifier=after_identifier,
+            checksum_up_to=checksum_up_to,
+            from_timestamp=scope.from_timestamp,
+            to_timestamp=scope.to_timestamp,
+            exclude_ignored_assets=scope.include_ignored_assets is False,
+        )
+        if checksum_up_to is not None and state is not None:
+            checksum_up_to = None
+            if result.get('checksum_up_to') == {
+                'count': state.rows,
+                'checksum': str(state.checksum),
+            }:
+                incremental = True
+                rows_loaded, checksum = state.rows, state.checksum
+            else:  # the loaded events changed. Start over and load everything
+                after_identifier = None
+                continue
+
+        batch = _columnar_frame(result['columns'], scope.privacy_mode)
+        if len(batch) != 0:
+            frames.append(batch)
+        rows_loaded += len(batch)
+        checksum = (checksum + int(result.get('checksum', 0))) % COLUMNAR_CHECKSUM_MODULO
+        entries_limit = result.get('entries_limit')
+        has_more = result.get('has_more') is True
+        if (last_identifier := result.get('last_identifier')) is not None:
+            after_identifier = last_identifier
+        elif has_more:  # a batch that has more can't be empty. Don't loop forever on it
+            completeness = 'stopped_early'
+            break
+
+    frame = pd.concat(frames, ignore_index=True) if len(frames) != 0 else pd.DataFrame()
+    _fill_flag_columns(frame)  # batches may differ in which flags they carry
+    # Valuation runs here, in the loader, so its minutes of price lookups stay outside the
+    # connection lock and queries keep serving the previous snapshot meanwhile. On an
+    # incremental load only the new events are valued.
+    values = _add_fiat_values(frame) if scope.include_values else {}
+    new_rows = len(frame)
+    if incremental and previous is not None:
+        if new_rows == 0:
+            frame = previous.frame
+        else:
+            frame = pd.concat([previous.frame, frame], ignore_index=True)
+            _fill_flag_columns(frame)
+        if scope.include_values:
+            values |= {
+                key: previous.source.get(key, 0) + values[key]
+                for key in ('priced_rows', 'unpriced_rows', 'lookup_count')
+            }
+
+    load_state = None
+    if completeness == 'complete':
+        load_state = HistoryEventsLoadState(
+            scope=scope,
+            last_identifier=after_identifier or 0,
+            rows=rows_loaded,
+            checksum=checksum,
+            value_currency=values.get('value_currency'),
+        )
+    return TableData(
+        frame=frame,
+        source={
+            'endpoint': 'history/events/columnar',
+            'range_scoped': True,
+            'rows_loaded': len(frame),
+            'completeness': completeness,
+            'cache_truncated': completeness == 'truncated_by_max_events',
+            'incremental': incremental,
+            'new_rows': new_rows,
+            'backend_metadata': {'entries_limit': entries_limit},
+            'privacy_mode': scope.privacy_mode,
+            **values,
+        },
+        load_state=load_state,
+    )
+
+
+def _load_history_events(scope: AnalyticsScope, previous: TableData | None) -> TableData:
+    if scope.aggregate_by_group_ids is False:
+        try:
+            return _load_history_events_columnar(scope=scope, previous=previous)
+        except BackendEndpointMissingError:
+            pass  # a backend older than the columnar export. Page the events listing
+
+    return _load_history_events_pages(scope)
+
+
+def _load_balances(scope: AnalyticsScope, _previous: TableData | None) -> TableData:
     # Never force a refresh here: recalculating balances is slow and should stay an explicit
     # user action in the app. The analytics layer reads the latest cached snapshot.
     result = query_all_balances(refresh=False, timeout=balances_timeout())
@@ -602,7 +872,9 @@ def _load_balances(scope: AnalyticsScope) -> TableData:
     )
 
 
-TABLE_LOADERS: Final[dict[str, Callable[[AnalyticsScope], TableData]]] = {
+# Loaders get the scope and what the table holds now, for the ones that can load it
+# incrementally.
+TABLE_LOADERS: Final[dict[str, Callable[[AnalyticsScope, TableData | None], TableData]]] = {
     'history_events': _load_history_events,
     'balances': _load_balances,
 }
@@ -757,6 +1029,8 @@ class AnalyticsSession:
             loaded: dict[str, Any] = {}
             errors: dict[str, str] = {}
             pending: dict[str, TableData] = {}
+            with self._lock:
+                current_tables = dict(self._tables)
             # Backend loading can be slow. Keep it outside the connection lock so queries
             # continue using the previous complete snapshot until the frames are ready.
             for table in _normalize_tables(tables):
@@ -764,7 +1038,7 @@ class AnalyticsSession:
                     errors[table] = f'Unknown table {table!r}. Available: {list(AVAILABLE_TABLES)}'
                     continue
                 try:
-                    table_data = loader(scope)
+                    table_data = loader(scope, current_tables.get(table))
                 except BackendQueryError as e:
                     errors[table] = str(e)
                 except (KeyError, TypeError, ValueError, sqlite3.Error) as e:
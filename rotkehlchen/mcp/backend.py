@@ -39,6 +39,11 @@ class BackendQueryError(Exception):
     """Raised when the local rotki backend cannot be queried."""
 
 
+class BackendEndpointMissingError(BackendQueryError):
+    """Raised when the rotki backend does not have the queried endpoint, e.g. because it is
+    older than this MCP server."""
+
+
 def configure_backend(
         base_url: str,
         timeout: int,
@@ -114,6 +119,10 @@ def request_api(
     except requests.exceptions.RequestException as e:
         raise BackendQueryError(f'Could not connect to rotki backend at {url}: {e!s}') from e
 
+    if response.status_code == HTTPStatus.NOT_FOUND:
+        raise BackendEndpointMissingError(
+            f'rotki backend returned HTTP {response.status_code} for {url}: {response.text}',
+        )
     if response.status_code != HTTPStatus.OK:
         raise BackendQueryError(
             f'rotki backend returned HTTP {response.status_code} for {url}: {response.text}',
@@ -168,6 +177,47 @@ def query_history_events_page(
     return payload['result']
 
 
+def query_history_events_columns(
+        limit: int,
+        after_identifier: int | None = None,
+        checksum_up_to: int | None = None,
+        from_timestamp: int | None = None,
+        to_timestamp: int | None = None,
+        exclude_ignored_assets: bool = True,
+) -> dict[str, Any]:
+    """Fetch one batch of the columnar history events export: the events after
+    ``after_identifier`` in identifier order, as one list of values per column. When
+    ``checksum_up_to`` is given the result also carries the count and checksum of the events
+    up to that identifier, which is how an incremental load checks its earlier rows are still
+    current. Returns the backend ``result`` dict.
+    """
+    backend_config = get_backend_config()
+    body: dict[str, Any] = {'limit': limit, 'exclude_ignored_assets': exclude_ignored_assets}
+    for key, value in (
+            ('after_identifier', after_identifier),
+            ('checksum_up_to', checksum_up_to),
+            ('from_timestamp', from_timestamp),
+            ('to_timestamp', to_timestamp),
+    ):
+        if value is not None:
+            body[key] = value
+
+    payload = request_api(
+        base_url=backend_config.base_url,
+        endpoint='history/events/columnar',
+        timeout=backend_config.timeout,
+        json_data=body,
+        method='POST',
+    )
+    if not isinstance(result := payload['result'], dict) or not isinstance(
+            result.get('columns'),
+            dict,
+    ):
+        raise BackendQueryError('rotki backend returned an unexpected columnar events response')
+
+    return result
+
+
 def query_settings() -> dict[str, Any]:
     """Return the user's settings. The analytics layer reads ``main_currency`` from here so
     that valued events are denominated the same way the rest of rotki denominates them.
@@ -85,6 +85,11 @@ async def refresh_analytics_data(
     actually queryable. The counters under ``source.backend_metadata`` are the backend's own
     and will not match it — ``entries_found`` in particular is a pre-serialization estimate,
     so do not compute coverage from it.
+
+    Refreshing ``history_events`` again with the same arguments is cheap: only the events
+    added since the last load are fetched (``source.incremental`` is true and
+    ``source.new_rows`` counts them), unless loaded events were edited or removed meanwhile,
+    in which case everything is reloaded.
     """
     return await asyncio.to_thread(
         _refresh_analytics_data,
@@ -0,0 +1,93 @@
+"""Chunked format of the premium DB backups
+
+The exported plaintext DB is split in chunks made of whole SQLite pages. A chunk ends after
+a page whose hash hits the boundary condition, so the boundaries depend on the content of
+the pages and not on their position. When a change adds or removes pages everything after
+it shifts, but the chunks after the change still end at the same pages and stay the same.
+
+Each chunk is identified by a keyed hash of its content, so that the server can tell which
+chunks it already has without being able to check guesses about their content. Only the
+chunks the server does not have are compressed, encrypted and uploaded. The manifest is the
+ordered list of the chunk ids of a backup.
+"""
+import base64
+import hashlib
+import hmac
+import zlib
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from rotkehlchen.crypto import decrypt, encrypt
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+SQLITE_HEADER_SIZE: Final = 100
+BACKUP_CHUNK_MIN_SIZE: Final = 256 * 1024
+BACKUP_CHUNK_AVG_SIZE: Final = 1024 * 1024
+BACKUP_CHUNK_MAX_SIZE: Final = 4 * 1024 * 1024
+
+
+class ChunkedBackup(NamedTuple):
+    # The ids of all the chunks of the DB in order
+    chunk_ids: list[str]
+    # The compressed and encrypted chunks that the server does not have, keyed by id
+    new_chunks: dict[str, bytes]
+    # The hash of the backup as given by backup_manifest_hash
+    data_hash: str
+    # The size in bytes of the plaintext DB
+    data_size: int
+
+
+def _sqlite_page_size(header: bytes) -> int:
+    """Read the page size of a plaintext SQLite DB from its header"""
+    if (page_size := int.from_bytes(header[16:18], byteorder='big')) == 1:
+        return 65536  # the only page size that does not fit in the two bytes
+
+    return page_size if page_size >= 512 else 4096  # 4096 for an empty or broken header
+
+
+def iterate_backup_chunks(dbpath: Path) -> Iterator[bytes]:
+    """Split the plaintext DB at dbpath in chunks and yield them in order"""
+    with open(dbpath, 'rb') as f:
+        page_size = _sqlite_page_size(f.read(SQLITE_HEADER_SIZE))
+        boundary_modulo = max(1, BACKUP_CHUNK_AVG_SIZE // page_size)
+        f.seek(0)
+        chunk = bytearray()
+        while len(page := f.read(page_size)) != 0:
+            chunk += page
+            if len(chunk) >= BACKUP_CHUNK_MAX_SIZE or (
+                len(chunk) >= BACKUP_CHUNK_MIN_SIZE and
+                int.from_bytes(hashlib.blake2b(page, digest_size=4).digest()) % boundary_modulo == 0  # noqa: E501
+            ):
+                yield bytes(chunk)
+                chunk = bytearray()
+
+        if len(chunk) != 0:
+            yield bytes(chunk)
+
+
+def backup_chunk_key(password: str) -> bytes:
+    """The key of the chunk ids of the DB with the given password"""
+    return hashlib.sha256(b'rotki backup chunk id' + password.encode()).digest()
+
+
+def backup_chunk_id(key: bytes, chunk: bytes) -> str:
+    return hmac.new(key, chunk, hashlib.sha256).hexdigest()
+
+
+def backup_manifest_hash(chunk_ids: list[str]) -> str:
+    """The hash of a chunked backup. Same for the same content as it does not depend on
+    the random IV of the chunk encryption"""
+    return base64.b64encode(hashlib.sha256(','.join(chunk_ids).encode()).digest()).decode()
+
+
+def pack_backup_chunk(password: str, chunk: bytes) -> bytes:
+    return encrypt(password.encode(), zlib.compress(chunk, level=9))
+
+
+def unpack_backup_chunk(password: str, data: bytes) -> bytes:
+    """May raise:
+    - UnableToDecryptRemoteData due to decrypt()
+    """
+    return zlib.decompress(decrypt(password.encode(), data))
@@ -62,6 +62,7 @@ ASSET_MOVEMENT_MATCHING_CAPABILITY: Final = 'asset_movement_matching'
 GNOSIS_PAY_CAPABILITY: Final = 'gnosispay'
 MONERIUM_CAPABILITY: Final = 'monerium'
 MCP_CAPABILITY: Final = 'mcp'
+CHUNKED_BACKUPS_CAPABILITY: Final = 'chunked_backups'
 
 
 class RemoteMetadata(NamedTuple):
@@ -71,8 +72,11 @@ class RemoteMetadata(NamedTuple):
     last_modify_ts: Timestamp
     # This is the hash of the remote DB data
     data_hash: str
-    # This is the size in bytes of the remote DB data
+    # This is the size in bytes of the remote DB data. For a chunked backup it is the
+    # size of the plaintext DB and not of the compressed and encrypted data.
     data_size: int
+    # Whether the remote DB data is a chunked backup
+    chunked: bool = False
 
 
 class UserLimits(TypedDict):
@@ -99,6 +103,8 @@ class UserLimits(TypedDict):
     gnosispay: bool
     monerium: bool
     mcp: bool
+    # whether the server stores the DB backups in the chunked format of premium/chunks.py
+    chunked_backups: bool
     # minimum tier required to unlock each capability
     unlocks: dict[str, str]
 
@@ -158,7 +164,15 @@ KNOWN_STATUS_CODES: Final = (
     HTTPStatus.BAD_REQUEST,
     HTTPStatus.CREATED,
 )
-NEST_API_ENDPOINTS: Final = ('backup', 'backup/range', 'devices', 'limits')
+NEST_API_ENDPOINTS: Final = (
+    'backup',
+    'backup/range',
+    'backup/chunk',
+    'backup/chunks',
+    'backup/manifest',
+    'devices',
+    'limits',
+)
 UPLOAD_CHUNK_SIZE: Final = 10_000_000  # 10 MB
 MAX_UPLOAD_CHUNK_RETRIES: Final = 1
 
@@ -929,6 +943,173 @@ class Premium:
 
         return response.content
 
+    def query_backup_chunk_ids(self) -> set[str]:
+        """Queries the ids of the DB backup chunks stored in the server
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.get(
+                f'{self.rotki_nest}{(method := "backup/chunks")}',
+                params=self.sign(method=method),
+                timeout=ROTKEHLCHEN_SERVER_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            msg = f'Could not connect to rotki server due to {e!s}'
+            log.error(msg)
+            raise RemoteError(msg) from e
+
+        result = _process_dict_response(response)
+        if not isinstance(chunk_ids := result.get('chunk_ids'), list):
+            msg = 'Problem connecting to rotki server. backup/chunks response missing chunk_ids key'  # noqa: E501
+            log.error(f'{msg}. Response was {result}')
+            raise RemoteError(msg)
+
+        return set(chunk_ids)
+
+    def upload_backup_chunks(self, chunks: dict[str, bytes]) -> None:
+        """Uploads the given encrypted DB backup chunks keyed by their id. The chunks are
+        sent in batches of up to UPLOAD_CHUNK_SIZE bytes.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        batches: list[dict[str, bytes]] = [{}]
+        batch_size = 0
+        for chunk_id, data in chunks.items():
+            if batch_size + len(data) > UPLOAD_CHUNK_SIZE and len(batches[-1]) != 0:
+                batches.append({})
+                batch_size = 0
+            batches[-1][chunk_id] = data
+            batch_size += len(data)
+
+        for batch_idx, batch in enumerate(batches):
+            if len(batch) == 0:
+                continue
+
+            self.msg_aggregator.add_message(
+                message_type=WSMessageType.DATABASE_UPLOAD_PROGRESS,
+                data={
+                    'type': str(DBUploadStatusStep.UPLOADING),
+                    'current_chunk': batch_idx + 1,
+                    'total_chunks': len(batches),
+                },
+            )
+            try:
+                response = self.session.post(
+                    f'{self.rotki_nest}{(method := "backup/chunks")}',
+                    files={chunk_id: (chunk_id, data) for chunk_id, data in batch.items()},
+                    data=self.sign(method=method),
+                    timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+                )
+            except requests.exceptions.RequestException as e:
+                log.error(msg := f'Could not connect to rotki server due to {e!s}')
+                raise RemoteError(msg) from e
+
+            _process_dict_response(
+                response=response,
+                status_codes=(HTTPStatus.OK,),
+                user_msg='Size limit reached' if response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE else f'Could not upload database backup due to: {response.text}',  # noqa: E501
+            )
+
+    def upload_backup_manifest(
+            self,
+            chunk_ids: list[str],
+            our_hash: str,
+            last_modify_ts: Timestamp,
+            total_size: int,
+    ) -> None:
+        """Uploads the manifest of a chunked DB backup. The server checks that it has all
+        its chunks and makes it the latest backup.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.post(
+                f'{self.rotki_nest}{(method := "backup/manifest")}',
+                data=self.sign(
+                    method=method,
+                    chunk_ids=','.join(chunk_ids),
+                    file_hash=our_hash,
+                    last_modify_ts=last_modify_ts,
+                    compression='zlib',
+                    total_size=total_size,
+                ),
+                timeout=ROTKEHLCHEN_SERVER_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            log.error(msg := f'Could not connect to rotki server due to {e!s}')
+            raise RemoteError(msg) from e
+
+        _process_dict_response(
+            response=response,
+            status_codes=(HTTPStatus.OK,),
+            user_msg=f'Could not upload database backup due to: {response.text}',
+        )
+
+    def pull_backup_manifest(self) -> list[str] | None:
+        """Pulls the chunk ids of the latest DB backup from the server
+
+        Returns None if the latest backup saved in the server is not a chunked one.
+
+        May raise:
+        - RemoteError if there are problems reaching the server or if
+        there is an error returned by the server
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.get(
+                f'{self.rotki_nest}{(method := "backup/manifest")}',
+                params=self.sign(method=method),
+                timeout=ROTKEHLCHEN_SERVER_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            msg = f'Could not connect to rotki server due to {e!s}'
+            log.error(msg)
+            raise RemoteError(msg) from e
+
+        check_response_status_code(response, (HTTPStatus.OK, HTTPStatus.NOT_FOUND))
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+
+        result = _process_dict_response(response)
+        if not isinstance(chunk_ids := result.get('chunk_ids'), list):
+            msg = 'Problem connecting to rotki server. backup/manifest response missing chunk_ids key'  # noqa: E501
+            log.error(f'{msg}. Response was {result}')
+            raise RemoteError(msg)
+
+        return chunk_ids
+
+    def pull_backup_chunk(self, chunk_id: str) -> bytes:
+        """Pulls an encrypted DB backup chunk from the server
+
+        May raise:
+        - RemoteError if there are problems reaching the server, if
+        there is an error returned by the server or if the chunk is missing
+        - PremiumAuthenticationError if the given key is rejected by the Rotkehlchen server
+        """
+        try:
+            response = self.session.get(
+                f'{self.rotki_nest}{(method := "backup/chunk")}',
+                params=self.sign(method=method, chunk_id=chunk_id),
+                timeout=ROTKEHLCHEN_SERVER_BACKUP_TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            msg = f'Could not connect to rotki server due to {e!s}'
+            log.error(msg)
+            raise RemoteError(msg) from e
+
+        check_response_status_code(response, (HTTPStatus.OK,))
+        return response.content
+
     def query_last_data_metadata(self) -> RemoteMetadata:
         """Queries last metadata from the server and returns the response
         as a RemoteMetadata object.
@@ -958,6 +1139,7 @@ class Premium:
                 last_modify_ts=Timestamp(result['last_modify_ts']),
                 data_hash=result['data_hash'],
                 data_size=result['data_size'],
+                chunked=result.get('chunked', False) is True,
             )
         except KeyError as e:
             msg = f'Problem connecting to rotki server. last_data_metadata response missing {e!s} key'  # noqa: E501
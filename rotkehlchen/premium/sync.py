@@ -14,8 +14,10 @@ from rotkehlchen.errors.api import (
     RotkehlchenPermissionError,
 )
 from rotkehlchen.errors.misc import DataIntegrityError, RemoteError, UnableToDecryptRemoteData
+from rotkehlchen.feature_flags import is_chunked_backups_enabled
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import (
+    CHUNKED_BACKUPS_CAPABILITY,
     Premium,
     PremiumCredentials,
     RemoteMetadata,
@@ -72,6 +74,34 @@ class PremiumSyncManager(LockableQueryMixIn):
         self.last_remote_data_upload_ts = metadata.upload_ts
         return metadata
 
+    def _chunked_backups_enabled(self) -> bool:
+        """Whether chunked backups are enabled locally and the server stores the DB
+        backups in the chunked format"""
+        assert self.premium is not None, 'caller should make sure premium exists'
+        if is_chunked_backups_enabled() is False:
+            return False
+
+        try:
+            return self.premium.fetch_limits().get(CHUNKED_BACKUPS_CAPABILITY, False) is True
+        except (RemoteError, PremiumAuthenticationError) as e:
+            log.error(f'Could not query premium limits for the chunked backups due to {e!s}')
+            return False
+
+    def _pull_chunked_backup(self, chunk_ids: list[str]) -> dict[str, bytes]:
+        """Pull the encrypted chunks of the given manifest, each only once
+
+        May raise:
+        - RemoteError
+        - PremiumAuthenticationError
+        """
+        assert self.premium is not None, 'caller should make sure premium exists'
+        encrypted_chunks: dict[str, bytes] = {}
+        for chunk_id in chunk_ids:
+            if chunk_id not in encrypted_chunks:
+                encrypted_chunks[chunk_id] = self.premium.pull_backup_chunk(chunk_id)
+
+        return encrypted_chunks
+
     def _can_sync_data_from_server(self, new_account: bool) -> SyncCheckResult:
         """
         Checks if the remote data can be pulled from the server.
@@ -131,17 +161,29 @@ class PremiumSyncManager(LockableQueryMixIn):
         if self.premium is None:
             return False, 'Pulling failed. User does not have active premium.'
 
+        result: bytes | None = None
+        chunk_ids: list[str] | None = None
+        encrypted_chunks: dict[str, bytes] = {}
         try:
-            result = self.premium.pull_data()
+            if (
+                self._chunked_backups_enabled() and
+                (chunk_ids := self.premium.pull_backup_manifest()) is not None
+            ):
+                encrypted_chunks = self._pull_chunked_backup(chunk_ids)
+            else:  # the latest backup in the server is a whole encrypted DB
+                result = self.premium.pull_data()
         except (RemoteError, PremiumAuthenticationError) as e:
             log.debug('sync from server -- pulling failed.', error=str(e))
             return False, f'Pulling failed: {e!s}'
 
-        if result is None:
+        if result is None and chunk_ids is None:
             return False, 'No data found'
 
         try:
-            self.data.decompress_and_decrypt_db(result)
+            if chunk_ids is not None:
+                self.data.join_and_decrypt_db(chunk_ids, encrypted_chunks)
+            elif result is not None:
+                self.data.decompress_and_decrypt_db(result)
         except UnableToDecryptRemoteData as e:
             raise PremiumAuthenticationError(
                 'The given password can not unlock the database that was retrieved  from '
@@ -195,17 +237,6 @@ class PremiumSyncManager(LockableQueryMixIn):
         """
         assert self.premium is not None, 'caller should make sure premium exists'
         log.debug('Starting maybe_upload_data_to_server')
-        ok, integrity_error = self.data.db.db_integrity_check()
-        if not ok:
-            message = f'Local database failed the integrity check: {integrity_error}'
-            log.error('upload to server aborted -- %s', message)
-            self.data.msg_aggregator.add_message(
-                message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
-                data={'uploaded': False, 'actionable': True, 'message': message},
-            )
-            self.last_upload_attempt_ts = ts_now()
-            return False, message
-
         try:
             metadata = self._query_last_data_metadata()
         except (RemoteError, PremiumAuthenticationError) as e:
@@ -233,6 +264,19 @@ class PremiumSyncManager(LockableQueryMixIn):
             self.last_upload_attempt_ts = ts_now()
             return False, message
 
+        # The integrity check, export, compression and encryption all go over the whole DB
+        # so they only run after the cheap checks above found that there is something to upload
+        ok, integrity_error = self.data.db.db_integrity_check()
+        if not ok:
+            message = f'Local database failed the integrity check: {integrity_error}'
+            log.error('upload to server aborted -- %s', message)
+            self.data.msg_aggregator.add_message(
+                message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+                data={'uploaded': False, 'actionable': True, 'message': message},
+            )
+            self.last_upload_attempt_ts = ts_now()
+            return False, message
+
         with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
             tempdbpath = self.data.db.export_unencrypted(tempdbfile)
             exported_ok, exported_error = plaintext_db_integrity_check(tempdbpath)
@@ -246,7 +290,35 @@ class PremiumSyncManager(LockableQueryMixIn):
                 )
                 self.last_upload_attempt_ts = ts_now()
                 return False, message
-            data, our_hash = self.data.compress_and_encrypt_db(tempdbpath)
+            if self._chunked_backups_enabled():
+                try:
+                    remote_chunk_ids = self.premium.query_backup_chunk_ids()
+                except (RemoteError, PremiumAuthenticationError) as e:
+                    tempdbpath.unlink(missing_ok=True)
+                    message = str(e)
+                    log.debug('upload to server -- chunk ids query error', error=message)
+                    self.data.msg_aggregator.add_message(
+                        message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+                        data={'uploaded': False, 'actionable': False, 'message': message},
+                    )
+                    self.last_upload_attempt_ts = ts_now()
+                    return False, message
+
+                # The remote size is compared against ours in the format of the remote backup.
+                # Only the first chunked upload over a whole DB backup has to compress it all.
+                data_bytes_size = (
+                    tempdbpath.stat().st_size if metadata.chunked else
+                    self.data.whole_db_backup_size(tempdbpath)
+                )
+                # only the chunks that the server does not have get compressed and encrypted
+                backup = self.data.chunk_and_encrypt_db(tempdbpath, remote_chunk_ids)
+                our_hash = backup.data_hash
+                data = b''  # the new chunks are uploaded instead
+            else:
+                backup = None
+                plaintext_size = tempdbpath.stat().st_size
+                data, our_hash = self.data.compress_and_encrypt_db(tempdbpath)
+                data_bytes_size = plaintext_size if metadata.chunked else len(data)
 
         log.debug(
             'CAN_PUSH',
@@ -263,7 +335,6 @@ class PremiumSyncManager(LockableQueryMixIn):
             self.last_upload_attempt_ts = ts_now()
             return False, message
 
-        data_bytes_size = len(data)
         if data_bytes_size < metadata.data_size and not force_upload:
             with self.data.db.conn.read_ctx() as cursor:
                 ask_user_upon_size_discrepancy = self.data.db.get_setting(
@@ -283,12 +354,21 @@ class PremiumSyncManager(LockableQueryMixIn):
                 return False, message
 
         try:
-            self.premium.upload_data(
-                data_blob=data,
-                our_hash=our_hash,
-                last_modify_ts=our_last_write_ts,
-                compression_type='zlib',
-            )
+            if backup is not None:  # chunked
+                self.premium.upload_backup_chunks(backup.new_chunks)
+                self.premium.upload_backup_manifest(
+                    chunk_ids=backup.chunk_ids,
+                    our_hash=our_hash,
+                    last_modify_ts=our_last_write_ts,
+                    total_size=backup.data_size,
+                )
+            else:
+                self.premium.upload_data(
+                    data_blob=data,
+                    our_hash=our_hash,
+                    last_modify_ts=our_last_write_ts,
+                    compression_type='zlib',
+                )
         except (RemoteError, PremiumAuthenticationError) as e:
             message = str(e)
             log.debug('upload to server -- upload error', error=message)
@@ -303,7 +383,10 @@ class PremiumSyncManager(LockableQueryMixIn):
         self.last_data_upload_ts = ts_now()
         self.last_upload_attempt_ts = self.last_data_upload_ts
         self.last_remote_data_upload_ts = self.last_data_upload_ts
-        with self.data.db.user_write() as cursor:
+        # Use write_ctx directly (not user_write) to skip the last_write_ts bump. Otherwise
+        # saving this would make the DB look modified after the upload, and the next sync
+        # would export, compress, encrypt and upload it again even if nothing else changed.
+        with self.data.db.conn.write_ctx() as cursor:
             self.data.db.set_static_cache(
                 write_cursor=cursor,
                 name=DBCacheStatic.LAST_DATA_UPLOAD_TS,
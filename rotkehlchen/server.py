@@ -15,6 +15,7 @@ from rotkehlchen.args import app_args
 from rotkehlchen.db.misc import get_sqlcipher_version_string
 from rotkehlchen.logging import TRACE, RotkehlchenLogsAdapter, add_logging_level, configure_logging
 from rotkehlchen.rotkehlchen import Rotkehlchen
+from rotkehlchen.utils.perf import PERF_RECORDER
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -60,6 +61,8 @@ class RotkehlchenServer:
             ws_notifier=self.rotkehlchen.rotki_notifier,
             cors_domain_list=domain_list,
         )
+        if self.args.perf_instrumentation:
+            PERF_RECORDER.enable(sample_rate=self.args.perf_flamegraph_sample_rate)
 
     def shutdown(self, *args: Any) -> None:
         """Shut the server down. Also used as a signal handler, hence the extra arguments."""
@@ -1,16 +1,21 @@
 import logging
 import time
+from collections import defaultdict
 from typing import TYPE_CHECKING, Final, Literal, NamedTuple
 
 from rotkehlchen.api.websockets.typedefs import ProgressUpdateSubType, WSMessageType
 from rotkehlchen.chain.evm.decoding.cowswap.constants import CPT_COWSWAP
 from rotkehlchen.concurrency import checkpoint
-from rotkehlchen.constants import ZERO
+from rotkehlchen.constants import DAY_IN_MILLISECONDS, ZERO
 from rotkehlchen.constants.assets import A_ETH, A_ETH2
 from rotkehlchen.db.cache import DBCacheStatic
 from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HistoryMappingState
 from rotkehlchen.db.filtering import HistoryEventFilterQuery
-from rotkehlchen.db.history_events import DBHistoryEvents, get_bitcoin_counterparty_addresses
+from rotkehlchen.db.history_events import (
+    HISTORY_EVENTS_STREAM_CHUNK_SIZE,
+    DBHistoryEvents,
+    get_bitcoin_counterparty_addresses,
+)
 from rotkehlchen.db.settings import CachedSettings
 from rotkehlchen.exchanges.constants import ALL_SUPPORTED_EXCHANGES
 from rotkehlchen.fval import FVal
@@ -34,6 +39,8 @@ from rotkehlchen.utils.misc import ts_ms_to_sec, ts_now, ts_sec_to_ms
 from rotkehlchen.utils.mixins.lockable import skip_if_running
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.drivers.sqlite import DBCursor
     from rotkehlchen.history.events.structures.base import HistoryBaseEntry
@@ -288,22 +295,23 @@ def process_historical_balances(
     if from_ts is not None:
         bucket_balances = _load_bucket_balances_before_ts(database, from_ts)
 
+    db_events = DBHistoryEvents(database)
+    filter_query = HistoryEventFilterQuery.make(
+        from_ts=ts_ms_to_sec(from_ts) if from_ts is not None else None,
+        exclude_ignored_assets=True,
+    )
     with database.conn.read_ctx() as cursor:
         last_run_ts = database.get_static_cache(
             cursor=cursor,
             name=DBCacheStatic.LAST_HISTORICAL_BALANCE_PROCESSING_TS,
         )
-        events = DBHistoryEvents(database).get_history_events_internal(
+        total_events, _ = db_events.get_history_events_count(
             cursor=cursor,
-            filter_query=HistoryEventFilterQuery.make(
-                from_ts=ts_ms_to_sec(from_ts) if from_ts is not None else None,
-                order_by_rules=[('timestamp', True), ('sequence_index', True)],
-                exclude_ignored_assets=True,
-            ),
+            query_filter=filter_query,
         )
-        # Snapshot the modification timestamp after reading events. This allows us to
+        # Snapshot the modification timestamp before streaming the events. This allows us to
         # detect concurrent modifications: if the modification timestamp changed between
-        # the read and processing completion, events were modified during processing.
+        # the snapshot and processing completion, events were modified during processing.
         modification_ts_at_start = cursor.execute(
             'SELECT value FROM key_value_cache WHERE name = ?',
             (DBCacheStatic.STALE_BALANCES_MODIFICATION_TS.value,),
@@ -314,8 +322,9 @@ def process_historical_balances(
         )
         treat_eth2_as_eth = CachedSettings().get_entry('treat_eth2_as_eth') is True
 
-    if (total_events := len(events)) == 0:
+    if total_events == 0:
         log.debug('No events to process for historical balances')
+        _update_daily_balances(database=database, from_ts=from_ts)
         _finalize_processing(
             database=database,
             modification_ts_at_start=modification_ts_at_start,
@@ -325,13 +334,20 @@ def process_historical_balances(
     metrics_batch: list[tuple[int | None, str, str | None, str | None, str, str, str, int, int, int]] = []  # noqa: E501
     modified_buckets: ModifiedBuckets = {}
     first_batch_written, send_ws_every = False, msg_aggregator.how_many_events_per_ws(total_events)
-    for idx, event in enumerate(events):
+    processed_ids: set[int] = set()
+    for idx, event in enumerate(_iterate_events_to_process(
+        db_events=db_events,
+        filter_query=filter_query,
+        processed_ids=processed_ids,
+    )):
         for event_to_apply in events_to_apply if (events_to_apply := _maybe_add_profit_event(
             database=database,
             event=event,
             bucket_balances=bucket_balances,
             treat_eth2_as_eth=treat_eth2_as_eth,
         )) is not None else (event,):
+            if event_to_apply.identifier is not None:
+                processed_ids.add(event_to_apply.identifier)
             _apply_to_buckets(
                 database=database,
                 event=event_to_apply,
@@ -385,6 +401,7 @@ def process_historical_balances(
         },
     )
     _detect_unmatched_bridge_issues(database=database)
+    _update_daily_balances(database=database, from_ts=from_ts)
     _finalize_processing(database=database, modification_ts_at_start=modification_ts_at_start)
     log.debug(
         'Completed historical balance processing for %s events with %s modified buckets',
@@ -393,6 +410,33 @@ def process_historical_balances(
     )
 
 
+def _iterate_events_to_process(
+        db_events: DBHistoryEvents,
+        filter_query: HistoryEventFilterQuery,
+        processed_ids: set[int],
+) -> Iterator[HistoryBaseEntry]:
+    """Stream the events to process from the DB in chunks, skipping those in processed_ids.
+
+    Creating a profit event shifts the sequence index of the rest of its group, which can
+    bring events that were already processed, as well as the new profit event, after the
+    key the next chunk is read from. Only events of the current timestamp can resurface
+    this way, so processed_ids is cleared whenever the timestamp advances.
+    """
+    current_ts: TimestampMS | None = None
+    for events in db_events.iterate_history_events_internal(
+        filter_query=filter_query,
+        chunk_size=HISTORY_EVENTS_STREAM_CHUNK_SIZE,
+    ):
+        for event in events:
+            if event.timestamp != current_ts:
+                current_ts = event.timestamp
+                processed_ids.clear()
+            elif event.identifier in processed_ids:
+                continue
+
+            yield event
+
+
 def _detect_unmatched_bridge_issues(database: DBHandler) -> None:
     """Surface bridge legs whose counterpart is unknown as data issues.
 
@@ -462,6 +506,62 @@ def _detect_unmatched_bridge_issues(database: DBHandler) -> None:
         write_cursor.execute(query, bindings)
 
 
+def _update_daily_balances(database: DBHandler, from_ts: TimestampMS | None) -> None:
+    """Rebuild the event_metrics_daily_balances rows from the day of from_ts onwards.
+
+    The balance of each bucket before that day is loaded from its latest metric and then
+    only the metrics written since are replayed, so the work done is proportional to the
+    reprocessed events and not to the whole history.
+    """
+    from_day = TimestampMS(0 if from_ts is None else from_ts - from_ts % DAY_IN_MILLISECONDS)
+    metric_key = EventMetricKey.BALANCE.serialize()
+    bucket_balances: dict[tuple[str, str | None, str | None, str], FVal] = {}
+    asset_balances: dict[str, FVal] = defaultdict(lambda: ZERO)
+    daily_rows: list[tuple[int, str, str]] = []
+    with database.conn.read_ctx() as cursor:
+        if from_day != 0:  # see _load_bucket_balances_before_ts for the use of MAX(sort_key)
+            cursor.execute(
+                'SELECT location, location_label, protocol, asset, metric_value, MAX(sort_key) '
+                'FROM event_metrics WHERE metric_key = ? AND timestamp < ? '
+                'GROUP BY location, location_label, protocol, asset',
+                (metric_key, from_day),
+            )
+            for row in cursor:
+                bucket_balances[row[:4]] = (balance := FVal(row[4]))
+                asset_balances[row[3]] += balance
+
+        current_day, day_assets = from_day, set[str]()
+        cursor.execute(
+            'SELECT location, location_label, protocol, asset, metric_value, timestamp '
+            'FROM event_metrics WHERE metric_key = ? AND timestamp >= ? '
+            'ORDER BY timestamp, sort_key, id',
+            (metric_key, from_day),
+        )
+        for row in cursor:
+            if (day := row[5] - row[5] % DAY_IN_MILLISECONDS) != current_day:
+                daily_rows.extend((current_day, x, str(asset_balances[x])) for x in day_assets)
+                current_day, day_assets = day, set()
+
+            balance = FVal(row[4])
+            asset_balances[row[3]] += balance - bucket_balances.get(row[:4], ZERO)
+            bucket_balances[row[:4]] = balance
+            day_assets.add(row[3])
+
+        daily_rows.extend((current_day, x, str(asset_balances[x])) for x in day_assets)
+
+    with database.user_write() as write_cursor:
+        write_cursor.execute(
+            'DELETE FROM event_metrics_daily_balances WHERE day >= ?',
+            (from_day,),
+        )
+        write_cursor.executemany(
+            'INSERT INTO event_metrics_daily_balances(day, asset, amount) VALUES (?, ?, ?)',
+            daily_rows,
+        )
+
+    log.debug(f'Wrote {len(daily_rows)} daily balances from {from_day=}')
+
+
 def _finalize_processing(
         database: DBHandler,
         modification_ts_at_start: int | None,
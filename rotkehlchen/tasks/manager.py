@@ -1,8 +1,9 @@
 import logging
 import random
 import threading
-from collections import defaultdict, deque
-from typing import TYPE_CHECKING, Final, NamedTuple
+import time
+from collections import Counter, defaultdict, deque
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.chain.bitcoin.xpub import XpubManager
@@ -58,6 +59,13 @@ from rotkehlchen.tasks.historical_balances import process_historical_balances
 from rotkehlchen.tasks.internal_tx_conflicts import (
     repull_internal_tx_conflicts,
 )
+from rotkehlchen.tasks.scheduling import (
+    RESOURCE_CONCURRENCY_LIMITS,
+    SchedulerTaskStats,
+    TaskResource,
+    get_scheduler_task_spec,
+    scheduler_task,
+)
 from rotkehlchen.tasks.utils import (
     prefetch_scheduler_task_timestamps,
     should_run_periodic_task,
@@ -156,6 +164,10 @@ class TaskManager:
         self.last_exchange_query_ts: defaultdict[ExchangeLocationID, int] = defaultdict(int)
         self.prepared_cryptocompare_query = False
         self.running_tasks: dict[SchedulerTask, list[Task]] = {}
+        # queue and run time metrics of each scheduling function. Run times are recorded
+        # from the done callbacks of the tasks, hence the lock.
+        self.scheduler_stats: dict[SchedulerTask, SchedulerTaskStats] = {}
+        self.scheduler_stats_lock = threading.Lock()
         # Per-tick snapshot of periodic-task last-run timestamps, set for the duration of a
         # _schedule pass so each task's should_run check reads from memory instead of the DB.
         self._scheduler_task_timestamps: Mapping[str, str] | None = None
@@ -211,6 +223,7 @@ class TaskManager:
         ))
         self.schedule_lock = threading.Semaphore()
 
+    @scheduler_task(resource=TaskResource.DB_WRITE, cost=3)
     def _maybe_schedule_db_upload(self) -> list[Task] | None:
         assert self.premium_sync_manager is not None, 'caller should make sure premium sync manager exists'  # noqa: E501
         if self.premium_sync_manager.check_if_should_sync(force_upload=False) is False:
@@ -273,6 +286,7 @@ class TaskManager:
 
         self.prepared_cryptocompare_query = True
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=1)
     def _maybe_schedule_cryptocompare_query(self) -> list[Task] | None:
         """Schedules a cryptocompare query for a single asset history"""
         if self.cryptocompare.has_api_key() is False:
@@ -311,6 +325,7 @@ class TaskManager:
             timestamp=now_ts,
         )]
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=2)
     def _maybe_schedule_xpub_derivation(self) -> list[Task] | None:
         """Schedules the xpub derivation task if enough time has passed and if user has xpubs"""
         now = ts_now()
@@ -350,6 +365,7 @@ class TaskManager:
             ))
         return tasks
 
+    @scheduler_task(resource=TaskResource.EVM_INDEXER, cost=3)
     def _maybe_query_evm_transactions(self) -> list[Task] | None:
         """Schedules the evm transaction query task if enough time has passed"""
         shuffled_chains = list(EVM_CHAINS_WITH_TRANSACTIONS)
@@ -397,6 +413,7 @@ class TaskManager:
                 )]
         return None
 
+    @scheduler_task(resource=TaskResource.RPC_NODES, cost=2)
     def _maybe_schedule_evm_txreceipts(self) -> list[Task] | None:
         """Schedules the evm transaction receipts query task
 
@@ -434,6 +451,7 @@ class TaskManager:
             )]
         return None
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=3)
     def _maybe_schedule_exchange_history_query(self) -> list[Task] | None:
         """Schedules the exchange history query task if enough time has passed"""
         if len(self.exchange_manager.connected_exchanges) == 0:
@@ -465,6 +483,7 @@ class TaskManager:
             fail_callback=exchange_fail_cb,
         )]
 
+    @scheduler_task(resource=TaskResource.CPU, cost=3)
     def _maybe_decode_transactions(self) -> list[Task] | None:
         """Schedules the transaction decoding task
 
@@ -508,6 +527,7 @@ class TaskManager:
             )]
         return None
 
+    @scheduler_task(resource=TaskResource.LIGHT, cost=1)
     def _maybe_check_premium_status(self) -> None:
         """
         Validates the premium status of the account and if the credentials are not valid
@@ -609,6 +629,7 @@ class TaskManager:
             return None
         return self._spawn_historical_balance_processing(from_ts=None)
 
+    @scheduler_task(resource=TaskResource.CPU, cost=4)
     def _maybe_process_historical_balances(self) -> list[Task] | None:
         if self.history_processing_coordinator.is_history_fetching():
             return None
@@ -633,6 +654,7 @@ class TaskManager:
             from_ts=TimestampMS(int(stale_from_ts)) if stale_from_ts is not None else None,
         )
 
+    @scheduler_task(resource=TaskResource.RPC_NODES, cost=4)
     def _maybe_update_snapshot_balances(self) -> list[Task] | None:
         """
         Update the balances of a user if the difference between last time they were updated
@@ -668,6 +690,7 @@ class TaskManager:
         except RemoteError as e:
             log.error(f'Skipping produced blocks query due to error: {e!s}')
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=2)
     def _maybe_query_produced_blocks(self) -> list[Task] | None:
         """Schedules the blocks production query if enough time has passed"""
         if (
@@ -691,6 +714,7 @@ class TaskManager:
             indices=indices,
         )]
 
+    @scheduler_task(resource=TaskResource.EVM_INDEXER, cost=2)
     def _maybe_query_withdrawals(self) -> list[Task] | None:
         """Schedules the eth withdrawal query if enough time has passed"""
         if (eth2 := self.chains_aggregator.get_module('eth2')) is None:
@@ -723,6 +747,7 @@ class TaskManager:
             to_ts=now,
         )]
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=1)
     def _maybe_detect_withdrawal_exits(self) -> list[Task] | None:
         """Schedules the task that detects if any of the withdrawals should be exits
 
@@ -747,6 +772,7 @@ class TaskManager:
             method=eth2.detect_exited_validators,
         )]
 
+    @scheduler_task(resource=TaskResource.CPU, cost=2)
     def _maybe_process_eth2_events(self) -> list[Task] | None:
         if (
             (self.chains_aggregator.get_module('eth2')) is None or
@@ -768,6 +794,7 @@ class TaskManager:
             database=self.database,
         )]
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=1)
     def _maybe_check_data_updates(self) -> list[Task] | None:
         """
         Function that schedules the data update task if either there is no data update
@@ -783,6 +810,7 @@ class TaskManager:
             method=self.data_updater.check_for_updates,
         )]
 
+    @scheduler_task(resource=TaskResource.EVM_INDEXER, cost=2)
     def _maybe_detect_evm_accounts(self) -> list[Task] | None:
         """
         Function that schedules the EVM accounts detection task if there has been more than
@@ -800,6 +828,7 @@ class TaskManager:
             chains=self.database.get_chains_to_detect_evm_accounts(),
         )]
 
+    @scheduler_task(resource=TaskResource.RPC_NODES, cost=1)
     def _maybe_update_ilk_cache(self) -> list[Task] | None:
         with self.database.conn.read_ctx() as cursor:
             if len(self.database.get_single_blockchain_addresses(cursor, SupportedBlockchain.ETHEREUM)) == 0:  # noqa: E501
@@ -816,6 +845,7 @@ class TaskManager:
 
         return None
 
+    @scheduler_task(resource=TaskResource.DB_WRITE, cost=1)
     def _maybe_detect_new_spam_tokens(self) -> list[Task] | None:
         """
         This function queries the globaldb looking for assets that look like spam tokens
@@ -832,6 +862,7 @@ class TaskManager:
             user_db=self.database,
         )]
 
+    @scheduler_task(resource=TaskResource.EVM_INDEXER, cost=1)
     def _maybe_repull_internal_tx_conflicts(self) -> list[Task] | None:
         with self.database.conn.read_ctx() as cursor:
             if not table_exists(cursor, 'evm_internal_tx_conflicts'):  # temporary table, to be removed in a future release  # noqa: E501
@@ -856,6 +887,7 @@ class TaskManager:
             limit=cached_settings.internal_txs_to_repull,
         )]
 
+    @scheduler_task(resource=TaskResource.DB_WRITE, cost=1)
     def _maybe_update_owned_assets(self) -> list[Task] | None:
         """
         This function runs the logic to copy the owned assets from the user db to the globaldb.
@@ -873,6 +905,7 @@ class TaskManager:
             user_db=self.database,
         )]
 
+    @scheduler_task(resource=TaskResource.RPC_NODES, cost=1)
     def _maybe_update_aave_v3_underlying_assets(self) -> list[Task] | None:
         """
         This function runs the logic to query the aave v3 contracts to get all the
@@ -889,6 +922,7 @@ class TaskManager:
             chains_aggregator=self.chains_aggregator,
         )]
 
+    @scheduler_task(resource=TaskResource.RPC_NODES, cost=1)
     def _maybe_update_spark_underlying_assets(self) -> list[Task] | None:
         """This function runs the logic to query the Spark contracts to get all the
         underlying assets supported by them and save them in the globaldb.
@@ -909,6 +943,7 @@ class TaskManager:
             chains_aggregator=self.chains_aggregator,
         )]
 
+    @scheduler_task(resource=TaskResource.DB_WRITE, cost=1)
     def _maybe_create_calendar_reminder(self) -> list[Task] | None:
         """Create upcoming reminders for specific history events, if not already created."""
         if (
@@ -931,6 +966,7 @@ class TaskManager:
             ethereum_inquirer=self.chains_aggregator.ethereum.node_inquirer,
         )]
 
+    @scheduler_task(resource=TaskResource.LIGHT, cost=1)
     def _maybe_trigger_calendar_reminder(self) -> list[Task] | None:
         """Get upcoming reminders and maybe process them"""
         if (now := ts_now()) - self.last_calendar_reminder_check < 60 * 5:
@@ -970,6 +1006,7 @@ class TaskManager:
             msg_aggregator=self.msg_aggregator,
         )]
 
+    @scheduler_task(resource=TaskResource.DB_WRITE, cost=1)
     def _maybe_delete_past_calendar_events(self) -> list[Task] | None:
         """
         Delete old calendar events if the setting for deleting them allows it and if they haven't
@@ -986,6 +1023,7 @@ class TaskManager:
             database=self.database,
         )]
 
+    @scheduler_task(resource=TaskResource.REMOTE, cost=1)
     def _maybe_sync_google_calendar(self) -> list[Task] | None:
         """
         Periodically sync rotki calendar events to Google Calendar if authenticated.
@@ -1026,6 +1064,7 @@ class TaskManager:
         result = google_calendar.sync_events(calendar_entries)
         log.debug(f'Google Calendar sync completed: {result}')
 
+    @scheduler_task(resource=TaskResource.EVM_INDEXER, cost=2)
     def _maybe_query_graph_delegated_tokens(self) -> list[Task] | None:
         """
         Periodically query Ethereum transaction logs for Graph staking-related transactions,
@@ -1054,9 +1093,34 @@ class TaskManager:
             if not all(task.dead for task in tasks)
         }
 
+    def _get_scheduler_stats(self, scheduling_fn: SchedulerTask) -> SchedulerTaskStats:
+        """Get or create the stats of a scheduling function. Call with the stats lock held"""
+        if (stats := self.scheduler_stats.get(scheduling_fn)) is None:
+            stats = self.scheduler_stats[scheduling_fn] = SchedulerTaskStats(
+                spec=get_scheduler_task_spec(scheduling_fn),
+            )
+        return stats
+
+    def _track_run_time(self, stats: SchedulerTaskStats, tasks: list[Task]) -> None:
+        """Record the run time of the tasks spawned by a scheduling function once all end"""
+        start, pending = time.monotonic(), len(tasks)
+
+        def on_task_done(_task: Task) -> None:
+            nonlocal pending
+            with self.scheduler_stats_lock:
+                pending -= 1
+                if pending == 0:
+                    stats.record_run(time.monotonic() - start)
+
+        for task in tasks:
+            task.add_done_callback(on_task_done)
+
     def _run_scheduler_check(self, scheduling_fn: SchedulerTask) -> bool:
         if scheduling_fn in self.running_tasks:
             return False  # the specified task is already running
+
+        with self.scheduler_stats_lock:
+            stats = self._get_scheduler_stats(scheduling_fn)
         try:
             new_tasks = scheduling_fn()
         except (RemoteError, PremiumAuthenticationError, DeserializationError, UnknownAsset) as e:
@@ -1066,11 +1130,15 @@ class TaskManager:
                 scheduling_fn.__name__,
                 e,
             )
-            return False
+            new_tasks = None
+
+        with self.scheduler_stats_lock:
+            stats.record_check(now=time.monotonic(), spawned=new_tasks is not None)
         if new_tasks is None:
             return False
 
         self.running_tasks[scheduling_fn] = new_tasks
+        self._track_run_time(stats=stats, tasks=new_tasks)
         return True
 
     def _drain_priority_tasks_queue(self) -> None:
@@ -1090,7 +1158,13 @@ class TaskManager:
             self._scheduler_task_timestamps = None
 
     def _schedule(self) -> None:
-        """Schedules background tasks"""
+        """Schedules background tasks
+
+        The scheduling functions are checked in order of their aging priority and only
+        while there are free task slots and their resource is below its concurrency
+        limit. The ones that could not be checked are deferred, which raises their
+        priority for the next ticks.
+        """
         current_tasks = len(self.task_supervisor.tasks) + len(self.api_tasks)
         not_proceed = current_tasks >= self.max_tasks_num
         log.debug(
@@ -1099,25 +1173,50 @@ class TaskManager:
             self.max_tasks_num,
             'Will not schedule' if not_proceed else 'Will schedule',
         )
-        if not_proceed:
-            return  # too busy
+        now = time.monotonic()
+        candidates = [fn for fn in self.potential_tasks if fn not in self.running_tasks]
+        with self.scheduler_stats_lock:
+            if not_proceed:  # too busy
+                for scheduling_fn in candidates:
+                    self._get_scheduler_stats(scheduling_fn).defer(now)
+                return
 
-        random.shuffle(self.potential_tasks)
-        max_tasks = min(self.max_tasks_num - current_tasks, len(self.potential_tasks))
+            candidates.sort(key=lambda fn: self._get_scheduler_stats(fn).priority(now))
 
+        running_per_resource = Counter(
+            get_scheduler_task_spec(scheduling_fn).resource
+            for scheduling_fn in self.running_tasks
+        )
+        free_slots = self.max_tasks_num - current_tasks
         # Read all periodic-task last-run timestamps once for this pass so the should_run checks
         # below hit this snapshot instead of each issuing its own key_value_cache query.
         self._scheduler_task_timestamps = prefetch_scheduler_task_timestamps(self.database)
         try:
-            spawned_new = 0
-            for scheduling_fn in self.potential_tasks:
-                if spawned_new >= max_tasks:
-                    break  # no more task slots left
+            for scheduling_fn in candidates:
+                resource = get_scheduler_task_spec(scheduling_fn).resource
+                if free_slots <= 0 or (
+                    (limit := RESOURCE_CONCURRENCY_LIMITS[resource]) is not None and
+                    running_per_resource[resource] >= limit
+                ):
+                    with self.scheduler_stats_lock:
+                        self._get_scheduler_stats(scheduling_fn).defer(now)
+                    continue
+
                 if self._run_scheduler_check(scheduling_fn):
-                    spawned_new += 1
+                    free_slots -= 1
+                    running_per_resource[resource] += 1
         finally:
             self._scheduler_task_timestamps = None
 
+    def get_scheduler_stats(self) -> dict[str, dict[str, Any]]:
+        """The queue and run time metrics of the scheduling functions, by name"""
+        with self.scheduler_stats_lock:
+            return {
+                getattr(scheduling_fn, '__name__', str(scheduling_fn)): stats.serialize(
+                    running=scheduling_fn in self.running_tasks,
+                ) for scheduling_fn, stats in self.scheduler_stats.items()
+            }
+
     def schedule(self) -> None:
         """Schedules background task while holding the scheduling lock
 
@@ -1151,4 +1250,6 @@ class TaskManager:
 
         self.running_tasks.clear()
         self.priority_tasks_queue.clear()
+        with self.scheduler_stats_lock:
+            self.scheduler_stats.clear()
         self.should_schedule = False
@@ -0,0 +1,118 @@
+"""Resource classes and bookkeeping of the background tasks of the TaskManager
+
+Each scheduling function of the TaskManager declares with scheduler_task() the resource
+its tasks mostly compete for and their expected cost. The scheduler runs at most
+RESOURCE_CONCURRENCY_LIMITS tasks of each resource at the same time and checks the
+scheduling functions in order of an aging priority: a function that could not be checked
+in a tick, due to missing capacity, gains priority the longer it waits. Cheaper
+functions gain it faster, so an expensive task waits more but is never starved.
+"""
+import time
+from dataclasses import dataclass
+from enum import auto
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from rotkehlchen.utils.mixins.enums import SerializableEnumNameMixin
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class TaskResource(SerializableEnumNameMixin):
+    """What the tasks of a scheduling function mostly compete for"""
+    LIGHT = auto()  # quick checks that barely use anything
+    EVM_INDEXER = auto()  # the etherscan (v2 single key for all chains) and other indexers
+    RPC_NODES = auto()  # the connected RPC nodes of the chains
+    REMOTE = auto()  # other remote services such as exchanges, oracles and the rotki server
+    DB_WRITE = auto()  # the single writer of the user DB
+    CPU = auto()  # pure python processing such as decoding or balance processing
+
+
+# Max tasks of each resource running at the same time. None for no limit other than the
+# total max_tasks_num of the TaskManager.
+RESOURCE_CONCURRENCY_LIMITS: Final[dict[TaskResource, int | None]] = {
+    TaskResource.LIGHT: None,
+    TaskResource.EVM_INDEXER: 1,
+    TaskResource.RPC_NODES: 2,
+    TaskResource.REMOTE: 2,
+    TaskResource.DB_WRITE: 1,
+    TaskResource.CPU: 1,
+}
+
+
+class SchedulerTaskSpec(NamedTuple):
+    resource: TaskResource
+    cost: int  # expected relative cost. 1 for the cheapest tasks
+
+
+DEFAULT_SCHEDULER_TASK_SPEC: Final = SchedulerTaskSpec(resource=TaskResource.LIGHT, cost=1)
+
+
+def scheduler_task[F: Callable[..., Any]](
+        resource: TaskResource,
+        cost: int,
+) -> Callable[[F], F]:
+    """Declare the resource and expected cost of the tasks of a scheduling function"""
+    def decorator(func: F) -> F:
+        func.scheduler_task_spec = SchedulerTaskSpec(resource=resource, cost=cost)  # type: ignore[attr-defined]  # noqa: E501
+        return func
+
+    return decorator
+
+
+def get_scheduler_task_spec(scheduling_fn: Callable[..., Any]) -> SchedulerTaskSpec:
+    """The declared spec of a scheduling function (bound method) or the default one"""
+    return getattr(
+        getattr(scheduling_fn, '__func__', None),
+        'scheduler_task_spec',
+        DEFAULT_SCHEDULER_TASK_SPEC,
+    )
+
+
+@dataclass(slots=True)
+class SchedulerTaskStats:
+    """Queue and run time metrics of the tasks of a scheduling function"""
+    spec: SchedulerTaskSpec
+    deferred_since: float | None = None  # monotonic time it was first not checked for capacity
+    runs: int = 0
+    finished_runs: int = 0
+    total_queue_seconds: float = 0.0
+    max_queue_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+    max_run_seconds: float = 0.0
+
+    def defer(self, now: float) -> None:
+        if self.deferred_since is None:
+            self.deferred_since = now
+
+    def priority(self, now: float) -> tuple[float, int]:
+        """Sort key of the scheduling function. Lower is checked first"""
+        waited = 0.0 if self.deferred_since is None else now - self.deferred_since
+        return -waited / self.spec.cost, self.spec.cost
+
+    def record_check(self, now: float, spawned: bool) -> None:
+        """Record that the scheduling function was checked and whether it spawned tasks"""
+        queue_seconds = 0.0 if self.deferred_since is None else now - self.deferred_since
+        self.deferred_since = None
+        if spawned:
+            self.runs += 1
+            self.total_queue_seconds += queue_seconds
+            self.max_queue_seconds = max(self.max_queue_seconds, queue_seconds)
+
+    def record_run(self, seconds: float) -> None:
+        self.finished_runs += 1
+        self.total_run_seconds += seconds
+        self.max_run_seconds = max(self.max_run_seconds, seconds)
+
+    def serialize(self, running: bool) -> dict[str, Any]:
+        return {
+            'resource': self.spec.resource.serialize(),
+            'cost': self.spec.cost,
+            'running': running,
+            'waiting_secs': 0.0 if self.deferred_since is None else time.monotonic() - self.deferred_since,  # noqa: E501
+            'runs': self.runs,
+            'avg_queue_secs': self.total_queue_seconds / self.runs if self.runs != 0 else 0.0,
+            'max_queue_secs': self.max_queue_seconds,
+            'avg_run_secs': self.total_run_seconds / self.finished_runs if self.finished_runs != 0 else 0.0,  # noqa: E501
+            'max_run_secs': self.max_run_seconds,
+        }
@@ -21,6 +21,7 @@ from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_ETH
 from rotkehlchen.constants.misc import DEFAULT_BALANCE_LABEL, ZERO
 from rotkehlchen.db.cache import DBCacheDynamic
+from rotkehlchen.db.constants import HISTORY_EVENTS_STORED_COLUMNS
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import HistoryEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
@@ -1543,7 +1544,7 @@ def test_redecode_block_production_events(rotkehlchen_api_server: APIServer) ->
     with db.conn.read_ctx() as cursor:
         # Check raw data from the db since deserializing EthBlockEvents performs the same check
         # for if the address is tracked that we are trying to test here.
-        assert cursor.execute('SELECT * FROM history_events').fetchall() == [
+        assert cursor.execute(f'SELECT {HISTORY_EVENTS_STORED_COLUMNS} FROM history_events').fetchall() == [  # noqa: E501
             (1, 4, f'BP1_{block_number}', 0, timestamp, 'f', mev_builder_address, 'ETH', reward1, f'Validator {v_index} produced block {block_number} with {reward1} ETH going to {mev_builder_address} as the block reward', 'informational', 'block production', None, 0),  # noqa: E501
             (2, 4, f'BP1_{block_number}', 1, timestamp, 'f', fee_recipient_address, 'ETH', reward2, f'Validator {v_index} produced block {block_number}. Relayer reported {reward2} ETH as the MEV reward going to {fee_recipient_address}', 'informational', 'mev reward', None, 0),  # noqa: E501
             (3, 2, f'BP1_{block_number}', 2, timestamp, 'f', fee_recipient_address, 'ETH', reward2, f'Received {reward2} ETH from {mev_builder_address} as mev reward for block {block_number} in {tx_hash_str}', 'staking', 'mev reward', f'{{"validator_index": {v_index}}}', 0),  # noqa: E501
@@ -1000,7 +1000,7 @@ def test_query_transactions_check_decoded_events(
     with rotki.data.db.conn.read_ctx() as cursor:
         for name, count in (
                 ('evm_transactions', 4), ('evm_internal_transactions', 0),
-                ('evmtx_receipts', 4), ('evmtx_receipt_log_topics', 6),
+                ('evmtx_receipts', 4),
                 ('evmtx_address_mappings', 4), ('evm_tx_mappings', 4),
                 ('history_events_mappings', 2),
         ):
@@ -1015,7 +1015,7 @@ def test_query_transactions_check_decoded_events(
     with rotki.data.db.conn.read_ctx() as cursor:
         for name, count in (
                 ('evm_transactions', 2), ('evm_internal_transactions', 0),
-                ('evmtx_receipts', 2), ('evmtx_receipt_log_topics', 6),
+                ('evmtx_receipts', 2),
                 ('evmtx_address_mappings', 2), ('evm_tx_mappings', 0),
                 ('history_events_mappings', 2),
         ):
@@ -1060,7 +1060,7 @@ def test_query_transactions_check_decoded_events(
     with rotki.data.db.conn.read_ctx() as cursor:
         for name in (
                 'evm_transactions', 'evm_internal_transactions',
-                'evmtx_receipts', 'evmtx_receipt_log_topics',
+                'evmtx_receipts',
                 'evmtx_address_mappings', 'evm_tx_mappings',
                 'history_events_mappings',
         ):
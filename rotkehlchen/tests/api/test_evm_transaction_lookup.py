@@ -6,6 +6,7 @@ import requests
 
 from rotkehlchen.chain.evm.types import NodeName, WeightedNode
 from rotkehlchen.constants.misc import ONE
+from rotkehlchen.db.evmtx import pack_receipt_logs
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.tests.utils.api import (
     api_url_for,
@@ -49,8 +50,9 @@ def test_lookup_evm_transaction_from_db(rotkehlchen_api_server: APIServer) -> No
             ),
         )
         write_cursor.execute(
-            'INSERT INTO evmtx_receipts(tx_id, contract_address, status, type) VALUES (?, ?, ?, ?)',  # noqa: E501
-            (write_cursor.lastrowid, None, 1, 2),
+            'INSERT INTO evmtx_receipts(tx_id, contract_address, status, type, logs) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (write_cursor.lastrowid, None, 1, 2, pack_receipt_logs([])),
         )
 
     result = assert_proper_response_with_result(
@@ -965,7 +965,7 @@ def test_get_historical_netvalue(
             A_EUR.identifier: '16800',
         },
         {  # Day 3: After BTC spend (-0.5) and ETH -> EUR swap (-0.2 ETH, +240 EUR)
-            A_BTC.identifier: '1.7000000000000002',
+            A_BTC.identifier: '1.7',
             A_ETH.identifier: '10.5',
             A_EUR.identifier: '17040',
         },
@@ -1010,6 +1010,20 @@ def test_get_historical_netvalue(
         assert timestamp == expected_ts
         assert balances == expected_bal
 
+    # a range without any activity still has the balances held before it
+    response = requests.post(
+        api_url_for(rotkehlchen_api_server, 'historicalnetvalueresource'),
+        json={
+            'from_timestamp': START_TS + DAY_IN_SECONDS * 4,
+            'to_timestamp': START_TS + DAY_IN_SECONDS * 5,
+        },
+    )
+    result = assert_proper_sync_response_with_result(response)
+    assert result['times'] == [
+        timestamp_to_daystart_timestamp(Timestamp(START_TS + DAY_IN_SECONDS * 4)),
+    ]
+    assert result['values'] == [expected_balances_ignored[-1]]
+
 
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_get_historical_netvalue_with_negative_balance_events(
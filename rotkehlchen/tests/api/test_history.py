@@ -391,6 +391,46 @@ def test_query_pnl_report_events_pagination_filtering(
         else:
             assert x['timestamp'] >= events[idx + 1]['timestamp']
 
+    # the summary breakdown by event type agrees with filtering the events by event type
+    response = requests.get(
+        api_url_for(
+            rotkehlchen_api_server_with_exchanges,
+            'accountingreportsummaryresource',
+            report_id=report_id,
+        ),
+        json={'group_by': 'event_type'},
+    )
+    summary = assert_proper_sync_response_with_result(response)
+    assert sum(entry['events_num'] for entry in summary) == 37
+    for entry in summary:
+        response = requests.post(
+            api_url_for(
+                rotkehlchen_api_server_with_exchanges,
+                'per_report_data_resource',
+                report_id=report_id,
+            ),
+            json={'event_type': entry['event_type'], 'limit': 5, 'offset': 0},
+        )
+        events_result = assert_proper_sync_response_with_result(response)
+        assert events_result['entries_found'] == entry['events_num']
+        assert len(events_result['entries']) == min(5, entry['events_num'])
+        assert all(x['type'] == entry['event_type'] for x in events_result['entries'])
+        type_events = [x for x in events if x['type'] == entry['event_type']]
+        for pnl_key in ('pnl_taxable', 'pnl_free'):  # summed exactly
+            assert FVal(entry[pnl_key]) == sum((FVal(x[pnl_key]) for x in type_events), FVal(0))
+
+    response = requests.get(
+        api_url_for(
+            rotkehlchen_api_server_with_exchanges,
+            'accountingreportsummaryresource',
+            report_id=report_id,
+        ),
+        json={'group_by': 'asset'},
+    )
+    summary = assert_proper_sync_response_with_result(response)
+    assert sum(entry['events_num'] for entry in summary) == 37
+    assert all(entry.keys() == {'asset', 'events_num', 'pnl_taxable', 'pnl_free'} for entry in summary)  # noqa: E501
+
 
 @pytest.mark.parametrize('ethereum_accounts', [[]])
 @pytest.mark.parametrize('have_decoders', [[True]])
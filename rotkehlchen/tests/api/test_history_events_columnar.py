@@ -0,0 +1,163 @@
+"""Tests for the columnar bulk export of history events"""
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import requests
+
+from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.constants.assets import A_DAI, A_ETH
+from rotkehlchen.db.history_events import (
+    HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO,
+    HISTORY_EVENTS_COLUMNAR_COLUMNS,
+    DBHistoryEvents,
+    _columnar_row_checksum,
+)
+from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.structures.base import HistoryEvent
+from rotkehlchen.history.events.structures.eth2 import EthWithdrawalEvent
+from rotkehlchen.history.events.structures.evm_event import EvmEvent
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.serialization.deserialize import deserialize_evm_tx_hash
+from rotkehlchen.tests.utils.api import (
+    api_url_for,
+    assert_error_response,
+    assert_proper_response_with_result,
+)
+from rotkehlchen.types import Location, TimestampMS
+from rotkehlchen.utils.misc import ts_ms_to_sec
+
+if TYPE_CHECKING:
+    from rotkehlchen.api.server import APIServer
+
+TX_HASH = '0x9a76e51e6feb83690b4f0ecb257adbceb73b6f8b38d7d5c5d3f5e22fd10e3c71'
+ADDRESS = string_to_evm_address('0xA7C8F1e13eDC5FBfB768f55ECF2Fee5d4C5BF964')
+
+
+def _query_columns(server: APIServer, json_filter: dict[str, Any]) -> dict[str, Any]:
+    return assert_proper_response_with_result(
+        response=requests.post(
+            api_url_for(server, 'historyeventscolumnarresource'),
+            json=json_filter,
+        ),
+        rotkehlchen_api_server=server,
+    )
+
+
+def test_history_events_columnar_export(rotkehlchen_api_server: APIServer) -> None:
+    """Test that the columnar export returns the events as columns in batches, applies the
+    time and ignored assets filters and that the checksums of the batches add up"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    with rotki.data.db.user_write() as write_cursor:
+        DBHistoryEvents(rotki.data.db).add_history_events(write_cursor, [
+            HistoryEvent(
+                group_identifier='group1',
+                sequence_index=0,
+                timestamp=TimestampMS(1000000),
+                location=Location.KRAKEN,
+                location_label='kraken',
+                asset=A_ETH,
+                amount=FVal('1.5'),
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                notes='Staking reward',
+            ), EvmEvent(
+                tx_ref=deserialize_evm_tx_hash(TX_HASH),
+                sequence_index=1,
+                timestamp=TimestampMS(2000000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.SPEND,
+                event_subtype=HistoryEventSubType.FEE,
+                asset=A_ETH,
+                amount=FVal('0.01'),
+                address=ADDRESS,
+                counterparty='gas',
+                extra_data={'some': 'data'},
+            ), EthWithdrawalEvent(
+                validator_index=42,
+                timestamp=TimestampMS(3000000),
+                amount=FVal(32),
+                withdrawal_address=ADDRESS,
+                is_exit=True,
+            ), HistoryEvent(
+                group_identifier='group4',
+                sequence_index=0,
+                timestamp=TimestampMS(4000000),
+                location=Location.EXTERNAL,
+                asset=A_DAI,
+                amount=FVal(10),
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+            ),
+        ])
+        rotki.data.db.add_to_ignored_assets(write_cursor, A_DAI)
+
+    result = _query_columns(rotkehlchen_api_server, {'exclude_ignored_assets': False})
+    columns = result['columns']
+    assert tuple(columns) == HISTORY_EVENTS_COLUMNAR_COLUMNS
+    assert result['has_more'] is False
+    assert result['last_identifier'] == columns['identifier'][-1]
+    assert columns['entry_type'] == [
+        'history event', 'evm event', 'eth withdrawal event', 'history event',
+    ]
+    assert columns['timestamp'] == [1000000, 2000000, 3000000, 4000000]
+    assert columns['location'] == ['kraken', 'ethereum', 'ethereum', 'external']
+    assert columns['asset'] == [A_ETH.identifier, A_ETH.identifier, A_ETH.identifier, A_DAI.identifier]  # noqa: E501
+    assert columns['amount'] == ['1.5', '0.01', '32', '10']
+    assert columns['user_notes'][:2] == ['Staking reward', None]
+    assert columns['extra_data'] == [None, {'some': 'data'}, None, None]
+    assert columns['tx_ref'] == [None, TX_HASH, None, None]
+    assert columns['counterparty'] == [None, 'gas', None, None]
+    assert columns['address'] == [None, ADDRESS, None, None]
+    assert columns['validator_index'] == [None, None, 42, None]
+    assert columns['is_exit'] == [None, None, True, None]
+    assert columns['block_number'] == [None, None, None, None]
+    all_checksum = int(result['checksum'])
+
+    # ignored assets are excluded by default and the time range is in seconds
+    assert _query_columns(rotkehlchen_api_server, {})['columns']['identifier'] == columns['identifier'][:3]  # noqa: E501
+    assert _query_columns(rotkehlchen_api_server, {
+        'from_timestamp': ts_ms_to_sec(TimestampMS(2000000)),
+        'to_timestamp': ts_ms_to_sec(TimestampMS(3000000)),
+    })['columns']['identifier'] == columns['identifier'][1:3]
+
+    # batches continue after the last identifier and their checksums add up to the total
+    first = _query_columns(rotkehlchen_api_server, {'exclude_ignored_assets': False, 'limit': 3})
+    assert first['columns']['identifier'] == columns['identifier'][:3]
+    assert first['has_more'] is True
+    with patch(
+        'rotkehlchen.db.history_events._columnar_row_checksum',
+        side_effect=_columnar_row_checksum,
+    ) as checksum_mock:
+        second = _query_columns(rotkehlchen_api_server, {
+            'exclude_ignored_assets': False,
+            'limit': 3,
+            'after_identifier': first['last_identifier'],
+            'checksum_up_to': first['last_identifier'],
+        })
+    # only the new row is hashed. The rows of the first batch reuse its running checksum
+    assert checksum_mock.call_count == 1
+    assert second['columns']['identifier'] == columns['identifier'][3:]
+    assert second['has_more'] is False
+    assert (int(first['checksum']) + int(second['checksum'])) % HISTORY_EVENTS_COLUMNAR_CHECKSUM_MODULO == all_checksum  # noqa: E501
+    # the checksum of the already loaded events tells whether they changed since
+    assert second['checksum_up_to'] == {'count': 3, 'checksum': first['checksum']}
+    with rotki.data.db.user_write() as write_cursor:
+        write_cursor.execute(
+            'UPDATE history_events SET amount=? WHERE identifier=?',
+            ('2', columns['identifier'][0]),
+        )
+    assert _query_columns(rotkehlchen_api_server, {
+        'exclude_ignored_assets': False,
+        'after_identifier': first['last_identifier'],
+        'checksum_up_to': first['last_identifier'],
+    })['checksum_up_to'] != second['checksum_up_to']
+
+    assert_error_response(
+        response=requests.post(
+            api_url_for(rotkehlchen_api_server, 'historyeventscolumnarresource'),
+            json={'from_timestamp': 3000, 'to_timestamp': 2000},
+        ),
+        contained_in_msg='from_timestamp must be less than or equal to to_timestamp',
+        status_code=HTTPStatus.BAD_REQUEST,
+    )
@@ -0,0 +1,95 @@
+"""Tests for paginating history events with the keyset continuation cursor"""
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.structures.base import HistoryEvent
+from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.tests.utils.api import (
+    api_url_for,
+    assert_error_response,
+    assert_proper_response_with_result,
+)
+from rotkehlchen.types import Location, TimestampMS
+
+if TYPE_CHECKING:
+    from rotkehlchen.api.server import APIServer
+
+
+def _query_events(server: APIServer, json_filter: dict[str, Any]) -> dict[str, Any]:
+    return assert_proper_response_with_result(
+        response=requests.post(
+            api_url_for(server, 'historyeventresource'),
+            json=json_filter,
+        ),
+        rotkehlchen_api_server=server,
+    )
+
+
+def test_history_events_cursor_pagination(rotkehlchen_api_server: APIServer) -> None:
+    """Test that paging with the cursor returns the same pages as paging with offset,
+    both for plain and grouped queries and with events sharing the same timestamp"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    dbevents = DBHistoryEvents(rotki.data.db)
+    with rotki.data.db.user_write() as write_cursor:
+        dbevents.add_history_events(write_cursor, [
+            HistoryEvent(
+                group_identifier=f'group{idx}',
+                sequence_index=sequence_index,
+                timestamp=TimestampMS(1000 * (idx // 2)),  # pairs of groups share a timestamp
+                location=Location.EXTERNAL,
+                asset=A_ETH,
+                amount=FVal(idx + 1),
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+            ) for idx in range(7) for sequence_index in range(idx % 3 + 1)
+        ])
+
+    for extra_args, expected_entries in (
+            ({}, 13),
+            ({'aggregate_by_group_ids': True}, 7),
+            ({'order_by_attributes': ['timestamp'], 'ascending': [True]}, 13),
+    ):
+        all_entries = _query_events(rotkehlchen_api_server, extra_args)['entries']
+        assert len(all_entries) == expected_entries
+
+        offset_entries, cursor_entries, cursor = [], [], None
+        for offset in range(0, expected_entries, 3):
+            offset_entries.extend(_query_events(
+                rotkehlchen_api_server,
+                extra_args | {'limit': 3, 'offset': offset},
+            )['entries'])
+
+        for _ in range(10):
+            result = _query_events(
+                rotkehlchen_api_server,
+                extra_args | {'limit': 3, 'exact_count': False} | ({} if cursor is None else {'cursor': cursor}),  # noqa: E501
+            )
+            assert result['entries_found'] is None
+            cursor_entries.extend(result['entries'])
+            if (cursor := result['next_cursor']) is None:
+                break
+
+        assert cursor_entries == offset_entries == all_entries
+
+    # exact counts are still returned by default, counting all the pages
+    result = _query_events(rotkehlchen_api_server, {'limit': 3})
+    assert result['entries_found'] == 13
+    assert result['next_cursor'] is not None
+
+    for json_filter, error_msg in (
+            ({'limit': 3, 'offset': 3, 'cursor': result['next_cursor']}, 'can not be used together'),  # noqa: E501
+            ({'limit': 3, 'cursor': 'not a cursor'}, 'Invalid pagination cursor'),
+    ):
+        assert_error_response(
+            response=requests.post(
+                api_url_for(rotkehlchen_api_server, 'historyeventresource'),
+                json=json_filter,
+            ),
+            contained_in_msg=error_msg,
+            status_code=HTTPStatus.BAD_REQUEST,
+        )
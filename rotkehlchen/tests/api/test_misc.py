@@ -24,6 +24,7 @@ from rotkehlchen.tests.utils.api import (
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.types import ChainID, Location, SupportedBlockchain
 from rotkehlchen.utils.misc import get_system_spec
+from rotkehlchen.utils.perf import PERF_RECORDER
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -176,6 +177,61 @@ def test_query_ping(rotkehlchen_api_server: APIServer) -> None:
     assert response_json['message'] == expected_message
 
 
+def test_perf_stats(rotkehlchen_api_server: APIServer) -> None:
+    """Test that the per route request stats are only served while the instrumentation
+    is enabled and that they include the DB statements of the requests"""
+    perf_url = api_url_for(rotkehlchen_api_server, 'perfresource')
+    assert_error_response(
+        response=requests.get(perf_url),
+        contained_in_msg='Performance instrumentation is not enabled',
+        status_code=HTTPStatus.CONFLICT,
+    )
+    PERF_RECORDER.enable()
+    try:
+        for _ in range(3):
+            assert_proper_response(requests.get(
+                api_url_for(rotkehlchen_api_server, 'settingsresource'),
+            ))
+
+        result = assert_proper_sync_response_with_result(
+            requests.get(perf_url, json={'route': 'GET /api/1/settings'}),
+        )
+        assert result['enabled'] is True
+        assert list(result['routes']) == ['GET /api/1/settings']
+        stats = result['routes']['GET /api/1/settings']
+        assert stats['requests'] == 3
+        assert stats['errors'] == 0
+        assert sum(bucket['count'] for bucket in stats['histogram']) == 3
+        assert stats['percentiles_ms']['p50'] <= stats['percentiles_ms']['p99'] <= stats['max_ms']  # noqa: E501
+        assert stats['db']['statements'] >= 3
+        assert stats['db']['slowest_statements'][0]['count'] >= 1
+
+        assert_proper_response(requests.delete(perf_url))
+        assert assert_proper_sync_response_with_result(
+            requests.get(perf_url, json={'route': 'GET /api/1/settings'}),
+        )['routes'] == {}
+    finally:
+        PERF_RECORDER.disable()
+        PERF_RECORDER.reset()
+
+
+@pytest.mark.parametrize('start_with_logged_in_user', [False])
+def test_perf_stats_require_login(rotkehlchen_api_server: APIServer) -> None:
+    """Test that the request stats can not be read or cleared without a logged in user"""
+    perf_url = api_url_for(rotkehlchen_api_server, 'perfresource')
+    PERF_RECORDER.enable()
+    try:
+        for response in (requests.get(perf_url), requests.delete(perf_url)):
+            assert_error_response(
+                response=response,
+                contained_in_msg='No user is currently logged in',
+                status_code=HTTPStatus.UNAUTHORIZED,
+            )
+    finally:
+        PERF_RECORDER.disable()
+        PERF_RECORDER.reset()
+
+
 def test_query_version_when_update_required(rotkehlchen_api_server: APIServer) -> None:
     """
     Test that endpoint to query app version and available updates works
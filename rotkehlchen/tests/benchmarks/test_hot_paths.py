@@ -8,9 +8,11 @@ Run explicitly with:
 Kept pytest-codspeed compatible: only the plain `benchmark` fixture API is
 used, so switching/adding `pytest-codspeed` later is a drop-in.
 """
+import tracemalloc
 from typing import TYPE_CHECKING
 
 import pytest
+from sqlcipher3 import dbapi2 as sqlcipher  # pylint: disable=no-name-in-module
 
 from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
@@ -19,9 +21,11 @@ from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_ETH, A_USDC
 from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HistoryMappingState
 from rotkehlchen.db.evmtx import DBEvmTx
-from rotkehlchen.db.filtering import EvmEventFilterQuery
+from rotkehlchen.db.filtering import EvmEventFilterQuery, HistoryEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.db.utils import exact_sum_query
 from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.structures.base import HistoryEvent
 from rotkehlchen.history.events.structures.evm_event import EvmEvent
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.serialization.deserialize import deserialize_evm_tx_hash
@@ -44,6 +48,8 @@ if TYPE_CHECKING:
 N_EVENTS = 1_000
 N_CUSTOMIZED_TXS = 1_000
 N_DECODE_TXS = 50
+N_BULK_EVENTS = 400_000
+N_SUM_EVENTS = 100_000
 USDT_ADDRESS = string_to_evm_address('0xdAC17F958D2ee523a2206206994597C13D831ec7')
 
 
@@ -242,6 +248,213 @@ def test_transaction_decoding(
     benchmark(run)
 
 
+@pytest.mark.benchmark
+def test_receipts_loading(benchmark: Callable, database: DBHandler) -> None:
+    """Loading the receipts and logs of a batch of transactions for decoding.
+
+    The logs are stored packed in the receipt so the size of the stored logs is recorded
+    next to the timing, together with the size of their raw fields for comparison.
+    """
+    from_address = string_to_evm_address('0x9531C059098e3d194fF87FebB587aB07B30B1306')
+    to_address = string_to_evm_address('0x4bBa290826C253BD854121346c370a9886d1bC26')
+    tx_data = _make_decodable_transactions(from_address, to_address)
+    dbevmtx = DBEvmTx(database)
+    with database.user_write() as write_cursor:
+        dbevmtx.add_transactions(write_cursor, [tx for tx, _ in tx_data], relevant_address=None)
+        for _, receipt in tx_data:
+            dbevmtx.add_or_ignore_receipt_data(
+                write_cursor=write_cursor,
+                chain_id=ChainID.ETHEREUM,
+                data={
+                    'transactionHash': str(receipt.tx_hash),
+                    'contractAddress': None,
+                    'status': 1,
+                    'type': '0x0',
+                    'logs': [{
+                        'logIndex': entry.log_index,
+                        'data': '0x' + entry.data.hex(),
+                        'address': entry.address,
+                        'topics': ['0x' + topic.hex() for topic in entry.topics],
+                    } for entry in receipt.logs],
+                },
+            )
+
+    with database.conn.read_ctx() as cursor:
+        benchmark.extra_info['packed_logs_bytes'] = cursor.execute(
+            'SELECT SUM(LENGTH(logs)) FROM evmtx_receipts',
+        ).fetchone()[0]
+    benchmark.extra_info['raw_logs_bytes'] = sum(
+        len(entry.data) + len(entry.address) + 32 * len(entry.topics)
+        for _, receipt in tx_data for entry in receipt.logs
+    )
+    tx_hashes = [tx.tx_hash for tx, _ in tx_data]
+
+    def run() -> None:
+        with database.conn.read_ctx() as cursor:
+            decoding_data = dbevmtx.get_transactions_decoding_data(
+                cursor=cursor,
+                tx_hashes=tx_hashes,
+                chain_id=ChainID.ETHEREUM,
+            )
+        assert decoding_data[tx_hashes[0]][1] == tx_data[0][1]
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark
+def test_receipts_loading_row_per_log(benchmark: Callable, database: DBHandler) -> None:
+    """Loading the logs of the same batch of receipts as test_receipts_loading from the
+    row per log and per topic layout used before DB v54, for comparison with the packed one.
+
+    The legacy tables are created standalone so that this runs the same on any schema.
+    """
+    from_address = string_to_evm_address('0x9531C059098e3d194fF87FebB587aB07B30B1306')
+    to_address = string_to_evm_address('0x4bBa290826C253BD854121346c370a9886d1bC26')
+    tx_data = _make_decodable_transactions(from_address, to_address)
+    with database.user_write() as write_cursor:
+        write_cursor.executescript("""
+CREATE TABLE legacy_evmtx_receipt_logs (
+    identifier INTEGER NOT NULL PRIMARY KEY,
+    tx_id INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    address TEXT NOT NULL,
+    UNIQUE(tx_id, log_index)
+);
+CREATE TABLE legacy_evmtx_receipt_log_topics (
+    log INTEGER NOT NULL,
+    topic BLOB NOT NULL,
+    topic_index INTEGER NOT NULL,
+    FOREIGN KEY(log) REFERENCES legacy_evmtx_receipt_logs(identifier) ON DELETE CASCADE,
+    PRIMARY KEY(log, topic_index)
+);
+""")
+        for tx_id, (_, receipt) in enumerate(tx_data):
+            for entry in receipt.logs:
+                write_cursor.execute(
+                    'INSERT INTO legacy_evmtx_receipt_logs(tx_id, log_index, data, address) '
+                    'VALUES (?, ?, ?, ?)',
+                    (tx_id, entry.log_index, entry.data, entry.address),
+                )
+                log_id = write_cursor.lastrowid
+                write_cursor.executemany(
+                    'INSERT INTO legacy_evmtx_receipt_log_topics(log, topic, topic_index) '
+                    'VALUES (?, ?, ?)',
+                    [(log_id, topic, topic_index) for topic_index, topic in enumerate(entry.topics)],  # noqa: E501
+                )
+
+    tx_ids = list(range(len(tx_data)))
+    placeholders = ','.join('?' * len(tx_ids))
+
+    def run() -> None:
+        logs_by_tx: dict[int, list[EvmTxReceiptLog]] = {}
+        last_log_id = None
+        with database.conn.read_ctx() as cursor:
+            for tx_id, log_id, log_index, data, address, topic in cursor.execute(
+                'SELECT L.tx_id, L.identifier, L.log_index, L.data, L.address, T.topic '
+                'FROM legacy_evmtx_receipt_logs AS L '
+                'LEFT JOIN legacy_evmtx_receipt_log_topics AS T ON L.identifier=T.log '
+                f'WHERE L.tx_id IN ({placeholders}) '
+                'ORDER BY L.tx_id, L.log_index, T.topic_index',
+                tx_ids,
+            ):
+                if log_id != last_log_id:
+                    logs_by_tx.setdefault(tx_id, []).append(EvmTxReceiptLog(
+                        log_index=log_index,
+                        data=data,
+                        address=string_to_evm_address(address),
+                    ))
+                    last_log_id = log_id
+                if topic is not None:
+                    logs_by_tx[tx_id][-1].topics.append(topic)
+
+        assert logs_by_tx[0] == tx_data[0][1].logs
+
+    benchmark(run)
+
+
+def _insert_bulk_events(database: DBHandler, count: int) -> None:
+    """Insert count staking reward events of two assets and exchanges"""
+    insert_query = 'INSERT INTO ' + HistoryEvent(
+        group_identifier='',
+        sequence_index=0,
+        timestamp=TimestampMS(0),
+        location=Location.KRAKEN,
+        event_type=HistoryEventType.RECEIVE,
+        event_subtype=HistoryEventSubType.NONE,
+        asset=A_ETH,
+        amount=ONE,
+    ).serialize_for_db()[0][0]
+    with database.user_write() as write_cursor:
+        write_cursor.executemany(insert_query, (
+            HistoryEvent(
+                group_identifier=f'group{idx // 2}',
+                sequence_index=idx % 2,
+                timestamp=TimestampMS(1600000000000 + idx * 60_000),
+                location=Location.KRAKEN if idx % 2 == 0 else Location.BINANCE,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=A_USDC if idx % 3 == 0 else A_ETH,
+                amount=FVal(f'{idx + 1}.{idx % 100:02d}'),
+                notes=f'Staking reward {idx}',
+                extra_data={'reward_id': idx} if idx % 10 == 0 else None,
+            ).serialize_for_db()[0][2]
+            for idx in range(count)
+        ))
+
+
+@pytest.mark.benchmark
+def test_history_events_bulk_loading(benchmark: Callable, database: DBHandler) -> None:
+    """Loading the whole history events table, as done by the accounting, stats and
+    historical balances processing of a big history.
+
+    The peak and retained python memory of one load are recorded next to the timing.
+    """
+    _insert_bulk_events(database, N_BULK_EVENTS)
+    db = DBHistoryEvents(database)
+    filter_query = HistoryEventFilterQuery.make()
+
+    def load() -> list:
+        with database.conn.read_ctx() as cursor:
+            return db.get_history_events_internal(cursor=cursor, filter_query=filter_query)
+
+    tracemalloc.start()
+    events = load()
+    benchmark.extra_info['retained_bytes'] = tracemalloc.get_traced_memory()[0]
+    benchmark.extra_info['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert len(events) == N_BULK_EVENTS
+    assert events[0].extra_data == {'reward_id': 0}
+    del events
+
+    benchmark(load)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize('sum_expression', [
+    'SUM(CAST(amount AS REAL))',
+    'FVAL_SUM(amount)',
+    exact_sum_query('amount'),
+])
+def test_amount_sums(benchmark: Callable, database: DBHandler, sum_expression: str) -> None:
+    """Summing the amounts of a big history per asset with the native SUM() of the amounts
+    cast to REAL, with the exact FVAL_SUM() aggregate, which runs python code per row, and
+    with the native SUM() of the generated integer amount columns."""
+    _insert_bulk_events(database, N_SUM_EVENTS)
+    query = f'SELECT asset, {sum_expression} FROM history_events GROUP BY asset'
+    with database.conn.read_ctx() as cursor:
+        try:
+            assert len(cursor.execute(query).fetchall()) == 2
+        except sqlcipher.OperationalError:  # versions without the aggregate
+            pytest.skip(f'{sum_expression} is not available')
+
+    def run() -> list:
+        with database.conn.read_ctx() as cursor:
+            return cursor.execute(query).fetchall()
+
+    benchmark(run)
+
+
 @pytest.mark.benchmark
 def test_events_filter_query_construction(benchmark: Callable) -> None:
     """Filter-query construction + SQL preparation, done per events API call"""
@@ -163,8 +163,6 @@ TABLES_AT_INIT = [
     'evm_internal_transactions',
     'evm_internal_tx_conflicts',
     'evmtx_receipts',
-    'evmtx_receipt_logs',
-    'evmtx_receipt_log_topics',
     'evmtx_address_mappings',
     'evm_tx_mappings',
     'manually_tracked_balances',
@@ -176,9 +174,11 @@ TABLES_AT_INIT = [
     'tags',
     'xpubs',
     'xpub_mappings',
+    'xpub_derived_keys',
     'eth2_validators',
     'eth_validators_data_cache',
     'event_metrics',
+    'event_metrics_daily_balances',
     'ignored_actions',
     'nfts',
     'history_events',
@@ -12,7 +12,9 @@ from sqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.assets.utils import get_or_create_evm_token
 from rotkehlchen.chain.evm.accounting.structures import BaseEventSettings
+from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.constants import DAY_IN_MILLISECONDS
 from rotkehlchen.constants.assets import A_COW, A_ETH
 from rotkehlchen.constants.misc import (
     AIRDROPSDIR_NAME,
@@ -35,6 +37,7 @@ from rotkehlchen.db.constants import (
 )
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.drivers.sqlite import DBConnection, DBConnectionType
+from rotkehlchen.db.evmtx import unpack_receipt_logs
 from rotkehlchen.db.schema import DB_SCRIPT_CREATE_TABLES
 from rotkehlchen.db.settings import ROTKEHLCHEN_DB_VERSION
 from rotkehlchen.db.upgrade_manager import (
@@ -3320,10 +3323,6 @@ def test_latest_upgrade_correctness(user_data_dir):
     result = cursor.execute("SELECT name FROM sqlite_master WHERE type='view'")
     views_before = {x[0] for x in result}
 
-    assert cursor.execute(
-        "SELECT COUNT(*) FROM settings WHERE name='location_unsupported_assets_version'",
-    ).fetchone()[0] == 1
-
     last_db.logout()
 
     # Execute upgrade
@@ -3357,10 +3356,7 @@ def test_latest_upgrade_correctness(user_data_dir):
     assert cursor.execute(
         "SELECT value FROM settings WHERE name='version'",
     ).fetchone()[0] == str(ROTKEHLCHEN_DB_VERSION)
-    assert cursor.execute(
-        "SELECT COUNT(*) FROM settings WHERE name='location_unsupported_assets_version'",
-    ).fetchone()[0] == 0
-    removed_tables = set()
+    removed_tables = {'evmtx_receipt_logs', 'evmtx_receipt_log_topics'}
     removed_views = set()
     missing_tables = tables_before - tables_after_upgrade
     missing_views = views_before - views_after_upgrade
@@ -3370,15 +3366,7 @@ def test_latest_upgrade_correctness(user_data_dir):
     assert tables_after_creation - tables_after_upgrade == {'evm_internal_tx_conflicts'}
     assert views_after_creation - views_after_upgrade == set()
     new_tables = tables_after_upgrade - tables_before
-    assert new_tables == {
-        'bitcoin_transactions',
-        'bitcoin_tx_io',
-        'bitcoin_tx_mappings',
-        'bitcointx_address_mappings',
-        'data_issues',
-        'event_metrics',
-        'evm_account_proxies',
-    }
+    assert new_tables == {'event_metrics_daily_balances', 'xpub_derived_keys'}
     new_views = views_after_upgrade - views_before
     assert new_views == set()
     db.logout()
@@ -4196,6 +4184,9 @@ def test_upgrade_db_52_to_53(
         resume_from_backup=False,
     )
     with db_v52.conn.write_ctx() as write_cursor:
+        assert write_cursor.execute(
+            "SELECT COUNT(*) FROM settings WHERE name='location_unsupported_assets_version'",
+        ).fetchone()[0] == 1
         assert not table_exists(cursor=write_cursor, name='event_metrics')
         assert not table_exists(cursor=write_cursor, name='data_issues')
         assert index_exists(
@@ -4865,6 +4856,9 @@ def test_upgrade_db_52_to_53(
             "SELECT value FROM settings WHERE name='address_name_priority'",
         ).fetchone()[0]) == expected_address_name_priority
         assert db.get_setting(cursor, 'version') == 53
+        assert cursor.execute(
+            "SELECT COUNT(*) FROM settings WHERE name='location_unsupported_assets_version'",
+        ).fetchone()[0] == 0
         assert table_exists(cursor=cursor, name='evm_account_proxies')
         assert index_exists(cursor=cursor, name='idx_evm_account_proxies_chain_account')
         assert cursor.execute(
@@ -4882,3 +4876,138 @@ def test_upgrade_db_52_to_53(
     assert airdrop_parquet_path.exists() is False
     assert airdrop_csv_path.exists() is True
     db.logout()
+
+
+def test_upgrade_db_53_to_54(user_data_dir, messages_aggregator):
+    """Test upgrading the DB from version 53 to version 54."""
+    _use_prepared_db(user_data_dir, 'v50_rotkehlchen.db')
+    db_v53 = _init_db_with_target_version(
+        target_version=53,
+        user_data_dir=user_data_dir,
+        msg_aggregator=messages_aggregator,
+        resume_from_backup=False,
+    )
+    with db_v53.conn.write_ctx() as write_cursor:
+        write_cursor.executemany(
+            'INSERT INTO evm_transactions(tx_hash, chain_id, timestamp, block_number, '
+            'from_address, to_address, value, gas, gas_price, gas_used, input_data, nonce) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(
+                tx_hash, 1, 1730000000, 1,
+                '0x0000000000000000000000000000000000000001',
+                '0x0000000000000000000000000000000000000002',
+                '1', '0', '0', '0', b'', 0,
+            ) for tx_hash in (b'\x01' * 32, b'\x02' * 32)],
+        )
+        tx_id, no_logs_tx_id = (row[0] for row in write_cursor.execute(
+            'SELECT identifier FROM evm_transactions WHERE tx_hash IN (?, ?) ORDER BY tx_hash',
+            (b'\x01' * 32, b'\x02' * 32),
+        ))
+        # balance metrics of two buckets of the same asset over two days, to be summed per day
+        day = 1729987200000
+        for idx, (timestamp, location_label, balance) in enumerate((
+                (day + 1000, 'label1', '1'),
+                (day + 2000, 'label2', '2'),
+                (day + DAY_IN_MILLISECONDS + 1000, 'label1', '0.5'),
+        )):
+            write_cursor.execute(
+                'INSERT INTO history_events(entry_type, group_identifier, sequence_index, '
+                'timestamp, location, location_label, asset, amount, type, subtype) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    HistoryBaseEntryType.HISTORY_EVENT.serialize_for_db(),
+                    f'DAILY_BALANCES_{idx}',
+                    0,
+                    timestamp,
+                    Location.BLOCKCHAIN.serialize_for_db(),
+                    location_label,
+                    'ETH',
+                    '1',
+                    HistoryEventType.RECEIVE.serialize(),
+                    HistoryEventSubType.NONE.serialize(),
+                ),
+            )
+            write_cursor.execute(
+                'INSERT INTO event_metrics(event_identifier, location, location_label, '
+                'protocol, metric_key, metric_value, asset, timestamp, sequence_index, '
+                'sort_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    write_cursor.lastrowid, Location.BLOCKCHAIN.serialize_for_db(),
+                    location_label, None, 'balance', balance, 'ETH', timestamp, 0, idx,
+                ),
+            )
+
+        # a receipt with a log with topics and an anonymous one, and a receipt without logs
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipts(tx_id, contract_address, status, type) '
+            'VALUES (?, ?, ?, ?)',
+            [
+                (tx_id, None, 1, 2),
+                (no_logs_tx_id, '0x0000000000000000000000000000000000000005', 0, 0),
+            ],
+        )
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipt_logs(tx_id, log_index, data, address) VALUES (?, ?, ?, ?)',
+            [
+                (tx_id, 5, b'\x02' * 32, '0x0000000000000000000000000000000000000003'),
+                (tx_id, 7, b'', '0x0000000000000000000000000000000000000004'),
+            ],
+        )
+        write_cursor.executemany(
+            'INSERT INTO evmtx_receipt_log_topics(log, topic, topic_index) '
+            'SELECT identifier, ?, ? FROM evmtx_receipt_logs WHERE tx_id=? AND log_index=5',
+            [(b'\x0b' * 32, 1, tx_id), (b'\x0a' * 32, 0, tx_id)],
+        )
+
+    db_v53.logout()
+    db = _init_db_with_target_version(
+        target_version=54,
+        user_data_dir=user_data_dir,
+        msg_aggregator=messages_aggregator,
+        resume_from_backup=False,
+    )
+    with db.conn.read_ctx() as cursor:
+        assert db.get_setting(cursor, 'version') == 54
+        assert cursor.execute(
+            'SELECT day, asset, amount FROM event_metrics_daily_balances ORDER BY day',
+        ).fetchall() == [(day, 'ETH', '3'), (day + DAY_IN_MILLISECONDS, 'ETH', '2.5')]
+        assert cursor.execute(  # the generated integer columns are there for existing rows
+            'SELECT metric_value_int, metric_value_frac_hi, metric_value_frac_lo '
+            'FROM event_metrics ORDER BY sort_key',
+        ).fetchall() == [(1, 0, 0), (2, 0, 0), (0, 500000000, 0)]
+        assert cursor.execute(
+            'SELECT SUM(amount_int) FROM history_events WHERE group_identifier LIKE ?',
+            ('DAILY_BALANCES_%',),
+        ).fetchone()[0] == 3
+        assert 'amount_int' in {x[1] for x in cursor.execute(
+            "SELECT * FROM pragma_table_xinfo('history_events_backup')",
+        )}
+        assert not table_exists(cursor=cursor, name='evmtx_receipt_logs')
+        assert not table_exists(cursor=cursor, name='evmtx_receipt_log_topics')
+        assert not table_exists(cursor=cursor, name='evmtx_receipts_old')
+        assert table_exists(cursor=cursor, name='xpub_derived_keys')
+        assert cursor.execute(
+            'SELECT tx_id, contract_address, status, type FROM evmtx_receipts ORDER BY tx_id',
+        ).fetchall() == [
+            (tx_id, None, 1, 2),
+            (no_logs_tx_id, '0x0000000000000000000000000000000000000005', 0, 0),
+        ]
+        assert unpack_receipt_logs(cursor.execute(
+            'SELECT logs FROM evmtx_receipts WHERE tx_id=?', (tx_id,),
+        ).fetchone()[0]) == [
+            EvmTxReceiptLog(
+                log_index=5,
+                data=b'\x02' * 32,
+                address=string_to_evm_address('0x0000000000000000000000000000000000000003'),
+                topics=[b'\x0a' * 32, b'\x0b' * 32],
+            ), EvmTxReceiptLog(
+                log_index=7,
+                data=b'',
+                address=string_to_evm_address('0x0000000000000000000000000000000000000004'),
+            ),
+        ]
+        assert unpack_receipt_logs(cursor.execute(
+            'SELECT logs FROM evmtx_receipts WHERE tx_id=?', (no_logs_tx_id,),
+        ).fetchone()[0]) == []
+
+    db.logout()
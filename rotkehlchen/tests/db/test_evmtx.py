@@ -1,7 +1,11 @@
+import pytest
+
 from rotkehlchen.chain.accounts import BlockchainAccountData
+from rotkehlchen.chain.evm.structures import EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmAccount
 from rotkehlchen.data_handler import DataHandler
-from rotkehlchen.db.evmtx import DBEvmTx
+from rotkehlchen.db.evmtx import DBEvmTx, pack_receipt_logs, unpack_receipt_logs
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.db.filtering import EvmTransactionsFilterQuery
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.constants import (
@@ -312,3 +316,31 @@ def test_query_also_internal_evm_transactions(data_dir, username, sql_vm_instruc
         )
         assert result == [tx1, tx3, tx4]
     data.logout()
+
+
+def test_pack_unpack_receipt_logs():
+    """Test that receipt logs survive being packed in the receipt blob, including anonymous
+    logs, empty data and the empty list of logs, and that malformed input is rejected"""
+    logs = [
+        EvmTxReceiptLog(
+            log_index=0,
+            data=b'\x01' * 64,
+            address=ETH_ADDRESS1,
+            topics=[b'\x02' * 32, b'\x03' * 32, b'\x04' * 32],
+        ),
+        EvmTxReceiptLog(log_index=3, data=b'', address=ETH_ADDRESS2, topics=[b'\x05' * 32]),
+        EvmTxReceiptLog(log_index=2**32 - 1, data=b'\x06', address=ETH_ADDRESS3),
+    ]
+    assert unpack_receipt_logs(packed := pack_receipt_logs(logs)) == logs
+    assert unpack_receipt_logs(pack_receipt_logs([])) == []
+
+    with pytest.raises(DeserializationError):
+        unpack_receipt_logs(b'\x02' + packed[1:])
+
+    with pytest.raises(DeserializationError):
+        pack_receipt_logs([EvmTxReceiptLog(
+            log_index=0,
+            data=b'',
+            address=ETH_ADDRESS1,
+            topics=[b'\x02' * 20],
+        )])
@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 import pytest
 
+from rotkehlchen.accounting.types import EventAccountingRuleStatus
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
 from rotkehlchen.chain.bitcoin.btc.constants import BTC_GROUP_IDENTIFIER_PREFIX
 from rotkehlchen.chain.bitcoin.types import BitcoinTx
@@ -33,7 +34,9 @@ from rotkehlchen.db.filtering import (
     HistoryEventFilterQuery,
 )
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.db.utils import deserialize_exact_sum, exact_sum_query
 from rotkehlchen.fval import FVal
+from rotkehlchen.history.events.projection import PROJECTED_EVENT_CLASSES, ProjectedHistoryEvent
 from rotkehlchen.history.events.structures.asset_movement import AssetMovement
 from rotkehlchen.history.events.structures.base import (
     HistoryBaseEntry,
@@ -2223,3 +2226,201 @@ def test_delete_events_by_tx_ref_is_scoped_to_the_location(database: DBHandler)
         assert write_cursor.execute('SELECT location FROM history_events').fetchall() == [
             (Location.BITCOIN_CASH.serialize_for_db(),),
         ]
+
+
+def test_fval_sum_aggregate(database: DBHandler) -> None:
+    """Test that FVAL_SUM sums the amounts in SQL without losing precision"""
+    db_events = DBHistoryEvents(database)
+    with database.user_write() as write_cursor:
+        db_events.add_history_events(
+            write_cursor=write_cursor,
+            history=[HistoryEvent(
+                group_identifier=f'group{idx}',
+                sequence_index=0,
+                timestamp=TimestampMS(1500000000000 + idx),
+                location=Location.EXTERNAL,
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=asset,
+                amount=FVal(amount),
+            ) for idx, (asset, amount) in enumerate((
+                (A_ETH, '0.1'),
+                (A_ETH, '0.2'),
+                (A_DAI, '123456789012345678901234.000000000000000001'),
+                (A_DAI, '0.000000000000000001'),
+            ))],
+        )
+
+    with database.conn.read_ctx() as cursor:
+        assert {asset: FVal(total) for asset, total in cursor.execute(
+            'SELECT asset, FVAL_SUM(amount) FROM history_events GROUP BY asset',
+        )} == {
+            A_DAI.identifier: FVal('123456789012345678901234.000000000000000002'),
+            A_ETH.identifier: FVal('0.3'),
+        }
+        assert cursor.execute(
+            'SELECT FVAL_SUM(amount) FROM history_events WHERE asset=?',
+            (A_BTC.identifier,),
+        ).fetchone()[0] is None
+
+
+def test_exact_sum_query(database: DBHandler) -> None:
+    """Test that the amounts are summed exactly through their generated integer columns
+    and that the amounts which don't fit them are still summed exactly"""
+    amounts = {
+        A_ETH: ('0.1', '0.2', '-0.000000000000000001', '999999999999.999999999999999999'),
+        A_DAI: ('123456789012345678901234.5', '0.0000000000000000000001', '-1.5', '2'),
+        A_BTC: ('1234567890123', '-0.5'),
+    }
+    with database.user_write() as write_cursor:
+        DBHistoryEvents(database).add_history_events(
+            write_cursor=write_cursor,
+            history=[HistoryEvent(
+                group_identifier=f'{asset.identifier}{idx}',
+                sequence_index=0,
+                timestamp=TimestampMS(1500000000000 + idx),
+                location=Location.EXTERNAL,
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=asset,
+                amount=FVal(amount),
+            ) for asset, asset_amounts in amounts.items() for idx, amount in enumerate(asset_amounts)],  # noqa: E501
+        )
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT amount_int, amount_frac_hi, amount_frac_lo FROM history_events '
+            'WHERE asset=? ORDER BY timestamp',
+            (A_ETH.identifier,),
+        ).fetchall() == [
+            (0, 100000000, 0),
+            (0, 200000000, 0),
+            (0, 0, -1),
+            (999999999999, 999999999, 999999999),
+        ]
+        assert {row[0]: deserialize_exact_sum(row[1:]) for row in cursor.execute(
+            f'SELECT asset, {exact_sum_query("amount")} FROM history_events GROUP BY asset',
+        )} == {
+            asset.identifier: sum((FVal(x) for x in asset_amounts), start=ZERO)
+            for asset, asset_amounts in amounts.items()
+        }
+        assert deserialize_exact_sum(cursor.execute(
+            f'SELECT {exact_sum_query("amount")} FROM history_events WHERE asset=?',
+            ('USD',),
+        ).fetchone()) == ZERO
+
+
+@pytest.mark.parametrize('aggregate_by_group_ids', [False, True])
+def test_projected_events_serialize_as_full_events(
+        database: DBHandler,
+        aggregate_by_group_ids: bool,
+) -> None:
+    """Test that the history events listing, which serializes the rows of some entry types
+    without building the events, gives the exact same output as the full events"""
+    db = DBHistoryEvents(database)
+    user_address = make_evm_address()
+    with database.user_write() as write_cursor:
+        db.add_history_events(write_cursor=write_cursor, history=[
+            HistoryEvent(
+                group_identifier='kraken_staking',
+                sequence_index=0,
+                timestamp=TimestampMS(1000),
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=A_ETH,
+                amount=FVal('0.25'),
+            ), HistoryEvent(
+                group_identifier='external',
+                sequence_index=0,
+                timestamp=TimestampMS(2000),
+                location=Location.EXTERNAL,
+                location_label='my wallet',
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=A_DAI,
+                amount=FVal(10),
+                notes='Some notes',
+                extra_data={'some': 'data'},
+            ), EvmEvent(
+                tx_ref=(tx_hash := make_evm_tx_hash()),
+                sequence_index=0,
+                timestamp=TimestampMS(3000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.SPEND,
+                event_subtype=HistoryEventSubType.FEE,
+                asset=A_ETH,
+                amount=FVal('0.001'),
+                location_label=user_address,
+                counterparty=CPT_GAS,
+            ), EvmEvent(
+                tx_ref=tx_hash,
+                sequence_index=1,
+                timestamp=TimestampMS(3000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.TRADE,
+                event_subtype=HistoryEventSubType.SPEND,
+                asset=A_USDC,
+                amount=FVal(100),
+                location_label=user_address,
+                counterparty=CPT_ONEINCH_V6,
+                address=make_evm_address(),
+                notes='Swap 100 USDC in 1inch',
+                extra_data={'sub_swaps': [{'from_amount': '100'}]},
+            ), AssetMovement(
+                timestamp=TimestampMS(2500),
+                location=Location.KRAKEN,
+                event_subtype=HistoryEventSubType.RECEIVE,
+                asset=A_BTC,
+                amount=ONE,
+            ), EthWithdrawalEvent(
+                validator_index=42,
+                timestamp=TimestampMS(5000),
+                amount=FVal(32),
+                withdrawal_address=user_address,
+                is_exit=True,
+            ),
+        ])
+        # amounts not written by rotki may not be normalized
+        write_cursor.execute("UPDATE history_events SET amount='10.00' WHERE amount='10'")
+
+    def serialize_page(project_for_api: bool) -> tuple[list[Any], str | None]:
+        with database.conn.read_ctx() as cursor:
+            result = db.get_history_events_and_limit_info(
+                cursor=cursor,
+                filter_query=HistoryEventFilterQuery.make(limit=5),
+                entries_limit=None,
+                aggregate_by_group_ids=aggregate_by_group_ids,
+                project_for_api=project_for_api,
+            )
+
+        serialized = []
+        for entry in result.events:
+            grouped_events_num, event = entry if aggregate_by_group_ids else (None, entry)  # type: ignore[misc]  # noqa: E501  # depends on aggregate_by_group_ids
+            serialized.append(event.serialize_for_api(
+                mapping_states={event.identifier: [HistoryMappingState.CUSTOMIZED]},
+                ignored_ids={'external'},
+                hidden_event_ids=set(),
+                event_accounting_rule_status=EventAccountingRuleStatus.HAS_RULE,
+                grouped_events_num=grouped_events_num,
+            ))
+            if event.entry_type in PROJECTED_EVENT_CLASSES:
+                assert isinstance(event, ProjectedHistoryEvent) is project_for_api
+                if isinstance(event, ProjectedHistoryEvent):  # only has what the listing reads
+                    with pytest.raises(AttributeError):
+                        _ = event.asset  # type: ignore[attr-defined]
+            else:
+                assert isinstance(event, HistoryBaseEntry)
+
+        return serialized, result.next_cursor
+
+    projected, projected_next_cursor = serialize_page(project_for_api=True)
+    full, full_next_cursor = serialize_page(project_for_api=False)
+    assert len(projected) == 5
+    assert json.dumps(projected) == json.dumps(full)
+    assert projected_next_cursor == full_next_cursor
+    if aggregate_by_group_ids is False:  # the page has the events that serialize differently
+        assert projected_next_cursor is not None
+        assert 'auto_notes' in projected[0]['entry']
+        assert projected[1]['entry']['amount'] == '10'
+        assert projected[4]['has_details'] is True
@@ -80,6 +80,24 @@ def test_delete_bitcoin_xpub(setup_db_for_xpub_tests):
     db.logout()
 
 
+def test_xpub_derived_keys(setup_db_for_xpub_tests):
+    """Test that derived public keys are cached per xpub and removed with the xpub"""
+    db, xpub1, xpub2, _, _ = setup_db_for_xpub_tests
+    xpub1_keys = {(0, 0): b'\x02' + b'\x01' * 32, (1, 0): b'\x03' + b'\x02' * 32}
+    with db.user_write() as cursor:
+        db.add_xpub_derived_keys(cursor, xpub_data=xpub1, derived_keys=xpub1_keys)
+        db.add_xpub_derived_keys(cursor, xpub_data=xpub2, derived_keys={(0, 5): b'\x02' * 33})
+        # keys that are already cached are ignored
+        db.add_xpub_derived_keys(cursor, xpub_data=xpub1, derived_keys={(0, 0): b'\x03' * 33})
+        assert db.get_xpub_derived_keys(cursor, xpub1) == xpub1_keys
+        assert db.get_xpub_derived_keys(cursor, xpub2) == {(0, 5): b'\x02' * 33}
+
+        db.delete_bitcoin_xpub(cursor, xpub1)
+        assert db.get_xpub_derived_keys(cursor, xpub1) == {}
+        assert db.get_xpub_derived_keys(cursor, xpub2) == {(0, 5): b'\x02' * 33}
+    db.logout()
+
+
 def test_get_bitcoin_xpub_data(setup_db_for_xpub_tests):
     """Test that retrieving bitcoin xpub data also returns all properly mapped tags"""
     db, xpub1, xpub2, xpub3, _ = setup_db_for_xpub_tests
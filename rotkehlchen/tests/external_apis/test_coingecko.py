@@ -1,3 +1,4 @@
+from unittest.mock import patch
 
 import pytest
 
@@ -105,3 +106,17 @@ def test_coingecko_query_multiple_current_prices(session_coingecko: Coingecko):
         ],
         to_asset=A_ETH.resolve_to_asset_with_oracles(),
     ) == {A_BTC: FVal(31.906046), A_DAI: FVal(0.0003068), A_BNB: FVal(0.21387074)}
+
+
+@pytest.mark.freeze_time('2024-10-11 12:00:00 GMT')
+def test_coingecko_price_range_older_than_a_year_without_api_key(coingecko: Coingecko):
+    """Without an api key coingecko can't be queried for ranges older than a year"""
+    with patch.object(coingecko, '_query') as query_mock:
+        assert coingecko.query_historical_price_range(
+            from_asset=A_BTC,
+            to_asset=A_EUR,
+            from_timestamp=Timestamp(1600000000),
+            to_timestamp=Timestamp(1650000000),
+        ) == []
+
+    assert query_mock.call_count == 0
@@ -1,3 +1,4 @@
+import datetime
 import hashlib
 import hmac
 import json
@@ -15,7 +16,8 @@ import pytest
 
 from rotkehlchen.api.websockets.typedefs import DBUploadStatusStep, WSMessageType
 from rotkehlchen.concurrency import spawn, wait
-from rotkehlchen.constants.assets import A_EUR
+from rotkehlchen.constants.assets import A_EUR, A_USD
+from rotkehlchen.constants.misc import USERDB_NAME
 from rotkehlchen.db.cache import DBCacheStatic
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.errors.api import (
@@ -24,6 +26,7 @@ from rotkehlchen.errors.api import (
     PremiumPermissionError,
     RotkehlchenPermissionError,
 )
+from rotkehlchen.feature_flags import ROTKI_CHUNKED_BACKUPS
 from rotkehlchen.premium.premium import (
     DOCKER_PLATFORM_KEY,
     DOCKER_SHORT_ID_HASH_LENGTH,
@@ -45,6 +48,7 @@ from rotkehlchen.tests.utils.mock import MockResponse
 from rotkehlchen.tests.utils.premium import (
     VALID_PREMIUM_KEY,
     VALID_PREMIUM_SECRET,
+    MockChunkedBackupServer,
     assert_db_got_replaced,
     create_patched_requests_get_for_premium,
     get_different_hash,
@@ -278,6 +282,101 @@ def test_upload_data_to_server_smaller_db(rotkehlchen_instance, db_settings: dic
             assert post_mock.called
 
 
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_upload_data_to_server_unmodified_db(rotkehlchen_instance: Rotkehlchen, freezer) -> None:
+    """Test that an upload does not mark the DB as modified, so that the next sync stops
+    at the last write check without checking, exporting or encrypting the whole DB"""
+    with rotkehlchen_instance.data.db.user_write() as write_cursor:
+        rotkehlchen_instance.data.db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_EUR))  # noqa: E501
+
+    with rotkehlchen_instance.data.db.conn.read_ctx() as cursor:
+        last_write_ts = rotkehlchen_instance.data.db.get_setting(cursor, name='last_write_ts')
+
+    freezer.move_to(datetime.datetime.fromtimestamp(last_write_ts + 100, tz=datetime.UTC))
+    assert rotkehlchen_instance.premium is not None
+    patched_post = patch.object(
+        rotkehlchen_instance.premium.session,
+        'post',
+        return_value=MockResponse(HTTPStatus.OK, '{"success": true}'),
+    )
+    with patched_post, create_patched_requests_get_for_premium(
+        session=rotkehlchen_instance.premium.session,
+        metadata_last_modify_ts=0,
+        metadata_data_hash='somehash',
+        metadata_data_size=2,
+    ):
+        assert rotkehlchen_instance.premium_sync_manager.maybe_upload_data_to_server() == (True, None)  # noqa: E501
+
+    with rotkehlchen_instance.data.db.conn.read_ctx() as cursor:
+        assert rotkehlchen_instance.data.db.get_setting(cursor, name='last_write_ts') == last_write_ts  # noqa: E501
+
+    with (
+        create_patched_requests_get_for_premium(
+            session=rotkehlchen_instance.premium.session,
+            metadata_last_modify_ts=last_write_ts,  # what the server got with the upload
+            metadata_data_hash='somehash',
+            metadata_data_size=2,
+        ),
+        patch.object(rotkehlchen_instance.data.db, 'db_integrity_check') as integrity_mock,
+        patch.object(rotkehlchen_instance.data.db, 'export_unencrypted') as export_mock,
+    ):
+        assert rotkehlchen_instance.premium_sync_manager.maybe_upload_data_to_server() == (
+            False, 'Remote database is more recent than local',
+        )
+
+    assert integrity_mock.call_count == export_mock.call_count == 0
+
+
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+@pytest.mark.parametrize('premium_limits_override', [{'chunked_backups': True}])
+def test_upload_and_pull_chunked_backup(rotkehlchen_instance: Rotkehlchen, freezer) -> None:
+    """Test that with chunked backups only the chunks the server does not have are
+    uploaded and that pulling joins the chunks back to the uploaded DB"""
+    db, sync_manager = rotkehlchen_instance.data.db, rotkehlchen_instance.premium_sync_manager
+    assert rotkehlchen_instance.premium is not None
+    server = MockChunkedBackupServer()
+    with (  # small chunks so that the test DB is split in many of them
+        patch.dict(os.environ, {ROTKI_CHUNKED_BACKUPS: 'True'}),
+        server.patch_session(rotkehlchen_instance.premium.session),
+        patch('rotkehlchen.premium.chunks.BACKUP_CHUNK_MIN_SIZE', 8 * 1024),
+        patch('rotkehlchen.premium.chunks.BACKUP_CHUNK_AVG_SIZE', 32 * 1024),
+        patch('rotkehlchen.premium.chunks.BACKUP_CHUNK_MAX_SIZE', 128 * 1024),
+    ):
+        with db.user_write() as write_cursor:
+            db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_EUR))
+            last_write_ts = db.get_setting(write_cursor, name='last_write_ts')
+
+        # a whole DB backup in the server is compared in its compressed and encrypted size
+        server.data_size = (db.user_data_dir / USERDB_NAME).stat().st_size // 2
+        assert sync_manager.maybe_upload_data_to_server() == (
+            False, 'Remote database bigger than the local one',
+        )
+        assert server.manifest is None and len(server.uploaded_chunk_ids) == 0
+
+        server.data_size = 0
+        assert sync_manager.maybe_upload_data_to_server() == (True, None)
+        assert server.manifest is not None and len(server.manifest) > 2
+        assert sorted(server.uploaded_chunk_ids) == sorted(set(server.manifest))
+        assert server.last_modify_ts == last_write_ts
+
+        freezer.move_to(datetime.datetime.fromtimestamp(last_write_ts + 100, tz=datetime.UTC))
+        with db.user_write() as write_cursor:
+            db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_GBP))
+
+        server.uploaded_chunk_ids = []
+        assert sync_manager.maybe_upload_data_to_server() == (True, None)
+        assert 0 < len(server.uploaded_chunk_ids) < len(set(server.manifest))
+        assert server.last_modify_ts == last_write_ts + 100
+
+        with db.user_write() as write_cursor:  # change it locally to see the pull replace it
+            db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_USD))
+
+        assert sync_manager.sync_data(action='download', perform_migrations=False) == (True, '')
+
+    with db.conn.read_ctx() as cursor:
+        assert db.get_setting(cursor, name='main_currency') == A_GBP
+
+
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_upload_aborts_on_local_db_integrity_failure(rotkehlchen_instance: Rotkehlchen) -> None:
     """If the local DB fails the integrity check, no upload happens and the user is notified."""
@@ -1,4 +1,5 @@
 import json
+import zlib
 from concurrent.futures import ThreadPoolExecutor
 from threading import Event
 from typing import Any
@@ -17,13 +18,27 @@ from rotkehlchen.mcp.analytics import (
     _validate_sql,
     sync_privacy_mode,
 )
-from rotkehlchen.mcp.backend import configure_backend, get_backend_config, set_privacy_mode
+from rotkehlchen.mcp.backend import (
+    BackendEndpointMissingError,
+    configure_backend,
+    get_backend_config,
+    set_privacy_mode,
+)
 from rotkehlchen.mcp.taxonomy import RECIPES
 
 ADDRESS = '0xc37b40ABdB939635068d3c5f13E7faF686F03B65'
 TX_HASH = '0x' + 'ab' * 32
 
 
+@pytest.fixture(autouse=True)
+def _columnar_export_missing(monkeypatch) -> None:
+    """Most tests here feed the paged events listing, which is what gets loaded when the
+    backend has no columnar export. The columnar tests mock that export on top of this."""
+    def missing_export(**kwargs):
+        raise BackendEndpointMissingError('no columnar export')
+    monkeypatch.setattr(analytics, 'query_history_events_columns', missing_export)
+
+
 def test_sync_privacy_mode_should_clear_data_only_when_mode_changes(monkeypatch) -> None:
     configure_backend(base_url='http://backend/api/1', timeout=5, privacy_mode='balanced')
     session = analytics.get_analytics_session()
@@ -51,7 +66,7 @@ class BlockingTableLoader:
         self.started = started
         self.proceed = proceed
 
-    def __call__(self, scope: AnalyticsScope) -> TableData:
+    def __call__(self, scope: AnalyticsScope, previous: TableData | None) -> TableData:
         self.started.set()
         assert self.proceed.wait(timeout=5)
         return TableData(
@@ -65,7 +80,7 @@ class OrderedTableLoader:
         self.started = started
         self.proceed = proceed
 
-    def __call__(self, scope: AnalyticsScope) -> TableData:
+    def __call__(self, scope: AnalyticsScope, previous: TableData | None) -> TableData:
         if scope.from_timestamp == 1:
             self.started.set()
             assert self.proceed.wait(timeout=5)
@@ -868,6 +883,188 @@ def test_max_events_cap_should_report_truncation(monkeypatch) -> None:
     assert source['cache_truncated'] is True
 
 
+class ColumnarBackendMock:
+    """Serve ``events`` the way the columnar export does: batches of columns ordered by
+    identifier, each with the checksum of its events."""
+    def __init__(self, events: list[dict[str, Any]]) -> None:
+        self.events = events
+        self.calls: list[tuple[int | None, int | None]] = []
+
+    @staticmethod
+    def _checksum(events: list[dict[str, Any]]) -> str:
+        return str(sum(
+            zlib.crc32(json.dumps(event, sort_keys=True).encode()) for event in events
+        ) % analytics.COLUMNAR_CHECKSUM_MODULO)
+
+    def __call__(
+            self,
+            limit: int,
+            after_identifier: int | None = None,
+            checksum_up_to: int | None = None,
+            **kwargs: Any,
+    ) -> dict[str, Any]:
+        self.calls.append((after_identifier, checksum_up_to))
+        after = [x for x in self.events if x['identifier'] > (after_identifier or 0)]
+        batch = after[:limit]
+        result = {
+            'columns': {key: [event[key] for event in batch] for key in self.events[0]},
+            'last_identifier': batch[-1]['identifier'] if len(batch) != 0 else None,
+            'has_more': len(after) > limit,
+            'checksum': self._checksum(batch),
+            'entries_limit': None,
+        }
+        if checksum_up_to is not None:
+            loaded = [x for x in self.events if x['identifier'] <= checksum_up_to]
+            result['checksum_up_to'] = {'count': len(loaded), 'checksum': self._checksum(loaded)}
+        return result
+
+
+def _columnar_event(identifier: int, **fields: Any) -> dict[str, Any]:
+    """An event with every column of the export, as the backend sends them"""
+    return {
+        'identifier': identifier,
+        'entry_type': 'history event',
+        'group_identifier': f'group{identifier}',
+        'sequence_index': 0,
+        'timestamp': 1614556800000 + identifier * 1000,
+        'location': 'ethereum',
+        'location_label': None,
+        'asset': 'ETH',
+        'amount': str(identifier),
+        'user_notes': None,
+        'event_type': 'spend',
+        'event_subtype': 'fee',
+        'extra_data': None,
+        'tx_ref': None,
+        'counterparty': None,
+        'address': None,
+        'validator_index': None,
+        'is_exit': None,
+        'block_number': None,
+    } | fields
+
+
+@pytest.mark.parametrize('privacy_mode', ['strict', 'balanced', 'raw'])
+def test_columnar_load_should_match_paged_load(monkeypatch, privacy_mode: str) -> None:
+    """The columnar export is sanitized column-wise, so it must produce the very same
+    table the paged listing produces row by row for the same events."""
+    configure_backend(base_url='http://backend/api/1', timeout=5, privacy_mode=privacy_mode)
+    events = [
+        _columnar_event(1, location_label='kraken', user_notes=f'Sent to {ADDRESS}'),
+        _columnar_event(
+            2,
+            entry_type='evm event',
+            location_label=ADDRESS,
+            tx_ref=TX_HASH,
+            counterparty='uniswap-v3',
+            address=ADDRESS,
+            extra_data={'amount': '5', 'vault': ADDRESS},
+        ),
+        _columnar_event(
+            3,
+            entry_type='eth withdrawal event',
+            event_type='staking',
+            event_subtype='remove asset',
+            validator_index=42,
+            is_exit=True,
+        ),
+    ]
+    monkeypatch.setattr(analytics, 'query_history_events_columns', ColumnarBackendMock(events))
+    columnar = AnalyticsSession()
+    source = columnar.refresh(
+        tables=None, from_timestamp=0, to_timestamp=0, include_ignored_assets=False,
+    )['tables']['history_events']['source']
+    assert source['endpoint'] == 'history/events/columnar'
+    assert source['completeness'] == 'complete'
+
+    _mock_history_pages(monkeypatch, events)
+    monkeypatch.setattr(
+        analytics,
+        'query_history_events_columns',
+        Mock(side_effect=BackendEndpointMissingError('no columnar export')),
+    )
+    paged = AnalyticsSession()
+    assert paged.refresh(
+        tables=None, from_timestamp=0, to_timestamp=0, include_ignored_assets=False,
+    )['tables']['history_events']['source']['endpoint'] == 'history/events'
+
+    def non_null_rows(session: AnalyticsSession) -> list[dict[str, Any]]:
+        """Paged rows tell a missing field from a null one, columns can't. Compare values"""
+        return [
+            {column: value for column, value in row.items() if value is not None}
+            for row in session.query_sql(
+                'select * from history_events order by identifier', max_rows=10,
+            )['rows']
+        ]
+
+    columnar_rows = non_null_rows(columnar)
+    assert columnar_rows == non_null_rows(paged)
+    if privacy_mode != 'raw':
+        assert ADDRESS not in str(columnar_rows)
+        assert columnar_rows[0]['user_notes'] == '[redacted]'
+    assert columnar_rows[1]['extra_data_amount_float'] == 5.0
+
+
+def test_columnar_refresh_should_only_fetch_new_events(monkeypatch) -> None:
+    configure_backend(base_url='http://backend/api/1', timeout=5, privacy_mode='balanced')
+    backend = ColumnarBackendMock([_columnar_event(1), _columnar_event(2)])
+    monkeypatch.setattr(analytics, 'query_history_events_columns', backend)
+    session = AnalyticsSession()
+
+    def refresh() -> dict[str, Any]:
+        return session.refresh(
+            tables=None, from_timestamp=0, to_timestamp=0, include_ignored_assets=False,
+        )['tables']['history_events']
+
+    first = refresh()
+    assert first['rows'] == 2 and first['source']['incremental'] is False
+    assert backend.calls == [(None, None)]
+
+    backend.events.append(_columnar_event(3))
+    backend.calls.clear()
+    second = refresh()
+    assert second['rows'] == 3
+    assert second['source']['incremental'] is True
+    assert second['source']['new_rows'] == 1
+    assert backend.calls == [(2, 2)]  # only what came after the loaded events
+
+    backend.calls.clear()
+    assert refresh()['source']['new_rows'] == 0  # nothing new, the loaded table stays
+
+    # an edited event changes the checksum of the loaded ones, so all is loaded again
+    backend.events[0] = _columnar_event(1, amount='100')
+    backend.calls.clear()
+    fourth = refresh()
+    assert fourth['rows'] == 3
+    assert fourth['source']['incremental'] is False
+    assert backend.calls == [(3, 3), (None, None)]
+    assert session.query_sql(
+        'select amount_float from history_events order by identifier', max_rows=10,
+    )['rows'] == [{'amount_float': 100.0}, {'amount_float': 2.0}, {'amount_float': 3.0}]
+
+
+def test_columnar_load_should_batch_and_respect_max_events(monkeypatch) -> None:
+    backend = ColumnarBackendMock([_columnar_event(identifier) for identifier in range(1, 6)])
+    monkeypatch.setattr(analytics, 'query_history_events_columns', backend)
+    monkeypatch.setattr(analytics, 'COLUMNAR_BATCH_SIZE', 2)
+
+    configure_backend(base_url='http://backend/api/1', timeout=5)
+    full = AnalyticsSession().refresh(
+        tables=None, from_timestamp=0, to_timestamp=0, include_ignored_assets=False,
+    )['tables']['history_events']
+    assert full['rows'] == 5
+    assert full['source']['completeness'] == 'complete'
+    assert [after for after, _ in backend.calls] == [None, 2, 4]
+
+    configure_backend(base_url='http://backend/api/1', timeout=5, max_events=3)
+    capped = AnalyticsSession().refresh(
+        tables=None, from_timestamp=0, to_timestamp=0, include_ignored_assets=False,
+    )['tables']['history_events']
+    assert capped['rows'] == 3
+    assert capped['source']['completeness'] == 'truncated_by_max_events'
+    assert capped['source']['cache_truncated'] is True
+
+
 def _described(session: AnalyticsSession, table: str = 'history_events') -> dict[str, Any]:
     return {column['name']: column for column in session.describe_table(table)['columns']}
 
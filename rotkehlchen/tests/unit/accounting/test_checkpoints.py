@@ -0,0 +1,79 @@
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import pytest
+
+from rotkehlchen.accounting.checkpoints import calculate_settings_hash
+from rotkehlchen.constants.assets import A_ETH, A_EUR
+from rotkehlchen.db.reports import DBAccountingReports
+from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.premium.premium import SubscriptionStatus
+from rotkehlchen.tests.utils.accounting import accounting_history_process, history1
+from rotkehlchen.tests.utils.history import prices
+from rotkehlchen.tests.utils.messages import no_message_errors
+from rotkehlchen.types import Price, Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.accounting.accountant import Accountant
+
+
+def _get_checkpoints(accountant: Accountant) -> list[Timestamp]:
+    with accountant.db.conn.read_ctx() as cursor:
+        settings_hash = calculate_settings_hash(
+            cursor=cursor,
+            settings=accountant.db.get_settings(cursor),
+            ignored_asset_ids=accountant.db.get_ignored_asset_ids(cursor),
+            ignored_action_ids=accountant.db.get_ignored_action_ids(cursor),
+        )
+    return [x.timestamp for x in DBAccountingReports(accountant.db).get_checkpoints(
+        settings_hash=settings_hash,
+        before_ts=Timestamp(1495751688),
+    )]
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_resume_from_checkpoint(accountant: Accountant) -> None:
+    """Test that a report resumes from the checkpoint left by a previous report with the
+    same result, and that editing an event before the checkpoint invalidates it"""
+    accountant.premium.status = SubscriptionStatus.ACTIVE  # type: ignore[union-attr]
+    start_ts, end_ts = Timestamp(1474000000), Timestamp(1495751688)
+    accounting_history_process(accountant, start_ts, end_ts, history1)
+    no_message_errors(accountant.msg_aggregator)
+    full_pnls = deepcopy(accountant.pots[0].pnls)
+    full_processed_num = len(accountant.pots[0].processed_events)
+    assert _get_checkpoints(accountant) == [1473505138]
+
+    accounting_history_process(accountant, start_ts, end_ts, history1)
+    no_message_errors(accountant.msg_aggregator)
+    assert accountant.pots[0].pnls == full_pnls
+    # only the events after the checkpoint got processed
+    assert len(accountant.pots[0].processed_events) < full_processed_num
+
+    edited_history = deepcopy(history1)
+    edited_history[2].amount = FVal(400)  # pay more EUR for the ETH of the second swap
+    accounting_history_process(accountant, start_ts, end_ts, edited_history)
+    no_message_errors(accountant.msg_aggregator)
+    assert len(accountant.pots[0].processed_events) == full_processed_num
+    assert accountant.pots[0].pnls != full_pnls
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_price_edit_invalidates_checkpoints(accountant: Accountant) -> None:
+    """Test that replacing a stored price makes the existing checkpoints unusable"""
+    accountant.premium.status = SubscriptionStatus.ACTIVE  # type: ignore[union-attr]
+    accounting_history_process(accountant, Timestamp(1474000000), Timestamp(1495751688), history1)  # noqa: E501
+    no_message_errors(accountant.msg_aggregator)
+    assert _get_checkpoints(accountant) == [1473505138]
+
+    assert GlobalDBHandler.add_single_historical_price(HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(1446979735),
+        price=Price(FVal('0.5')),
+    )) is True
+    assert _get_checkpoints(accountant) == []
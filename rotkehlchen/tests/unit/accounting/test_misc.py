@@ -1,8 +1,12 @@
+import dataclasses
+import tempfile
+from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 
+from rotkehlchen.accounting.export.csv import FILENAME_ALL_CSV
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
@@ -25,7 +29,14 @@ from rotkehlchen.tests.utils.accounting import (
 from rotkehlchen.tests.utils.constants import A_GBP
 from rotkehlchen.tests.utils.history import prices
 from rotkehlchen.tests.utils.messages import no_message_errors
-from rotkehlchen.types import AssetAmount, Location, Price, Timestamp, TimestampMS
+from rotkehlchen.types import (
+    AssetAmount,
+    CostBasisMethod,
+    Location,
+    Price,
+    Timestamp,
+    TimestampMS,
+)
 from rotkehlchen.utils.misc import ts_ms_to_sec
 
 if TYPE_CHECKING:
@@ -131,6 +142,61 @@ def test_fees_count_in_cost_basis(accountant, google_service):
     check_pnls_and_csv(accountant, expected_pnls, google_service)
 
 
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+@pytest.mark.parametrize('db_settings', [
+    {'cost_basis_method': CostBasisMethod.FIFO},
+    {'cost_basis_method': CostBasisMethod.ACB},
+])
+def test_streaming_report_export(accountant: Accountant) -> None:
+    """Test that a report processed in streaming mode keeps no processed events in memory
+    and that its CSV export, read back from the report DB, is the same as the in-memory one"""
+    history = [*create_swap_events(
+        timestamp=TimestampMS(1609537953000),
+        location=Location.KRAKEN,
+        group_identifier='1xyz',
+        spend=AssetAmount(asset=A_EUR, amount=FVal('598.26')),
+        receive=AssetAmount(asset=A_ETH, amount=ONE),
+        fee=AssetAmount(asset=A_EUR, amount=ONE),
+    ), *create_swap_events(
+        timestamp=TimestampMS(1624395186000),
+        location=Location.KRAKEN,
+        group_identifier='2xyz',
+        spend=AssetAmount(asset=A_ETH, amount=FVal('0.5')),
+        receive=AssetAmount(asset=A_EUR, amount=FVal('0.5') * FVal('1862.06')),
+        fee=AssetAmount(asset=A_ETH, amount=FVal('0.1')),
+    ), *create_swap_events(
+        timestamp=TimestampMS(1625001464000),
+        location=Location.KRAKEN,
+        group_identifier='3xyz',
+        spend=AssetAmount(asset=A_ETH, amount=FVal('0.4')),
+        receive=AssetAmount(asset=A_EUR, amount=FVal('0.4') * FVal('1837.31')),
+    )]
+    pot, exported_csvs = accountant.pots[0], []
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        for streaming_min_events in (len(history) + 1, len(history)):
+            with patch('rotkehlchen.accounting.accountant.STREAMING_REPORT_MIN_EVENTS', streaming_min_events):  # noqa: E501
+                accounting_history_process(
+                    accountant=accountant,
+                    start_ts=Timestamp(1436979735),
+                    end_ts=Timestamp(1625001466),
+                    history_list=history,
+                )
+
+            assert pot.stream_events is (streaming_min_events == len(history))
+            assert len(pot.processed_events) == (0 if pot.stream_events else pot.processed_events_num)  # noqa: E501
+            accountant.csvexporter.settings = dataclasses.replace(
+                accountant.csvexporter.settings,
+                pnl_csv_with_formulas=True,
+                pnl_csv_have_summary=True,
+            )
+            directory = Path(tmpdirname) / str(streaming_min_events)
+            assert accountant.export(directory_path=directory) == (True, '')
+            exported_csvs.append((directory / FILENAME_ALL_CSV).read_text(encoding='utf8'))
+
+    assert pot.processed_events_num != 0
+    assert exported_csvs[0] == exported_csvs[1]
+
+
 @pytest.mark.parametrize('mocked_price_queries', [prices])
 @pytest.mark.parametrize('db_settings', [{'include_fees_in_cost_basis': False}])
 def test_fees_in_received_asset(accountant, google_service):
@@ -1,3 +1,4 @@
+
 from rotkehlchen.constants.assets import A_BAL, A_BTC, A_ETH, A_USD
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
@@ -156,3 +157,85 @@ def test_historical_price_lookup_uses_pair_timestamp_index(globaldb) -> None:
         and 'timestamp>? AND timestamp<?' in row[-1]
         for row in query_plan
     )
+
+
+def test_price_series_cache(globaldb, historical_price_test_data):  # pylint: disable=unused-argument
+    """Lookups served from the in-memory price series match the DB ones and see new writes
+    that are merged in the cached series in place"""
+    lookups = [
+        {'timestamp': 1511627623, 'max_seconds_distance': 3600},
+        {'timestamp': 1511627623, 'max_seconds_distance': 3600, 'sources': (HistoricalPriceOracle.MANUAL,)},  # noqa: E501
+        {'timestamp': 1511627623, 'max_seconds_distance': 3600, 'sources': (HistoricalPriceOracle.CRYPTOCOMPARE, HistoricalPriceOracle.MANUAL)},  # noqa: E501
+        {'timestamp': 1511627623, 'max_seconds_distance': 10},
+        {'timestamp': 1618481099, 'max_seconds_distance': 3600},
+    ]
+    expected = [
+        globaldb.get_historical_price(from_asset=A_ETH, to_asset=A_EUR, **kwargs)
+        for kwargs in lookups
+    ]
+    cache = globaldb.price_series
+    with cache.scope():
+        assert [
+            globaldb.get_historical_price(from_asset=A_ETH, to_asset=A_EUR, **kwargs)
+            for kwargs in lookups
+        ] == expected
+        assert list(cache.series) == [pair := (A_ETH.identifier, A_EUR.identifier)]
+        points = cache.total_points
+
+        # a manual price at the same timestamp has to be seen and preferred
+        manual_price = HistoricalPrice(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            source=HistoricalPriceOracle.MANUAL,
+            timestamp=Timestamp(1618481101),
+            price=Price(FVal(2000)),
+        )
+        assert globaldb.add_single_historical_price(manual_price) is True
+        assert len(cache.series[pair]) == cache.total_points == points + 1
+        assert globaldb.get_historical_price(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            timestamp=Timestamp(1618481099),
+            max_seconds_distance=3600,
+        ) == manual_price
+
+        edited_price = HistoricalPrice(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            source=HistoricalPriceOracle.MANUAL,
+            timestamp=Timestamp(1618481101),
+            price=Price(FVal(2100)),
+        )
+        assert globaldb.edit_manual_price(edited_price) is True
+        assert len(cache.series[pair]) == points + 1
+        assert globaldb.get_historical_price(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            timestamp=Timestamp(1618481099),
+            max_seconds_distance=3600,
+        ) == edited_price
+
+        assert globaldb.delete_historical_price(
+            from_asset=A_ETH,
+            to_asset=A_EUR,
+            timestamp=Timestamp(1618481101),
+            source_type=HistoricalPriceOracle.MANUAL,
+        ) is True
+        assert len(cache.series[pair]) == cache.total_points == points
+        assert [
+            globaldb.get_historical_price(from_asset=A_ETH, to_asset=A_EUR, **kwargs)
+            for kwargs in lookups
+        ] == expected
+
+        # loading another pair evicts the least recently used one when over the limit
+        cache.max_points = cache.total_points
+        globaldb.get_historical_price(
+            from_asset=A_BTC,
+            to_asset=A_EUR,
+            timestamp=Timestamp(1618481102),
+            max_seconds_distance=3600,
+        )
+        assert list(cache.series) == [(A_BTC.identifier, A_EUR.identifier)]
+
+    assert cache.active is False
+    assert len(cache.series) == cache.total_points == 0
@@ -292,6 +292,25 @@ def test_zpub_to_addresses():
         assert child.address() == expected_addresses[i]
 
 
+def test_derive_child_pubkeys():
+    """Test that batch deriving child public keys gives the same keys as deriving each child"""
+    for xpub, xpub_type in (
+        ('xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk', None),  # noqa: E501
+        ('xpub6BgBgsespWvERF3LHQu6CnqdvfEvtMcQjYrcRzx53QJjSxarj2afYWcLteoGVky7D3UKDP9QyrLprQ3VCECoY49yfdDEHGCtMMj92pReUsQ', XpubType.P2TR),  # noqa: E501
+        ('zpub6quTRdxqWmerHdiWVKZdLMp9FY641F1F171gfT2RS4D1FyHnutwFSMiab58Nbsdu4fXBaFwpy5xyGnKZ8d6xn2j4r4yNmQ3Yp3yDDxQUo3q', None),  # noqa: E501
+    ):
+        root = HDKey.from_xpub(xpub=xpub, xpub_type=xpub_type).derive_child(0)
+        indices = [0, 1, 2, 7, 19]
+        pubkeys = root.derive_child_pubkeys(indices)
+        for index, pubkey in zip(indices, pubkeys, strict=True):
+            child = root.derive_child(index)
+            assert pubkey == child.pubkey.format(compressed=True)
+            assert root.pubkey_to_address(pubkey) == child.address()
+
+    with pytest.raises(XPUBError):
+        root.derive_child_pubkeys([2**31])
+
+
 def test_from_bad_xpub():
     with pytest.raises(XPUBError):
         HDKey.from_xpub('ddodod')
@@ -319,6 +338,9 @@ def test_secp256k1_public_key_validation_and_tweaks():
     with pytest.raises(ValueError):
         key.add(b'\x00' * 32)
 
+    tweaks = [(1).to_bytes(32, byteorder='big'), b'\x00' * 32, b'\xff' * 32, b'\x07' * 32]
+    assert key.add_batch(tweaks) == [key.add(tweaks[0]), None, None, key.add(tweaks[3])]
+
 
 def test_xpub_data_comparison():
     hdkey1 = HDKey.from_xpub('xpub6DCi5iJ57ZPd5qPzvTm5hUt6X23TJdh9H4NjNsNbt7t7UuTMJfawQWsdWRFhfLwkiMkB1rQ4ZJWLB9YBnzR7kbs9N8b2PsKZgKUHQm1X4or')  # noqa: E501
@@ -1,12 +1,21 @@
 import csv
+import random
 import tempfile
+from copy import deepcopy
 from itertools import zip_longest
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
+from unittest.mock import patch
 
 import pytest
 
 from rotkehlchen.accounting.cost_basis import AssetAcquisitionEvent
+from rotkehlchen.accounting.cost_basis.base import (
+    FIFOAcquisitionLedger,
+    FIFOCostBasisMethod,
+    LIFOAcquisitionLedger,
+    LIFOCostBasisMethod,
+)
 from rotkehlchen.accounting.export.csv import FILENAME_ALL_CSV, CSVExporter
 from rotkehlchen.accounting.mixins.event import AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
@@ -29,8 +38,10 @@ from rotkehlchen.history.events.structures.swap import (
     create_swap_events_multi_fee,
 )
 from rotkehlchen.history.events.structures.types import HistoryEventSubType, HistoryEventType
-from rotkehlchen.tests.utils.accounting import accounting_history_process
+from rotkehlchen.tests.utils.accounting import accounting_history_process, history1
 from rotkehlchen.tests.utils.factories import make_evm_address, make_evm_tx_hash
+from rotkehlchen.tests.utils.history import prices
+from rotkehlchen.tests.utils.messages import no_message_errors
 from rotkehlchen.types import (
     AssetAmount,
     CostBasisMethod,
@@ -44,7 +55,10 @@ from rotkehlchen.utils.misc import ts_ms_to_sec
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.accountant import Accountant
-    from rotkehlchen.accounting.cost_basis.base import AverageCostBasisMethod
+    from rotkehlchen.accounting.cost_basis.base import (
+        AverageCostBasisMethod,
+        BaseCostBasisMethod,
+    )
     from rotkehlchen.accounting.pot import AccountingPot
     from rotkehlchen.db.dbhandler import DBHandler
 
@@ -1559,3 +1573,117 @@ def test_asset_collections_enabled(accountant: Accountant) -> None:
     )
     assert result is True
     assert len(cost_basis.missing_acquisitions) == 0
+
+
+@pytest.mark.parametrize(('heap_method', 'ledger_method'), [
+    (FIFOCostBasisMethod, FIFOAcquisitionLedger),
+    (LIFOCostBasisMethod, LIFOAcquisitionLedger),
+])
+@pytest.mark.parametrize('taxfree_after_period', [None, 500])
+def test_acquisition_ledger_matches_heap(
+        heap_method: type[BaseCostBasisMethod],
+        ledger_method: type[BaseCostBasisMethod],
+        taxfree_after_period: int | None,
+) -> None:
+    """Differential test of the array backed ledgers against the heap based methods.
+
+    Feeds both the same random sequence of acquisitions, spends, reductions and
+    checkpoint restores and checks that every result and remaining acquisition is equal.
+    """
+    rng = random.Random(42)
+    settings = DBSettings(taxfree_after_period=taxfree_after_period)
+    heap, ledger = heap_method(), ledger_method()
+
+    def random_amount() -> FVal:
+        if (choice := rng.random()) < 0.05:
+            return ZERO
+        if choice < 0.35:
+            return FVal(rng.randint(1, 10))
+        if choice < 0.7:  # tiny amounts with different decimals like staking rewards
+            return FVal(f'{rng.randint(1, 10 ** 6)}E-{rng.randint(0, 18)}')
+        if choice < 0.8:
+            return ONE / FVal(rng.randint(1, 9))
+        return FVal(f'{rng.randint(1, 1000)}.{rng.randint(0, 99)}')
+
+    for index in range(2000):
+        if (action := rng.random()) < 0.5:
+            amount, timestamp, rate = random_amount(), Timestamp(rng.randint(0, 1000)), Price(random_amount())  # noqa: E501
+            for manager in (heap, ledger):
+                manager.add_in_event(AssetAcquisitionEvent(
+                    amount=amount,
+                    timestamp=timestamp,
+                    rate=rate,
+                    index=index,
+                ))
+        elif action < 0.85:
+            amount, timestamp = random_amount() * rng.randint(1, 5), Timestamp(rng.randint(0, 1200))  # noqa: E501
+            results = []
+            for manager in (heap, ledger):
+                missing_acquisitions: list[MissingAcquisition] = []
+                used_acquisitions: list[AssetAcquisitionEvent] = []
+                cost_basis_info = manager.calculate_spend_cost_basis(
+                    spending_amount=amount,
+                    spending_asset=A_ETH,
+                    timestamp=timestamp,
+                    missing_acquisitions=missing_acquisitions,
+                    used_acquisitions=used_acquisitions,
+                    settings=settings,
+                    timestamp_to_date=str,
+                    originating_event_id=index,
+                )
+                results.append((
+                    cost_basis_info.taxable_amount,
+                    cost_basis_info.taxable_bought_cost,
+                    cost_basis_info.taxfree_bought_cost,
+                    cost_basis_info.is_complete,
+                    [(x.amount, x.event.index, x.event.remaining_amount, x.taxable) for x in cost_basis_info.matched_acquisitions],  # noqa: E501
+                    [x.index for x in used_acquisitions],
+                    missing_acquisitions,
+                ))
+            assert results[0] == results[1]
+        elif action < 0.95:
+            amount = random_amount()
+            assert heap.reduce_amount(amount, A_ETH) == ledger.reduce_amount(amount, A_ETH)
+        else:  # go through a checkpoint
+            heap_state, ledger_state = heap.serialize_state(), ledger.serialize_state()
+            heap, ledger = heap_method(), ledger_method()
+            heap.restore_state(heap_state)
+            ledger.restore_state(ledger_state)
+
+        assert len(heap) == len(ledger)
+        if len(heap) != 0:  # the next acquisition to consume is the same
+            assert heap.get_acquisitions()[0] == ledger.get_acquisitions()[0]
+        assert sorted(
+            (x.timestamp, x.index, x.remaining_amount) for x in heap.get_acquisitions()
+        ) == sorted(
+            (x.timestamp, x.index, x.remaining_amount) for x in ledger.get_acquisitions()
+        )
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+@pytest.mark.parametrize('db_settings', [
+    {'cost_basis_method': CostBasisMethod.FIFO},
+    {'cost_basis_method': CostBasisMethod.LIFO},
+    {'cost_basis_method': CostBasisMethod.FIFO, 'taxfree_after_period': -1},
+    {'cost_basis_method': CostBasisMethod.LIFO, 'taxfree_after_period': -1},
+])
+def test_acquisition_ledger_report_matches_heap(accountant: Accountant) -> None:
+    """Differential test of a whole report of the accounting fixtures processed with the
+    array backed ledgers against the same report processed with the heap based methods"""
+    reports = []
+    for ledgers in (
+            {},  # the ledgers are what CostBasisEvents uses
+            {'FIFOAcquisitionLedger': FIFOCostBasisMethod, 'LIFOAcquisitionLedger': LIFOCostBasisMethod},  # noqa: E501
+    ):
+        with patch.multiple('rotkehlchen.accounting.cost_basis.base', **ledgers):
+            accounting_history_process(accountant, Timestamp(1436979735), Timestamp(1519693374), history1)  # noqa: E501
+
+        no_message_errors(accountant.msg_aggregator)
+        reports.append(deepcopy((
+            accountant.pots[0].pnls,
+            [(x.pnl, x.cost_basis) for x in accountant.pots[0].processed_events],
+        )))
+
+    assert reports[0][0] == reports[1][0]
+    assert reports[0][1] == reports[1][1]
+    assert len(reports[0][1]) != 0
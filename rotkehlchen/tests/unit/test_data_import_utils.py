@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING, Any
 
-from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.constants.assets import A_BTC, A_ETH
 from rotkehlchen.data_import.importers.rotki_events import RotkiGenericEventsImporter
 from rotkehlchen.data_import.importers.rotki_trades import RotkiGenericTradesImporter
 from rotkehlchen.data_import.utils import BaseExchangeImporter, detect_duplicate_event
+from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HistoryMappingState
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.fval import FVal
 from rotkehlchen.history.events.structures.base import HistoryEvent
@@ -107,3 +108,44 @@ def test_rotki_generic_events_unknown_asset(database, tmp_path) -> None:
     assert len(error_msgs) == 1
     assert 'ZZZFAKE' in error_msgs[0]['msg']
     assert 'Unknown asset' in error_msgs[0]['msg']
+
+
+def test_flush_all_skips_duplicates(database) -> None:
+    """Test that flushing imported events in bulk skips both events already in the DB
+    and repeated events of the same batch, while mapping and ignoring the new ones"""
+    history_db = DBHistoryEvents(database)
+    events = [HistoryEvent(
+        group_identifier=f'CSV{idx}',
+        sequence_index=0,
+        timestamp=TimestampMS(1700000000000 + idx),
+        location=Location.BINANCE,
+        event_type=HistoryEventType.STAKING,
+        event_subtype=HistoryEventSubType.REWARD,
+        asset=A_ETH if idx != 2 else A_BTC,
+        amount=FVal(idx + 1),
+    ) for idx in range(4)]
+    with database.user_write() as write_cursor:
+        history_db.add_history_event(write_cursor, events[0])
+        database.add_to_ignored_assets(write_cursor, A_BTC)
+
+    importer = DummyImporter(db=database, name='dummy')
+    with database.user_write() as write_cursor:
+        importer.add_history_events(write_cursor, [*events, events[3]])
+        importer.flush_all(write_cursor)
+
+    assert len(importer.import_msgs) == 2
+    for import_msg, amount in zip(importer.import_msgs, ('1', '4'), strict=True):
+        assert import_msg['row'] == -1
+        assert 'is_error' not in import_msg
+        assert import_msg['msg'].startswith('Skipped duplicate')
+        assert f'staking/reward of {amount} ETH' in import_msg['msg']
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT group_identifier, ignored FROM history_events ORDER BY group_identifier',
+        ).fetchall() == [('CSV0', 0), ('CSV1', 0), ('CSV2', 1), ('CSV3', 0)]
+        assert cursor.execute(
+            'SELECT H.group_identifier FROM history_events_mappings M INNER JOIN '
+            'history_events H ON H.identifier=M.parent_identifier WHERE M.name=? AND M.value=? '
+            'ORDER BY H.group_identifier',
+            (HISTORY_MAPPING_KEY_STATE, HistoryMappingState.IMPORTED_FROM_CSV.serialize_for_db()),
+        ).fetchall() == [('CSV1',), ('CSV2',), ('CSV3',)]
@@ -13,9 +13,12 @@ from rotkehlchen.chain.evm.decoding.constants import (
 )
 from rotkehlchen.chain.evm.decoding.interfaces import ReloadableCacheDecoderMixin
 from rotkehlchen.chain.evm.decoding.structures import (
+    DEFAULT_EVM_DECODING_OUTPUT,
     FAILED_ENRICHMENT_OUTPUT,
+    EvmDecodingOutput,
     TransferEnrichmentOutput,
 )
+from rotkehlchen.chain.evm.decoding.utils import decodes_topics
 from rotkehlchen.chain.evm.l2_with_l1_fees.types import L2WithL1FeesTransaction
 from rotkehlchen.chain.evm.structures import EvmTxReceipt, EvmTxReceiptLog
 from rotkehlchen.chain.evm.types import EvmAccount, string_to_evm_address
@@ -858,3 +861,98 @@ def test_one_failing_enricher_does_not_hide_the_rest(
         enricher_rules[:] = original_rules
 
     assert len(reached) == 1
+
+
+def test_event_rules_dispatch_by_topic(
+        ethereum_transaction_decoder: EthereumTransactionDecoder,
+) -> None:
+    """Event rules declaring their topics must only be tried for logs with one of them,
+    while rules without a declaration keep being tried for every log in registration order."""
+    called = []
+    topic_a, topic_b = b'\x01' * 32, b'\x02' * 32
+
+    @decodes_topics(topic_a)
+    def topic_a_rule(**kwargs: Any) -> EvmDecodingOutput:
+        called.append('a')
+        return DEFAULT_EVM_DECODING_OUTPUT
+
+    def any_topic_rule(**kwargs: Any) -> EvmDecodingOutput:
+        called.append('any')
+        return DEFAULT_EVM_DECODING_OUTPUT
+
+    event_rules = ethereum_transaction_decoder.rules.event_rules
+    original_rules = event_rules.copy()
+    event_rules[:] = [topic_a_rule, any_topic_rule]
+    try:
+        for topic in (topic_a, topic_b):
+            assert ethereum_transaction_decoder.try_all_rules(
+                token=None,
+                tx_log=Mock(topics=[topic]),
+                transaction=Mock(tx_hash=make_evm_tx_hash()),
+                decoded_events=[],
+                action_items=[],
+                all_logs=[],
+            ) is None
+    finally:
+        event_rules[:] = original_rules
+
+    assert called == ['a', 'any', 'any']
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_bulk_transaction_contexts_match_single_loading(
+        ethereum_transaction_decoder: EthereumTransactionDecoder,
+        database: DBHandler,
+) -> None:
+    """The transaction contexts loaded in bulk must be the same as loading them one by one
+    and carry the decoded state of each transaction."""
+    decoder = ethereum_transaction_decoder
+    tx_hashes = decoder.dbtx.get_transaction_hashes_not_decoded(
+        filter_query=decoder._get_tx_not_decoded_filter_query(limit=None),
+    )
+    assert len(tx_hashes) > 1
+    decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=tx_hashes[:1])
+    with database.conn.read_ctx() as cursor:
+        bulk_contexts = decoder._load_transaction_contexts(cursor=cursor, tx_hashes=tx_hashes)
+        single_contexts = [
+            decoder._load_transaction_context(cursor=cursor, tx_hash=tx_hash)
+            for tx_hash in tx_hashes
+        ]
+
+    assert [x.decoded for x in bulk_contexts] == [True] + [False] * (len(tx_hashes) - 1)
+    for bulk_context, single_context in zip(bulk_contexts, single_contexts, strict=True):
+        assert bulk_context.transaction == single_context.transaction
+        assert bulk_context.receipt == single_context.receipt
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_concurrently_decoded_transaction_is_written_once(
+        ethereum_transaction_decoder: EthereumTransactionDecoder,
+        database: DBHandler,
+) -> None:
+    """A transaction decoded by another decoding run after its context was loaded as not
+    decoded must not get its events written again"""
+    decoder = ethereum_transaction_decoder
+    tx_hash = decoder.dbtx.get_transaction_hashes_not_decoded(
+        filter_query=decoder._get_tx_not_decoded_filter_query(limit=None),
+    )[0]
+    with database.conn.read_ctx() as cursor:
+        stale_context = decoder._load_transaction_contexts(cursor=cursor, tx_hashes=[tx_hash])[0]  # noqa: E501
+
+    assert stale_context.decoded is False
+    decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=[tx_hash])
+    write_buffer: list = []
+    with patch.object(
+        decoder.dbevents,
+        'add_history_events',
+        wraps=decoder.dbevents.add_history_events,
+    ) as add_mock:
+        decoder._decode_transaction_from_context(
+            context=stale_context,
+            ignore_cache=False,
+            delete_customized=False,
+            write_buffer=write_buffer,
+        )
+        decoder._flush_buffered_tx_event_writes(write_buffer)
+
+    assert add_mock.call_count == 0
@@ -18,6 +18,7 @@ from rotkehlchen.chain.evm.decoding.cowswap.constants import CPT_COWSWAP
 from rotkehlchen.chain.evm.decoding.hop.constants import CPT_HOP
 from rotkehlchen.chain.evm.decoding.weth.constants import CPT_WETH
 from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.constants import DAY_IN_MILLISECONDS
 from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_ETH2, A_USDC, A_WETH
 from rotkehlchen.constants.misc import ONE, ZERO
 from rotkehlchen.db.cache import DBCacheStatic
@@ -1076,6 +1077,136 @@ def test_synthetic_profit_event_when_protocol_withdrawal_exceeds_deposit(
                 ]
 
 
+@pytest.mark.parametrize('db_settings', [{'auto_create_profit_events': True}])
+def test_process_historical_balances_in_small_chunks(
+        database: DBHandler,
+        messages_aggregator: MessagesAggregator,
+) -> None:
+    """Test that streaming the events in chunks gives the same metrics as a single chunk,
+    even when a profit event shifts the sequence indexes of events in a later chunk."""
+    with database.user_write() as write_cursor:
+        DBHistoryEvents(database).add_history_events(
+            write_cursor=write_cursor,
+            history=[EvmEvent(
+                tx_ref=make_evm_tx_hash(),
+                sequence_index=0,
+                timestamp=TimestampMS(1000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=A_ETH,
+                amount=FVal('10'),
+                location_label=TEST_ADDR1,
+            ), EvmEvent(
+                tx_ref=make_evm_tx_hash(),
+                sequence_index=0,
+                timestamp=TimestampMS(2000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.DEPOSIT,
+                event_subtype=HistoryEventSubType.DEPOSIT_TO_PROTOCOL,
+                asset=A_ETH,
+                amount=FVal('5'),
+                location_label=TEST_ADDR1,
+                counterparty=CPT_LIQUITY,
+            ), *(EvmEvent(
+                tx_ref=(tx_hash := make_evm_tx_hash()) if idx == 0 else tx_hash,
+                sequence_index=idx,
+                timestamp=TimestampMS(3000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.WITHDRAWAL if idx == 0 else HistoryEventType.SPEND,
+                event_subtype=HistoryEventSubType.WITHDRAW_FROM_PROTOCOL if idx == 0 else HistoryEventSubType.NONE,  # noqa: E501
+                asset=A_ETH,
+                amount=FVal('5.1') if idx == 0 else ONE,
+                location_label=TEST_ADDR1,
+                counterparty=CPT_LIQUITY if idx == 0 else None,
+            ) for idx in range(3))],
+        )
+
+    with patch('rotkehlchen.tasks.historical_balances.HISTORY_EVENTS_STREAM_CHUNK_SIZE', 1):
+        process_historical_balances(database, messages_aggregator)  # creates the profit event
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 6
+        chunked_metrics = cursor.execute(
+            'SELECT metric_value, timestamp FROM event_metrics ORDER BY sort_key, metric_value',
+        ).fetchall()
+
+    process_historical_balances(database, messages_aggregator)
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT metric_value, timestamp FROM event_metrics ORDER BY sort_key, metric_value',
+        ).fetchall() == chunked_metrics
+
+
+def test_daily_balances_updated_incrementally(
+        database: DBHandler,
+        messages_aggregator: MessagesAggregator,
+) -> None:
+    """Test that the daily balances are summed over buckets, only rewritten from the day
+    of the reprocessing onwards and match the ones of processing everything again."""
+    dbevents = DBHistoryEvents(database)
+    with database.user_write() as write_cursor:
+        dbevents.add_history_events(write_cursor=write_cursor, history=[
+            _make_balance_event(timestamp=1000, amount='10'),
+            _make_balance_event(timestamp=DAY_IN_MILLISECONDS + 1000, amount='2.2'),
+            _make_balance_event(timestamp=3 * DAY_IN_MILLISECONDS + 1000, amount='1'),
+        ])
+        dbevents.add_history_event(write_cursor=write_cursor, event=EvmEvent(
+            tx_ref=make_evm_tx_hash(),
+            sequence_index=0,
+            timestamp=TimestampMS(DAY_IN_MILLISECONDS + 2000),
+            location=Location.ETHEREUM,
+            event_type=HistoryEventType.RECEIVE,
+            event_subtype=HistoryEventSubType.NONE,
+            asset=A_ETH,
+            amount=FVal('0.5'),
+            location_label=TEST_ADDR2,
+        ))
+
+    def get_daily_balances() -> list[tuple[int, str, str]]:
+        with database.conn.read_ctx() as cursor:
+            return cursor.execute(
+                'SELECT day, asset, amount FROM event_metrics_daily_balances ORDER BY day',
+            ).fetchall()
+
+    process_historical_balances(database, messages_aggregator)
+    assert get_daily_balances() == [
+        (0, A_ETH.identifier, '10'),
+        (DAY_IN_MILLISECONDS, A_ETH.identifier, '12.7'),
+        (3 * DAY_IN_MILLISECONDS, A_ETH.identifier, '13.7'),
+    ]
+
+    with database.user_write() as write_cursor:  # mark an untouched day as modified
+        write_cursor.execute(
+            'UPDATE event_metrics_daily_balances SET amount=? WHERE day=0',
+            ('1000',),
+        )
+        dbevents.add_history_event(
+            write_cursor=write_cursor,
+            event=_make_balance_event(timestamp=2 * DAY_IN_MILLISECONDS, amount='0.3'),
+        )
+
+    process_historical_balances(
+        database=database,
+        msg_aggregator=messages_aggregator,
+        from_ts=TimestampMS(2 * DAY_IN_MILLISECONDS),
+    )
+    assert get_daily_balances() == [
+        (0, A_ETH.identifier, '1000'),
+        (DAY_IN_MILLISECONDS, A_ETH.identifier, '12.7'),
+        (2 * DAY_IN_MILLISECONDS, A_ETH.identifier, '13'),
+        (3 * DAY_IN_MILLISECONDS, A_ETH.identifier, '14'),
+    ]
+
+    process_historical_balances(database, messages_aggregator)
+    assert get_daily_balances() == [
+        (0, A_ETH.identifier, '10'),
+        (DAY_IN_MILLISECONDS, A_ETH.identifier, '12.7'),
+        (2 * DAY_IN_MILLISECONDS, A_ETH.identifier, '13'),
+        (3 * DAY_IN_MILLISECONDS, A_ETH.identifier, '14'),
+    ]
+
+
 @pytest.mark.parametrize('db_settings', [
     {'auto_create_profit_events': True},
     {'auto_create_profit_events': False},
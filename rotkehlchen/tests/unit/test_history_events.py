@@ -439,3 +439,41 @@ def test_ignored_group_lookup_detects_across_chunks(database: DBHandler) -> None
         )
 
     assert result.ignored_group_identifiers == {'ignored_grp_btc'}
+
+
+def test_events_read_from_db_load_extra_data_lazily(database: DBHandler) -> None:
+    """Test that the events read from the DB are slotted and only load their extra_data json
+    when it is accessed, and that an invalid json is still treated as no extra data"""
+    events_db = DBHistoryEvents(database)
+    tx_hash = make_evm_tx_hash()
+    with database.user_write() as write_cursor:
+        events_db.add_history_events(write_cursor=write_cursor, history=[EvmEvent(
+            tx_ref=tx_hash,
+            sequence_index=idx,
+            timestamp=TimestampMS(1710000000000),
+            location=Location.ETHEREUM,
+            event_type=HistoryEventType.RECEIVE,
+            event_subtype=HistoryEventSubType.NONE,
+            asset=A_ETH,
+            amount=ONE,
+            extra_data={'vault_id': idx},
+        ) for idx in range(2)])
+        write_cursor.execute(
+            'UPDATE history_events SET extra_data=? WHERE sequence_index=1',
+            ('{invalid',),
+        )
+
+    with database.conn.read_ctx() as cursor:
+        events = events_db.get_history_events_internal(
+            cursor=cursor,
+            filter_query=HistoryEventFilterQuery.make(),
+        )
+
+    assert not hasattr(events[0], '__dict__')
+    assert events[0]._raw_extra_data == '{"vault_id": 0}'
+    assert events[0].extra_data == {'vault_id': 0}
+    assert events[0]._raw_extra_data is None
+    assert events[1].extra_data is None
+    events[1].extra_data = {'vault_id': 1}
+    assert events[1].extra_data == {'vault_id': 1}
+    assert events[1].serialize_for_db()[0][2][-1] == '{"vault_id": 1}'
@@ -31,8 +31,9 @@ from rotkehlchen.externalapis.defillama import Defillama
 from rotkehlchen.externalapis.moralis import Moralis
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import _prioritize_manual_balances_query
-from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.history.price import PriceHistorian, plan_price_ranges
 from rotkehlchen.history.types import (
+    DAILY_GRANULARITY_ORACLES,
     DEFAULT_HISTORICAL_PRICE_ORACLES_ORDER,
     HistoricalPrice,
     HistoricalPriceOracle,
@@ -266,6 +267,161 @@ def test_cached_price_returns_without_oracle_calls(globaldb, fake_price_historia
         )
 
 
+def test_query_historical_prices_only_queries_misses(globaldb, fake_price_historian):
+    """Test that the bulk price query uses the cached prices without asking the oracles
+    and queries a daily-granularity oracle only once per asset pair and day for the misses."""
+    price_historian = fake_price_historian
+    price_historian.set_oracles_order([HistoricalPriceOracle.COINGECKO])
+    day_start = Timestamp(1611532800)
+    globaldb.add_single_historical_price(
+        HistoricalPrice(
+            from_asset=A_BTC,
+            to_asset=A_USD,
+            price=(btc_price := Price(FVal('30000'))),
+            timestamp=Timestamp(day_start + 100),
+            source=HistoricalPriceOracle.MANUAL,
+        ),
+    )
+    coingecko = price_historian._coingecko
+    coingecko.query_historical_price.return_value = (link_price := Price(FVal('15')))
+
+    assert price_historian.query_historical_prices(queries=[
+        (A_BTC, A_USD, Timestamp(day_start + 200)),
+        (A_LINK, A_USD, Timestamp(day_start + 300)),
+        (A_LINK, A_USD, Timestamp(day_start + 20000)),
+        (A_LINK, A_USD, Timestamp(day_start + 20000)),
+        (A_USD, A_USD, day_start),
+    ]) == {
+        (A_BTC, A_USD, Timestamp(day_start + 200)): btc_price,
+        (A_LINK, A_USD, Timestamp(day_start + 300)): link_price,
+        (A_LINK, A_USD, Timestamp(day_start + 20000)): link_price,
+        (A_USD, A_USD, day_start): ONE,
+    }
+    assert coingecko.query_historical_price.call_count == 1
+
+    # the price fetched from the oracle is now cached at the day start
+    coingecko.query_historical_price.side_effect = PriceQueryUnsupportedAsset('chainlink')
+    assert price_historian.query_historical_prices(
+        queries=[(A_LINK, A_USD, Timestamp(day_start + 40000))],
+    ) == {(A_LINK, A_USD, Timestamp(day_start + 40000)): link_price}
+    assert coingecko.query_historical_price.call_count == 1
+
+
+def test_plan_price_ranges():
+    """Test that the timestamps are covered with the fewest ranges of the max length"""
+    assert plan_price_ranges(timestamps=[], max_seconds=10) == []
+    assert plan_price_ranges(
+        timestamps=[Timestamp(x) for x in (1, 5, 11, 12, 30, 41, 42)],
+        max_seconds=10,
+    ) == [(1, 11), (12, 12), (30, 30), (41, 42)]
+
+
+def test_prefetch_historical_prices(globaldb, fake_price_historian):
+    """Test that only the uncached prices are prefetched with the fewest range queries
+    and that the next range oracle only gets the assets the previous one missed."""
+    price_historian = fake_price_historian
+    price_historian.set_oracles_order([
+        HistoricalPriceOracle.CRYPTOCOMPARE,
+        HistoricalPriceOracle.COINGECKO,
+    ])
+    day_start = Timestamp(1611532800)
+    globaldb.add_single_historical_price(HistoricalPrice(
+        from_asset=A_BTC,
+        to_asset=A_USD,
+        price=Price(FVal('30000')),
+        timestamp=Timestamp(day_start + 100),
+        source=HistoricalPriceOracle.MANUAL,
+    ))
+
+    def mock_range_query(source, supported_asset, from_asset, to_asset, from_timestamp, to_timestamp):  # noqa: E501
+        if from_asset != supported_asset:
+            raise PriceQueryUnsupportedAsset(from_asset.identifier)
+
+        if source in DAILY_GRANULARITY_ORACLES:
+            from_timestamp = timestamp_to_daystart_timestamp(from_timestamp)
+            to_timestamp = timestamp_to_daystart_timestamp(to_timestamp)
+
+        return [HistoricalPrice(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            source=source,
+            timestamp=timestamp,
+            price=Price(FVal(timestamp)),
+        ) for timestamp in sorted({from_timestamp, to_timestamp})]
+
+    cryptocompare, coingecko = price_historian._cryptocompare, price_historian._coingecko
+    cryptocompare.range_query_max_seconds = 10 * DAY_IN_SECONDS
+    cryptocompare.query_historical_price_range.side_effect = lambda **kwargs: mock_range_query(HistoricalPriceOracle.CRYPTOCOMPARE, A_BTC, **kwargs)  # noqa: E501
+    coingecko.range_query_max_seconds = Coingecko.range_query_max_seconds
+    coingecko.query_historical_price_range.side_effect = lambda **kwargs: mock_range_query(HistoricalPriceOracle.COINGECKO, A_LINK, **kwargs)  # noqa: E501
+    btc_timestamps = [day_start + offset for offset in (100, 5 * HOUR_IN_SECONDS, 2 * DAY_IN_SECONDS, 30 * DAY_IN_SECONDS)]  # noqa: E501
+    link_timestamps = [day_start + 300, day_start + 20000]
+    assets_timestamps = [
+        *((A_BTC, Timestamp(timestamp)) for timestamp in btc_timestamps),
+        *((A_LINK, Timestamp(timestamp)) for timestamp in link_timestamps),
+        (A_USD, day_start),
+    ]
+    assert price_historian.prefetch_historical_prices(
+        assets_timestamps=assets_timestamps,
+        to_asset=A_USD,
+    ) == 4
+    assert {
+        (call.kwargs['from_asset'], call.kwargs['from_timestamp'], call.kwargs['to_timestamp'])
+        for call in cryptocompare.query_historical_price_range.call_args_list
+    } == {
+        (A_BTC, btc_timestamps[1], btc_timestamps[2]),
+        (A_BTC, btc_timestamps[3], btc_timestamps[3]),
+        (A_LINK, link_timestamps[0], link_timestamps[1]),
+    }
+    assert coingecko.query_historical_price_range.call_count == 1
+    assert coingecko.query_historical_price_range.call_args.kwargs['from_asset'] == A_LINK
+
+    # all the prices are now served from the cache without any point query
+    for asset, timestamp in assets_timestamps:
+        price_historian.query_historical_price(from_asset=asset, to_asset=A_USD, timestamp=timestamp)  # noqa: E501
+    assert cryptocompare.query_historical_price.call_count == 0
+    assert coingecko.query_historical_price.call_count == 0
+    assert price_historian.prefetch_historical_prices(
+        assets_timestamps=assets_timestamps,
+        to_asset=A_USD,
+    ) == 0
+    assert cryptocompare.query_historical_price_range.call_count == 3
+
+
+def test_prefetch_historical_prices_skips_ranges_without_prices(globaldb, fake_price_historian):  # noqa: E501
+    """Test that a range without prices does not stop the prefetch of the asset's later
+    ranges from the same oracle"""
+    price_historian = fake_price_historian
+    price_historian.set_oracles_order([HistoricalPriceOracle.CRYPTOCOMPARE])
+    day_start = Timestamp(1611532800)
+    timestamps = [Timestamp(day_start + offset) for offset in (100, 30 * DAY_IN_SECONDS)]
+
+    def mock_range_query(from_asset, to_asset, from_timestamp, to_timestamp):
+        if from_timestamp == timestamps[0]:
+            raise NoPriceForGivenTimestamp(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                time=from_timestamp,
+            )
+
+        return [HistoricalPrice(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            source=HistoricalPriceOracle.CRYPTOCOMPARE,
+            timestamp=to_timestamp,
+            price=Price(FVal(10)),
+        )]
+
+    cryptocompare = price_historian._cryptocompare
+    cryptocompare.range_query_max_seconds = 10 * DAY_IN_SECONDS
+    cryptocompare.query_historical_price_range.side_effect = mock_range_query
+    assert price_historian.prefetch_historical_prices(
+        assets_timestamps=[(A_BTC, timestamp) for timestamp in timestamps],
+        to_asset=A_USD,
+    ) == 1
+    assert cryptocompare.query_historical_price_range.call_count == 2
+
+
 def test_disabled_historical_oracle_cache_is_ignored(
         globaldb,
         fake_price_historian,
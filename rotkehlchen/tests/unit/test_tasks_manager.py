@@ -46,6 +46,11 @@ from rotkehlchen.premium.sync import PremiumSyncManager
 from rotkehlchen.serialization.deserialize import deserialize_timestamp
 from rotkehlchen.tasks.assets import _find_missing_tokens, maybe_detect_new_tokens
 from rotkehlchen.tasks.manager import PREMIUM_STATUS_CHECK, TaskManager
+from rotkehlchen.tasks.scheduling import (
+    TaskResource,
+    get_scheduler_task_spec,
+    scheduler_task,
+)
 from rotkehlchen.tasks.utils import (
     prefetch_scheduler_task_timestamps,
     should_run_periodic_task,
@@ -107,6 +112,64 @@ def test_potential_maybe_schedule_task(task_manager: TaskManager):
     ]
 
 
+@pytest.mark.parametrize('enable_priority_tasks', [True])
+def test_scheduler_tasks_declare_resource(task_manager: TaskManager) -> None:
+    """Check that all the scheduling functions declare their resource and cost"""
+    for scheduling_fn in (*task_manager.potential_tasks, *task_manager.priority_tasks_queue):
+        assert hasattr(scheduling_fn.__func__, 'scheduler_task_spec'), scheduling_fn.__name__
+        assert get_scheduler_task_spec(scheduling_fn).cost >= 1
+
+
+@pytest.mark.parametrize('max_tasks_num', [5])
+def test_scheduler_resource_limits_and_aging(task_manager: TaskManager) -> None:
+    """Check that tasks of a resource at its concurrency limit are deferred and that
+    a deferred task is checked before the others in the next ticks"""
+    checked = []
+
+    class MockScheduling:
+
+        @scheduler_task(resource=TaskResource.CPU, cost=3)
+        def expensive_cpu(self) -> list[MagicMock]:
+            checked.append('expensive_cpu')
+            return [MagicMock(dead=False)]
+
+        @scheduler_task(resource=TaskResource.CPU, cost=1)
+        def cheap_cpu(self) -> list[MagicMock]:
+            checked.append('cheap_cpu')
+            return [MagicMock(dead=False)]
+
+        @scheduler_task(resource=TaskResource.REMOTE, cost=2)
+        def remote(self) -> list[MagicMock]:
+            checked.append('remote')
+            return [MagicMock(dead=False)]
+
+    mock_scheduling = MockScheduling()
+    task_manager.potential_tasks = [
+        mock_scheduling.expensive_cpu,
+        mock_scheduling.cheap_cpu,
+        mock_scheduling.remote,
+    ]
+    task_manager._schedule()  # only one cpu task can run and the cheaper one wins
+    assert checked == ['cheap_cpu', 'remote']
+    stats = task_manager.get_scheduler_stats()
+    assert stats['expensive_cpu']['resource'] == 'cpu'
+    assert stats['expensive_cpu']['running'] is False
+    assert stats['expensive_cpu']['runs'] == 0
+    assert stats['cheap_cpu']['running'] is True
+    assert stats['cheap_cpu']['runs'] == 1
+
+    checked.clear()
+    task_manager.running_tasks.clear()
+    task_manager.scheduler_stats[mock_scheduling.expensive_cpu].deferred_since -= 10  # type: ignore[operator]  # noqa: E501
+    task_manager._schedule()  # now the deferred expensive task goes first
+    assert checked == ['expensive_cpu', 'remote']
+    stats = task_manager.get_scheduler_stats()
+    assert stats['expensive_cpu']['runs'] == 1
+    assert stats['expensive_cpu']['max_queue_secs'] >= 10
+    assert stats['cheap_cpu']['waiting_secs'] >= 0
+    assert task_manager.scheduler_stats[mock_scheduling.cheap_cpu].deferred_since is not None
+
+
 @pytest.mark.parametrize('max_tasks_num', [5])
 def test_cryptocompare_task_not_scheduled_without_api_key(task_manager: TaskManager) -> None:
     task_manager.potential_tasks = [task_manager._maybe_schedule_cryptocompare_query]
@@ -12,10 +12,13 @@ from rotkehlchen.assets.asset import Asset, EvmToken
 from rotkehlchen.assets.utils import _query_or_get_given_token_info, get_or_create_evm_token
 from rotkehlchen.chain.ethereum.tokens import EthereumTokens
 from rotkehlchen.chain.evm.decoding.aave.constants import CPT_AAVE_V3
+from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
 from rotkehlchen.chain.evm.decoding.summer_fi.constants import CPT_SUMMER_FI
 from rotkehlchen.chain.evm.tokens import (
     ETHERSCAN_MAX_ARGUMENTS_TO_CONTRACT,
+    TOKEN_DETECTION_FULL_SWEEP_INTERVAL,
     EvmTokensWithProxies,
+    TokenChunkQueryResult,
     generate_multicall_chunks,
     get_rpc_first_chunk_size_call_order,
 )
@@ -26,6 +29,7 @@ from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_CRV, A_DAI, A_ETH, A_OMG, A_WETH
 from rotkehlchen.constants.resolver import evm_address_to_identifier
 from rotkehlchen.db.constants import EVM_ACCOUNTS_DETAILS_TOKENS
+from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.errors.misc import InputError, RemoteError, RequestTooLargeError
 from rotkehlchen.fval import FVal
@@ -40,12 +44,14 @@ from rotkehlchen.types import (
     SUPPORTED_CHAIN_IDS,
     ChainID,
     ChecksumEvmAddress,
+    EvmTransaction,
     Location,
     SupportedBlockchain,
+    Timestamp,
     TimestampMS,
     TokenKind,
 )
-from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.misc import address_to_bytes32, ts_now
 
 if TYPE_CHECKING:
     from rotkehlchen.chain.aggregator import ChainsAggregator
@@ -614,11 +620,10 @@ def test_last_queried_ts(tokens, freezer):
         )
         with tokens.db.conn.read_ctx() as cursor:
             after_first_query = cursor.execute(
-                'SELECT key, value FROM evm_accounts_details',
+                'SELECT key, value FROM evm_accounts_details ORDER BY key',
             ).fetchall()
-            assert len(after_first_query) == 1
-            assert after_first_query[0][0] == 'last_queried_timestamp'
-            assert int(after_first_query[0][1]) >= beginning
+            assert [x[0] for x in after_first_query] == ['last_queried_timestamp', 'last_token_sweep_ts']  # noqa: E501
+            assert all(int(x[1]) >= beginning for x in after_first_query)
 
         continuation = beginning + 10
         freezer.move_to(datetime.datetime.fromtimestamp(continuation, tz=datetime.UTC))
@@ -631,13 +636,110 @@ def test_last_queried_ts(tokens, freezer):
         with tokens.db.conn.read_ctx() as cursor:
             # Check that last_queried_timestamp was updated and that there are no duplicates
             after_second_query = cursor.execute(
-                'SELECT key, value FROM evm_accounts_details',
+                'SELECT key, value FROM evm_accounts_details ORDER BY key',
             ).fetchall()
-            assert len(after_second_query) == 1
-            assert after_second_query[0][0] == 'last_queried_timestamp'
+            assert [x[0] for x in after_second_query] == ['last_queried_timestamp', 'last_token_sweep_ts']  # noqa: E501
             assert int(after_second_query[0][1]) >= continuation
 
 
+def test_detection_checks_token_candidates_between_sweeps(tokens: EthereumTokens, freezer) -> None:  # noqa: E501
+    """Test that after a full sweep a tracked address is only checked for the tokens it has
+    events of or ERC20 Transfer logs with, until the sweep interval passes"""
+    tracked_address, other_address = make_evm_address(), make_evm_address()
+    event_token, log_token, unrelated_token, other_token = (
+        EvmTokenDetectionData(identifier=token.identifier, address=token.evm_address, decimals=18)
+        for token in (EvmToken(x.identifier) for x in (A_DAI, A_WETH, A_CRV, A_OMG))
+    )
+    with tokens.db.user_write() as write_cursor:
+        write_cursor.execute(
+            'INSERT INTO blockchain_accounts(blockchain, account) VALUES(?, ?)',
+            (SupportedBlockchain.ETHEREUM.value, tracked_address),
+        )
+
+    def detect() -> list[set[str]]:
+        """Run detection and return the identifiers checked per call for the tracked address"""
+        with (
+            patch.object(
+                GlobalDBHandler,
+                'get_token_detection_data',
+                return_value=([event_token, log_token, unrelated_token, other_token], []),
+            ),
+            patch.object(tokens, '_query_chunks', return_value=TokenChunkQueryResult(balances={}, had_failures=False)) as query_chunks,  # noqa: E501
+            patch.object(tokens, 'maybe_detect_proxies_tokens', return_value=None),
+        ):
+            tokens._query_new_tokens(addresses=[tracked_address])
+
+        return [{x.identifier for x in call.kwargs['tokens']} for call in query_chunks.call_args_list]  # noqa: E501
+
+    all_tokens = {event_token.identifier, log_token.identifier, unrelated_token.identifier, other_token.identifier}  # noqa: E501
+    assert detect() == [all_tokens]  # first detection is a full sweep
+    assert detect() == [set()]  # nothing interacted with since
+
+    tx_hash = make_evm_tx_hash()
+    with tokens.db.user_write() as write_cursor:
+        DBEvmTx(tokens.db).add_transactions(
+            write_cursor=write_cursor,
+            evm_transactions=[EvmTransaction(
+                tx_hash=tx_hash,
+                chain_id=ChainID.ETHEREUM,
+                timestamp=Timestamp(1700000000),
+                block_number=1,
+                from_address=other_address,
+                to_address=tracked_address,
+                value=0,
+                gas=1,
+                gas_price=1,
+                gas_used=1,
+                input_data=b'',
+                nonce=1,
+            )],
+            relevant_address=None,
+        )
+        DBEvmTx(tokens.db).add_or_ignore_receipt_data(
+            write_cursor=write_cursor,
+            chain_id=ChainID.ETHEREUM,
+            data={
+                'transactionHash': str(tx_hash),
+                'contractAddress': None,
+                'logs': [{
+                    'logIndex': 0,
+                    'data': '0x' + '00' * 31 + '01',
+                    'address': address,
+                    'topics': ['0x' + topic.hex() for topic in (
+                        ERC20_OR_ERC721_TRANSFER,
+                        address_to_bytes32(from_address),
+                        address_to_bytes32(to_address),
+                    )],
+                } for address, from_address, to_address in (
+                    (log_token.address, other_address, tracked_address),
+                    (other_token.address, other_address, make_evm_address()),
+                )],
+            },
+        )
+        DBHistoryEvents(tokens.db).add_history_event(
+            write_cursor=write_cursor,
+            event=EvmEvent(
+                tx_ref=tx_hash,
+                sequence_index=0,
+                timestamp=TimestampMS(1700000000000),
+                location=Location.ETHEREUM,
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                asset=A_DAI,
+                amount=ONE,
+                location_label=tracked_address,
+            ),
+        )
+
+    assert detect() == [{event_token.identifier, log_token.identifier}]
+
+    freezer.move_to(datetime.datetime.fromtimestamp(
+        ts_now() + TOKEN_DETECTION_FULL_SWEEP_INTERVAL,
+        tz=datetime.UTC,
+    ))
+    assert detect() == [all_tokens]
+
+
 def test_query_new_tokens_caches_balances_without_duplicates(tokens: EthereumTokens) -> None:
     tracked_address = make_evm_address()
     detected_balance = FVal('12.34')
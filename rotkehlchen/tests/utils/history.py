@@ -894,6 +894,7 @@ def maybe_mock_historical_price_queries(
     if not should_mock_price_queries:
         # ensure that no previous overwrite of the price historian affects the instance
         historian.__dict__.pop('query_historical_price', None)
+        historian.__dict__.pop('prefetch_historical_prices', None)
         return
 
     if dont_mock_price_for is None:
@@ -938,6 +939,8 @@ def maybe_mock_historical_price_queries(
         return price
 
     historian.query_historical_price = mock_historical_price_query
+    # the mocked prices are never read from the cache so there is nothing to prefetch
+    historian.prefetch_historical_prices = lambda assets_timestamps, to_asset: 0
 
 
 def assert_pnl_debug_import(filepath: Path, database: DBHandler) -> None:
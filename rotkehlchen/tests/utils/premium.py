@@ -1,7 +1,8 @@
+import json
 import os
 import tempfile
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 from unittest.mock import patch
 
 from rotkehlchen.constants import ROTKEHLCHEN_SERVER_TIMEOUT
@@ -82,6 +83,8 @@ def create_patched_requests_get_for_premium(
                 data_hash=metadata_data_hash,
                 data_size=metadata_data_size,
             )
+        elif url.endswith('limits'):
+            return MockResponse(HTTPStatus.OK, '{}')
         elif 'backup' in url:
             implementation = mock_get_backup(saved_data=saved_data)
         else:
@@ -92,6 +95,67 @@ def create_patched_requests_get_for_premium(
     return patch.object(session, 'get', side_effect=mocked_get)
 
 
+class MockChunkedBackupServer:
+    """Local mock of the rotki server endpoints that store the chunked DB backups"""
+
+    def __init__(self) -> None:
+        self.chunks: dict[str, bytes] = {}
+        self.manifest: list[str] | None = None
+        self.last_modify_ts = 0
+        self.data_hash = ''
+        self.data_size = 0
+        self.uploaded_chunk_ids: list[str] = []
+
+    def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> MockResponse:
+        if url.endswith('last_data_metadata'):
+            return MockResponse(HTTPStatus.OK, json.dumps({
+                'upload_ts': 1337,
+                'last_modify_ts': self.last_modify_ts,
+                'data_hash': self.data_hash,
+                'data_size': self.data_size,
+                'chunked': self.manifest is not None,
+            }))
+        if url.endswith('backup/manifest'):
+            if self.manifest is None:
+                return MockResponse(HTTPStatus.NOT_FOUND, '{"error": "No backup found"}')
+            return MockResponse(HTTPStatus.OK, json.dumps({'chunk_ids': self.manifest}))
+        if url.endswith('backup/chunk'):
+            assert params is not None
+            return MockResponse(HTTPStatus.OK, text='', content=self.chunks[params['chunk_id']])
+        if url.endswith('backup/chunks'):
+            return MockResponse(HTTPStatus.OK, json.dumps({'chunk_ids': list(self.chunks)}))
+
+        raise ValueError(f'Unmocked url {url} in session get for premium')
+
+    def post(
+            self,
+            url: str,
+            data: dict[str, Any],
+            files: dict[str, tuple[str, bytes]] | None = None,
+            **kwargs: Any,
+    ) -> MockResponse:
+        if url.endswith('backup/chunks'):
+            assert files is not None
+            for chunk_id, (_, chunk) in files.items():
+                self.chunks[chunk_id] = chunk
+                self.uploaded_chunk_ids.append(chunk_id)
+            return MockResponse(HTTPStatus.OK, '{"success": true}')
+        if url.endswith('backup/manifest'):
+            chunk_ids = data['chunk_ids'].split(',')
+            if any(chunk_id not in self.chunks for chunk_id in chunk_ids):
+                return MockResponse(HTTPStatus.BAD_REQUEST, '{"error": "Missing chunks"}')
+            self.manifest = chunk_ids
+            self.last_modify_ts = int(data['last_modify_ts'])
+            self.data_hash = data['file_hash']
+            self.data_size = int(data['total_size'])
+            return MockResponse(HTTPStatus.OK, '{"success": true}')
+
+        raise ValueError(f'Unmocked url {url} in session post for premium')
+
+    def patch_session(self, session):
+        return patch.multiple(session, get=self.get, post=self.post)
+
+
 def create_patched_premium(
         premium_credentials: PremiumCredentials,
         username: str,
@@ -12,6 +12,7 @@ from rotkehlchen.constants import GLOBAL_REQUESTS_TIMEOUT
 from rotkehlchen.db.settings import CachedSettings
 from rotkehlchen.errors.misc import RemoteError, UnableToDecryptRemoteData
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.utils.perf import record_http_response
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -84,6 +85,7 @@ def create_session(
     ))
     session.mount('http://', adapter)
     session.mount('https://', adapter)
+    session.hooks['response'].append(record_http_response)
     return session
 
 
@@ -0,0 +1,309 @@
+"""Opt-in per request performance instrumentation of the REST API
+
+When enabled (--perf-instrumentation) every API request opens a span in the thread
+serving it. While the span is open the DB statements executed through DBCursor,
+the lookups of the instrumented in-memory caches and the outbound HTTP calls of
+sessions made by create_session() are recorded in it. When the request finishes the
+span is aggregated into the stats of its route, which are served by the /perf endpoint.
+
+Work the request hands off to other threads, e.g. async queries, is not attributed
+to the request.
+
+Optionally a fraction of the requests is sampled with a stack sampler so that the
+folded stacks of each route can be rendered as a flamegraph.
+"""
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+from urllib.parse import urlsplit
+
+from rotkehlchen.concurrency import spawn
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+    import requests
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+# Upper bounds in milliseconds of the request duration histogram buckets
+PERF_HISTOGRAM_BUCKETS_MS: Final = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000,
+)
+PERF_PERCENTILES: Final = (50, 90, 99)
+PERF_MAX_STATEMENTS_PER_ROUTE: Final = 50  # keep the statements taking the most time
+PERF_MAX_STACKS_PER_ROUTE: Final = 5000  # distinct folded stacks kept per route
+PERF_SAMPLING_INTERVAL: Final = 0.005  # seconds between two stack samples
+
+
+@dataclass(slots=True)
+class RequestSpan:
+    """What happened while serving a single request"""
+    route: str
+    start: float
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    statements: dict[str, list[float]] = field(default_factory=dict)  # statement -> [count, seconds]  # noqa: E501
+    cache_hits: Counter[str] = field(default_factory=Counter)
+    cache_misses: Counter[str] = field(default_factory=Counter)
+    http_calls: int = 0
+    http_seconds: float = 0.0
+    http_hosts: Counter[str] = field(default_factory=Counter)
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        self.db_statements += 1
+        self.db_seconds += seconds
+        if (entry := self.statements.get(statement)) is None:
+            self.statements[statement] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+
+@dataclass(slots=True)
+class RouteStats:
+    """Aggregated spans of all the requests of a route"""
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(PERF_HISTOGRAM_BUCKETS_MS) + 1))  # noqa: E501
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    statements: dict[str, list[float]] = field(default_factory=dict)
+    cache_hits: Counter[str] = field(default_factory=Counter)
+    cache_misses: Counter[str] = field(default_factory=Counter)
+    http_calls: int = 0
+    http_seconds: float = 0.0
+    http_hosts: Counter[str] = field(default_factory=Counter)
+
+    def add(self, span: RequestSpan, seconds: float, is_error: bool) -> None:
+        self.requests += 1
+        self.errors += is_error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        milliseconds, bucket = seconds * 1000, len(PERF_HISTOGRAM_BUCKETS_MS)
+        for idx, upper_bound in enumerate(PERF_HISTOGRAM_BUCKETS_MS):
+            if milliseconds <= upper_bound:
+                bucket = idx
+                break
+        self.histogram[bucket] += 1
+        self.db_statements += span.db_statements
+        self.db_seconds += span.db_seconds
+        for statement, (count, statement_seconds) in span.statements.items():
+            if (entry := self.statements.get(statement)) is None:
+                self.statements[statement] = [count, statement_seconds]
+            else:
+                entry[0] += count
+                entry[1] += statement_seconds
+
+        if len(self.statements) > PERF_MAX_STATEMENTS_PER_ROUTE:
+            self.statements = dict(sorted(
+                self.statements.items(),
+                key=lambda item: item[1][1],
+                reverse=True,
+            )[:PERF_MAX_STATEMENTS_PER_ROUTE])
+
+        self.cache_hits.update(span.cache_hits)
+        self.cache_misses.update(span.cache_misses)
+        self.http_calls += span.http_calls
+        self.http_seconds += span.http_seconds
+        self.http_hosts.update(span.http_hosts)
+
+    def percentile_ms(self, percentile: int) -> float:
+        """Estimate a percentile of the duration as the upper bound of its histogram bucket"""
+        threshold, cumulative = self.requests * percentile / 100, 0
+        for idx, count in enumerate(self.histogram):
+            cumulative += count
+            if cumulative >= threshold and count != 0:
+                if idx == len(PERF_HISTOGRAM_BUCKETS_MS):
+                    break
+                return min(PERF_HISTOGRAM_BUCKETS_MS[idx], self.max_seconds * 1000)
+
+        return self.max_seconds * 1000
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'total_ms': self.total_seconds * 1000,
+            'max_ms': self.max_seconds * 1000,
+            'percentiles_ms': {
+                f'p{percentile}': self.percentile_ms(percentile)
+                for percentile in PERF_PERCENTILES
+            },
+            'histogram': [
+                {'le_ms': upper_bound, 'count': count}
+                for upper_bound, count in zip(
+                    (*PERF_HISTOGRAM_BUCKETS_MS, None),
+                    self.histogram,
+                    strict=True,
+                )
+            ],
+            'db': {
+                'statements': self.db_statements,
+                'total_ms': self.db_seconds * 1000,
+                'slowest_statements': [
+                    {'statement': statement, 'count': count, 'total_ms': seconds * 1000}
+                    for statement, (count, seconds) in sorted(
+                        self.statements.items(),
+                        key=lambda item: item[1][1],
+                        reverse=True,
+                    )
+                ],
+            },
+            'caches': {
+                name: {'hits': self.cache_hits[name], 'misses': self.cache_misses[name]}
+                for name in sorted(self.cache_hits.keys() | self.cache_misses.keys())
+            },
+            'http': {
+                'calls': self.http_calls,
+                'total_ms': self.http_seconds * 1000,
+                'hosts': dict(self.http_hosts),
+            },
+        }
+
+
+_request_span: ContextVar[RequestSpan | None] = ContextVar('perf_request_span', default=None)
+
+
+def get_request_span() -> RequestSpan | None:
+    """The span of the request served by the current thread if instrumentation is on"""
+    return _request_span.get()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    if (span := _request_span.get()) is None:
+        return
+
+    if hit:
+        span.cache_hits[cache] += 1
+    else:
+        span.cache_misses[cache] += 1
+
+
+def record_http_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """requests response hook recording an outbound HTTP call in the current span"""
+    if (span := _request_span.get()) is None:
+        return
+
+    span.http_calls += 1
+    span.http_seconds += response.elapsed.total_seconds()
+    span.http_hosts[urlsplit(response.url).netloc] += 1
+
+
+def _fold_stack(frame: FrameType | None) -> str:
+    """Fold a stack in the `outer;...;inner` format consumed by flamegraph tools"""
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class PerfRecorder:
+    """Aggregates the spans of the API requests per route"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.lock = threading.Lock()
+        self.routes: defaultdict[str, RouteStats] = defaultdict(RouteStats)
+        self.stacks: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._sampled_threads: dict[int, str] = {}  # thread ident -> route
+        self._sampler_running = False
+
+    def enable(self, sample_rate: float = 0.0) -> None:
+        """Start recording the requests. A sample_rate above zero also samples the
+        stacks of that fraction of the requests"""
+        self.sample_rate = sample_rate
+        self.enabled = True
+        log.info(f'Enabled API performance instrumentation with flamegraph sample rate {sample_rate}')  # noqa: E501
+        with self.lock:
+            if sample_rate > 0 and self._sampler_running is False:
+                self._sampler_running = True
+                spawn(self._sample_stacks)
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self.lock:
+            self.routes.clear()
+            self.stacks.clear()
+
+    def start_request(self, route: str) -> Token[RequestSpan | None] | None:
+        """Open the span of the request served by the current thread. Returns the
+        token to pass to finish_request or None if instrumentation is disabled"""
+        if self.enabled is False:
+            return None
+
+        if self.sample_rate > 0 and random.random() < self.sample_rate:  # noqa: S311  # not for cryptographic use
+            with self.lock:
+                self._sampled_threads[threading.get_ident()] = route
+
+        return _request_span.set(RequestSpan(route=route, start=time.perf_counter()))
+
+    def finish_request(self, token: Token[RequestSpan | None], is_error: bool) -> None:
+        """Close the span opened by start_request and aggregate it to its route"""
+        span = _request_span.get()
+        _request_span.reset(token)
+        if span is None:
+            return
+
+        seconds = time.perf_counter() - span.start
+        with self.lock:
+            self._sampled_threads.pop(threading.get_ident(), None)
+            self.routes[span.route].add(span=span, seconds=seconds, is_error=is_error)
+
+    def serialize(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'flamegraph_sample_rate': self.sample_rate,
+                'routes': {route: stats.serialize() for route, stats in self.routes.items()},
+            }
+
+    def folded_stacks(self, route: str | None = None) -> str:
+        """The sampled stacks of all (or one) routes in the folded flamegraph format"""
+        with self.lock:
+            return '\n'.join(
+                f'{stack} {count}'
+                for stacks_route, stacks in self.stacks.items()
+                if route is None or stacks_route == route
+                for stack, count in stacks.most_common()
+            )
+
+    def _sample_stacks(self) -> None:
+        """Periodically record the stack of every thread serving a sampled request"""
+        while self.enabled:
+            time.sleep(PERF_SAMPLING_INTERVAL)
+            with self.lock:
+                if len(self._sampled_threads) == 0:
+                    continue
+                sampled_threads = dict(self._sampled_threads)
+
+            frames = sys._current_frames()
+            folded = [
+                (route, _fold_stack(frame)) for ident, route in sampled_threads.items()
+                if (frame := frames.get(ident)) is not None
+            ]
+            with self.lock:
+                for route, stack in folded:
+                    route_stacks = self.stacks[route]
+                    if stack in route_stacks or len(route_stacks) < PERF_MAX_STACKS_PER_ROUTE:
+                        route_stacks[stack] += 1
+
+        with self.lock:
+            self._sampler_running = False
+
+
+PERF_RECORDER: Final = PerfRecorder()
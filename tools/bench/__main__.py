@@ -24,7 +24,7 @@ from tools.bench.output import (
     to_gha_benchmark,
 )
 from tools.bench.runner import BenchError
-from tools.bench.stats import summarize
+from tools.bench.stats import summarize, summarize_memory
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
@@ -42,7 +42,13 @@ def run_command(args: argparse.Namespace) -> None:
                 blocks=args.samples,
                 work_dir=work_dir,
             )
-            results[profile] = {op: summarize(values) for op, values in samples.items()}
+            results[profile] = {
+                op: summarize(values) | (
+                    {'memory': summarize_memory(samples.memory[op])}
+                    if op in samples.memory else {}
+                )
+                for op, values in samples.timings.items()
+            }
     finally:
         shutil.rmtree(work_dir, ignore_errors=True)
 
@@ -14,10 +14,16 @@ from pathlib import Path
 from typing import Any
 
 from rotkehlchen.db.settings import ROTKEHLCHEN_DB_VERSION
-from tools.bench.harness import ensure_profile_cached, load_expected, run_block
+from tools.bench.harness import (
+    ProfileSamples,
+    add_block_samples,
+    ensure_profile_cached,
+    load_expected,
+    run_block,
+)
 from tools.bench.micro_compare import run_micro_compare
 from tools.bench.runner import BenchError
-from tools.bench.stats import compare_samples
+from tools.bench.stats import compare_memory, compare_samples
 
 
 def _git(repo_root: Path, *args: str) -> str:
@@ -88,7 +94,11 @@ def run_compare(
         work_dir: Path,
         micro: bool = True,
 ) -> dict[str, Any]:
-    """Returns {base_commit, head_commit, profiles: {profile: {op: comparison}}, micro}"""
+    """Returns {base_commit, head_commit, profiles: {profile: {op: comparison}}, micro}
+
+    Each operation comparison also holds a 'memory' comparison per memory metric
+    when both sides captured it.
+    """
     head_commit = _git(repo_root, 'rev-parse', 'HEAD')
     base_commit = _git(repo_root, 'merge-base', 'HEAD', base_ref)
     if base_commit == head_commit:
@@ -101,7 +111,10 @@ def run_compare(
         comparison: dict[str, Any] = {}
         for profile in profiles:
             expected = load_expected(cached[profile], profile)
-            samples: dict[str, dict[str, list[float]]] = {'base': {}, 'head': {}}
+            samples = {
+                'base': ProfileSamples(timings={}, memory={}),
+                'head': ProfileSamples(timings={}, memory={}),
+            }
             for block_index in range(blocks):
                 for side, side_root in (('base', worktree), ('head', repo_root)):
                     block = run_block(
@@ -111,13 +124,19 @@ def run_compare(
                         expected=expected,
                         work_dir=work_dir / side,
                     )
-                    for name, duration_ms in block.items():
-                        samples[side].setdefault(name, []).append(duration_ms)
+                    add_block_samples(samples[side], block)
                 print(f'  [{profile}] block pair {block_index + 1}/{blocks} done')
-            comparison[profile] = {
-                op: compare_samples(base=base_samples, head=samples['head'][op])
-                for op, base_samples in samples['base'].items()
-            }
+            comparison[profile] = {}
+            for op, base_samples in samples['base'].timings.items():
+                comparison[profile][op] = compare_samples(
+                    base=base_samples,
+                    head=samples['head'].timings[op],
+                )
+                if op in samples['base'].memory and op in samples['head'].memory:
+                    comparison[profile][op]['memory'] = compare_memory(
+                        base=samples['base'].memory[op],
+                        head=samples['head'].memory[op],
+                    )
 
         if micro:  # pure-python micro suite, A/B'd against the same base worktree
             micro_comparison = run_micro_compare(repo_root, worktree, work_dir)
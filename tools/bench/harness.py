@@ -14,24 +14,49 @@ positive (an op bimodal between ~125ms and ~830ms depending on where in the
 block it landed relative to post-unlock background-task activity).
 boot_to_ping and user_unlock are cold-path by definition and contribute one
 sample per block.
+
+After the timed passes every operation runs twice more, untimed, to capture
+its memory through the launcher's control channel. The first run reads the
+peak RSS and the net count of allocated blocks, the second one traces the
+python allocations for the peak of the python heap. They are separate since
+tracing the allocations slows the operation down and its own bookkeeping
+would count towards the peak RSS.
+
+Operations that write (imports, matching) would measure a different path on
+each pass over the data written by the previous one. So every pass of them,
+timed or memory, runs on its own backend booted on a pristine copy of the
+profile. There is no warmup pass for them, each pass is the first run of the
+operation after unlock.
 """
 import json
 import shutil
 import subprocess  # noqa: S404
 import time
-from typing import TYPE_CHECKING, Any, Final
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
-from tools.bench.operations import OPERATIONS
+from tools.bench.operations import OPERATIONS, Operation
 from tools.bench.runner import BackendRunner, BenchError
 from tools.scenarios.base import USER_PASSWORD
 from tools.scenarios.cache import cached_profile_path, compute_cache_key, materialize
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
 OP_INNER_PASSES: Final = 3
 
 
+class BlockResult(NamedTuple):
+    timings: dict[str, float]  # operation → duration in ms
+    memory: dict[str, dict[str, float]]  # operation → memory metric → value
+
+
+class ProfileSamples(NamedTuple):
+    timings: dict[str, list[float]]  # operation → one duration per block
+    memory: dict[str, dict[str, list[float]]]  # operation → metric → one value per block
+
+
 def ensure_profile_cached(head_repo_root: Path, profile: str) -> Path:
     """Build (or fetch from cache) a profile using the HEAD checkout's
     generator. Runs as a subprocess so the build's GlobalDBHandler singleton
@@ -59,53 +84,106 @@ def load_expected(cached_profile: Path, profile: str) -> dict[str, Any]:
     )
 
 
-def run_block(
+@contextmanager
+def _unlocked_backend(
         repo_root: Path,
         profile: str,
         cached_profile: Path,
-        expected: dict[str, Any],
         work_dir: Path,
-) -> dict[str, float]:
-    """Run one measurement block against the backend of the given checkout.
-    Returns operation name → duration in ms."""
+        timings: dict[str, float] | None = None,
+) -> Iterator[BackendRunner]:
+    """Boot the backend of the given checkout on a pristine copy of the profile and unlock
+    it. If timings is given the boot and the unlock are recorded in it."""
     data_dir = work_dir / 'data'
     if data_dir.exists():
         shutil.rmtree(data_dir)
     materialize(cached_profile, data_dir)
 
-    timings: dict[str, float] = {}
     with BackendRunner(
         repo_root=repo_root,
         data_dir=data_dir,
         log_dir=work_dir / 'logs',
     ) as backend:
-        timings['boot_to_ping'] = backend.start()
+        boot_ms = backend.start()
         start = time.perf_counter()
         backend.request('POST', f'/users/{profile}', {
             'password': USER_PASSWORD,
             'sync_approval': 'no',
             'resume_from_backup': False,
         })
-        timings['user_unlock'] = (time.perf_counter() - start) * 1000
+        if timings is not None:
+            timings['boot_to_ping'] = boot_ms
+            timings['user_unlock'] = (time.perf_counter() - start) * 1000
         backend.use_mock_rpc_nodes()  # untimed setup: chain queries go to the mock
+        yield backend
+
+    if len(backend.mock.unhandled) != 0:
+        top = ', '.join(f'{k} ({n}x)' for k, n in backend.mock.unhandled.most_common(5))
+        print(f'  WARNING: unmocked external requests this block: {top}')
+
+    shutil.rmtree(data_dir)
+
+
+def _measure_memory(
+        backend: BackendRunner,
+        operation: Operation,
+        expected: dict[str, Any],
+        traced: bool,
+) -> dict[str, float]:
+    """Run the operation once, untimed, reading either the untraced or the traced
+    memory metrics (see module docstring)"""
+    route = '/memory/heap' if traced else '/memory'
+    backend.control('POST', f'{route}/reset')
+    operation.run(backend, expected)
+    return backend.control('GET', route)
 
-        operations = [op for op in OPERATIONS if profile in op.profiles]
-        for operation in operations:  # warmup pass
+
+def run_block(
+        repo_root: Path,
+        profile: str,
+        cached_profile: Path,
+        expected: dict[str, Any],
+        work_dir: Path,
+) -> BlockResult:
+    """Run one measurement block against the backend of the given checkout"""
+    timings: dict[str, float] = {}
+    memory: dict[str, dict[str, float]] = {}
+    operations = [op for op in OPERATIONS if profile in op.profiles]
+    backend_args = {
+        'repo_root': repo_root,
+        'profile': profile,
+        'cached_profile': cached_profile,
+        'work_dir': work_dir,
+    }
+    with _unlocked_backend(**backend_args, timings=timings) as backend:
+        reading = [op for op in operations if op.writes is False]
+        for operation in reading:  # warmup pass
             operation.run(backend, expected)
-        for operation in operations:  # timed passes; min is the sample (see module docstring)
+        for operation in reading:  # timed passes; min is the sample (see module docstring)
             passes = []
             for _ in range(OP_INNER_PASSES):
                 start = time.perf_counter()
                 operation.run(backend, expected)
                 passes.append((time.perf_counter() - start) * 1000)
             timings[operation.name] = min(passes)
+        for operation in reading:  # untimed memory passes (see module docstring)
+            memory[operation.name] = _measure_memory(backend, operation, expected, traced=False)
+            memory[operation.name] |= _measure_memory(backend, operation, expected, traced=True)
+
+    for operation in (op for op in operations if op.writes is True):
+        passes = []
+        for _ in range(OP_INNER_PASSES):  # every pass on a pristine profile
+            with _unlocked_backend(**backend_args) as backend:
+                start = time.perf_counter()
+                operation.run(backend, expected)
+                passes.append((time.perf_counter() - start) * 1000)
+        timings[operation.name] = min(passes)
+        memory[operation.name] = {}
+        for traced in (False, True):
+            with _unlocked_backend(**backend_args) as backend:
+                memory[operation.name] |= _measure_memory(backend, operation, expected, traced)
 
-    if len(backend.mock.unhandled) != 0:
-        top = ', '.join(f'{k} ({n}x)' for k, n in backend.mock.unhandled.most_common(5))
-        print(f'  WARNING: unmocked external requests this block: {top}')
-
-    shutil.rmtree(data_dir)
-    return timings
+    return BlockResult(timings=timings, memory=memory)
 
 
 def run_profile(
@@ -115,10 +193,10 @@ def run_profile(
         blocks: int,
         work_dir: Path,
         label: str = '',
-) -> dict[str, list[float]]:
+) -> ProfileSamples:
     """Run the given number of blocks and aggregate samples per operation"""
     expected = load_expected(cached_profile, profile)
-    samples: dict[str, list[float]] = {}
+    samples = ProfileSamples(timings={}, memory={})
     for block_index in range(blocks):
         block = run_block(
             repo_root=repo_root,
@@ -127,7 +205,14 @@ def run_profile(
             expected=expected,
             work_dir=work_dir,
         )
-        for name, duration_ms in block.items():
-            samples.setdefault(name, []).append(duration_ms)
+        add_block_samples(samples, block)
         print(f'  [{label or profile}] block {block_index + 1}/{blocks} done')
     return samples
+
+
+def add_block_samples(samples: ProfileSamples, block: BlockResult) -> None:
+    for name, duration_ms in block.timings.items():
+        samples.timings.setdefault(name, []).append(duration_ms)
+    for name, metrics in block.memory.items():
+        for metric, value in metrics.items():
+            samples.memory.setdefault(name, {}).setdefault(metric, []).append(value)
@@ -10,15 +10,29 @@ refusal instead of silent nondeterministic network traffic.
 
 The same pattern as the premium monkeypatch idea (design §5.3): the patch
 lives in the harness, never in shipped backend code.
+
+It also serves a tiny control channel on ROTKI_BENCH_CONTROL_PORT that the
+harness uses to capture per-operation memory (peak RSS, python heap peak and
+net allocated blocks) and to run the operations that have no synchronous REST
+endpoint (historical balances processing, asset movement matching) in-process.
 """
 
+import gc
+import json
 import os
+import resource
+import sys
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlsplit, urlunsplit
 
 import requests.adapters
 
 MOCK_URL = os.environ['ROTKI_BENCH_MOCK_URL']
+CONTROL_PORT = int(os.environ['ROTKI_BENCH_CONTROL_PORT'])
 ORIGINAL_HOST_HEADER = 'X-Bench-Original-Host'
 
 _mock_parts = urlsplit(MOCK_URL)
@@ -54,6 +68,140 @@ def _never_update_protocol_cache(*_args: Any, **_kwargs: Any) -> bool:
 
 _eth_utils.should_update_protocol_cache = _never_update_protocol_cache
 
+# Keep a handle on the app instance for the in-process operations of the control channel
+import rotkehlchen.rotkehlchen as _rotkehlchen_module
+
+_rotki_instances: list[Any] = []
+_original_rotki_init = _rotkehlchen_module.Rotkehlchen.__init__
+
+
+def _capturing_rotki_init(self: Any, *args: Any, **kwargs: Any) -> None:
+    _original_rotki_init(self, *args, **kwargs)
+    _rotki_instances.append(self)
+
+
+_rotkehlchen_module.Rotkehlchen.__init__ = _capturing_rotki_init  # type: ignore[method-assign]
+
+_memory_baseline = {'allocated_blocks': 0}
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS since the last reset. VmHWM is only resettable on linux. Elsewhere
+    this falls back to the peak of the whole process lifetime."""
+    try:
+        for line in Path('/proc/self/status').read_text(encoding='utf-8').splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024  # bytes on macOS
+
+
+def _memory_reset() -> bool:
+    """Start an untraced memory measurement. Peak RSS and the allocated blocks are read
+    without tracemalloc running since its own bookkeeping would inflate them."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    gc.collect()
+    try:  # '5' resets the peak RSS (VmHWM) to the current RSS
+        Path('/proc/self/clear_refs').write_text('5', encoding='utf-8')
+    except OSError:
+        pass
+    _memory_baseline['allocated_blocks'] = sys.getallocatedblocks()
+    return True
+
+
+def _memory_read() -> dict[str, float]:
+    return {
+        'peak_rss_mb': round(_peak_rss_mb(), 2),
+        'allocated_blocks': sys.getallocatedblocks() - _memory_baseline['allocated_blocks'],
+    }
+
+
+def _heap_reset() -> bool:
+    """Start tracing the python allocations for the python heap peak"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    return True
+
+
+def _heap_read() -> dict[str, float]:
+    _, python_peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    tracemalloc.stop()
+    return {'python_peak_mb': round(python_peak / 1024 ** 2, 2)}
+
+
+def _rotki() -> Any:
+    if len(_rotki_instances) == 0:
+        raise RuntimeError('the rotki instance has not been created yet')
+    return _rotki_instances[-1]
+
+
+def _process_historical_balances() -> bool:
+    from rotkehlchen.tasks.historical_balances import process_historical_balances
+
+    rotki = _rotki()
+    process_historical_balances(database=rotki.data.db, msg_aggregator=rotki.msg_aggregator)
+    return True
+
+
+def _match_asset_movements() -> bool:
+    from rotkehlchen.tasks.events import process_asset_movements
+
+    process_asset_movements(database=_rotki().data.db)
+    return True
+
+
+CONTROL_ROUTES = {
+    ('POST', '/memory/reset'): _memory_reset,
+    ('GET', '/memory'): _memory_read,
+    ('POST', '/memory/heap/reset'): _heap_reset,
+    ('GET', '/memory/heap'): _heap_read,
+    ('POST', '/operations/historical_balances'): _process_historical_balances,
+    ('POST', '/operations/asset_movement_matching'): _match_asset_movements,
+}
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str) -> None:
+        if (route := CONTROL_ROUTES.get((method, self.path))) is None:
+            self._reply(404, {'result': None, 'message': f'unknown control route {method} {self.path}'})  # noqa: E501
+            return
+        try:
+            result = route()
+        except Exception as e:  # noqa: BLE001  # reported to the harness as a failed operation
+            self._reply(500, {'result': None, 'message': repr(e)})
+            return
+        self._reply(200, {'result': result, 'message': ''})
+
+    def _reply(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        """Keep the control requests out of the backend's stdout log"""
+
+
+threading.Thread(
+    target=ThreadingHTTPServer(('127.0.0.1', CONTROL_PORT), _ControlHandler).serve_forever,
+    name='bench-control',
+    daemon=True,
+).start()
+
 from rotkehlchen.__main__ import main
 
 main()
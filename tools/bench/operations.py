@@ -5,18 +5,25 @@ Criteria for inclusion: user-visible, deterministic on a seeded profile, no
 network egress. ``boot_to_ping`` and ``user_unlock`` are measured by the block
 driver in harness.py, not here, since their timing brackets differ.
 
-PnL/accounting operations are deliberately absent until the accounting rework
-lands (design §4.1).
+Operations backed by background tasks without a synchronous REST endpoint
+(historical balances processing, asset movement matching) run in-process
+through the launcher's control channel instead (see launch_backend.py).
+Operations that write (imports, matching) are marked so, and the block driver
+runs every pass of them on a pristine copy of the profile.
 """
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Final
 
+from tools.scenarios.deterministic import SCENARIO_NOW
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from tools.bench.runner import BackendRunner
 
 EVENTS_PAGE_SIZE: Final = 50
+# whale PnL reports and balance processing can outlast the runner's default timeout
+LONG_OPERATION_TIMEOUT: Final = 1800
 
 
 @dataclass(frozen=True)
@@ -24,6 +31,7 @@ class Operation:
     name: str
     profiles: tuple[str, ...]  # profiles this operation runs on
     run: Callable[[BackendRunner, dict[str, Any]], None]  # (backend, expected.json)
+    writes: bool = False  # if True each pass needs a pristine profile
 
 
 def _history_events_p1(backend: BackendRunner, _expected: dict[str, Any]) -> None:
@@ -91,6 +99,33 @@ def _redecode_transactions(backend: BackendRunner, _expected: dict[str, Any]) ->
     })
 
 
+def _pnl_report(backend: BackendRunner, _expected: dict[str, Any]) -> None:
+    # the whole profile history. Prices come from the daily prices the profiles seed
+    backend.request('GET', '/history', {
+        'from_timestamp': 0,
+        'to_timestamp': SCENARIO_NOW,
+        'async_query': False,
+    }, timeout=LONG_OPERATION_TIMEOUT)
+
+
+def _historical_balances(backend: BackendRunner, _expected: dict[str, Any]) -> None:
+    # full reprocessing of the event metrics behind the historical balances views
+    backend.control('POST', '/operations/historical_balances', timeout=LONG_OPERATION_TIMEOUT)
+
+
+def _csv_import_trades(backend: BackendRunner, expected: dict[str, Any]) -> None:
+    backend.request('PUT', '/import', {
+        'source': 'rotki_trades',
+        'file': str(backend.data_dir / expected['csv_imports']['rotki_trades.csv']['path']),
+        'async_query': False,
+    })
+
+
+def _asset_movement_matching(backend: BackendRunner, _expected: dict[str, Any]) -> None:
+    # the matching task normally runs in the background (and via the api only with premium)
+    backend.control('POST', '/operations/asset_movement_matching')
+
+
 OPERATIONS: Final = (
     Operation(
         name='history_events_p1',
@@ -137,4 +172,26 @@ OPERATIONS: Final = (
         profiles=('small', 'whale'),
         run=_redecode_transactions,
     ),
+    Operation(
+        name='pnl_report',
+        profiles=('small', 'whale'),
+        run=_pnl_report,
+    ),
+    Operation(
+        name='historical_balances',
+        profiles=('small', 'whale'),
+        run=_historical_balances,
+    ),
+    Operation(
+        name='csv_import_trades',
+        profiles=('small', 'whale'),
+        run=_csv_import_trades,
+        writes=True,
+    ),
+    Operation(
+        name='asset_movement_matching',
+        profiles=('small', 'whale'),
+        run=_asset_movement_matching,
+        writes=True,
+    ),
 )
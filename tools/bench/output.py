@@ -33,14 +33,20 @@ def collect_meta(repo_root: Path) -> dict[str, Any]:
     }
 
 
+def _memory_cells(summary: dict[str, Any]) -> str:
+    if (memory := summary.get('memory')) is None:
+        return '- | - | -'
+    return f'{memory["peak_rss_mb"]} | {memory["python_peak_mb"]} | {memory["allocated_blocks"]}'  # noqa: E501
+
+
 def render_run_table(results: dict[str, dict[str, Any]]) -> str:
     """Markdown table for a single `run` result: profile/op → summary"""
     lines = [
-        '| profile | operation | median ms | min ms | max ms | stddev |',
-        '|---|---|---:|---:|---:|---:|',
+        '| profile | operation | median ms | min ms | max ms | stddev | peak RSS MB | python peak MB | allocated blocks |',  # noqa: E501
+        '|---|---|---:|---:|---:|---:|---:|---:|---:|',
     ]
     lines.extend(
-        f'| {profile} | {op} | {s["median_ms"]} | {s["min_ms"]} | {s["max_ms"]} | {s["stddev_ms"]} |'  # noqa: E501
+        f'| {profile} | {op} | {s["median_ms"]} | {s["min_ms"]} | {s["max_ms"]} | {s["stddev_ms"]} | {_memory_cells(s)} |'  # noqa: E501
         for profile, ops in results.items()
         for op, s in ops.items()
     )
@@ -49,24 +55,40 @@ def render_run_table(results: dict[str, dict[str, Any]]) -> str:
 
 def to_gha_benchmark(results: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert a `run` result to github-action-benchmark's
-    customSmallerIsBetter format: one datapoint per profile/operation."""
-    return [
-        {
-            'name': f'{profile}/{op}',
-            'unit': 'ms',
-            'value': summary['median_ms'],
-            'extra': f'min {summary["min_ms"]}ms, stddev {summary["stddev_ms"]}ms',
-        }
-        for profile, ops in results.items()
-        for op, summary in ops.items()
-    ]
+    customSmallerIsBetter format: one datapoint per profile/operation, plus
+    one for the peak RSS of each operation with memory captured."""
+    datapoints = []
+    for profile, ops in results.items():
+        for op, summary in ops.items():
+            datapoints.append({
+                'name': f'{profile}/{op}',
+                'unit': 'ms',
+                'value': summary['median_ms'],
+                'extra': f'min {summary["min_ms"]}ms, stddev {summary["stddev_ms"]}ms',
+            })
+            if (memory := summary.get('memory')) is not None:
+                datapoints.append({
+                    'name': f'{profile}/{op}/peak_rss',
+                    'unit': 'MB',
+                    'value': memory['peak_rss_mb'],
+                    'extra': f'python peak {memory["python_peak_mb"]}MB, {memory["allocated_blocks"]} allocated blocks',  # noqa: E501
+                })
+    return datapoints
+
+
+def _memory_delta_cell(comparison: dict[str, Any]) -> str:
+    if (peak_rss := comparison.get('memory', {}).get('peak_rss_mb')) is None:
+        return '-'
+    sign = '+' if peak_rss['delta'] >= 0 else ''
+    cell = f'{sign}{peak_rss["delta"]} MB ({sign}{peak_rss["delta_pct"]}%)'
+    return f'**{cell}**' if peak_rss['significant'] else cell
 
 
 def render_compare_table(comparison: dict[str, dict[str, Any]]) -> str:
     """Markdown table for a `compare` result: per profile/op deltas"""
     lines = [
-        '| profile | operation | base median | head median | Δ ms | Δ % | significant |',
-        '|---|---|---:|---:|---:|---:|:---:|',
+        '| profile | operation | base median | head median | Δ ms | Δ % | significant | Δ peak RSS |',  # noqa: E501
+        '|---|---|---:|---:|---:|---:|:---:|---:|',
     ]
     for profile, ops in comparison.items():
         for op, c in ops.items():
@@ -74,7 +96,8 @@ def render_compare_table(comparison: dict[str, dict[str, Any]]) -> str:
             sign = '+' if c['delta_ms'] >= 0 else ''
             lines.append(
                 f'| {profile} | {op} | {c["base"]["median_ms"]} | {c["head"]["median_ms"]} '
-                f'| {sign}{c["delta_ms"]} | {sign}{c["delta_pct"]}% | {marker} |',
+                f'| {sign}{c["delta_ms"]} | {sign}{c["delta_pct"]}% | {marker} '
+                f'| {_memory_delta_cell(c)} |',
             )
     return '\n'.join(lines)
 
@@ -41,6 +41,7 @@ class BackendRunner:
         self.data_dir = data_dir
         self.log_dir = log_dir
         self.port = free_port()
+        self.control_port = free_port()
         self.process: subprocess.Popen | None = None
         self.session = requests.Session()
         # serve the profile's on-chain state when present (older base-side
@@ -69,7 +70,10 @@ class BackendRunner:
                     '--logfile', str(self.log_dir / 'rotki.log'),
                 ],
                 cwd=self.repo_root,
-                env=os.environ | {'ROTKI_BENCH_MOCK_URL': self.mock.url},
+                env=os.environ | {
+                    'ROTKI_BENCH_MOCK_URL': self.mock.url,
+                    'ROTKI_BENCH_CONTROL_PORT': str(self.control_port),
+                },
                 stdout=stdout,
                 stderr=subprocess.STDOUT,
             )
@@ -119,22 +123,36 @@ class BackendRunner:
             'active': True,
         })
 
-    def request(self, method: str, path: str, json: dict | None = None) -> dict[str, Any]:
+    def request(
+            self,
+            method: str,
+            path: str,
+            json: dict | None = None,
+            timeout: float = REQUEST_TIMEOUT,
+    ) -> Any:
         """Perform an API call and return the response 'result'. Raises
         BenchError on transport errors or API-level errors so a failing
         operation can never be silently timed as fast."""
+        return self._call(method, self.url(path), json, timeout)
+
+    def control(self, method: str, path: str, timeout: float = REQUEST_TIMEOUT) -> Any:
+        """Call the launcher's control channel (see launch_backend.py). Same
+        error semantics as request()."""
+        return self._call(method, f'http://127.0.0.1:{self.control_port}{path}', None, timeout)
+
+    def _call(self, method: str, url: str, json: dict | None, timeout: float) -> Any:
         try:
             response = self.session.request(
                 method=method,
-                url=self.url(path),
+                url=url,
                 json=json,
-                timeout=REQUEST_TIMEOUT,
+                timeout=timeout,
             )
         except requests.RequestException as e:
-            raise BenchError(f'{method} {path} failed: {e}') from e
+            raise BenchError(f'{method} {url} failed: {e}') from e
         payload = response.json()
         if payload.get('result') is None:
-            raise BenchError(f'{method} {path} returned error: {payload.get("message")}')
+            raise BenchError(f'{method} {url} returned error: {payload.get("message")}')
         return payload['result']
 
     def __enter__(self) -> Self:
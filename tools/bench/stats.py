@@ -1,7 +1,11 @@
 """Sample statistics and the A/B significance rule (design §4.2)"""
 import statistics
 from math import sqrt
-from typing import Any
+from typing import Any, Final
+
+# memory readings are much less noisy than timings, so besides the stddev rule a
+# memory delta must also be at least this relative change to count as significant
+MEMORY_MIN_DELTA_PCT: Final = 5
 
 
 def summarize(samples: list[float]) -> dict[str, Any]:
@@ -31,3 +35,36 @@ def compare_samples(base: list[float], head: list[float]) -> dict[str, Any]:
         'delta_pct': round(100 * delta_ms / base_median, 2) if base_median != 0 else 0.0,
         'significant': pooled_stddev > 0 and abs(delta_ms) > 3 * pooled_stddev,
     }
+
+
+def summarize_memory(samples: dict[str, list[float]]) -> dict[str, Any]:
+    """Median over the blocks of each memory metric of an operation"""
+    return {metric: round(statistics.median(values), 2) for metric, values in samples.items()}
+
+
+def compare_memory(
+        base: dict[str, list[float]],
+        head: dict[str, list[float]],
+) -> dict[str, Any]:
+    """Per-metric memory comparison with the same 3x pooled stddev rule as
+    compare_samples plus a minimum relative change (MEMORY_MIN_DELTA_PCT)"""
+    comparison = {}
+    for metric, base_values in base.items():
+        if (head_values := head.get(metric)) is None:
+            continue
+        base_median, head_median = statistics.median(base_values), statistics.median(head_values)
+        delta = head_median - base_median
+        delta_pct = 100 * delta / base_median if base_median != 0 else 0.0
+        pooled_stddev = sqrt(
+            (statistics.stdev(base_values) ** 2 + statistics.stdev(head_values) ** 2) / 2,
+        ) if min(len(base_values), len(head_values)) > 1 else 0.0
+        comparison[metric] = {
+            'base': round(base_median, 2),
+            'head': round(head_median, 2),
+            'delta': round(delta, 2),
+            'delta_pct': round(delta_pct, 2),
+            'significant': (
+                abs(delta) > 3 * pooled_stddev and abs(delta_pct) >= MEMORY_MIN_DELTA_PCT
+            ),
+        }
+    return comparison
@@ -5,6 +5,7 @@ so that schema changes have a single maintenance touchpoint. Event rows are
 serialized by the real event structures' ``serialize_for_db()`` — the bulk
 writer only batches them with explicitly assigned identifiers for speed.
 """
+import csv
 import json
 import sys
 from typing import TYPE_CHECKING, Any, Final
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
     from rotkehlchen.chain.accounts import BlockchainAccountData
     from rotkehlchen.db.settings import ModifiableDBSettings
     from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+    from rotkehlchen.history.types import HistoricalPrice
     from rotkehlchen.types import ChainID, ChecksumEvmAddress, EvmTransaction
 
 # Matches testEnv.PASSWORD in frontend/app/tests/e2e/fixtures/index.ts
@@ -113,6 +115,31 @@ class ProfileBuilder:
                 price=Price(FVal(usd_price)),
             )
 
+    def add_historical_prices(self, prices: Sequence[HistoricalPrice]) -> None:
+        """Seed historical prices into the global DB (as produced by
+        profiles.common.make_daily_prices) so PnL reports run offline."""
+        GlobalDBHandler.add_historical_prices(list(prices))
+        self.stats['historical_prices'] = self.stats.get('historical_prices', 0) + len(prices)
+
+    def add_csv_import(
+            self,
+            name: str,
+            header: Sequence[str],
+            rows: Sequence[Sequence[str]],
+    ) -> None:
+        """Write a CSV file for the import benchmarks into the data dir. Its path
+        (relative to the data dir) and row count land in expected.json."""
+        path = self.output_dir / 'imports' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('w', encoding='utf-8', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(header)
+            writer.writerows(rows)
+        self.stats.setdefault('csv_imports', {})[name] = {
+            'path': f'imports/{name}',
+            'rows': len(rows),
+        }
+
     def add_balance_snapshots(
             self,
             balance_rows: Sequence[tuple],
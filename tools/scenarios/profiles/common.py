@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, Final
 from eth_utils import to_checksum_address
 
 from rotkehlchen.chain.evm.decoding.constants import ERC20_OR_ERC721_TRANSFER
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
 from rotkehlchen.history.events.structures.asset_movement import AssetMovement
 from rotkehlchen.history.events.structures.base import HistoryEvent
 from rotkehlchen.history.events.structures.evm_event import EvmEvent
@@ -20,6 +21,7 @@ if TYPE_CHECKING:
 
     from rotkehlchen.assets.asset import Asset
     from rotkehlchen.history.events.structures.base import HistoryBaseEntry
+    from rotkehlchen.history.types import HistoricalPrice
     from rotkehlchen.types import (
         ChainID,
         ChecksumEvmAddress,
@@ -437,3 +439,80 @@ def make_staking_reward(
         amount=amount,
         notes=f'Receive {amount} {asset[1]} as staking reward',
     )
+
+
+PRICE_HISTORY_SEED_OFFSET: Final = 0xBEEF  # decouple from the profile's event rng stream
+CSV_IMPORT_SEED_OFFSET: Final = 0xC5F
+ROTKI_TRADES_CSV_HEADER: Final = (
+    'Location', 'Spend Currency', 'Receive Currency', 'Receive Amount', 'Spend Amount',
+    'Fee', 'Fee Currency', 'Description', 'Timestamp',
+)
+
+
+def make_daily_prices(
+        seed: int,
+        assets: Sequence[tuple[Asset, str]],
+        days: int,
+) -> list[HistoricalPrice]:
+    """Day-start USD prices of the assets for the given days before the frozen clock.
+
+    They are stored with the coingecko source since its rows are daily: any lookup
+    during the day resolves to the day-start row, so a PnL report over the profile's
+    history finds every price in the cache and never asks the remote oracles. Each
+    price moves around the asset's USD_PRICES entry so that reports have real gains.
+    """
+    from rotkehlchen.constants.assets import A_USD  # heavy imports kept local
+    from rotkehlchen.fval import FVal
+    from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+    from rotkehlchen.types import Price, Timestamp
+    from tools.scenarios.deterministic import SCENARIO_NOW, DeterministicFactory
+
+    factory = DeterministicFactory(seed + PRICE_HISTORY_SEED_OFFSET)
+    first_day = SCENARIO_NOW - SCENARIO_NOW % DAY_IN_SECONDS - days * DAY_IN_SECONDS
+    unique_assets = {asset.identifier: (asset, symbol) for asset, symbol in assets}
+    prices = []
+    for asset, symbol in unique_assets.values():
+        usd_price = FVal(USD_PRICES[symbol])
+        prices.extend(
+            HistoricalPrice(
+                from_asset=asset,
+                to_asset=A_USD,
+                source=HistoricalPriceOracle.COINGECKO,
+                timestamp=Timestamp(first_day + day * DAY_IN_SECONDS),
+                price=Price(usd_price * factory.amount(0.7, 1.4, 4)),
+            )
+            for day in range(days + 1)
+        )
+    return prices
+
+
+def make_rotki_trades_csv(
+        seed: int,
+        assets: Sequence[tuple[Asset, str]],
+        count: int,
+        months: int,
+) -> list[tuple[str, ...]]:
+    """Rows of a rotki generic trades CSV (see ROTKI_TRADES_CSV_HEADER) for the import
+    benchmark. Assets are written by identifier, which the importer resolves directly.
+
+    Uses its own seeded factory so the file never shifts the profile's event rng stream.
+    """
+    from tools.scenarios.deterministic import DeterministicFactory
+
+    factory = DeterministicFactory(seed + CSV_IMPORT_SEED_OFFSET)
+    rows = []
+    for idx in range(count):
+        spend, receive = factory.rng.sample(list(assets), k=2)
+        with_fee = factory.rng.random() < 0.5
+        rows.append((
+            'external',
+            spend[0].identifier,
+            receive[0].identifier,
+            str(factory.amount(0.01, 5000, 8)),
+            str(factory.amount(0.01, 5000, 8)),
+            str(factory.amount(0.0001, 1, 8)) if with_fee else '',
+            spend[0].identifier if with_fee else '',
+            f'Imported trade {idx}',
+            str(factory.timestamp_ms_in_month(factory.rng.randrange(months))),
+        ))
+    return rows
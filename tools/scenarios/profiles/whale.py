@@ -12,19 +12,27 @@ from rotkehlchen.assets.asset import Asset
 from rotkehlchen.balances.manual import ManuallyTrackedBalance
 from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.constants.assets import A_BTC, A_ETH
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
 from rotkehlchen.fval import FVal
 from rotkehlchen.types import ChainID, Location, SupportedBlockchain
-from tools.scenarios.deterministic import DeterministicFactory, monthly_ramp_weights
+from tools.scenarios.deterministic import (
+    SECONDS_PER_MONTH,
+    DeterministicFactory,
+    monthly_ramp_weights,
+)
 from tools.scenarios.profiles.common import (
     MODULE_TOKEN_PRICES,
+    ROTKI_TRADES_CSV_HEADER,
     USD_PRICES,
     EvmPools,
     erc20,
     make_asset_movement,
     make_chain_state,
+    make_daily_prices,
     make_decodable_evm_transactions,
     make_evm_tx_group,
     make_exchange_swap,
+    make_rotki_trades_csv,
     make_snapshots,
     make_staking_reward,
 )
@@ -42,6 +50,8 @@ N_EVM_ACCOUNTS: Final = 20
 N_BTC_ACCOUNTS: Final = 5
 # transactions seeded with receipts so the redecode benchmark operation can run offline
 N_DECODABLE_TXS: Final = 300
+# rows of the rotki generic trades CSV used by the import benchmark operation
+N_CSV_TRADES: Final = 5_000
 USDT_ADDRESS: Final = '0xdAC17F958D2ee523a2206206994597C13D831ec7'
 
 # Row-count targets per category (~400k total)
@@ -291,4 +301,24 @@ def build(builder: ProfileBuilder) -> dict[str, Any] | None:
         receipts=decodable_receipts,
         relevant_address=evm_accounts[0],
     )
+    # daily prices for the whole history so the PnL report operation runs offline
+    builder.add_historical_prices(make_daily_prices(
+        seed=SEED,
+        assets=[
+            (asset, symbol)
+            for pools in pools_per_chain.values()
+            for asset, symbol in pools.assets
+        ],
+        days=ACTIVE_MONTHS * SECONDS_PER_MONTH // DAY_IN_SECONDS + 1,
+    ))
+    builder.add_csv_import(
+        name='rotki_trades.csv',
+        header=ROTKI_TRADES_CSV_HEADER,
+        rows=make_rotki_trades_csv(
+            seed=SEED,
+            assets=pools_per_chain[Location.ETHEREUM].assets,
+            count=N_CSV_TRADES,
+            months=ACTIVE_MONTHS,
+        ),
+    )
     return {'evm_accounts': evm_accounts}